@@ -11,6 +11,9 @@ DEFAULT_CONFIG = {
     "llm_model": "gemma3:4b",
     "llm_api_key": "",  # OpenAI API 키 (ollama/request는 불필요)
     "temperature": 0.3,  # 0.0 - 2.0 (창의성 vs 일관성) - 기본값 통일
+    "llm_num_ctx": 8192,  # Ollama 컨텍스트 길이 (정적 지시문 + context_max_tokens + 답변이 들어가도록, 고정값 유지)
+    "llm_keep_alive": "30m",  # Ollama 모델 상주 시간 (질문 사이 언로드 방지 → 접두부 KV 캐시 재사용, -1 = 무기한)
+    "llm_options": {},  # Ollama options 추가 전달 (예: {"num_thread": 8, "top_p": 0.9})
 
     # 임베딩 설정
     "embedding_api_type": "ollama",  # ollama, request, openai, openai-compatible
@@ -21,17 +24,31 @@ DEFAULT_CONFIG = {
     # 문서 처리 설정
     "chunk_size": 1500,    # 권장 설정 (표/수식 완전 포함)
     "chunk_overlap": 200,  # chunk_size의 13%
+    "ingestion_parse_workers": 0,  # 업로드 파싱 프로세스 수 (0 = CPU 수 - 1)
+    "ingestion_use_processes": True,  # 파싱을 프로세스 풀에서 수행 (False = 스레드)
+    "ingestion_embed_workers": 4,  # 동시 임베딩 배치 요청 수
+    "ingestion_embed_batch_size": 64,  # 임베딩 요청 1회당 청크 수
+    "ingestion_queue_size": 4,  # 파싱/임베딩/기록 단계 사이 대기 파일 수 상한 (메모리 제한)
+    "ingestion_incremental_update": True,  # 재업로드 시 페이지/슬라이드 해시 비교로 변경분만 재임베딩
+    "ingestion_journal_enabled": True,  # 업로드 저널 (강제 종료/실패 시 마지막 기록 배치 이후부터 재개)
+    "pdf_parallel_page_workers": 0,  # 긴 PDF(16페이지 이상) 페이지 구간 병렬 분석 프로세스 수 (0 = CPU 수, 1 = 순차)
+    "pdf_layout_backend": "pymupdf",  # PDF 레이아웃 분석 백엔드 (pymupdf: span 기반 고속, pdfplumber: 문자 단위 기존 방식)
     "top_k": 3,
     "multi_query_num": 3,
 
     # ChromaDB 설정
     "chroma_distance_function": "cosine",  # l2, cosine, ip (정규화된 임베딩은 cosine 권장)
+    "search_cache_size": 128,  # search_with_mode 결과 LRU 캐시 크기 (0 = 비활성화, 문서 추가/삭제 시 자동 무효화)
 
     # Re-ranker 설정 (기본 활성화)
     "use_reranker": True,  # Re-ranker 사용 여부 (고정)
     "reranker_model": "multilingual-mini",  # multilingual-mini로 통일 (base 모델 미사용)
     "reranker_top_k": 3,  # 최종 반환 문서 수 (deprecated, score filtering으로 대체)
     "reranker_initial_k": 60,  # Re-ranking할 초기 후보 수 (리콜 향상)
+    "enable_cascade_rerank": False,  # Cross-Encoder 전 저장 임베딩 코사인 1차 선별 (벤치마크 후 활성화)
+    "cascade_min_keep": 20,  # Cascade 최소 유지 후보 수
+    "cascade_max_keep": 40,  # Cascade 최대 유지 후보 수 (Cross-Encoder 입력 상한)
+    "lazy_reranker_loading": True,  # Re-ranker 백그라운드 로딩+워밍업 (준비 전 질의는 Hybrid 점수 사용)
 
     # Score-based Filtering 설정 (OpenAI 스타일)
     "enable_score_filtering": True,  # Score 기반 필터링 사용 여부
@@ -59,10 +76,33 @@ DEFAULT_CONFIG = {
     # Query Expansion 설정
     "enable_synonym_expansion": True,  # 동의어 확장 사용 여부
     "enable_multi_query": True,  # 다중 쿼리 재작성 사용 여부
+    "enable_multi_query_gate": True,  # 원본 쿼리 1차 검색이 확실하면 Multi-Query 생략
+    "multi_query_gate_min_top1": 0.8,  # 게이트 통과 최소 top-1 reranker 점수
+    "multi_query_gate_min_margin": 0.15,  # 게이트 통과 최소 top-1/top-2 점수 차 (또는 Gap 분리)
+
+    # Session Candidate Pool 설정 (후속 질문)
+    "enable_session_pool": True,  # 최근 턴 검색 후보를 먼저 Re-ranking (부족하면 전체 검색)
+    "session_pool_max_turns": 3,  # 후보를 유지할 최근 턴 수
+    "session_pool_min_hits": 2,  # 풀 사용에 필요한 임계값 이상 후보 수
+    "session_pool_min_similarity": 0.5,  # 질문-후보 최대 임베딩 유사도가 이보다 낮으면 풀 생략
 
     # Small-to-Large 설정
     "small_to_large_context_size": 800,  # Partial context 추출 크기 (자식 청크 전후)
 
+    # Context Packing 설정
+    "context_max_tokens": 4000,  # LLM 컨텍스트 토큰 예산 (근사치, 0 = 무제한)
+    "enable_context_compression": False,  # 질문 관련 문장(+이웃)만 남기는 추출 압축 (로컬 모델 prefill 단축)
+    "context_compression_ratio": 0.3,  # 압축 후 유지할 문자 비율 (0.3 ≈ 3배 이상 축소)
+
+    # Answer Cache 설정 (대화 이력 없는 질문만, 문서 추가/삭제 시 자동 무효화)
+    "enable_answer_cache": True,  # 동일 질문 최종 답변 재사용
+    "answer_cache_max_entries": 256,  # 최대 캐시 항목 수 (LRU)
+    "answer_cache_semantic": False,  # 질문 임베딩 유사도 기반 근접 중복 일치 (질문당 임베딩 1회 추가)
+    "answer_cache_semantic_threshold": 0.97,  # 근접 중복 인정 최소 코사인 유사도
+
+    # Citation 설정
+    "enable_streaming_citations": True,  # 스트리밍 답변에 문장 단위 출처 인라인 표시
+
     # Question Classifier 설정 (Phase 2: Quick Wins)
     "enable_question_classifier": True,  # 질문 분류기 사용 여부
     "classifier_use_llm": True,  # LLM 하이브리드 모드 (False: 규칙만)
@@ -76,6 +116,10 @@ DEFAULT_CONFIG = {
     "enable_vision_chunking": False,  # PPTX Vision 청킹 사용 여부
     "vision_enabled": True,  # 비전 임베딩 기능 사용 여부
     "vision_mode": "auto",  # auto | ollama | openai-compatible
+    "vision_max_concurrency": 4,  # 슬라이드 Vision 분석 동시 요청 수
+    "vision_image_max_side": 1280,  # Vision 요청 이미지 긴 변 최대 픽셀 (0 = 원본 크기)
+    "vision_jpeg_quality": 85,  # Vision 요청 이미지 JPEG 품질 (0 = PNG 유지)
+    "vision_cache_enabled": True,  # 슬라이드 분석 결과 캐시 (이미지 해시 + 모델 + 프롬프트, data/vision_cache)
 
     # 공유 DB 설정
     "shared_db_enabled": False,  # 공유 DB 사용 여부
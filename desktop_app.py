@@ -1,6 +1,7 @@
 from utils.encoding_helper import setup_utf8_encoding
 setup_utf8_encoding()  # Windows 터미널 한글 출력 설정
 
+import multiprocessing
 import sys
 import os
 
@@ -8,8 +9,7 @@ from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication, QMessageBox
 from ui.main_window import MainWindow
 from config import ConfigManager
-from utils.document_processor import DocumentProcessor
-from utils.vector_store import VectorStoreManager
+from utils.bulk_ingest import build_document_processor, build_vector_manager, resolve_shared_db
 from utils.rag_chain import RAGChain
 
 # 오프라인 모드 설정 (외부 네트워크 의존성 제거)
@@ -82,42 +82,12 @@ def main() -> None:
             )
             sys.exit(1)
 
-        # 공유 DB 설정 로드 (config.json에서 직접 읽기)
-        shared_db_enabled = config.get("shared_db_enabled", False)
-        shared_db_path = config.get("shared_db_path", "")
-
-        # 공유 DB 경로 유효성 검증
-        if shared_db_enabled and shared_db_path:
-            import os
-            chroma_db_file = os.path.join(shared_db_path, "chroma.sqlite3")
-            if os.path.exists(chroma_db_file):
-                print(f"[초기화] ✓ 공유 DB 연결 성공: {shared_db_path}")
-            else:
-                print(f"[초기화] ⚠ 공유 DB 경로에 chroma.sqlite3 파일이 없습니다: {shared_db_path}")
-                print(f"[초기화] ℹ 설정 탭에서 올바른 경로를 지정하세요")
-                shared_db_enabled = False
-        elif shared_db_enabled:
-            print(f"[초기화] ⚠ 공유 DB 사용이 활성화되었지만 경로가 설정되지 않았습니다")
-            print(f"[초기화] ℹ 설정 탭에서 공유 DB 경로를 지정하세요")
-            shared_db_enabled = False
-        else:
-            print(f"[초기화] ℹ 공유 DB 사용 안 함 (개인 DB만 사용)")
-
-        doc_processor = DocumentProcessor(
-            chunk_size=config.get("chunk_size", 1500),
-            chunk_overlap=config.get("chunk_overlap", 200),
-        )
+        # 공유 DB 설정 로드 및 경로 유효성 검증
+        shared_db_path, shared_db_enabled = resolve_shared_db(config)
 
-        vector_manager = VectorStoreManager(
-            persist_directory="data/chroma_db",
-            embedding_api_type=config.get("embedding_api_type", "ollama"),
-            embedding_base_url=config.get("embedding_base_url", "http://localhost:11434"),
-            embedding_model=config.get("embedding_model", "nomic-embed-text"),
-            embedding_api_key=config.get("embedding_api_key", ""),
-            shared_db_path=shared_db_path if shared_db_enabled else None,
-            shared_db_enabled=shared_db_enabled,
-            distance_function=config.get("chroma_distance_function", "l2"),
-        )
+        # 일괄 업로드 CLI(ingest.py)와 같은 생성 경로 사용
+        doc_processor = build_document_processor(config)
+        vector_manager = build_vector_manager(config, shared_db_path, shared_db_enabled)
         # VectorStoreManager 객체를 RAGChain에 전달 (Chroma 객체 직접 전달하지 않음)
         multi_query_num = int(config.get("multi_query_num", 3))
         enable_multi_query = config.get("enable_multi_query", True) and multi_query_num > 0
@@ -129,10 +99,32 @@ def main() -> None:
             llm_model=config.get("llm_model", "gemma3:4b"),
             llm_api_key=config.get("llm_api_key", ""),
             temperature=config.get("temperature", 0.7),
+            llm_num_ctx=config.get("llm_num_ctx", 8192),
+            llm_keep_alive=config.get("llm_keep_alive", "30m"),
+            llm_options=config.get("llm_options", {}),
             top_k=config.get("top_k", 3),
             use_reranker=config.get("use_reranker", True),
             reranker_model=reranker_model,
             reranker_initial_k=config.get("reranker_initial_k", 20),
+            enable_cascade_rerank=config.get("enable_cascade_rerank", False),
+            cascade_min_keep=config.get("cascade_min_keep", 20),
+            cascade_max_keep=config.get("cascade_max_keep", 40),
+            lazy_reranker_loading=config.get("lazy_reranker_loading", True),
+            enable_streaming_citations=config.get("enable_streaming_citations", True),
+            enable_multi_query_gate=config.get("enable_multi_query_gate", True),
+            multi_query_gate_min_top1=config.get("multi_query_gate_min_top1", 0.8),
+            multi_query_gate_min_margin=config.get("multi_query_gate_min_margin", 0.15),
+            context_max_tokens=config.get("context_max_tokens", 4000),
+            enable_context_compression=config.get("enable_context_compression", False),
+            context_compression_ratio=config.get("context_compression_ratio", 0.3),
+            enable_answer_cache=config.get("enable_answer_cache", True),
+            answer_cache_max_entries=config.get("answer_cache_max_entries", 256),
+            answer_cache_semantic=config.get("answer_cache_semantic", False),
+            answer_cache_semantic_threshold=config.get("answer_cache_semantic_threshold", 0.97),
+            enable_session_pool=config.get("enable_session_pool", True),
+            session_pool_max_turns=config.get("session_pool_max_turns", 3),
+            session_pool_min_hits=config.get("session_pool_min_hits", 2),
+            session_pool_min_similarity=config.get("session_pool_min_similarity", 0.5),
             # Query Expansion 설정
             enable_synonym_expansion=config.get("enable_synonym_expansion", True),
             enable_multi_query=enable_multi_query,
@@ -224,4 +216,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # PyInstaller 패키징 시 업로드 파싱 프로세스 풀 지원
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,87 @@
+"""
+일괄 문서 업로드 CLI (GUI 없이 실행)
+
+폴더를 한 번 스캔하거나(--watch 없이) 계속 감시하며(--watch) 새 파일/수정된 파일을 업로드한다.
+데스크톱 앱과 같은 DocumentProcessor + VectorStoreManager + IngestionPipeline을 사용하고,
+내용 해시가 같은 파일은 건너뛴다.
+
+사용 예:
+    python ingest.py data/downloaded_pdfs
+    python ingest.py D:/papers --watch --interval 30 --parse-workers 6 --embed-workers 8
+"""
+from utils.encoding_helper import setup_utf8_encoding
+setup_utf8_encoding()  # Windows 터미널 한글 출력 설정
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from config import ConfigManager
+from utils.bulk_ingest import (BulkIngestor, build_document_processor, build_vector_manager, format_report,
+                               resolve_shared_db)
+
+# 폐쇄망 환경 설정 (데스크톱 앱과 동일)
+os.environ["TIKTOKEN_CACHE_DIR"] = "./tiktoken_cache"
+os.environ["ANONYMIZED_TELEMETRY"] = "False"
+os.environ["CHROMA_TELEMETRY"] = "False"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="폴더 단위 일괄 문서 업로드 (스캔 / 감시)")
+    parser.add_argument("directory", help="업로드할 문서 폴더")
+    parser.add_argument("--watch", action="store_true", help="폴더를 계속 감시하며 새 파일 업로드")
+    parser.add_argument("--interval", type=float, default=10.0, help="감시 주기 (초)")
+    parser.add_argument("--max-retries", type=int, default=5, help="감시 모드에서 실패한 파일 재시도 횟수")
+    parser.add_argument("--no-recursive", action="store_true", help="하위 폴더 제외")
+    parser.add_argument("--target-db", choices=["personal", "shared"], default="personal", help="대상 DB")
+    parser.add_argument("--parse-workers", type=int, default=None, help="파싱 워커 수 (기본: ingestion_parse_workers)")
+    parser.add_argument("--embed-workers", type=int, default=None, help="동시 임베딩 요청 수 (기본: ingestion_embed_workers)")
+    parser.add_argument("--embed-batch-size", type=int, default=None, help="임베딩 요청 1회당 청크 수")
+    parser.add_argument("--threads", action="store_true", help="파싱을 프로세스 대신 스레드로 수행")
+    parser.add_argument("--no-copy", action="store_true", help="원본 파일을 embedded_documents에 복사하지 않음")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not os.path.isdir(args.directory):
+        print(f"[ERROR] 폴더가 없습니다: {args.directory}")
+        return 2
+
+    config = ConfigManager().get_all()
+    shared_db_path, shared_db_enabled = resolve_shared_db(config)
+    if args.target_db == "shared" and not shared_db_enabled:
+        print("[ERROR] 공유 DB를 사용할 수 없습니다 (설정 탭에서 공유 DB 경로 확인)")
+        return 2
+
+    ingestor = BulkIngestor(
+        build_document_processor(config),
+        build_vector_manager(config, shared_db_path, shared_db_enabled),
+        config,
+        target_db=args.target_db,
+        copy_to_embedded=not args.no_copy,
+        parse_workers=args.parse_workers,
+        embed_workers=args.embed_workers,
+        embed_batch_size=args.embed_batch_size,
+        use_processes=False if args.threads else None,
+    )
+    recursive = not args.no_recursive
+
+    if not args.watch:
+        report = ingestor.ingest_directory(args.directory, recursive=recursive)
+        print(format_report(report))
+        return 1 if report["failed"] else 0
+
+    try:
+        ingestor.watch(args.directory, interval=args.interval, recursive=recursive, max_retries=args.max_retries,
+                       on_report=lambda report: print(format_report(report)))
+    except KeyboardInterrupt:
+        print("\n[BulkIngest] 중단 요청 (Ctrl+C)")
+    return 0
+
+
+if __name__ == "__main__":
+    # 업로드 파싱 프로세스 풀 지원
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -16,6 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import ConfigManager
 from utils.document_processor import DocumentProcessor
 from utils.vector_store import VectorStoreManager
+from utils.incremental_ingest import IncrementalUpdater
 
 def re_embed_all_documents():
     """모든 문서 재임베딩"""
@@ -50,6 +51,9 @@ def re_embed_all_documents():
         distance_function=config.get("chroma_distance_function", "l2"),
     )
 
+    # 이미 임베딩된 파일은 페이지/슬라이드 해시 비교로 변경분만 반영 (청킹 설정이 바뀌면 전체 재처리)
+    updater = IncrementalUpdater(doc_processor, vector_manager)
+
     # 4. 임베딩할 파일 목록
     embedded_docs_dir = "data/embedded_documents"
     if not os.path.exists(embedded_docs_dir):
@@ -86,6 +90,14 @@ def re_embed_all_documents():
         print("-" * 60)
 
         try:
+            # 기존 청크가 있으면 증분 업데이트
+            result = updater.update(file_path, file_name, file_type)
+            if result is not None:
+                print(f"  [OK] 증분 업데이트: 유지 {result['unchanged']}, 재처리 {result['changed']}, "
+                      f"삭제 {result['removed']}페이지 → 청크 {result['chunks']}개")
+                total_chunks += result["chunks"]
+                continue
+
             # 문서 처리
             chunks = doc_processor.process_document(
                 file_path=file_path,
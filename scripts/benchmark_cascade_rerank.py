@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Benchmark cascade re-ranking: recall loss vs. cross-encoder latency saved."""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.vector_store import VectorStoreManager
+from utils.reranker import get_reranker
+from utils.cascade_prefilter import BiEncoderPrefilter
+
+QUESTIONS_PATH = ROOT_DIR / "tests" / "data" / "benchmark_questions.json"
+OUTPUT_PATH = ROOT_DIR / "test_logs" / "cascade_rerank_benchmark.json"
+
+
+def load_vector_manager(config_path: Path = ROOT_DIR / "config_test.json") -> VectorStoreManager:
+    with config_path.open("r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    return VectorStoreManager(
+        persist_directory="data/chroma_db",
+        embedding_api_type=config.get("embedding_api_type", "request"),
+        embedding_base_url=config.get("embedding_base_url", "http://localhost:11434"),
+        embedding_model=config.get("embedding_model", "mxbai-embed-large:latest"),
+        embedding_api_key=config.get("embedding_api_key", ""),
+        distance_function=config.get("chroma_distance_function", "cosine")
+    )
+
+
+def doc_key(doc) -> str:
+    if getattr(doc, "id", None):
+        return doc.id
+    meta = doc.metadata or {}
+    return f"{meta.get('file_name', '')}|{meta.get('page_number', '')}|{doc.page_content[:50]}"
+
+
+def rerank_top(reranker, query: str, candidates: List[tuple], top_k: int) -> List[str]:
+    docs_for_rerank = [{
+        "page_content": d.page_content,
+        "metadata": d.metadata,
+        "vector_score": s,
+        "document": d
+    } for d, s in candidates]
+    reranked = reranker.rerank(query, docs_for_rerank, top_k=top_k)
+    return [doc_key(d["document"]) for d in reranked]
+
+
+def run(args: argparse.Namespace) -> None:
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    with QUESTIONS_PATH.open("r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    vector_manager = load_vector_manager()
+    reranker = get_reranker(model_name="multilingual-mini")
+    prefilter = BiEncoderPrefilter(
+        vector_manager,
+        min_keep=args.min_keep,
+        max_keep=args.max_keep,
+        z_cutoff=args.z_cutoff
+    )
+
+    # 모델 워밍업 (첫 predict 그래프 초기화 비용 제외)
+    reranker.model.predict([["warm-up", "warm-up"]])
+
+    results: List[Dict[str, Any]] = []
+    for idx, q in enumerate(questions, 1):
+        question = q["question"]
+        candidates = vector_manager.similarity_search_hybrid(
+            question, initial_k=args.initial_k * 2, top_k=args.initial_k
+        )
+        if not candidates:
+            continue
+
+        start = time.perf_counter()
+        full_top = rerank_top(reranker, question, candidates, args.top_k)
+        full_sec = time.perf_counter() - start
+
+        start = time.perf_counter()
+        kept = prefilter.filter(question, candidates)
+        prefilter_sec = time.perf_counter() - start
+        cascade_top = rerank_top(reranker, question, kept, args.top_k)
+        cascade_sec = time.perf_counter() - start
+
+        recall = len(set(full_top) & set(cascade_top)) / max(len(full_top), 1)
+        top1_match = bool(full_top and cascade_top and full_top[0] == cascade_top[0])
+
+        results.append({
+            "id": q.get("id"),
+            "candidates": len(candidates),
+            "kept": len(kept),
+            "full_rerank_sec": full_sec,
+            "cascade_total_sec": cascade_sec,
+            "prefilter_sec": prefilter_sec,
+            "recall_at_k": recall,
+            "top1_match": top1_match
+        })
+        print(f"[{idx}/{len(questions)}] {len(candidates)}→{len(kept)} | "
+              f"full={full_sec:.3f}s cascade={cascade_sec:.3f}s | recall@{args.top_k}={recall:.2f}")
+
+    if not results:
+        print("No results.")
+        return
+
+    n = len(results)
+    summary = {
+        "questions": n,
+        "initial_k": args.initial_k,
+        "top_k": args.top_k,
+        "min_keep": args.min_keep,
+        "max_keep": args.max_keep,
+        "z_cutoff": args.z_cutoff,
+        "avg_candidates": sum(r["candidates"] for r in results) / n,
+        "avg_kept": sum(r["kept"] for r in results) / n,
+        "avg_full_rerank_sec": sum(r["full_rerank_sec"] for r in results) / n,
+        "avg_cascade_total_sec": sum(r["cascade_total_sec"] for r in results) / n,
+        "avg_recall_at_k": sum(r["recall_at_k"] for r in results) / n,
+        "top1_match_rate": sum(1 for r in results if r["top1_match"]) / n
+    }
+    summary["latency_saved_pct"] = (
+        1.0 - summary["avg_cascade_total_sec"] / summary["avg_full_rerank_sec"]
+        if summary["avg_full_rerank_sec"] > 0 else 0.0
+    )
+
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_PATH.open("w", encoding="utf-8") as f:
+        json.dump({"timestamp": time.time(), "summary": summary, "results": results}, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 100)
+    print(f"avg candidates {summary['avg_candidates']:.1f} → kept {summary['avg_kept']:.1f}")
+    print(f"avg latency: full {summary['avg_full_rerank_sec']:.3f}s vs cascade {summary['avg_cascade_total_sec']:.3f}s "
+          f"({summary['latency_saved_pct']:.1%} saved)")
+    print(f"avg recall@{args.top_k}: {summary['avg_recall_at_k']:.3f} | top-1 match: {summary['top1_match_rate']:.1%}")
+    print(f"Results saved to {OUTPUT_PATH}")
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--initial-k", type=int, default=40)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-keep", type=int, default=20)
+    parser.add_argument("--max-keep", type=int, default=40)
+    parser.add_argument("--z-cutoff", type=float, default=0.0)
+    run(parser.parse_args())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark PDF layout analysis backends (pdfplumber vs. PyMuPDF spans) on real documents."""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.pdf_chunking_engine import PDFChunkingEngine
+
+PDF_DIR = ROOT_DIR / "embedded_documents"
+OUTPUT_PATH = ROOT_DIR / "test_logs" / "pdf_layout_benchmark.json"
+BACKENDS = ("pdfplumber", "pymupdf")
+
+
+def chunk_pdf(path: Path, backend: str, page_workers: int) -> Dict[str, Any]:
+    engine = PDFChunkingEngine({
+        "max_size": 1500,
+        "overlap_size": 200,
+        "min_chunk_size": 50,
+        "min_word_count": 5,
+        "layout_backend": backend,
+        "parallel_page_workers": page_workers,
+    })
+    # 페이지별 진행 로그 숨김
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        chunks = engine.process_pdf_document(str(path))
+        elapsed = time.perf_counter() - start
+    return {
+        "sec": elapsed,
+        "chunks": len(chunks),
+        "types": dict(Counter(c.chunk_type for c in chunks)),
+        "chars": sum(len(c.content) for c in chunks if c.chunk_type != "page_summary"),
+    }
+
+
+def run(args: argparse.Namespace) -> None:
+    pdfs = sorted(PDF_DIR.glob("*.pdf"))[:args.limit]
+    if not pdfs:
+        print(f"No PDFs in {PDF_DIR}")
+        return
+
+    results: List[Dict[str, Any]] = []
+    for idx, path in enumerate(pdfs, 1):
+        row = {"file": path.name}
+        for backend in BACKENDS:
+            row[backend] = chunk_pdf(path, backend, args.page_workers)
+        results.append(row)
+        plumber, mupdf = row["pdfplumber"], row["pymupdf"]
+        print(f"[{idx}/{len(pdfs)}] {path.name[:40]:40s} | pdfplumber {plumber['sec']:.2f}s ({plumber['chunks']}) "
+              f"vs pymupdf {mupdf['sec']:.2f}s ({mupdf['chunks']})")
+
+    totals = {backend: sum(r[backend]["sec"] for r in results) for backend in BACKENDS}
+    summary = {
+        "files": len(results),
+        "page_workers": args.page_workers,
+        "total_sec": totals,
+        "speedup": totals["pdfplumber"] / totals["pymupdf"] if totals["pymupdf"] > 0 else 0.0,
+        "total_chunks": {backend: sum(r[backend]["chunks"] for r in results) for backend in BACKENDS},
+    }
+
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_PATH.open("w", encoding="utf-8") as f:
+        json.dump({"timestamp": time.time(), "summary": summary, "results": results}, f, ensure_ascii=False, indent=2)
+
+    print("\n" + "=" * 100)
+    print(f"total: pdfplumber {totals['pdfplumber']:.2f}s vs pymupdf {totals['pymupdf']:.2f}s "
+          f"({summary['speedup']:.1f}x)")
+    print(f"chunks: {summary['total_chunks']}")
+    print(f"Results saved to {OUTPUT_PATH}")
+    print("=" * 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--limit", type=int, default=10, help="number of PDFs from embedded_documents/")
+    parser.add_argument("--page-workers", type=int, default=1, help="parallel_page_workers (1 = sequential)")
+    run(parser.parse_args())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Benchmark time-to-first-token: cache-friendly prompt layout vs. legacy (context-first) layout."""
+
+import argparse
+import inspect
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from utils.vector_store import VectorStoreManager
+from utils.context_packer import ContextPacker
+from utils.request_llm import RequestLLM
+from utils.rag_chain import RAGChain
+
+QUESTIONS_PATH = ROOT_DIR / "tests" / "data" / "benchmark_questions.json"
+OUTPUT_PATH = ROOT_DIR / "test_logs" / "prompt_ttft_benchmark.json"
+
+
+def load_config(config_path: Path) -> Dict[str, Any]:
+    with config_path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_vector_manager(config: Dict[str, Any]) -> VectorStoreManager:
+    return VectorStoreManager(
+        persist_directory="data/chroma_db",
+        embedding_api_type=config.get("embedding_api_type", "request"),
+        embedding_base_url=config.get("embedding_base_url", "http://localhost:11434"),
+        embedding_model=config.get("embedding_model", "mxbai-embed-large:latest"),
+        embedding_api_key=config.get("embedding_api_key", ""),
+        distance_function=config.get("chroma_distance_function", "cosine")
+    )
+
+
+def load_template() -> str:
+    """RAGChain 기본 템플릿 (전체 초기화 없이 __init__ 소스의 문자열만 사용)"""
+    source = inspect.getsource(RAGChain.__init__)
+    start = source.index('self.base_prompt_template = """') + len('self.base_prompt_template = """')
+    end = source.index('"""', start)
+    return source[start:end]
+
+
+def legacy_layout(template: str) -> str:
+    """이전 레이아웃 재현: 요청별 입력(문서/대화/질문)을 앞에, 정적 지시문을 뒤에 배치"""
+    static, dynamic = template.split("\n---\n", 1)
+    role, guide = static.split("\n\n", 1)
+    dynamic = dynamic.strip()
+    if dynamic.endswith("답변:"):
+        dynamic = dynamic[:-len("답변:")].rstrip()
+    return f"{role}\n\n{dynamic}\n\n---\n\n{guide.strip()}\n\n답변:"
+
+
+def time_to_first_token(llm: RequestLLM, prompt: str) -> Optional[float]:
+    start = time.perf_counter()
+    for chunk in llm.stream(prompt):
+        if chunk:
+            return time.perf_counter() - start
+    return None
+
+
+def run(args: argparse.Namespace) -> None:
+    os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+    config = load_config(Path(args.config))
+    with QUESTIONS_PATH.open("r", encoding="utf-8") as f:
+        questions = [q["question"] if isinstance(q, dict) else str(q) for q in json.load(f)][:args.limit]
+
+    vector_manager = load_vector_manager(config)
+    packer = ContextPacker(max_tokens=config.get("context_max_tokens", 4000))
+    cached_template = load_template()
+    layouts = {"cached": cached_template, "legacy": legacy_layout(cached_template)}
+
+    prompts: Dict[str, List[str]] = {name: [] for name in layouts}
+    for question in questions:
+        docs = vector_manager.vectorstore.similarity_search(question, k=args.top_k)
+        context = packer.pack(docs)
+        for name, template in layouts.items():
+            prompts[name].append(template.format(
+                chat_history="이전 대화 없음",
+                context=context,
+                question=question,
+                extra_instructions=""
+            ))
+
+    results: Dict[str, Any] = {"questions": len(questions), "layouts": {}}
+    for keep_alive in (None, args.keep_alive):
+        llm = RequestLLM(
+            base_url=config.get("llm_base_url", "http://localhost:11434"),
+            model=config.get("llm_model", "gemma3:4b"),
+            temperature=0.0,
+            num_ctx=args.num_ctx,
+            num_predict=8,
+            keep_alive=keep_alive
+        )
+        for name in layouts:
+            # 워밍업 1회 (모델 로드 시간 제외)
+            time_to_first_token(llm, prompts[name][0])
+            ttfts = []
+            for prompt in prompts[name]:
+                ttft = time_to_first_token(llm, prompt)
+                if ttft is not None:
+                    ttfts.append(ttft)
+            key = f"{name}|keep_alive={keep_alive}"
+            results["layouts"][key] = {
+                "median_ttft_sec": statistics.median(ttfts) if ttfts else None,
+                "mean_ttft_sec": statistics.mean(ttfts) if ttfts else None,
+                "samples": len(ttfts)
+            }
+            print(f"[TTFT] {key}: median {results['layouts'][key]['median_ttft_sec']}")
+
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_PATH.open("w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {OUTPUT_PATH}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--config", default=str(ROOT_DIR / "config_test.json"))
+    parser.add_argument("--limit", type=int, default=10, help="사용할 질문 수")
+    parser.add_argument("--top-k", type=int, default=5, help="질문당 컨텍스트 문서 수")
+    parser.add_argument("--num-ctx", type=int, default=8192)
+    parser.add_argument("--keep-alive", default="30m")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -13,8 +13,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from config import ConfigManager
-from utils.vector_store import VectorStoreManager
-from utils.document_processor import DocumentProcessor
+from utils.bulk_ingest import BulkIngestor, build_document_processor, build_vector_manager, format_report
 
 
 def print_header(title: str):
@@ -148,13 +147,7 @@ def download_and_embed_pdfs():
     
     # 4. 벡터스토어 초기화 및 기존 문서 확인
     print(f"\n[2/3] 벡터스토어 초기화")
-    vector_store = VectorStoreManager(
-        persist_directory="data/chroma_db",
-        embedding_api_type=conf.get("embedding_api_type"),
-        embedding_base_url=conf.get("embedding_base_url"),
-        embedding_model=conf.get("embedding_model"),
-        embedding_api_key=conf.get("embedding_api_key", "")
-    )
+    vector_store = build_vector_manager(conf)
     
     # 기존 문서 목록 확인
     existing_docs = vector_store.get_documents_list()
@@ -164,66 +157,15 @@ def download_and_embed_pdfs():
         for doc in existing_docs:
             print(f"  - {doc.get('file_name', 'Unknown')} ({doc.get('chunk_count', 0)}개 청크)")
     
-    # 5. 문서 처리 및 임베딩
+    # 5. 문서 처리 및 임베딩 (ingest.py와 같은 병렬 파이프라인, 내용 해시로 이미 임베딩된 파일 건너뜀)
     print(f"\n[3/3] 문서 처리 및 임베딩")
-    doc_processor = DocumentProcessor(
-        chunk_size=conf.get("chunk_size", 1500),
-        chunk_overlap=conf.get("chunk_overlap", 200),
-        enable_advanced_pdf_chunking=True,
-        enable_advanced_pptx_chunking=True
-    )
+    ingestor = BulkIngestor(build_document_processor(conf), vector_store, conf)
+    pdf_paths = [f["path"] for f in downloaded_files if os.path.exists(f["path"]) and f["path"].lower().endswith(".pdf")]
+    report = ingestor.ingest_paths(pdf_paths)
+    print(format_report(report))
     
-    embedded_files = []
-    
-    for file_info in downloaded_files:
-        file_path = file_info["path"]
-        file_name = file_info["name"]
-        
-        if not os.path.exists(file_path):
-            print(f"[SKIP] 파일 없음: {file_name}")
-            continue
-        
-        try:
-            print(f"\n처리 중: {file_name}")
-            
-            # 파일 타입 확인
-            file_type = doc_processor.get_file_type(file_name)
-            
-            if file_type != "pdf":
-                print(f"[SKIP] PDF 파일이 아님: {file_type}")
-                continue
-            
-            # 문서 처리
-            chunks = doc_processor.process_document(
-                file_path, file_name, file_type
-            )
-            
-            if not chunks:
-                print(f"[WARNING] 처리된 청크가 없음: {file_name}")
-                continue
-            
-            # 기존 문서 중복 체크
-            existing_docs = vector_store.get_documents_list()
-            existing_file_names = {doc.get("file_name", "") for doc in existing_docs}
-            
-            if file_name in existing_file_names:
-                print(f"[SKIP] 이미 임베딩됨: {file_name}")
-                embedded_files.append(file_info)  # 이미 임베딩된 것으로 표시
-                continue
-            
-            # 벡터스토어에 추가 (기존 문서 유지하며 추가)
-            success = vector_store.add_documents(chunks)
-            
-            if success:
-                print(f"✅ 임베딩 완료: {file_name} ({len(chunks)}개 청크)")
-                embedded_files.append(file_info)
-            else:
-                print(f"❌ 임베딩 실패: {file_name}")
-                
-        except Exception as e:
-            print(f"❌ 처리 실패: {file_name} - {e}")
-            import traceback
-            traceback.print_exc()
+    embedded_files = [f for f in downloaded_files
+                      if f["path"] in pdf_paths and f["name"] not in report["failed"]]
     
     # 결과 요약
     print_header("다운로드 및 임베딩 결과")
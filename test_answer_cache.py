@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+답변 캐시 단위 테스트
+정규화 일치, 코퍼스 버전 무효화, 의미 일치, query() 연동을 검증
+"""
+
+import numpy as np
+
+from utils.answer_cache import AnswerCache, normalize_question
+from utils.latency_budget import StageCostTracker
+from utils.rag_chain import RAGChain
+
+
+class _FakeEmbeddings:
+    """질문별 고정 벡터 (근접 중복 질문은 거의 같은 방향)"""
+
+    VECTORS = {
+        "tadf란 무엇인가": [1.0, 0.0, 0.0],
+        "tadf는 무엇인가": [0.99, 0.05, 0.0],
+        "kfret 값은": [0.0, 1.0, 0.0],
+    }
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        return self.VECTORS.get(text, [0.0, 0.0, 1.0])
+
+
+class _FakeVectorStore:
+    def __init__(self):
+        self.version = 0
+
+    def get_corpus_version(self, search_mode="integrated"):
+        return (("personal", self.version, 10),)
+
+
+def test_normalized_exact_hit():
+    cache = AnswerCache()
+    cache.put("TADF란 무엇인가?", "integrated", "cfg", 1, {"answer": "A"})
+
+    hit = cache.get("  tadf란   무엇인가 ", "integrated", "cfg", 1)
+    assert hit is not None
+    assert hit[0]["answer"] == "A"
+    assert hit[2]["tier"] == "exact"
+    assert normalize_question("TADF란 무엇인가?") == "tadf란 무엇인가"
+
+    # 다른 검색 모드/설정은 별도 항목
+    assert cache.get("TADF란 무엇인가?", "personal", "cfg", 1) is None
+    assert cache.get("TADF란 무엇인가?", "integrated", "other", 1) is None
+
+
+def test_corpus_version_change_invalidates():
+    cache = AnswerCache()
+    cache.put("kFRET 값은?", "integrated", "cfg", 1, {"answer": "A"})
+    assert cache.get("kFRET 값은?", "integrated", "cfg", 2) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_semantic_tier_matches_near_duplicates():
+    embeddings = _FakeEmbeddings()
+    cache = AnswerCache(embeddings=embeddings, semantic_threshold=0.95)
+    cache.put("TADF란 무엇인가?", "integrated", "cfg", 1, {"answer": "A"})
+
+    hit = cache.get("TADF는 무엇인가?", "integrated", "cfg", 1)
+    assert hit is not None and hit[2]["tier"] == "semantic"
+    assert cache.get("kFRET 값은?", "integrated", "cfg", 1) is None
+    assert cache.stats()["semantic_hits"] == 1
+
+
+def test_cached_result_is_copied():
+    cache = AnswerCache()
+    cache.put("q", "integrated", "cfg", 1, {"answer": "A", "sources": [{"file_name": "a.pdf"}]})
+    first = cache.get("q", "integrated", "cfg", 1)[0]
+    first["sources"].append({"file_name": "b.pdf"})
+    assert len(cache.get("q", "integrated", "cfg", 1)[0]["sources"]) == 1
+
+
+def _make_chain() -> RAGChain:
+    chain = RAGChain.__new__(RAGChain)
+    chain.answer_cache = AnswerCache()
+    chain.vectorstore = _FakeVectorStore()
+    chain.llm_api_type = "request"
+    chain.llm_base_url = "http://localhost:11434"
+    chain.llm_model = "gemma3:4b"
+    chain.temperature = 0.3
+    chain.top_k = 3
+    chain.use_reranker = True
+    chain.enable_self_consistency = False
+    chain.base_prompt_template = "BASE {context}"
+    chain.prompt_templates = {"summary": "SUMMARY {context}"}
+    chain.stage_costs = StageCostTracker()
+    chain._last_retrieved_docs = []
+    chain.calls = 0
+
+    def fake_query_internal(question, chat_history, constraints, search_mode):
+        chain.calls += 1
+        chain._last_retrieved_docs = [("doc", 0.9)]
+        return {"answer": f"answer {chain.calls}", "sources": [], "success": True}
+
+    chain._query_internal = fake_query_internal
+    return chain
+
+
+def test_query_uses_cache_until_corpus_changes():
+    chain = _make_chain()
+
+    first = chain.query("kFRET 값은?")
+    chain._last_retrieved_docs = []
+    second = chain.query("kFRET 값은?")
+    assert chain.calls == 1
+    assert second["answer"] == first["answer"]
+    assert second["cache"]["tier"] == "exact"
+    assert chain._last_retrieved_docs == [("doc", 0.9)]
+
+    # 대화 이력이 있으면 캐시 미사용
+    chain.query("kFRET 값은?", chat_history=[{"role": "user", "content": "이전 질문"}])
+    assert chain.calls == 2
+
+    # 문서 추가/삭제 → 코퍼스 버전 변경 → 재실행
+    chain.vectorstore.version += 1
+    third = chain.query("kFRET 값은?")
+    assert chain.calls == 3
+    assert "cache" not in third
+    assert chain.get_answer_cache_stats()["exact_hits"] == 1
+
+
+def test_settings_change_misses_cache():
+    chain = _make_chain()
+    chain.query("kFRET 값은?")
+    chain.llm_model = "llama3"
+    chain.query("kFRET 값은?")
+    assert chain.calls == 2
+
+
+if __name__ == "__main__":
+    test_normalized_exact_hit()
+    test_corpus_version_change_invalidates()
+    test_semantic_tier_matches_near_duplicates()
+    test_cached_result_is_copied()
+    test_query_uses_cache_until_corpus_changes()
+    test_settings_change_misses_cache()
+    print("[OK] 답변 캐시 테스트 통과")
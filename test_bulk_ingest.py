@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+일괄 업로드(BulkIngestor) 단위 테스트
+폴더 스캔, 내용 해시 중복 제거, 처리량 보고, 폴더 감시 모드를 검증
+"""
+
+import os
+import shutil
+import tempfile
+
+import fitz
+
+from utils.bulk_ingest import BulkIngestor, file_type_from_name
+from utils.document_processor import DocumentProcessor
+
+
+class _MemoryVectorManager:
+    def __init__(self):
+        self.embeddings = self
+        self.persist_directory = os.path.join(tempfile.mkdtemp(), "chroma_db")
+        self.stored = {}
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    def add_documents(self, documents, target_db="personal", embeddings=None, rebuild_bm25=True):
+        for doc in documents:
+            self.stored[doc.id] = doc.metadata["file_name"]
+        return True
+
+    def rebuild_bm25_index(self, target_db="personal"):
+        pass
+
+    def delete_documents_by_ids(self, chunk_ids, target_db="personal"):
+        for chunk_id in chunk_ids:
+            self.stored.pop(chunk_id, None)
+        return True
+
+    def delete_documents_by_file_name(self, file_name, target_db="personal"):
+        self.delete_documents_by_ids([i for i, name in self.stored.items() if name == file_name])
+        return True
+
+    def get_file_page_index(self, file_name, target_db="personal"):
+        ids = [i for i, name in self.stored.items() if name == file_name]
+        return {"category": None, "pages": {None: {"hash": None, "ids": ids}}} if ids else None
+
+
+_CONFIG = {"ingestion_use_processes": False, "ingestion_embed_batch_size": 8, "ingestion_parse_workers": 2}
+
+
+def _write_pdf(path: str, page_count: int, topic: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    doc = fitz.open()
+    for page_num in range(1, page_count + 1):
+        page = doc.new_page()
+        for line in range(8):
+            page.insert_text((72, 72 + line * 14), f"{topic} page {page_num} line {line} on host-guest energy transfer",
+                             fontsize=10)
+    doc.save(path)
+    doc.close()
+
+
+def _ingestor(manager):
+    processor = DocumentProcessor(chunk_size=200, chunk_overlap=20, enable_advanced_pdf_chunking=False)
+    return BulkIngestor(processor, manager, _CONFIG, copy_to_embedded=False)
+
+
+def test_scan_dedupes_by_content_and_reports_throughput():
+    folder = tempfile.mkdtemp()
+    _write_pdf(os.path.join(folder, "a.pdf"), 2, "alpha")
+    _write_pdf(os.path.join(folder, "b.pdf"), 3, "beta")
+    os.makedirs(os.path.join(folder, "sub"))
+    shutil.copy(os.path.join(folder, "a.pdf"), os.path.join(folder, "sub", "a_copy.pdf"))
+    _write_pdf(os.path.join(folder, "sub", "b.pdf"), 1, "other")  # 같은 파일명, 다른 내용
+    with open(os.path.join(folder, "notes.md"), "w") as f:
+        f.write("지원하지 않는 형식")
+
+    assert len(BulkIngestor.scan(folder)) == 4 and len(BulkIngestor.scan(folder, recursive=False)) == 2
+    manager = _MemoryVectorManager()
+    ingestor = _ingestor(manager)
+    messages = []
+    report = ingestor.ingest_directory(folder, on_message=messages.append)
+
+    assert (report["files"], report["succeeded"], report["skipped"]) == (2, 2, 2)
+    assert any("내용 중복: a.pdf" in m for m in messages) and any("파일명 중복" in m for m in messages)
+    assert report["pages"] == 5
+    assert report["chunks"] == report["embeddings"] == len(manager.stored) > 0
+    assert report["pages_per_sec"] > 0 and report["embeddings_per_sec"] > 0
+
+    # 다시 실행: 이미 업로드된 내용은 파싱/임베딩 없이 건너뜀 (새 인스턴스도 매니페스트로 판단)
+    again = _ingestor(manager).ingest_directory(folder)
+    assert (again["files"], again["skipped"], again["embeddings"]) == (0, 4, 0)
+
+    # GUI에서 삭제된 문서는 다시 업로드
+    manager.delete_documents_by_file_name("b.pdf")
+    again = _ingestor(manager).ingest_directory(folder)
+    assert again["files"] == 1 and again["pages"] == 3
+
+
+def test_reverted_file_is_ingested_again():
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "e.pdf")
+    _write_pdf(path, 2, "epsilon")
+    with open(path, "rb") as f:
+        v1 = f.read()
+    manager = _MemoryVectorManager()
+    assert _ingestor(manager).ingest_paths([path])["succeeded"] == 1
+
+    _write_pdf(path, 3, "epsilon revised")
+    assert _ingestor(manager).ingest_paths([path])["succeeded"] == 1
+
+    # v1로 되돌림: DB는 v2 내용이므로 "이미 업로드됨"으로 건너뛰면 안 됨
+    with open(path, "wb") as f:
+        f.write(v1)
+    report = _ingestor(manager).ingest_paths([path])
+    assert (report["files"], report["succeeded"], report["skipped"]) == (1, 1, 0)
+
+
+def test_watch_ingests_stable_files_once():
+    folder = tempfile.mkdtemp()
+    _write_pdf(os.path.join(folder, "c.pdf"), 2, "gamma")
+    manager = _MemoryVectorManager()
+    reports = []
+    _ingestor(manager).watch(folder, interval=0, on_report=reports.append, max_cycles=3)
+
+    # 첫 주기는 크기 확인만, 두 번째 주기에 업로드, 세 번째 주기는 변화 없음
+    assert len(reports) == 1 and reports[0]["succeeded"] == 1
+    assert set(manager.stored.values()) == {"c.pdf"}
+
+
+class _FlakyVectorManager(_MemoryVectorManager):
+    """첫 기록만 실패하는 벡터 저장소 (일시적 장애 재현)"""
+
+    def __init__(self):
+        super().__init__()
+        self.failures = 1
+
+    def add_documents(self, documents, target_db="personal", embeddings=None, rebuild_bm25=True):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Chroma 일시 오류")
+        return super().add_documents(documents, target_db, embeddings, rebuild_bm25)
+
+
+def test_watch_retries_failed_files():
+    folder = tempfile.mkdtemp()
+    _write_pdf(os.path.join(folder, "d.pdf"), 2, "delta")
+    manager = _FlakyVectorManager()
+    reports = []
+    _ingestor(manager).watch(folder, interval=0, on_report=reports.append, max_cycles=4)
+
+    # 두 번째 주기 실패 → 세 번째 주기 재시도 성공 → 네 번째 주기는 변화 없음
+    assert [(len(r["failed"]), r["succeeded"]) for r in reports] == [(1, 0), (0, 1)]
+    assert set(manager.stored.values()) == {"d.pdf"}
+
+
+def test_watch_backs_off_and_stops_retrying_failing_file():
+    folder = tempfile.mkdtemp()
+    _write_pdf(os.path.join(folder, "f.pdf"), 1, "phi")
+    manager = _FlakyVectorManager()
+    manager.failures = 100
+    reports = []
+    _ingestor(manager).watch(folder, interval=0, on_report=reports.append, max_cycles=12, max_retries=2)
+
+    # 주기 1 실패 → 1주기 후(2) 재시도 실패 → 2주기 후(4) 재시도 실패 → 이후 시도 안 함
+    assert len(reports) == 3 and all(len(r["failed"]) == 1 for r in reports)
+    assert manager.failures == 97
+
+
+def test_file_type_from_name():
+    assert file_type_from_name("Deck.PPTX") == "pptx"
+    assert file_type_from_name("table.xls") == "xlsx"
+    assert file_type_from_name("README") == "unknown"
+
+
+if __name__ == "__main__":
+    test_scan_dedupes_by_content_and_reports_throughput()
+    test_reverted_file_is_ingested_again()
+    test_watch_ingests_stable_files_once()
+    test_watch_retries_failed_files()
+    test_watch_backs_off_and_stops_retrying_failing_file()
+    test_file_type_from_name()
+    print("[OK] 일괄 업로드 테스트 통과")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cascade Re-ranking (Bi-Encoder Prefilter) 단위 테스트
+저장된 임베딩 코사인으로 후보가 적응적으로 축소되는지 검증
+"""
+
+import numpy as np
+
+from utils.cascade_prefilter import BiEncoderPrefilter
+
+
+class _Doc:
+    def __init__(self, doc_id: str, content: str):
+        self.id = doc_id
+        self.page_content = content
+        self.metadata = {}
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.query_calls = 0
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return [1.0, 0.0]
+
+
+class _FakeVectorManager:
+    """get_document_embeddings만 흉내내는 VectorStoreManager 대역"""
+
+    def __init__(self, vectors):
+        self.embeddings = _FakeEmbeddings()
+        self.vectors = vectors
+
+    def get_document_embeddings(self, docs):
+        return np.vstack([self.vectors[d.id] for d in docs]).astype(np.float32)
+
+
+def _make_candidates(n_relevant: int, n_noise: int):
+    vectors = {}
+    candidates = []
+    for i in range(n_relevant):
+        vectors[f"r{i}"] = [1.0, 0.05 * i]
+        candidates.append((_Doc(f"r{i}", "relevant"), 0.5))
+    for i in range(n_noise):
+        vectors[f"n{i}"] = [0.05, 1.0]
+        candidates.append((_Doc(f"n{i}", "noise"), 0.5))
+    return vectors, candidates
+
+
+def test_prefilter_keeps_relevant_and_respects_bounds():
+    vectors, candidates = _make_candidates(n_relevant=10, n_noise=50)
+    prefilter = BiEncoderPrefilter(_FakeVectorManager(vectors), min_keep=5, max_keep=20)
+
+    kept = prefilter.filter("query", candidates)
+    kept_ids = {d.id for d, _ in kept}
+
+    assert 5 <= len(kept) <= 20
+    assert all(f"r{i}" in kept_ids for i in range(10))
+    assert prefilter.last_stats["input"] == 60
+
+
+def test_prefilter_skips_small_candidate_sets():
+    vectors, candidates = _make_candidates(n_relevant=3, n_noise=2)
+    prefilter = BiEncoderPrefilter(_FakeVectorManager(vectors), min_keep=20, max_keep=40)
+
+    assert prefilter.filter("query", candidates) is candidates
+
+
+def test_prefilter_min_keep_override_and_query_cache():
+    vectors, candidates = _make_candidates(n_relevant=5, n_noise=45)
+    manager = _FakeVectorManager(vectors)
+    prefilter = BiEncoderPrefilter(manager, min_keep=5, max_keep=10)
+
+    assert len(prefilter.filter("query", candidates, min_keep=30)) == 30
+    prefilter.filter("query", candidates)
+    assert manager.embeddings.query_calls == 1
+
+
+if __name__ == "__main__":
+    test_prefilter_keeps_relevant_and_respects_bounds()
+    test_prefilter_skips_small_candidate_sets()
+    test_prefilter_min_keep_override_and_query_cache()
+    print("[OK] Cascade Re-ranking 테스트 통과")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Citation 매칭 단위 테스트
+문장은 1회 배치 임베딩, 출처는 저장된 임베딩을 재사용하는지 검증
+"""
+
+import numpy as np
+from langchain.schema import Document
+
+from utils.rag_chain import RAGChain
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        vectors = []
+        for text in texts:
+            if "apple" in text:
+                vectors.append([1.0, 0.0, 0.0])
+            elif "banana" in text:
+                vectors.append([0.0, 1.0, 0.0])
+            else:
+                vectors.append([0.0, 0.0, 1.0])
+        return vectors
+
+
+class _FakeVectorManager:
+    """get_stored_embeddings만 흉내내는 VectorStoreManager 대역"""
+
+    def __init__(self, stored):
+        self.embeddings = _FakeEmbeddings()
+        self.stored = stored
+
+    def get_stored_embeddings(self, docs):
+        return [self.stored.get(doc.id) for doc in docs]
+
+
+def _make_chain(vector_manager) -> RAGChain:
+    chain = RAGChain.__new__(RAGChain)
+    chain.vectorstore = vector_manager
+    return chain
+
+
+def test_citations_use_stored_vectors_and_single_sentence_batch():
+    manager = _FakeVectorManager({"a": np.array([1.0, 0.0, 0.1], dtype=np.float32)})
+    chain = _make_chain(manager)
+    sources = [
+        Document(page_content="apple report", metadata={"file_name": "Apple.pdf", "page_number": 1}, id="a"),
+        Document(page_content="banana report", metadata={"file_name": "Banana.pdf", "page_number": 2}),
+    ]
+
+    answer = chain._generate_source_citations(
+        "The apple is red and tasty. The banana is a yellow fruit. Ok. Nothing related at all here.",
+        sources
+    )
+
+    assert "tasty. [Apple, p.1]" in answer
+    assert "fruit. [Banana, p.2]" in answer
+    assert "here." in answer and "here. [" not in answer
+    # 출처 1회(저장 벡터 없는 1개만) + 문장 1회
+    assert manager.embeddings.batches[0] == ["banana report"]
+    assert len(manager.embeddings.batches) == 2
+
+
+def test_adaptive_thresholds_match_scalar_version():
+    chain = _make_chain(_FakeVectorManager({}))
+    sentences = ["a" * 12, "b" * 30, "c" * 80]
+
+    vectorized = chain._get_adaptive_thresholds(sentences)
+    assert list(vectorized) == [chain._get_adaptive_threshold(s, []) for s in sentences]
+
+
+if __name__ == "__main__":
+    test_citations_use_stored_vectors_and_single_sentence_batch()
+    test_adaptive_thresholds_match_scalar_version()
+    print("[OK] Citation 매칭 테스트 통과")
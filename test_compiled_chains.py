@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+사전 컴파일 체인 단위 테스트
+질문 유형별 체인이 재사용되고 명시적 입력만으로 동작하는지 검증
+"""
+
+from langchain_core.runnables import RunnableLambda
+
+from utils.rag_chain import RAGChain
+
+
+def _make_chain() -> RAGChain:
+    chain = RAGChain.__new__(RAGChain)
+    chain.llm = RunnableLambda(lambda prompt_value: prompt_value.to_string())
+    chain.base_prompt_template = "BASE {context}|{chat_history}|{question}|{extra_instructions}"
+    chain.prompt_templates = {
+        "summary": "SUMMARY {context}|{chat_history}|{question}|{extra_instructions}",
+    }
+    chain._compile_chains()
+    chain.prompt, chain.chain = chain._compiled_chains["base"]
+    return chain
+
+
+def test_compiled_chain_reused_per_query_type():
+    chain = _make_chain()
+
+    first = chain._select_prompt_for_query_type("summary")
+    second = chain._select_prompt_for_query_type("summary")
+    assert first[1] is second[1]
+
+    output = first[1].invoke({
+        "context": "ctx",
+        "chat_history": "이전 대화 없음",
+        "question": "q",
+        "extra_instructions": ""
+    })
+    assert output == "SUMMARY ctx|이전 대화 없음|q|"
+
+
+def test_unknown_query_type_uses_base_chain():
+    chain = _make_chain()
+    prompt, compiled = chain._select_prompt_for_query_type("unknown")
+    assert compiled is chain._compiled_chains["base"][1]
+
+
+def test_selection_is_request_local():
+    chain = _make_chain()
+    prompt, compiled = chain._select_prompt_for_query_type("summary")
+    # 다른 요청이 사용하는 공유 상태는 바뀌지 않음
+    assert chain.chain is chain._compiled_chains["base"][1]
+
+    # 선택한 체인을 명시적으로 넘긴 생성/형식 재시도는 해당 템플릿 사용
+    answer = chain._generate_answer_internal("q", "ctx", extra_instructions="x", chain=compiled)
+    assert answer.startswith("SUMMARY ctx|")
+    retried = chain._retry_format_generation("q", "ctx", "", {"expected_format": "list"}, chain=compiled)
+    assert retried.startswith("SUMMARY ctx|") and "불릿 리스트" in retried
+    assert chain._generate_answer_internal("q", "ctx").startswith("BASE ctx|")
+
+
+if __name__ == "__main__":
+    test_compiled_chain_reused_per_query_type()
+    test_unknown_query_type_uses_base_chain()
+    test_selection_is_request_local()
+    print("[OK] 사전 컴파일 체인 테스트 통과")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Extractive Context Compression 단위 테스트
+관련 문장과 이웃만 남기고 파일/페이지 메타데이터를 유지하는지 검증
+"""
+
+from langchain.schema import Document
+
+from utils.context_compressor import ExtractiveCompressor
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.batches = 0
+
+    def embed_query(self, text):
+        return [1.0, 0.0]
+
+    def embed_documents(self, texts):
+        self.batches += 1
+        return [[1.0, 0.0] if "효율" in t else [0.0, 1.0] for t in texts]
+
+
+def _filler(n):
+    return " ".join(f"관련 없는 배경 설명 문장 {i}번입니다." for i in range(n))
+
+
+def test_compression_keeps_relevant_sentences_and_metadata():
+    embeddings = _FakeEmbeddings()
+    compressor = ExtractiveCompressor(embeddings=embeddings, keep_ratio=0.2, neighbor_window=1, min_doc_chars=0)
+    doc = Document(
+        page_content=_filler(20) + " 소자의 외부 양자 효율은 25%입니다. " + _filler(20),
+        metadata={"file_name": "oled.pdf", "page_number": 7}
+    )
+
+    compressed = compressor.compress("효율은?", [doc])
+
+    assert "외부 양자 효율은 25%입니다." in compressed[0].page_content
+    assert compressed[0].metadata["file_name"] == "oled.pdf"
+    assert compressed[0].metadata["page_number"] == 7
+    assert compressed[0].metadata["compressed"] is True
+    assert len(compressed[0].page_content) * 3 < len(doc.page_content)
+    # 이웃 문장 유지
+    assert "배경 설명 문장 19번" in compressed[0].page_content
+    # 모든 문장을 한 번의 배치로 임베딩
+    assert embeddings.batches == 1
+
+
+def test_every_document_keeps_at_least_one_sentence():
+    compressor = ExtractiveCompressor(embeddings=_FakeEmbeddings(), keep_ratio=0.05, min_doc_chars=0)
+    docs = [
+        Document(page_content="효율 관련 문장입니다. " + _filler(5), metadata={"file_name": "a.pdf"}),
+        Document(page_content=_filler(5), metadata={"file_name": "b.pdf"}),
+    ]
+
+    compressed = compressor.compress("효율", docs)
+
+    assert [d.metadata["file_name"] for d in compressed] == ["a.pdf", "b.pdf"]
+    assert all(d.page_content for d in compressed)
+
+
+def test_short_chunks_are_left_untouched():
+    compressor = ExtractiveCompressor(embeddings=_FakeEmbeddings(), min_doc_chars=300)
+    doc = Document(page_content="짧은 청크입니다.", metadata={})
+    assert compressor.compress("q", [doc]) == [doc]
+
+
+if __name__ == "__main__":
+    test_compression_keeps_relevant_sentences_and_metadata()
+    test_every_document_keeps_at_least_one_sentence()
+    test_short_chunks_are_left_untouched()
+    print("[OK] Context Compression 테스트 통과")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Context Packer 단위 테스트
+토큰 예산, 부모/자식 중복 문장 제거, 문장 경계 절단을 검증
+"""
+
+from langchain.schema import Document
+
+from utils.context_packer import ContextPacker, estimate_tokens
+from utils.rag_chain import RAGChain
+
+
+def _doc(content, page=1, name="paper.pdf"):
+    return Document(page_content=content, metadata={"file_name": name, "page_number": page})
+
+
+def test_estimate_tokens_counts_hangul_per_char():
+    assert estimate_tokens("가나다라") == 4
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("") == 0
+
+
+def test_compact_headers_and_numbering():
+    packer = ContextPacker(max_tokens=0)
+    context = packer.pack([_doc("첫 번째 문서 내용입니다.", 3), _doc("두 번째 문서 내용입니다.", 5, "b.pptx")])
+
+    assert context.startswith("[1] paper.pdf · p.3\n첫 번째 문서 내용입니다.")
+    assert "[2] b.pptx · p.5\n두 번째 문서 내용입니다." in context
+
+
+def test_parent_child_overlap_removed():
+    child = "효율은 87.8%로 측정되었으며 이는 기존 대비 높은 수치입니다."
+    parent = "실험 조건은 상온입니다. " + child + " 추가 분석은 다음 절에 있습니다."
+    packer = ContextPacker(max_tokens=0)
+
+    context = packer.pack([_doc(child), _doc(parent, 2)])
+
+    assert context.count("87.8%") == 1
+    assert "실험 조건은 상온입니다." in context
+    assert packer.last_stats["packed"] == 2
+
+
+def test_budget_truncates_at_sentence_boundary():
+    sentences = [f"{i}번째 문장은 충분히 길게 작성된 테스트 문장입니다." for i in range(20)]
+    packer = ContextPacker(max_tokens=120, min_chunk_tokens=10)
+
+    context = packer.pack([_doc(" ".join(sentences)), _doc("다음 문서는 예산이 없어 제외됩니다.")])
+
+    assert context.endswith("입니다. …")
+    assert "다음 문서" not in context
+    assert packer.last_stats["tokens"] <= 120
+    assert packer.last_stats["truncated"] == 1
+
+
+def test_scores_decide_fill_order():
+    packer = ContextPacker(max_tokens=40, min_chunk_tokens=5)
+    low = _doc("낮은 점수 문서의 아주 긴 내용입니다. 이 내용은 예산을 넘깁니다.", 1)
+    high = _doc("높은 점수 문서입니다.", 2)
+
+    context = packer.pack([low, high], scores=[0.1, 0.9])
+
+    assert "높은 점수 문서입니다." in context
+
+
+def test_pack_with_indices_reports_kept_docs():
+    child = "효율은 87.8%로 측정되었으며 이는 기존 대비 높은 수치입니다."
+    parent = "실험 조건은 상온입니다. " + child
+    packer = ContextPacker(max_tokens=0)
+
+    context, kept = packer.pack_with_indices([_doc(parent), _doc(child, 2), _doc("세 번째 문서 내용입니다.", 3)])
+
+    assert kept == [0, 2]
+    assert "[2] paper.pdf · p.3" in context
+    assert packer.pack_with_indices([]) == ("", [])
+
+
+def _make_chain(max_tokens=0, min_chunk_tokens=40):
+    chain = RAGChain.__new__(RAGChain)
+    chain.context_compressor = None
+    chain.context_packer = ContextPacker(max_tokens=max_tokens, min_chunk_tokens=min_chunk_tokens)
+    chain._last_retrieved_docs = []
+    return chain
+
+
+def test_build_context_aligns_sources_with_citation_numbers():
+    child = "효율은 87.8%로 측정되었으며 이는 기존 대비 높은 수치입니다."
+    parent = _doc("실험 조건은 상온입니다. " + child, 1)
+    other = _doc("다른 파일의 결과 요약입니다.", 4, "b.pdf")
+    chain = _make_chain()
+
+    context = chain._build_context("효율은?", [(parent, 0.9), (_doc(child, 2), 0.8), (other, 0.7)])
+
+    # 중복으로 빠진 자식 청크는 출처에서도 제외 → [2]는 b.pdf
+    assert "[2] b.pdf · p.4" in context
+    assert [(d.metadata["file_name"], s) for d, s in chain._last_retrieved_docs] == [("paper.pdf", 0.9), ("b.pdf", 0.7)]
+
+
+def test_build_context_fills_budget_by_rerank_score():
+    low = _doc("낮은 점수 문서의 아주 긴 내용입니다. 이 내용은 예산을 넘깁니다.", 1)
+    high = _doc("높은 점수 문서입니다.", 2)
+    chain = _make_chain(max_tokens=25, min_chunk_tokens=5)
+
+    context = chain._build_context("질문", [(low, 0.1), (high, 0.9)])
+    assert context.startswith("[1] paper.pdf · p.2\n높은 점수 문서입니다.")
+    assert chain._last_retrieved_docs == [(high, 0.9)]
+
+    # 거리 점수(작을수록 유사)는 순서만 사용
+    chain._build_context("질문", [(low, 0.1), (high, 0.9)], rank_by_score=False)
+    assert chain._last_retrieved_docs[0] == (low, 0.1)
+
+
+if __name__ == "__main__":
+    test_estimate_tokens_counts_hangul_per_char()
+    test_compact_headers_and_numbering()
+    test_parent_child_overlap_removed()
+    test_budget_truncates_at_sentence_boundary()
+    test_scores_decide_fill_order()
+    test_pack_with_indices_reports_kept_docs()
+    test_build_context_aligns_sources_with_citation_numbers()
+    test_build_context_fills_budget_by_rerank_score()
+    print("[OK] Context Packer 테스트 통과")
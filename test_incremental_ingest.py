@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+증분 재업로드 단위 테스트
+페이지/슬라이드 콘텐츠 해시 비교로 변경된 페이지만 다시 임베딩하고,
+사라진 페이지만 삭제하며, 번호만 바뀐 페이지는 임베딩을 재사용하는지 검증
+"""
+
+import os
+import tempfile
+import uuid
+
+import chromadb
+import fitz
+from pptx import Presentation
+from pptx.util import Inches
+
+from utils.content_hash import diff_page_hashes
+from utils.document_processor import DocumentProcessor
+from utils.incremental_ingest import IncrementalUpdater
+from utils.ingestion_pipeline import IngestionPipeline
+from utils.vector_store import VectorStoreManager
+
+
+class _CountingEmbeddings:
+    def __init__(self):
+        self.embedded = []
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.0]
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+
+class _FakeChroma:
+    def __init__(self):
+        name = f"incremental-{uuid.uuid4().hex[:8]}"
+        self._collection = chromadb.EphemeralClient().create_collection(name)
+
+
+def _make_manager() -> VectorStoreManager:
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager.vectorstore = _FakeChroma()
+    manager.shared_vectorstore = None
+    manager.shared_db_enabled = False
+    manager.embeddings = _CountingEmbeddings()
+    manager._embedding_dimension = None
+    manager._corpus_versions = {"personal": 0, "shared": 0}
+    manager.bm25 = None
+    manager.shared_bm25 = None
+    manager.persist_directory = tempfile.mkdtemp()
+    return manager
+
+
+def _ingest(processor, manager, path, name, file_type):
+    chunks = processor.process_document(path, name, file_type)
+    embeddings = manager.embeddings.embed_documents([c.page_content for c in chunks])
+    manager.add_documents(chunks, embeddings=embeddings)
+    manager.embeddings.embedded.clear()
+    return chunks
+
+
+def _stored(manager, name):
+    data = manager.vectorstore._collection.get(where={"file_name": name}, include=["metadatas", "documents"])
+    return sorted((m["page_number"], doc) for m, doc in zip(data["metadatas"], data["documents"]))
+
+
+def _save_deck(path, bodies):
+    prs = Presentation()
+    for index, body in enumerate(bodies, 1):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {index} Title"
+        slide.placeholders[1].text = body
+        box = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(6), Inches(1))
+        box.text_frame.text = f"Footnote for slide {index} about OLED lifetime measurements"
+    prs.save(path)
+
+
+def _processor():
+    return DocumentProcessor(chunk_size=300, chunk_overlap=30, pdf_parallel_page_workers=1)
+
+
+def test_diff_detects_moved_changed_and_removed_pages():
+    stored = {1: "a", 2: "b", 3: "c", 4: "d"}
+    # 2페이지 앞에 새 페이지 삽입, 마지막 페이지 삭제, 3페이지(c) 수정
+    current = {1: "a", 2: "new", 3: "b", 4: "c2"}
+    diff = diff_page_hashes(stored, current)
+
+    assert diff.unchanged == [1]
+    assert diff.moved == {2: 3}
+    assert diff.changed == [2, 4]
+    assert diff.removed == [3, 4]
+
+
+def test_editing_one_slide_reembeds_only_that_slide():
+    path = os.path.join(tempfile.mkdtemp(), "deck.pptx")
+    bodies = [f"Body of slide {i} describing exciton quenching and device stability" for i in range(1, 7)]
+    _save_deck(path, bodies)
+    processor, manager = _processor(), _make_manager()
+    _ingest(processor, manager, path, "deck.pptx", "pptx")
+
+    bodies[3] = "Completely revised body text for slide four with new efficiency numbers"
+    _save_deck(path, bodies)
+    result = IncrementalUpdater(processor, manager).update(path, "deck.pptx", "pptx")
+
+    assert (result["unchanged"], result["changed"], result["removed"]) == (5, 1, 1)
+    # 임베딩 요청은 수정된 슬라이드 4의 청크뿐
+    fresh = processor.process_document(path, "deck.pptx", "pptx")
+    slide4 = [c.page_content for c in fresh if c.metadata["page_number"] == 4]
+    assert sorted(manager.embeddings.embedded) == sorted(slide4)
+    assert _stored(manager, "deck.pptx") == sorted((c.metadata["page_number"], c.page_content) for c in fresh)
+
+
+def test_unchanged_file_is_a_no_op_and_deleted_pages_are_removed():
+    path = os.path.join(tempfile.mkdtemp(), "paper.pdf")
+    doc = fitz.open()
+    for page_num in range(1, 5):
+        page = doc.new_page()
+        for line in range(8):
+            page.insert_text((72, 72 + line * 14), f"Page {page_num} line {line} reports charge balance in the EML", fontsize=10)
+    doc.save(path)
+    processor, manager = _processor(), _make_manager()
+    first = _ingest(processor, manager, path, "paper.pdf", "pdf")
+    assert sorted({c.metadata["page_number"] for c in first}) == [1, 2, 3, 4]
+
+    updater = IncrementalUpdater(processor, manager)
+    result = updater.update(path, "paper.pdf", "pdf")
+    assert result["changed"] == result["removed"] == 0 and manager.embeddings.embedded == []
+
+    # 마지막 페이지 삭제 → 임베딩 없이 4페이지 청크만 제거
+    doc.delete_page(3)
+    doc.save(path)
+    doc.close()
+    result = updater.update(path, "paper.pdf", "pdf")
+    assert (result["changed"], result["removed"]) == (0, 1)
+    assert manager.embeddings.embedded == []
+    assert {page for page, _ in _stored(manager, "paper.pdf")} == {1, 2, 3}
+
+
+def _heading_as_title(elements, current_title):
+    # 현재 분류기는 "title" 요소를 만들지 않으므로 heading으로 섹션 전환을 재현
+    for elem in elements:
+        if elem["type"] == "heading":
+            return elem["content"]
+    return current_title
+
+
+def _titled_processor():
+    processor = _processor()
+    processor.pdf_engine._update_section_title = _heading_as_title
+    return processor
+
+
+def _save_titled_pdf(path, headings):
+    """headings: {페이지 번호: 섹션 제목} (6페이지)"""
+    doc = fitz.open()
+    for page_num in range(1, 7):
+        page = doc.new_page()
+        y = 72
+        if page_num in headings:
+            page.insert_text((72, y), headings[page_num], fontsize=24)
+            y += 40
+        for line in range(6):
+            page.insert_text((72, y), f"Page {page_num} line {line} discusses triplet harvesting in TADF hosts",
+                             fontsize=10)
+            y += 14
+    doc.save(path)
+    doc.close()
+
+
+def _section_titles(chunks):
+    return sorted((c.metadata["page_number"], c.page_content, c.metadata["section_title"]) for c in chunks)
+
+
+def test_partial_pages_keep_section_titles_from_earlier_pages():
+    path = os.path.join(tempfile.mkdtemp(), "titled.pdf")
+    _save_titled_pdf(path, {2: "Introduction Overview", 5: "Experimental Methods"})
+    full = _titled_processor().process_document(path, "titled.pdf", "pdf")
+    expected = _section_titles(c for c in full if c.metadata["page_number"] in (4, 6))
+
+    # 저널 재개처럼 새 프로세서로 일부 페이지만 다시 청킹해도 앞 페이지 제목을 이어받음
+    partial = [c for batch in _titled_processor().iter_documents(path, "titled.pdf", "pdf", pages={4, 6})
+               for c in batch]
+    assert _section_titles(partial) == expected
+    assert {c.metadata["section_title"] for c in partial if c.metadata["page_number"] == 4} == {"Introduction Overview"}
+    # 해시도 전체 처리와 동일 (다음 증분 업로드에서 변경 없음으로 판단)
+    hashes = {c.metadata["page_number"]: c.metadata["content_hash"] for c in full}
+    assert all(c.metadata["content_hash"] == hashes[c.metadata["page_number"]] for c in partial)
+
+
+def test_heading_change_reprocesses_pages_that_inherit_it():
+    path = os.path.join(tempfile.mkdtemp(), "titled.pdf")
+    _save_titled_pdf(path, {2: "Introduction Overview", 5: "Experimental Methods"})
+    processor, manager = _titled_processor(), _make_manager()
+    _ingest(processor, manager, path, "titled.pdf", "pdf")
+
+    # 2페이지 제목만 수정 → 제목을 이어받는 3~5페이지도 다시 청킹 (6페이지는 5페이지 제목)
+    _save_titled_pdf(path, {2: "Background Overview", 5: "Experimental Methods"})
+    result = IncrementalUpdater(processor, manager).update(path, "titled.pdf", "pdf")
+    assert (result["unchanged"], result["changed"]) == (2, 4)
+
+    fresh = _titled_processor().process_document(path, "titled.pdf", "pdf")
+    data = manager.vectorstore._collection.get(where={"file_name": "titled.pdf"}, include=["metadatas", "documents"])
+    stored = sorted((m["page_number"], doc, m["section_title"]) for m, doc in zip(data["metadatas"], data["documents"]))
+    assert stored == _section_titles(fresh)
+
+
+def test_pipeline_summary_counts_incrementally_updated_files():
+    folder = tempfile.mkdtemp()
+    old_path, new_path = os.path.join(folder, "old.pptx"), os.path.join(folder, "new.pptx")
+    _save_deck(old_path, [f"Body of slide {i} about hole transport layers" for i in range(1, 4)])
+    _save_deck(new_path, ["Fresh deck body describing blue emitter lifetime"])
+    processor, manager = _processor(), _make_manager()
+    _ingest(processor, manager, old_path, "old.pptx", "pptx")
+
+    pipeline = IngestionPipeline(processor, manager, parse_workers=1, embed_workers=1, use_processes=False,
+                                 incremental_update=True)
+    summary = pipeline.run([(old_path, "old.pptx", "pptx"), (new_path, "new.pptx", "pptx")])
+    # old.pptx는 증분 반영(변경 없음), new.pptx만 전체 업로드 → 요청한 2개 파일 모두 집계
+    assert summary["files"] == 2
+    assert sorted(summary["succeeded"]) == ["new.pptx", "old.pptx"]
+
+
+def test_first_upload_returns_none():
+    path = os.path.join(tempfile.mkdtemp(), "new.pptx")
+    _save_deck(path, ["Only slide body with enough words to form a chunk"])
+    assert IncrementalUpdater(_processor(), _make_manager()).update(path, "new.pptx", "pptx") is None
+
+
+if __name__ == "__main__":
+    test_diff_detects_moved_changed_and_removed_pages()
+    test_editing_one_slide_reembeds_only_that_slide()
+    test_unchanged_file_is_a_no_op_and_deleted_pages_are_removed()
+    test_partial_pages_keep_section_titles_from_earlier_pages()
+    test_heading_change_reprocesses_pages_that_inherit_it()
+    test_pipeline_summary_counts_incrementally_updated_files()
+    test_first_upload_returns_none()
+    print("[OK] 증분 재업로드 테스트 통과")
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+업로드 저널 단위 테스트
+배치 체크포인트 기록/재생, 재개 계획, 파일 도중 실패 후 마지막 배치 이후부터 이어서 처리하는지 검증
+"""
+
+import os
+import tempfile
+
+import fitz
+
+from utils.document_processor import DocumentProcessor
+from utils.ingestion_journal import IngestionJournal
+from utils.ingestion_pipeline import IngestionPipeline
+
+
+def _journal_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "ingestion_journal.jsonl")
+
+
+def test_journal_replays_and_ignores_truncated_line():
+    path = _journal_path()
+    journal = IngestionJournal(path)
+    journal.begin("/docs/a.pdf", "a.pdf", "pdf", "personal", "hash-a")
+    journal.record_batch("a.pdf", "personal", ["a1", "a2"], [1, 1])
+    journal.record_batch("a.pdf", "personal", ["a3"], [2])
+    journal.fail("a.pdf", "personal", "임베딩 서버 응답 없음")
+    journal.begin("/docs/b.pdf", "b.pdf", "pdf", "personal", "hash-b")
+    journal.complete("b.pdf", "personal")
+    # 기록 도중 강제 종료된 마지막 줄
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"event": "batch", "key": "personal:a.pdf", "ids": ["a4"')
+
+    reopened = IngestionJournal(path)
+    entry = reopened.get("a.pdf", "personal")
+    assert entry["ids"] == ["a1", "a2", "a3"] and entry["pages"] == [1, 1, 2]
+    assert entry["status"] == "failed" and entry["error"] == "임베딩 서버 응답 없음"
+    assert reopened.get("b.pdf", "personal") is None
+    assert [e["file_name"] for e in reopened.unfinished()] == ["a.pdf"]
+
+    # 재생 후 압축: 완료 항목과 깨진 줄이 제거됨
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 3
+    assert IngestionJournal(path).get("a.pdf", "personal")["ids"] == ["a1", "a2", "a3"]
+
+
+def test_resume_plan_redoes_last_page():
+    entry = {"ids": ["c1", "c2", "c3", "c4", "c5"], "pages": [1, 1, 2, 3, 3]}
+    done_pages, partial_ids = IngestionJournal.resume_plan(entry)
+    assert done_pages == {1, 2} and partial_ids == ["c4", "c5"]
+
+    # 기록 확인이 없는 intent 청크는 삭제 대상, 해당 페이지는 다시 처리
+    pending = {"ids": ["c1", "c2", "c3"], "pages": [1, 2, 2], "pending": {"c4": 2, "c5": 3}}
+    assert IngestionJournal.resume_plan(pending) == ({1}, ["c2", "c3", "c4", "c5"])
+    assert IngestionJournal.resume_plan({"ids": [], "pages": [], "pending": {"c1": 1}}) == (set(), ["c1"])
+
+    # 페이지 번호가 없는 형식은 처음부터
+    assert IngestionJournal.resume_plan({"ids": ["t1"], "pages": [None]}) == (set(), ["t1"])
+    assert IngestionJournal.resume_plan({"ids": [], "pages": []}) == (set(), [])
+
+
+def _make_pdf(page_count: int, tag: str = "") -> str:
+    doc = fitz.open()
+    for page_num in range(1, page_count + 1):
+        page = doc.new_page()
+        for line in range(10):
+            page.insert_text((72, 72 + line * 14),
+                             f"Page {page_num}{tag} line {line} covers triplet harvesting in phosphorescent emitters",
+                             fontsize=10)
+    path = os.path.join(tempfile.mkdtemp(), "paper.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class _CrashingProcessor(DocumentProcessor):
+    """지정한 배치 수 이후 예외를 던지는 DocumentProcessor (강제 종료 재현)"""
+
+    def __init__(self, fail_after=None):
+        super().__init__(chunk_size=200, chunk_overlap=20, enable_advanced_pdf_chunking=False,
+                         enable_advanced_pptx_chunking=False)
+        self.fail_after = fail_after
+        self.requested_pages = []
+
+    def iter_documents(self, file_path, file_name, file_type, batch_size=64, pages=None, category=None):
+        self.requested_pages.append(None if pages is None else sorted(pages))
+        for index, batch in enumerate(super().iter_documents(file_path, file_name, file_type,
+                                                             batch_size=batch_size, pages=pages, category=category)):
+            if index == self.fail_after:
+                raise RuntimeError("업로드 중단")
+            yield batch
+
+
+class _MemoryVectorManager:
+    def __init__(self):
+        self.embeddings = self
+        self.stored = {}
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [[1.0, 0.0] for _ in texts]
+
+    def add_documents(self, documents, target_db="personal", embeddings=None, rebuild_bm25=True):
+        for doc in documents:
+            self.stored[doc.id] = (doc.metadata["page_number"], doc.page_content)
+        return True
+
+    def rebuild_bm25_index(self, target_db="personal"):
+        pass
+
+    def delete_documents_by_ids(self, chunk_ids, target_db="personal"):
+        for chunk_id in chunk_ids:
+            self.stored.pop(chunk_id, None)
+        return True
+
+
+def _run(processor, manager, journal, path):
+    done = []
+    pipeline = IngestionPipeline(processor, manager, parse_workers=1, embed_workers=1, embed_batch_size=4,
+                                 use_processes=False, journal=journal)
+    pipeline.run([(path, "paper.pdf", "pdf")],
+                 on_file_done=lambda name, ok, error, count: done.append((ok, error, count)))
+    return done
+
+
+def test_failed_upload_resumes_after_last_batch():
+    path = _make_pdf(6)
+    expected = sorted((d.metadata["page_number"], d.page_content) for d in
+                      _CrashingProcessor().process_document(path, "paper.pdf", "pdf"))
+    manager, journal_path = _MemoryVectorManager(), _journal_path()
+
+    done = _run(_CrashingProcessor(fail_after=2), manager, IngestionJournal(journal_path), path)
+    assert done == [(False, "업로드 중단", 0)]
+    entry = IngestionJournal(journal_path).get("paper.pdf", "personal")
+    assert entry["status"] == "failed" and sorted(entry["ids"]) == sorted(manager.stored)
+    done_pages, _ = IngestionJournal.resume_plan(entry)
+    assert done_pages
+
+    # 재시작: 새 저널 인스턴스로 재생 → 완료 페이지는 건너뛰고 나머지만 파싱/임베딩
+    manager.embedded = 0
+    processor = _CrashingProcessor()
+    journal = IngestionJournal(journal_path)
+    done = _run(processor, manager, journal, path)
+    assert processor.requested_pages == [sorted(set(range(1, 7)) - done_pages)]
+    assert done == [(True, None, len(expected))]
+    assert sorted(manager.stored.values()) == expected
+    assert manager.embedded < len(expected)
+    assert journal.get("paper.pdf", "personal") is None
+
+
+class _KilledAfterWriteManager(_MemoryVectorManager):
+    """Chroma 기록 직후 (저널 확인 전) 종료되는 상황 재현"""
+
+    def __init__(self, kill_after):
+        super().__init__()
+        self.kill_after = kill_after
+        self.calls = 0
+
+    def add_documents(self, documents, target_db="personal", embeddings=None, rebuild_bm25=True):
+        super().add_documents(documents, target_db, embeddings, rebuild_bm25)
+        self.calls += 1
+        if self.calls == self.kill_after:
+            raise RuntimeError("기록 직후 종료")
+        return True
+
+
+def test_unconfirmed_batch_is_removed_on_resume():
+    path = _make_pdf(6)
+    expected = sorted((d.metadata["page_number"], d.page_content) for d in
+                      _CrashingProcessor().process_document(path, "paper.pdf", "pdf"))
+    manager, journal_path = _KilledAfterWriteManager(kill_after=3), _journal_path()
+    _run(_CrashingProcessor(), manager, IngestionJournal(journal_path), path)
+
+    entry = IngestionJournal(journal_path).get("paper.pdf", "personal")
+    assert entry["pending"] and set(entry["pending"]) <= set(manager.stored)
+    assert sorted(IngestionJournal.written_ids(entry)) == sorted(manager.stored)
+
+    # 재개: 확인되지 않은 배치의 청크를 지우고 다시 처리 → 중복 없음
+    done = _run(_CrashingProcessor(), manager, IngestionJournal(journal_path), path)
+    assert done == [(True, None, len(expected))]
+    assert sorted(manager.stored.values()) == expected
+
+
+def test_changed_file_discards_partial_upload():
+    path = _make_pdf(4)
+    manager, journal_path = _MemoryVectorManager(), _journal_path()
+    _run(_CrashingProcessor(fail_after=1), manager, IngestionJournal(journal_path), path)
+    stale_ids = set(manager.stored)
+    assert stale_ids
+
+    # 내용이 바뀐 새 버전 → 이전 부분 기록 삭제 후 처음부터
+    os.replace(_make_pdf(4, tag="b"), path)
+    processor = _CrashingProcessor()
+    done = _run(processor, manager, IngestionJournal(journal_path), path)
+    assert processor.requested_pages == [None]
+    assert done[0][0] and not stale_ids & set(manager.stored)
+    assert all("b line" in content for _, content in manager.stored.values())
+
+
+if __name__ == "__main__":
+    test_journal_replays_and_ignores_truncated_line()
+    test_resume_plan_redoes_last_page()
+    test_failed_upload_resumes_after_last_batch()
+    test_unconfirmed_batch_is_removed_on_resume()
+    test_changed_file_discards_partial_upload()
+    print("[OK] 업로드 저널 테스트 통과")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+병렬 수집 파이프라인 단위 테스트
+파일별 완료/오류 보고, 배치 임베딩의 단일 writer 전달, 큐 종료 처리를 검증
+"""
+
+import threading
+
+from langchain.schema import Document
+
+from utils.ingestion_pipeline import IngestionPipeline
+
+
+class _FakeProcessor:
+    def __init__(self):
+        self.llm_client = None
+
+    def process_document(self, file_path, file_name, file_type):
+        if file_name.startswith("broken"):
+            raise ValueError("파싱 실패\n두 번째 줄")
+        if file_name.startswith("empty"):
+            return []
+        count = int(file_name.split("_")[1].split(".")[0])
+        return [Document(page_content=f"{file_name}-{i}", metadata={"file_name": file_name}) for i in range(count)]
+
+    def iter_documents(self, file_path, file_name, file_type, batch_size=64, pages=None):
+        chunks = self.process_document(file_path, file_name, file_type)
+        for i in range(0, len(chunks), batch_size):
+            yield chunks[i:i + batch_size]
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.batch_sizes.append(len(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+
+class _FakeVectorManager:
+    def __init__(self, fail_on=None):
+        self.embeddings = _FakeEmbeddings()
+        self.fail_on = fail_on
+        self.writes = []
+        self.writer_threads = set()
+
+    def add_documents(self, documents, target_db="personal", embeddings=None, rebuild_bm25=True):
+        self.writer_threads.add(threading.get_ident())
+        if documents[0].metadata["file_name"] == self.fail_on:
+            raise ValueError("DB 기록 실패")
+        self.writes.append((documents[0].metadata["file_name"], target_db, documents, embeddings))
+        return True
+
+    def rebuild_bm25_index(self, target_db="personal"):
+        pass
+
+    def delete_documents_by_ids(self, chunk_ids, target_db="personal"):
+        return True
+
+
+def _pipeline(vector_manager, **kwargs):
+    return IngestionPipeline(
+        _FakeProcessor(), vector_manager, parse_workers=2, embed_workers=3,
+        embed_batch_size=4, queue_size=1, use_processes=False, **kwargs
+    )
+
+
+def _jobs(*names):
+    return [(f"/tmp/{name}", name, "txt") for name in names]
+
+
+def test_all_files_written_with_precomputed_embeddings():
+    manager = _FakeVectorManager()
+    done = []
+    summary = _pipeline(manager).run(
+        _jobs("a_10.txt", "b_3.txt", "c_7.txt", "d_1.txt"), target_db="shared",
+        on_file_done=lambda name, ok, error, count: done.append((name, ok, count))
+    )
+
+    assert sorted(summary["succeeded"]) == ["a_10.txt", "b_3.txt", "c_7.txt", "d_1.txt"]
+    assert summary["chunks"] == 21
+    assert sorted(done) == [("a_10.txt", True, 10), ("b_3.txt", True, 3), ("c_7.txt", True, 7), ("d_1.txt", True, 1)]
+    for name, target_db, docs, embeddings in manager.writes:
+        assert target_db == "shared"
+        assert len(embeddings) == len(docs)
+        assert embeddings == [[float(len(d.page_content)), 1.0] for d in docs]
+    # 배치 크기 상한 준수 + 모든 기록은 단일 writer 스레드
+    assert max(manager.embeddings.batch_sizes) <= 4
+    assert len(manager.writer_threads) == 1
+
+
+def test_errors_are_reported_per_file():
+    manager = _FakeVectorManager(fail_on="c_2.txt")
+    done = {}
+    summary = _pipeline(manager).run(
+        _jobs("a_2.txt", "broken.txt", "empty.txt", "c_2.txt"),
+        on_file_done=lambda name, ok, error, count: done.__setitem__(name, (ok, error))
+    )
+
+    assert summary["succeeded"] == ["a_2.txt"]
+    assert set(summary["failed"]) == {"broken.txt", "empty.txt", "c_2.txt"}
+    assert done["broken.txt"] == (False, "파싱 실패\n두 번째 줄")
+    assert done["c_2.txt"] == (False, "DB 기록 실패")
+    assert done["a_2.txt"] == (True, None)
+
+
+def test_llm_client_forces_thread_parsing():
+    processor = _FakeProcessor()
+    processor.llm_client = object()
+    pipeline = IngestionPipeline(processor, _FakeVectorManager(), use_processes=True)
+    assert pipeline.use_processes is False
+
+
+def test_empty_job_list():
+    summary = _pipeline(_FakeVectorManager()).run([])
+    assert summary["succeeded"] == [] and summary["failed"] == {}
+
+
+if __name__ == "__main__":
+    test_all_files_written_with_precomputed_embeddings()
+    test_errors_are_reported_per_file()
+    test_llm_client_forces_thread_parsing()
+    test_empty_job_list()
+    print("[OK] 병렬 수집 파이프라인 테스트 통과")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Latency Budget 스케줄러 단위 테스트
+단계별 비용 추정(EWMA)과 예산 초과 단계 건너뛰기를 검증
+"""
+
+import threading
+
+from utils.latency_budget import LatencyBudget, StageCostTracker
+from utils.rag_chain import RAGChain
+
+
+def test_tracker_first_sample_replaces_prior_then_ewma():
+    tracker = StageCostTracker(alpha=0.5, default_costs_ms={"multi_query": 4000.0})
+
+    assert tracker.estimate("multi_query") == 4000.0
+    tracker.record("multi_query", 1000.0)
+    assert tracker.estimate("multi_query") == 1000.0
+    tracker.record("multi_query", 3000.0)
+    assert tracker.estimate("multi_query") == 2000.0
+
+
+def test_budget_skips_stages_that_do_not_fit_with_reserve():
+    tracker = StageCostTracker(default_costs_ms={
+        "synonym_expansion": 100.0,
+        "multi_query": 3000.0,
+        "generation": 1500.0,
+    })
+    budget = LatencyBudget(4000, tracker)
+
+    assert budget.allow("synonym_expansion", reserve_stages=("generation",)) is True
+    # 3000 + 1500(생성 예약) > 4000
+    assert budget.allow("multi_query", reserve_stages=("generation",)) is False
+
+    report = budget.report()
+    assert report["skipped_stages"] == ["multi_query"]
+    assert report["budget_ms"] == 4000.0
+    assert report["stage_estimates_ms"]["generation"] == 1500.0
+
+
+def test_concurrent_requests_keep_their_own_budget():
+    chain = RAGChain.__new__(RAGChain)
+    chain.stage_costs = StageCostTracker(default_costs_ms={"regeneration": 5000.0})
+    started = threading.Event()
+    release = threading.Event()
+    decisions = {}
+
+    def query_internal(question, chat_history, constraints, search_mode):
+        if question == "slow":
+            started.set()
+            release.wait(timeout=5)
+        decisions[question] = chain._stage_allowed("regeneration")
+        return {"answer": question, "success": True}
+
+    chain._query_internal = query_internal
+
+    # 빡빡한 예산의 요청이 진행 중인 동안 예산 없는 요청이 끝나도 예산이 유지됨
+    slow = threading.Thread(target=lambda: decisions.setdefault("result", chain.query("slow", budget_ms=1000)))
+    slow.start()
+    started.wait(timeout=5)
+    unbudgeted = chain.query("fast")
+    release.set()
+    slow.join(timeout=5)
+
+    assert decisions["fast"] is True and "budget" not in unbudgeted
+    assert decisions["slow"] is False and decisions["result"]["skipped_stages"] == ["regeneration"]
+
+if __name__ == "__main__":
+    test_tracker_first_sample_replaces_prior_then_ewma()
+    test_budget_skips_stages_that_do_not_fit_with_reserve()
+    test_concurrent_requests_keep_their_own_budget()
+    print("[OK] Latency Budget 테스트 통과")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Re-ranker 백그라운드 로딩 단위 테스트
+로딩 중에는 Hybrid 점수로 진행하고, 완료/실패 시 상태가 전환되는지 검증
+"""
+
+from concurrent.futures import Future
+
+from utils.rag_chain import RAGChain
+
+
+class _FakeReranker:
+    pass
+
+
+def _make_chain(future: Future) -> RAGChain:
+    """모델/LLM 초기화 없이 Re-ranker 상태만 가진 RAGChain"""
+    chain = RAGChain.__new__(RAGChain)
+    chain.use_reranker = True
+    chain.reranker = None
+    chain.reranker_model = "multilingual-mini"
+    chain._reranker_future = future
+    chain._reranker_wait_logged = False
+    chain.enable_cascade_rerank = True
+    chain.cascade_prefilter = object()
+    chain.vectorstore = None
+    return chain
+
+
+def test_reranker_not_ready_until_future_done():
+    future = Future()
+    chain = _make_chain(future)
+
+    assert chain._reranker_ready() is False
+    assert chain.use_reranker is True
+
+    reranker = _FakeReranker()
+    future.set_result(reranker)
+    assert chain._reranker_ready() is True
+    assert chain.reranker is reranker
+    assert chain._reranker_future is None
+
+
+def test_reranker_load_failure_disables_reranking():
+    future = Future()
+    future.set_exception(RuntimeError("모델 파일을 찾을 수 없습니다"))
+    chain = _make_chain(future)
+
+    assert chain._reranker_ready() is False
+    assert chain.use_reranker is False
+    assert chain.cascade_prefilter is None
+
+
+if __name__ == "__main__":
+    test_reranker_not_ready_until_future_done()
+    test_reranker_load_failure_disables_reranking()
+    print("[OK] Re-ranker 백그라운드 로딩 테스트 통과")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Multi-Query Confidence Gate 단위 테스트
+원본 쿼리 1차 Re-ranking 결과가 확실할 때만 재작성을 생략하는지 검증
+"""
+
+from langchain.prompts import PromptTemplate
+from langchain.schema import Document
+from langchain_core.runnables import RunnableLambda
+
+from utils.context_packer import ContextPacker
+from utils.latency_budget import StageCostTracker
+from utils.rag_chain import RAGChain
+
+
+def _make_chain() -> RAGChain:
+    chain = RAGChain.__new__(RAGChain)
+    chain.top_k = 3
+    chain.multi_query_gate_min_top1 = 0.8
+    chain.multi_query_gate_min_margin = 0.15
+    chain._multi_query_gate_stats = RAGChain._new_multi_query_gate_stats()
+    return chain
+
+
+def _candidates(scores):
+    return [(object(), score) for score in scores]
+
+
+def test_gate_passes_on_clear_winner():
+    chain = _make_chain()
+    gate = chain._first_pass_confidence(_candidates([0.95, 0.60, 0.55, 0.50]))
+    assert gate["passed"] is True
+
+
+def test_gate_passes_on_separated_top_cluster():
+    chain = _make_chain()
+    # top1/top2 차이는 작지만 상위 2개와 나머지 사이 Gap이 뚜렷
+    gate = chain._first_pass_confidence(_candidates([0.92, 0.90, 0.20, 0.18, 0.17, 0.15]))
+    assert gate["margin"] < 0.15
+    assert gate["gap_separated"] is True
+    assert gate["passed"] is True
+
+
+def test_gate_fails_on_low_or_flat_scores():
+    chain = _make_chain()
+    assert chain._first_pass_confidence(_candidates([0.55, 0.30, 0.20]))["passed"] is False
+    assert chain._first_pass_confidence(_candidates([0.90, 0.88, 0.86, 0.84, 0.82]))["passed"] is False
+
+
+def test_gate_stats_record_skip_rate():
+    chain = _make_chain()
+    for scores in ([0.95, 0.5], [0.5, 0.4]):
+        chain._record_multi_query_gate("q", chain._first_pass_confidence(_candidates(scores)))
+
+    stats = chain.get_multi_query_gate_stats()
+    assert stats["checked"] == 2
+    assert stats["skip_rate"] == 0.5
+    assert len(stats["history"]) == 2
+
+
+class _FakeLLM:
+    def __init__(self, first: str, regenerated: str):
+        self.first = first
+        self.regenerated = regenerated
+
+    def stream(self, prompt):
+        yield self.first
+
+    def invoke(self, prompt):
+        return self.regenerated
+
+
+def _make_answering_chain(llm, top_scores) -> RAGChain:
+    """검색 단계에서 게이트 판정만 기록하는 query_events용 RAGChain"""
+    chain = _make_chain()
+    chain.llm = llm
+    chain.enable_file_aggregation = False
+    chain.enable_self_consistency = False
+    chain.stage_costs = StageCostTracker()
+    chain.context_packer = ContextPacker()
+    prompt = PromptTemplate(template="{chat_history}{context}{question}{extra_instructions}",
+                            input_variables=["chat_history", "context", "question", "extra_instructions"])
+    chain._compiled_chains = {"base": (prompt, None)}
+    doc = Document(page_content="배터리 용량은 5000mAh 입니다", metadata={"file_name": "spec.pdf", "page_number": 3})
+    chain._last_retrieved_docs = [(doc, 0.9)]
+    chain._generate_source_citations = lambda answer, docs: answer
+
+    def get_context(question, history, mode):
+        chain._record_multi_query_gate(question, chain._first_pass_confidence(_candidates(top_scores)))
+        return doc.page_content
+
+    chain._get_context = get_context
+    return chain
+
+
+def test_gate_outcome_recorded_when_request_finishes():
+    fixed = "spec.pdf p.3 문서에 따르면 배터리 용량은 5000mAh 입니다."
+    # 게이트로 Multi-Query를 생략했는데 첫 답변이 검증 실패 → 재생성
+    chain = _make_answering_chain(_FakeLLM("해당 정보를 찾을 수 없습니다.", fixed), [0.95, 0.5])
+    events = list(chain.query_events("배터리 용량은?"))
+    assert events[-1]["result"]["answer"] == fixed
+
+    stats = chain.get_multi_query_gate_stats()
+    assert stats["history"][-1]["outcome"] == {"verification_failed": True, "regenerated": True, "no_sources": False}
+    assert stats["outcomes"]["skipped"] == {"finished": 1, "verification_failed": 1, "regenerated": 1, "no_sources": 0}
+    assert stats["outcomes"]["multi_query"]["finished"] == 0
+
+    # Multi-Query를 진행한 질문은 별도 집계
+    chain.llm = _FakeLLM(fixed, "unused")
+    chain._get_context = lambda question, history, mode: (
+        chain._record_multi_query_gate(question, chain._first_pass_confidence(_candidates([0.5, 0.4]))) or "ctx"
+    )
+    list(chain.query_events("배터리 용량은?"))
+    stats = chain.get_multi_query_gate_stats()
+    assert stats["history"][-1]["outcome"]["verification_failed"] is False
+    assert stats["outcomes"]["multi_query"] == {"finished": 1, "verification_failed": 0, "regenerated": 0, "no_sources": 0}
+
+
+def test_gate_outcome_recorded_by_query():
+    fixed = "spec.pdf p.3 문서에 따르면 배터리 용량은 5000mAh 입니다."
+    chain = _make_answering_chain(_FakeLLM("unused", fixed), [0.95, 0.5])
+    prompt, _ = chain._compiled_chains["base"]
+    chain._compiled_chains["base"] = (prompt, RunnableLambda(lambda inputs: "해당 정보를 찾을 수 없습니다."))
+
+    assert chain.query("배터리 용량은?")["answer"] == fixed
+    outcome = chain.get_multi_query_gate_stats()["history"][-1]["outcome"]
+    assert outcome == {"verification_failed": True, "regenerated": True, "no_sources": False}
+
+
+if __name__ == "__main__":
+    test_gate_passes_on_clear_winner()
+    test_gate_passes_on_separated_top_cluster()
+    test_gate_fails_on_low_or_flat_scores()
+    test_gate_stats_record_skip_rate()
+    test_gate_outcome_recorded_when_request_finishes()
+    test_gate_outcome_recorded_by_query()
+    print("[OK] Multi-Query Gate 테스트 통과")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+PDFLayoutAnalyzer 문자 배열 처리 단위 테스트
+NumPy 열 배열 기반 블록 분할/최빈 폰트/좌표가 기존 문자 dict 순회 결과와 같은지 검증
+"""
+
+import random
+
+from utils.pdf_layout_analyzer import PDFLayoutAnalyzer
+
+
+class _FakePage:
+    def __init__(self, chars):
+        self.chars = chars
+
+    def extract_text(self):
+        return "".join(c["text"] for c in self.chars)
+
+
+def _char(text, top, x0, size, fontname="Times-Roman"):
+    return {"text": text, "top": top, "bottom": top + size, "x0": x0, "x1": x0 + size * 0.5,
+            "size": size, "fontname": fontname}
+
+
+def _reference_blocks(chars):
+    """기존 구현: 직전 문자와 같은 줄(top 차 < 5)이고 폰트 크기 차 < 2이면 같은 블록"""
+    blocks, current = [], []
+    for char in chars:
+        if current and abs(char["top"] - current[-1]["top"]) < 5 and abs(char["size"] - current[-1]["size"]) < 2:
+            current.append(char)
+        else:
+            if current:
+                blocks.append(current)
+            current = [char]
+    if current:
+        blocks.append(current)
+    result = []
+    for block in blocks:
+        text = "".join(c["text"] for c in block)
+        if not text.strip():
+            continue
+        sizes = [c["size"] for c in block]
+        result.append((
+            text,
+            max(set(sizes), key=sizes.count),
+            any("bold" in c["fontname"].lower() for c in block),
+            (min(c["x0"] for c in block), min(c["top"] for c in block),
+             max(c["x1"] for c in block), max(c["bottom"] for c in block)),
+            block[0]["fontname"],
+        ))
+    return result
+
+
+def _dense_page(lines=60, chars_per_line=90, seed=7):
+    rng = random.Random(seed)
+    chars = []
+    for line in range(lines):
+        top = 40 + line * 12
+        # 줄마다 단일 폰트 크기 (최빈값 동률 없음), 일부 줄은 굵은 글꼴
+        size = rng.choice([9.0, 10.0, 10.5, 14.0, 20.0])
+        font = "Helvetica-Bold" if line % 7 == 0 else "Times-Roman"
+        for i in range(chars_per_line):
+            text = " " if i % 6 == 5 else rng.choice("abcdefghij")
+            chars.append(_char(text, top + rng.uniform(-1, 1), 50 + i * 5, size, font))
+    return chars
+
+
+def test_blocks_match_reference_implementation():
+    chars = _dense_page()
+    blocks = PDFLayoutAnalyzer()._extract_text_blocks_with_font(_FakePage(chars))
+    assert [(b.text, b.font_size, b.is_bold, b.coordinates, b.font_family) for b in blocks] == _reference_blocks(chars)
+
+
+def test_font_change_within_line_splits_block_and_mode_is_majority():
+    chars = [_char(t, 100, 10 + i, 10.0) for i, t in enumerate("Heading")]
+    chars += [_char(t, 100, 30 + i, 24.0, "Arial-Bold") for i, t in enumerate("BIG")]
+    chars += [_char("x", 100, 40, 10.5), _char("y", 100, 41, 10.5), _char("z", 100, 42, 10.0)]
+    blocks = PDFLayoutAnalyzer()._extract_text_blocks_with_font(_FakePage(chars))
+
+    assert [b.text for b in blocks] == ["Heading", "BIG", "xyz"]
+    assert blocks[1].is_bold and blocks[1].font_size == 24.0
+    assert blocks[2].font_size == 10.5
+
+
+def test_chars_with_missing_keys_use_defaults():
+    chars = [{"text": "a", "top": 10, "x0": 1, "x1": 2, "bottom": 20, "fontsize": 11.0},
+             {"text": "b", "top": 10, "x0": 2, "x1": 3, "bottom": 20, "fontsize": 11.0}]
+    blocks = PDFLayoutAnalyzer()._extract_text_blocks_with_font(_FakePage(chars))
+    assert len(blocks) == 1
+    assert (blocks[0].text, blocks[0].font_size, blocks[0].font_family) == ("ab", 11.0, "Arial")
+
+
+if __name__ == "__main__":
+    test_blocks_match_reference_implementation()
+    test_font_change_within_line_splits_block_and_mode_is_majority()
+    test_chars_with_missing_keys_use_defaults()
+    print("[OK] 문자 배열 블록 분석 테스트 통과")
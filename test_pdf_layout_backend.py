@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+PyMuPDF 레이아웃 분석 백엔드 단위 테스트
+span 기반 요소가 pdfplumber 백엔드와 같은 스키마를 갖고, 표 후보 페이지에서만 pdfplumber 표 추출이 실행되는지 검증
+"""
+
+import os
+import tempfile
+
+import fitz
+
+from utils.pdf_chunking_engine import PDFChunkingEngine
+from utils.pdf_layout_analyzer import PDFLayoutAnalyzer, PyMuPDFLayoutAnalyzer
+
+
+def _make_pdf() -> str:
+    doc = fitz.open()
+    # 1페이지: 굵은 큰 제목 + 문단
+    page = doc.new_page()
+    page.insert_text((72, 72), "Device Architecture", fontsize=24, fontname="hebo")
+    for i in range(5):
+        page.insert_text((72, 120 + i * 14), f"Paragraph line {i} describes the emissive layer stack in detail", fontsize=10)
+    # 2페이지: 괘선 표
+    page = doc.new_page()
+    page.insert_text((72, 60), "Table 1. Device performance", fontsize=10)
+    rows = [["Device", "EQE", "Lifetime"], ["A", "21.5", "1200"], ["B", "18.2", "950"]]
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            page.draw_rect(fitz.Rect(72 + c * 120, 80 + r * 24, 192 + c * 120, 104 + r * 24))
+            page.insert_text((78 + c * 120, 96 + r * 24), cell, fontsize=10)
+    path = os.path.join(tempfile.mkdtemp(), "layout.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_span_elements_match_schema():
+    path = _make_pdf()
+    analyzer = PyMuPDFLayoutAnalyzer()
+    with fitz.open(path) as doc:
+        elements = analyzer.analyze_page_elements(doc[0])
+        text = analyzer.extract_page_text(doc[0])
+    analyzer.close()
+
+    assert "Device Architecture" in text
+    heading = elements[0]
+    assert heading["type"] == "heading" and heading["content"] == "Device Architecture"
+    assert heading["properties"]["is_bold"] is True
+    assert heading["properties"]["font_size"] == 24
+    assert set(heading["properties"]) == {"font_size", "is_bold", "coordinates", "font_family"}
+    assert all(e["type"] == "paragraph" for e in elements[1:])
+
+
+class _SpyAnalyzer(PyMuPDFLayoutAnalyzer):
+    def __init__(self):
+        super().__init__()
+        self.plumber_pages = []
+
+    def _plumber_tables(self, plumber_page):
+        self.plumber_pages.append(plumber_page.page_number)
+        return PDFLayoutAnalyzer._run_table_extractor(self, plumber_page)
+
+
+def test_tables_only_on_tabular_pages():
+    path = _make_pdf()
+    analyzer = _SpyAnalyzer()
+    with fitz.open(path) as doc:
+        first = analyzer.analyze_page_elements(doc[0])
+        second = analyzer.analyze_page_elements(doc[1])
+    analyzer.close()
+
+    assert analyzer.plumber_pages == [2]
+    assert not [e for e in first if e["type"] == "table"]
+    tables = [e for e in second if e["type"] == "table"]
+    assert tables and tables[0]["data"][1] == ["A", "21.5", "1200"]
+
+
+def test_engine_backends_produce_same_chunk_types():
+    path = _make_pdf()
+    config = {"max_size": 500, "overlap_size": 50, "min_chunk_size": 10, "min_word_count": 2}
+    plumber = PDFChunkingEngine(dict(config, layout_backend="pdfplumber")).process_pdf_document(path)
+    mupdf = PDFChunkingEngine(dict(config, layout_backend="pymupdf")).process_pdf_document(path)
+
+    assert {c.chunk_type for c in mupdf} == {c.chunk_type for c in plumber}
+    assert [c.metadata.page_number for c in mupdf if c.chunk_type == "page_summary"] == [1, 2]
+
+
+if __name__ == "__main__":
+    test_span_elements_match_schema()
+    test_tables_only_on_tabular_pages()
+    test_engine_backends_produce_same_chunk_types()
+    print("[OK] PyMuPDF 레이아웃 백엔드 테스트 통과")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+PDF 페이지 병렬 분석 단위 테스트
+페이지 구간을 여러 프로세스로 나눠도 순차 처리와 같은 청크/섹션 제목이 나오는지 검증
+"""
+
+import os
+import tempfile
+
+import fitz
+
+from utils.pdf_chunking_engine import PDFChunkingEngine
+
+
+def _make_pdf(page_count: int, title_pages: dict) -> str:
+    """title_pages: {페이지 번호(1부터): 섹션 제목}"""
+    doc = fitz.open()
+    for page_num in range(1, page_count + 1):
+        page = doc.new_page()
+        y = 72
+        if page_num in title_pages:
+            page.insert_text((72, y), title_pages[page_num], fontsize=24)
+            y += 40
+        for line in range(6):
+            page.insert_text((72, y), f"Page {page_num} paragraph line {line} with enough words for a chunk", fontsize=10)
+            y += 14
+    path = os.path.join(tempfile.mkdtemp(), "sample.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _summary(chunks):
+    return [(c.chunk_type, c.content, c.metadata.page_number, c.metadata.section_title) for c in chunks]
+
+
+def _heading_as_title(elements, current_title):
+    # 현재 분류기는 "title" 요소를 만들지 않으므로 heading으로 섹션 전환을 재현
+    for elem in elements:
+        if elem["type"] == "heading":
+            return elem["content"]
+    return current_title
+
+
+def _engine(**overrides):
+    config = {"max_size": 500, "overlap_size": 50, "min_chunk_size": 10, "min_word_count": 2}
+    config.update(overrides)
+    engine = PDFChunkingEngine(config)
+    engine._update_section_title = _heading_as_title
+    return engine
+
+
+def test_parallel_matches_sequential_and_stitches_titles():
+    # 제목이 구간 경계(4페이지 구간) 앞뒤에 걸치도록 배치
+    path = _make_pdf(12, {2: "Introduction Overview", 7: "Experimental Methods"})
+    sequential = _engine(parallel_page_workers=1).process_pdf_document(path)
+    parallel_engine = _engine(parallel_page_workers=3, parallel_min_pages=4, min_pages_per_worker=2)
+    assert parallel_engine._page_worker_count(12) == 3
+    parallel = parallel_engine.process_pdf_document(path)
+
+    assert _summary(parallel) == _summary(sequential)
+    titles = {c.metadata.page_number: c.metadata.section_title for c in parallel if c.chunk_type == "page_summary"}
+    # 5페이지(두 번째 구간 시작)는 첫 구간 2페이지의 제목을 이어받아야 함
+    assert titles[5] == titles[3] == "Introduction Overview"
+    assert titles[8] == titles[12] == "Experimental Methods"
+
+
+def test_short_documents_stay_sequential():
+    engine = _engine(parallel_page_workers=4, parallel_min_pages=16)
+    assert engine._page_worker_count(10) == 1
+    assert _engine(parallel_page_workers=1)._page_worker_count(100) == 1
+
+
+if __name__ == "__main__":
+    test_parallel_matches_sequential_and_stitches_titles()
+    test_short_documents_stay_sequential()
+    print("[OK] PDF 페이지 병렬 분석 테스트 통과")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+표 검출 사전 판정 단위 테스트
+괘선/정렬 열이 없는 페이지는 extract_tables를 생략하고, 생략/추출 페이지 수가 청크 통계에 보고되는지 검증
+"""
+
+import os
+import tempfile
+
+import fitz
+import pdfplumber
+
+from utils.pdf_chunking_engine import PDFChunkingEngine
+from utils.pdf_layout_analyzer import PDFLayoutAnalyzer
+
+
+def _make_pdf() -> str:
+    doc = fitz.open()
+    # 1페이지: 본문만
+    page = doc.new_page()
+    for i in range(8):
+        page.insert_text((72, 72 + i * 14), f"Body text line {i} about charge transport in the hole layer", fontsize=10)
+    # 2페이지: 괘선 표
+    page = doc.new_page()
+    rows = [["Device", "EQE", "Lifetime"], ["A", "21.5", "1200"], ["B", "18.2", "950"]]
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            page.draw_rect(fitz.Rect(72 + c * 120, 80 + r * 24, 192 + c * 120, 104 + r * 24))
+            page.insert_text((78 + c * 120, 96 + r * 24), cell, fontsize=10)
+    # 3페이지: 괘선 없는 정렬 열
+    page = doc.new_page()
+    for r, row in enumerate([["Layer", "Thickness", "Material"], ["HTL", "40 nm", "NPB"],
+                             ["EML", "30 nm", "CBP"], ["ETL", "35 nm", "TPBi"]]):
+        for c, cell in enumerate(row):
+            page.insert_text((72 + c * 150, 100 + r * 18), cell, fontsize=10)
+    path = os.path.join(tempfile.mkdtemp(), "tables.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class _CountingAnalyzer(PDFLayoutAnalyzer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.extracted_pages = []
+
+    def _run_table_extractor(self, page):
+        self.extracted_pages.append(page.page_number)
+        return super()._run_table_extractor(page)
+
+
+def test_screening_skips_plain_pages():
+    path = _make_pdf()
+    analyzer = _CountingAnalyzer()
+    checks = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            analyzer.analyze_page_elements(page)
+            checks.append(analyzer.last_table_check)
+
+    assert analyzer.extracted_pages == [2, 3]
+    assert checks == ["skipped", "extracted", "extracted"]
+
+
+def test_screening_disabled_extracts_every_page():
+    path = _make_pdf()
+    analyzer = _CountingAnalyzer(enable_table_screening=False)
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            analyzer.analyze_page_elements(page)
+    assert analyzer.extracted_pages == [1, 2, 3]
+
+
+def test_chunk_statistics_report_skipped_pages():
+    path = _make_pdf()
+    for backend in ("pdfplumber", "pymupdf"):
+        engine = PDFChunkingEngine({"layout_backend": backend, "min_chunk_size": 10, "min_word_count": 1})
+        chunks = engine.process_pdf_document(path)
+        stats = engine.get_chunk_statistics(chunks)["table_detection"]
+        assert stats["pages_screened"] == 3
+        assert stats["pages_skipped"] == 1 and stats["pages_extracted"] == 2
+        assert stats["tables_found"] >= 1
+
+
+if __name__ == "__main__":
+    test_screening_skips_plain_pages()
+    test_screening_disabled_extracts_every_page()
+    test_chunk_statistics_report_skipped_pages()
+    print("[OK] 표 검출 사전 판정 테스트 통과")
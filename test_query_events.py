@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+query_events() 단위 테스트
+첫 생성은 즉시 토큰으로 흘려보내고, 검증 실패 시 replace 이벤트로 교체되는지 검증
+"""
+
+from langchain.prompts import PromptTemplate
+from langchain.schema import Document
+
+from utils.context_packer import ContextPacker
+from utils.latency_budget import StageCostTracker
+from utils.rag_chain import RAGChain
+
+
+class _FakeLLM:
+    def __init__(self, stream_text: str, regenerated: str):
+        self.stream_text = stream_text
+        self.regenerated = regenerated
+        self.stream_consumed = 0
+
+    def stream(self, prompt):
+        for i in range(0, len(self.stream_text), 10):
+            self.stream_consumed = i + 10
+            yield self.stream_text[i:i + 10]
+
+    def invoke(self, prompt):
+        return self.regenerated
+
+
+def _make_chain(llm) -> RAGChain:
+    """LLM/검색 없이 query_events 흐름만 검증하는 RAGChain"""
+    chain = RAGChain.__new__(RAGChain)
+    chain.llm = llm
+    chain.top_k = 3
+    chain.enable_file_aggregation = False
+    chain.enable_self_consistency = False
+    chain.stage_costs = StageCostTracker()
+    chain.context_packer = ContextPacker()
+    chain.chain = None
+    chain.prompt = PromptTemplate(
+        template="{chat_history}\n{context}\n{question}\n{extra_instructions}",
+        input_variables=["chat_history", "context", "question", "extra_instructions"]
+    )
+    chain._compiled_chains = {"base": (chain.prompt, chain.chain)}
+    doc = Document(page_content="배터리 용량은 5000mAh 입니다", metadata={"file_name": "spec.pdf", "page_number": 3})
+    chain._last_retrieved_docs = [(doc, 0.9)]
+    chain._get_context = lambda question, history, mode: "배터리 용량은 5000mAh 입니다"
+    chain._generate_source_citations = lambda answer, docs: answer
+    return chain
+
+
+def test_query_events_streams_tokens_then_final():
+    answer = "spec.pdf 3페이지 문서에 따르면 배터리 용량은 5000mAh 입니다. 구체적인 수치가 명시되어 있습니다."
+    chain = _make_chain(_FakeLLM(answer, "unused"))
+
+    events = list(chain.query_events("배터리 용량은?"))
+
+    tokens = "".join(e["text"] for e in events if e["type"] == "token")
+    assert tokens == answer
+    assert not [e for e in events if e["type"] == "replace"]
+    assert events[-1]["type"] == "final"
+    assert events[-1]["result"]["answer"] == answer
+    assert events[-1]["result"]["success"] is True
+
+
+def test_query_events_aborts_on_forbidden_phrase_and_replaces():
+    bad = "해당 정보를 찾을 수 없습니다. " + "관련 없는 내용이 길게 이어집니다. " * 20
+    fixed = "spec.pdf p.3 문서에 따르면 배터리 용량은 5000mAh 입니다."
+    llm = _FakeLLM(bad, fixed)
+    chain = _make_chain(llm)
+
+    events = list(chain.query_events("배터리 용량은?"))
+
+    replace = [e for e in events if e["type"] == "replace"]
+    assert replace and replace[0]["answer"] == fixed
+    assert replace[0]["reason"] == "verification_failed"
+    # 금지 구문 감지 후 첫 생성은 끝까지 소비하지 않음
+    assert llm.stream_consumed < len(bad)
+    assert events[-1]["result"]["answer"] == fixed
+    assert events[-1]["result"]["stream_aborted_early"] is True
+
+
+if __name__ == "__main__":
+    test_query_events_streams_tokens_then_final()
+    test_query_events_aborts_on_forbidden_phrase_and_replaces()
+    print("[OK] query_events 테스트 통과")
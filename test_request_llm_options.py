@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+LLM 클라이언트 옵션 전달 단위 테스트
+keep_alive/num_ctx/options가 Ollama 요청과 OllamaLLM에 그대로 전달되는지 검증
+"""
+
+from utils.rag_chain import RAGChain
+from utils.request_llm import RequestLLM
+
+
+def _make_request_llm(**kwargs) -> RequestLLM:
+    original = RequestLLM._validate_connection
+    RequestLLM._validate_connection = lambda self: None
+    try:
+        return RequestLLM(base_url="http://localhost:11434", model="gemma3:4b", **kwargs)
+    finally:
+        RequestLLM._validate_connection = original
+
+
+def test_ollama_payload_includes_keep_alive_and_options():
+    llm = _make_request_llm(num_ctx=8192, keep_alive="30m", options={"top_p": 0.9, "num_predict": 64})
+    payload = llm._ollama_payload("prompt", stream=True)
+
+    assert payload["keep_alive"] == "30m"
+    assert payload["stream"] is True
+    assert payload["options"]["num_ctx"] == 8192
+    assert payload["options"]["top_p"] == 0.9
+    # options가 기본 옵션보다 우선
+    assert payload["options"]["num_predict"] == 64
+
+
+def test_ollama_payload_omits_keep_alive_by_default():
+    llm = _make_request_llm()
+    payload = llm._ollama_payload("prompt", stream=False)
+    assert "keep_alive" not in payload
+    assert payload["options"]["num_ctx"] == 2048
+
+
+def test_create_llm_passes_settings_to_ollama_client():
+    chain = RAGChain.__new__(RAGChain)
+    chain.llm_api_type = "ollama"
+    chain.llm_base_url = "http://localhost:11434"
+    chain.llm_model = "gemma3:4b"
+    chain.llm_api_key = ""
+    chain.temperature = 0.3
+    chain.max_tokens = 1024
+    chain.llm_num_ctx = 8192
+    chain.llm_keep_alive = "30m"
+    chain.llm_options = {"top_p": 0.9, "num_ctx": 4096, "unknown_option": 1}
+
+    llm = chain._create_llm()
+    assert llm.num_ctx == 8192  # llm_num_ctx가 options보다 우선
+    assert llm.keep_alive == "30m"
+    assert llm.top_p == 0.9
+    assert llm.num_predict == 1024
+
+
+if __name__ == "__main__":
+    test_ollama_payload_includes_keep_alive_and_options()
+    test_ollama_payload_omits_keep_alive_by_default()
+    test_create_llm_passes_settings_to_ollama_client()
+    print("[OK] LLM 옵션 전달 테스트 통과")
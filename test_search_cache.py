@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+검색 결과 캐시 단위 테스트
+search_with_mode 반복 호출 재사용, 인자/코퍼스 버전별 분리, 복사본 반환을 검증
+"""
+
+from langchain.schema import Document
+
+from utils.search_cache import SearchResultCache
+from utils.vector_store import VectorStoreManager
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.size = 10
+
+    def count(self):
+        return self.size
+
+
+class _FakeChroma:
+    def __init__(self):
+        self._collection = _FakeCollection()
+
+
+def _make_manager() -> VectorStoreManager:
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager.vectorstore = _FakeChroma()
+    manager.shared_vectorstore = None
+    manager.shared_db_enabled = False
+    manager.cascade_prefilter = None
+    manager._corpus_versions = {"personal": 0, "shared": 0}
+    manager.search_cache = SearchResultCache(max_entries=4)
+    manager.calls = 0
+
+    def fake_search(query, search_mode, initial_k, top_k, use_reranker, reranker_model):
+        manager.calls += 1
+        return [(Document(page_content=f"{query} 결과", metadata={"file_name": "a.pdf"}), 0.9)]
+
+    manager._search_with_mode_uncached = fake_search
+    return manager
+
+
+def test_repeated_search_hits_cache():
+    manager = _make_manager()
+    first = manager.search_with_mode("kFRET 값", top_k=5)
+    second = manager.search_with_mode("kFRET 값", top_k=5)
+
+    assert manager.calls == 1
+    assert second[0][0].page_content == first[0][0].page_content
+    stats = manager.get_search_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_different_arguments_are_separate_entries():
+    manager = _make_manager()
+    manager.search_with_mode("kFRET 값", top_k=5)
+    manager.search_with_mode("kFRET 값", top_k=10)
+    manager.search_with_mode("kFRET 값", top_k=5, use_reranker=False)
+    manager.search_with_mode("kFRET 값", search_mode="personal", top_k=5)
+    assert manager.calls == 4
+
+
+def test_corpus_change_forces_new_search():
+    manager = _make_manager()
+    manager.search_with_mode("kFRET 값")
+    manager._bump_corpus_version("personal")
+    manager.search_with_mode("kFRET 값")
+    assert manager.calls == 2
+
+    # 다른 사용자가 청크를 추가한 경우 (로컬 카운터 변화 없음)
+    manager.vectorstore._collection.size += 3
+    manager.search_with_mode("kFRET 값")
+    assert manager.calls == 3
+
+
+def test_cached_documents_are_copies():
+    manager = _make_manager()
+    first = manager.search_with_mode("kFRET 값")
+    first[0][0].metadata["file_name"] = "changed.pdf"
+    second = manager.search_with_mode("kFRET 값")
+    assert second[0][0].metadata["file_name"] == "a.pdf"
+
+
+def test_lru_eviction():
+    cache = SearchResultCache(max_entries=2)
+    doc = Document(page_content="x", metadata={})
+    cache.put("a", [(doc, 1.0)])
+    cache.put("b", [(doc, 1.0)])
+    cache.get("a")
+    cache.put("c", [(doc, 1.0)])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+if __name__ == "__main__":
+    test_repeated_search_hits_cache()
+    test_different_arguments_are_separate_entries()
+    test_corpus_change_forces_new_search()
+    test_cached_documents_are_copies()
+    test_lru_eviction()
+    print("[OK] 검색 결과 캐시 테스트 통과")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+세션 후보 풀 단위 테스트
+후속 질문이 최근 턴 후보를 먼저 Re-ranking하고, 커버리지가 낮으면 전체 검색으로 폴백하는지 검증
+"""
+
+from langchain.schema import Document
+
+from utils.rag_chain import RAGChain
+from utils.session_pool import SessionCandidatePool
+
+
+class _FakeEmbeddings:
+    def __init__(self, vector):
+        self.vector = vector
+
+    def embed_query(self, text):
+        return self.vector
+
+
+class _FakeVectorStore:
+    def __init__(self):
+        self.version = 0
+        self.embeddings = _FakeEmbeddings([1.0, 0.0])
+
+    def get_corpus_version(self, search_mode="integrated"):
+        return (("personal", self.version, 10),)
+
+    def get_document_embeddings(self, docs):
+        return [doc.metadata["vec"] for doc in docs]
+
+
+class _FakeReranker:
+    def __init__(self):
+        self.calls = 0
+
+    def rerank(self, query, docs, top_k=3):
+        self.calls += 1
+        ranked = sorted(docs, key=lambda d: -d["document"].metadata["score"])
+        for d in ranked:
+            d["rerank_score"] = d["document"].metadata["score"]
+        return ranked[:top_k]
+
+
+def _doc(name, score, vec=(1.0, 0.0)):
+    return Document(page_content=f"{name} 내용", metadata={"file_name": f"{name}.pdf", "score": score, "vec": list(vec)}, id=name)
+
+
+def _joined_context(chain):
+    def build(question, pairs, rank_by_score=True):
+        chain._last_retrieved_docs = list(pairs)
+        return " | ".join(d.page_content for d, _ in pairs)
+    return build
+
+
+def _make_chain() -> RAGChain:
+    chain = RAGChain.__new__(RAGChain)
+    chain.session_pool = SessionCandidatePool(max_turns=3)
+    chain.session_pool_min_hits = 2
+    chain.session_pool_min_similarity = 0.5
+    chain._session_pool_stats = {"checked": 0, "used": 0}
+    chain.score_threshold = 0.5
+    chain.vectorstore = _FakeVectorStore()
+    chain.reranker = _FakeReranker()
+    chain._reranker_ready = lambda: True
+    chain._filter_by_category = lambda pairs, categories: pairs
+    chain._statistical_outlier_removal = lambda pairs, method='mad': pairs
+    chain._score_based_filtering = lambda pairs, question="": [p for p in pairs if p[1] >= 0.5]
+    chain._unique_by_file = lambda pairs, k: pairs[:k]
+    chain._build_context = _joined_context(chain)
+    chain._last_retrieved_docs = []
+    return chain
+
+
+HISTORY = [{"role": "user", "content": "이전 질문"}, {"role": "assistant", "content": "이전 답변"}]
+
+
+def _first_turn(chain, docs):
+    # 새 대화: 풀 미사용 → 전체 검색 결과를 풀에 기록
+    assert chain._get_context_from_session_pool("첫 질문", [], "integrated", "general", []) is None
+    chain._remember_candidates([(d, d.metadata["score"]) for d in docs])
+
+
+def test_follow_up_uses_pool_when_covered():
+    chain = _make_chain()
+    _first_turn(chain, [_doc("a", 0.9), _doc("b", 0.7), _doc("c", 0.1)])
+
+    context = chain._get_context_from_session_pool("후속 질문", HISTORY, "integrated", "general", [])
+    assert context == "a 내용 | b 내용"
+    assert chain.reranker.calls == 1
+    assert [d.id for d, _ in chain._last_retrieved_docs] == ["a", "b"]
+    assert chain.get_session_pool_stats()["used"] == 1
+
+
+def test_low_similarity_skips_rerank():
+    chain = _make_chain()
+    _first_turn(chain, [_doc("a", 0.9, vec=(0.0, 1.0)), _doc("b", 0.8, vec=(0.0, 1.0))])
+
+    assert chain._get_context_from_session_pool("다른 주제", HISTORY, "integrated", "general", []) is None
+    assert chain.reranker.calls == 0
+
+
+def test_low_coverage_falls_back():
+    chain = _make_chain()
+    _first_turn(chain, [_doc("a", 0.9), _doc("b", 0.2), _doc("c", 0.1)])
+
+    assert chain._get_context_from_session_pool("후속 질문", HISTORY, "integrated", "general", []) is None
+    assert chain.get_session_pool_stats()["checked"] == 1
+    assert chain.get_session_pool_stats()["used"] == 0
+
+
+def test_new_conversation_or_corpus_change_resets_pool():
+    chain = _make_chain()
+    _first_turn(chain, [_doc("a", 0.9), _doc("b", 0.7)])
+
+    chain.vectorstore.version += 1
+    assert chain._get_context_from_session_pool("후속 질문", HISTORY, "integrated", "general", []) is None
+    assert chain.reranker.calls == 0
+
+    chain._remember_candidates([(_doc("a", 0.9), 0.9)])
+    chain.clear_memory()
+    assert len(chain.session_pool) == 0
+
+
+def test_loaded_conversation_does_not_reuse_previous_candidates():
+    chain = _make_chain()
+    _first_turn(chain, [_doc("a", 0.9), _doc("b", 0.7)])
+
+    # 저장된 다른 대화 불러오기 (MainWindow/app.py가 clear_memory 호출) → 이력이 있어도 전체 검색
+    chain.clear_memory()
+    assert chain._get_context_from_session_pool("불러온 대화의 후속 질문", HISTORY, "integrated", "general", []) is None
+    assert chain.reranker.calls == 0
+
+
+def test_pool_keeps_recent_turns_only():
+    pool = SessionCandidatePool(max_turns=2)
+    for name in ("a", "b", "c"):
+        pool.begin_turn()
+        pool.add([(_doc(name, 0.9), 0.9)])
+    assert [d.id for d in pool.candidates()] == ["c", "b"]
+
+
+if __name__ == "__main__":
+    test_follow_up_uses_pool_when_covered()
+    test_low_similarity_skips_rerank()
+    test_low_coverage_falls_back()
+    test_new_conversation_or_corpus_change_resets_pool()
+    test_loaded_conversation_does_not_reuse_previous_candidates()
+    test_pool_keeps_recent_turns_only()
+    print("[OK] 세션 후보 풀 테스트 통과")
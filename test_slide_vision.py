@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+PPTX Vision 분석 단위 테스트
+슬라이드 이미지 축소/JPEG 변환, 동시 요청 수 제한, 분석 결과 캐시를 검증 (Vision API 호출은 가짜)
+"""
+
+import base64
+import io
+import os
+import tempfile
+import threading
+import time
+
+from PIL import Image
+from pptx import Presentation
+
+from utils.pptx_chunking_engine import PPTXChunkingEngine
+from utils.slide_vision import VisionResultCache, prepare_vision_image
+
+
+def _png_base64(width: int, height: int) -> str:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "navy").save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_prepare_vision_image_downscales_to_jpeg():
+    original = _png_base64(1920, 1080)
+    prepared, mime = prepare_vision_image(original, max_side=960, jpeg_quality=80)
+
+    img = Image.open(io.BytesIO(base64.b64decode(prepared)))
+    assert mime == "image/jpeg" and img.format == "JPEG"
+    assert img.size == (960, 540)
+    # 0/0이면 원본 그대로
+    assert prepare_vision_image(original, max_side=0, jpeg_quality=0) == (original, "image/png")
+
+
+class _FakeVisionEngine(PPTXChunkingEngine):
+    """Vision API 호출 대신 지연 후 고정 설명을 반환하며 동시 요청 수를 기록"""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _analyze_slide_with_vision(self, slide, slide_index, llm_api_type, llm_base_url, llm_model,
+                                   llm_api_key, slide_img_base64=None, image_mime="image/png"):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append((slide_index, image_mime))
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return f"슬라이드 {slide_index + 1} 차트 분석"
+
+
+def _save_deck(slide_count: int) -> str:
+    prs = Presentation()
+    for index in range(1, slide_count + 1):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Quarter {index} results"
+        slide.placeholders[1].text = f"Revenue grew {index * 3}% with EQE improvements in slide {index}"
+    path = os.path.join(tempfile.mkdtemp(), "vision.pptx")
+    prs.save(path)
+    return path
+
+
+def _summaries(engine, path, options, slides=None):
+    chunks = engine.iter_pptx_chunks(path, enable_vision=True, llm_api_type="ollama",
+                                     llm_base_url="http://localhost:11434", llm_model="llava",
+                                     slides=slides, vision_options=options)
+    return [c.content for c in chunks if c.chunk_type == "slide_summary"]
+
+
+def test_vision_requests_are_concurrent_bounded_and_cached():
+    path = _save_deck(6)
+    options = {"max_concurrency": 3, "image_max_side": 640, "jpeg_quality": 80,
+               "cache_enabled": True, "cache_dir": tempfile.mkdtemp(), "vision_enabled": True, "vision_mode": "auto"}
+
+    engine = _FakeVisionEngine({"max_size": 300})
+    summaries = _summaries(engine, path, options)
+    assert len(engine.calls) == 6 and engine.max_active == 3
+    assert {mime for _, mime in engine.calls} == {"image/jpeg"}
+    # 슬라이드 순서 유지
+    assert [s.split("\n")[1] for s in summaries] == [f"슬라이드 {i} 차트 분석" for i in range(1, 7)]
+
+    # 같은 슬라이드 재업로드: Vision API 호출 없이 캐시 사용
+    cached_engine = _FakeVisionEngine({"max_size": 300})
+    assert _summaries(cached_engine, path, options) == summaries
+    assert cached_engine.calls == []
+
+    # 모델/서버/비전 모드가 바뀌면 캐시 키가 달라짐
+    base = ("img", "ollama", "http://a:11434", "llava", "auto", "p", 640, 80)
+    assert VisionResultCache.make_key(*base) != VisionResultCache.make_key(*base[:3], "qwen2-vl", *base[4:])
+    assert VisionResultCache.make_key(*base) != VisionResultCache.make_key(*base[:2], "http://b:11434", *base[3:])
+    assert VisionResultCache.make_key(*base) != VisionResultCache.make_key(*base[:4], "openai-compatible", *base[5:])
+
+
+def test_text_only_requests_are_not_cached():
+    path = _save_deck(2)
+    cache_dir = tempfile.mkdtemp()
+    options = {"cache_enabled": True, "cache_dir": cache_dir, "vision_enabled": False, "vision_mode": "auto"}
+    engine = _FakeVisionEngine({"max_size": 300})
+    _summaries(engine, path, options)
+    assert len(engine.calls) == 2 and os.listdir(cache_dir) == []
+
+    # 이후 비전을 켜면 텍스트 전용 결과가 아닌 실제 이미지 분석 요청
+    engine = _FakeVisionEngine({"max_size": 300})
+    _summaries(engine, path, {**options, "vision_enabled": True})
+    assert len(engine.calls) == 2 and os.listdir(cache_dir)
+
+
+def test_vision_only_for_requested_slides():
+    path = _save_deck(4)
+    engine = _FakeVisionEngine({"max_size": 300})
+    summaries = _summaries(engine, path, {"cache_enabled": False}, slides={2, 4})
+    assert sorted(index for index, _ in engine.calls) == [1, 3]
+    assert len(summaries) == 2
+
+
+if __name__ == "__main__":
+    test_prepare_vision_image_downscales_to_jpeg()
+    test_vision_requests_are_concurrent_bounded_and_cached()
+    test_text_only_requests_are_not_cached()
+    test_vision_only_for_requested_slides()
+    print("[OK] PPTX Vision 분석 테스트 통과")
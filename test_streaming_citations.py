@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+스트리밍 Citation 단위 테스트
+토큰 단위로 흘려보내도 문장 뒤에 출처가 인라인으로 붙는지 검증
+"""
+
+import threading
+
+from langchain.prompts import PromptTemplate
+from langchain.schema import Document
+
+from utils.rag_chain import RAGChain
+from utils.streaming_citations import StreamingCitationProcessor
+
+
+class _FakeEmbeddings:
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        vectors = []
+        for text in texts:
+            if "apple" in text:
+                vectors.append([1.0, 0.0, 0.0])
+            elif "banana" in text:
+                vectors.append([0.0, 1.0, 0.0])
+            else:
+                vectors.append([0.0, 0.0, 1.0])
+        return vectors
+
+
+class _FakeVectorManager:
+    def __init__(self):
+        self.embeddings = _FakeEmbeddings()
+
+
+def _make_chain() -> RAGChain:
+    chain = RAGChain.__new__(RAGChain)
+    chain.vectorstore = _FakeVectorManager()
+    return chain
+
+
+def _stream(processor, text, size=3):
+    out = []
+    for i in range(0, len(text), size):
+        out.extend(processor.feed(text[i:i + size]))
+    out.extend(processor.flush())
+    return "".join(out)
+
+
+def test_streaming_citations_inline_and_preserve_layout():
+    chain = _make_chain()
+    sources = [
+        Document(page_content="apple report", metadata={"file_name": "Apple.pdf", "page_number": 1}),
+        Document(page_content="banana report", metadata={"file_name": "Banana.pdf", "page_number": 2}),
+    ]
+    processor = StreamingCitationProcessor(chain, sources)
+
+    text = "The apple is red and tasty.\n\nDr. Kim says the banana is yellow! Ok. Final unrelated sentence"
+    result = _stream(processor, text)
+
+    assert result == (
+        "The apple is red and tasty. [Apple, p.1]\n\n"
+        "Dr. Kim says the banana is yellow! [Banana, p.2] Ok. Final unrelated sentence"
+    )
+    assert processor.citation_count == 2
+    # 출처 임베딩은 1회만
+    assert chain.vectorstore.embeddings.batches[0] == ["apple report", "banana report"]
+
+
+def test_streaming_without_boundaries_passes_text_through():
+    chain = _make_chain()
+    processor = StreamingCitationProcessor(chain, [Document(page_content="apple", metadata={})])
+
+    assert "".join(processor.feed("짧은")) == "짧은"
+    assert "".join(processor.flush()) == ""
+
+
+class _FailingLLM:
+    """문장 몇 개를 흘려보낸 뒤 연결 오류를 내는 LLM"""
+
+    def stream(self, prompt):
+        for _ in range(3):
+            yield "The apple is red and tasty. "
+        raise ConnectionError("LLM 연결 끊김")
+
+
+def _stream_cite_threads():
+    return [t for t in threading.enumerate() if t.name.startswith("stream-cite")]
+
+
+def test_stream_error_stops_matching_thread():
+    chain = _make_chain()
+    chain.llm = _FailingLLM()
+    chain.enable_streaming_citations = True
+    prompt = PromptTemplate(template="{chat_history}{context}{question}{extra_instructions}",
+                            input_variables=["chat_history", "context", "question", "extra_instructions"])
+    chain._compiled_chains = {"base": (prompt, None)}
+    chain._get_context = lambda question, history, mode: "apple report"
+    chain._last_retrieved_docs = [(Document(page_content="apple report",
+                                            metadata={"file_name": "Apple.pdf", "page_number": 1}), 0.9)]
+
+    stream = chain.query_stream("apple?")
+    for text in stream:
+        if text.startswith("오류가 발생했습니다"):
+            break
+    # 오류 메시지를 내보낸 시점(제너레이터는 아직 살아 있음)에 매칭 스레드는 이미 정리됨
+    for thread in _stream_cite_threads():
+        thread.join(timeout=2)
+    assert not _stream_cite_threads()
+    stream.close()
+
+
+if __name__ == "__main__":
+    test_streaming_citations_inline_and_preserve_layout()
+    test_streaming_without_boundaries_passes_text_through()
+    test_stream_error_stops_matching_thread()
+    print("[OK] 스트리밍 Citation 테스트 통과")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+스트리밍 청크 파이프라인 단위 테스트
+엔진/DocumentProcessor가 페이지 단위로 청크를 생성하고, 수집 파이프라인이 배치 단위로 기록하며
+파일 도중 실패 시 부분 기록을 정리하는지 검증
+"""
+
+import os
+import tempfile
+import threading
+
+import fitz
+from langchain.schema import Document
+
+from utils.document_processor import DocumentProcessor
+from utils.ingestion_pipeline import IngestionPipeline
+from utils.pdf_chunking_engine import PDFChunkingEngine
+
+
+def _make_pdf(page_count: int) -> str:
+    doc = fitz.open()
+    for page_num in range(1, page_count + 1):
+        page = doc.new_page()
+        for line in range(10):
+            page.insert_text((72, 72 + line * 14),
+                             f"Page {page_num} line {line} explains the exciton diffusion length measurement", fontsize=10)
+    path = os.path.join(tempfile.mkdtemp(), "stream.pdf")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_pdf_engine_yields_page_by_page():
+    path = _make_pdf(5)
+    config = {"max_size": 300, "overlap_size": 30, "min_chunk_size": 10, "min_word_count": 2,
+              "parallel_page_workers": 1}
+    engine = PDFChunkingEngine(config)
+    chunks = engine.iter_pdf_chunks(path)
+    first = next(chunks)
+    # 첫 청크를 받은 시점에는 1페이지만 분석됨
+    assert first.metadata.page_number == 1
+    assert engine.last_table_stats["pages_screened"] == 1
+    rest = list(chunks)
+    assert engine.last_table_stats["pages_screened"] == 5
+
+    expected = PDFChunkingEngine(config).process_pdf_document(path)
+    assert [(c.chunk_type, c.content, c.metadata.page_number) for c in [first] + rest] == \
+           [(c.chunk_type, c.content, c.metadata.page_number) for c in expected]
+
+
+def test_processor_batches_match_process_document():
+    path = _make_pdf(6)
+    processor = DocumentProcessor(chunk_size=200, chunk_overlap=20, enable_advanced_pdf_chunking=False,
+                                  enable_advanced_pptx_chunking=False)
+    batches = list(processor.iter_documents(path, "stream.pdf", "pdf", batch_size=5))
+    chunks = processor.process_document(path, "stream.pdf", "pdf")
+
+    assert all(len(batch) <= 5 for batch in batches)
+    streamed = [doc for batch in batches for doc in batch]
+    assert [d.page_content for d in streamed] == [d.page_content for d in chunks]
+    assert [d.metadata["chunk_index"] for d in streamed] == list(range(len(chunks)))
+    assert [d.metadata["page_number"] for d in streamed] == [d.metadata["page_number"] for d in chunks]
+    assert "total_chunks" not in streamed[0].metadata
+    assert chunks[0].metadata["total_chunks"] == len(chunks)
+
+
+class _StreamingProcessor:
+    def __init__(self, batches, fail_after=None):
+        self.llm_client = None
+        self.batches = batches
+        self.fail_after = fail_after
+        self.produced = 0
+
+    def iter_documents(self, file_path, file_name, file_type, batch_size=64, pages=None):
+        for index in range(self.batches):
+            if index == self.fail_after:
+                raise ValueError("페이지 파싱 실패")
+            self.produced += 1
+            yield [Document(page_content=f"{file_name}-{index}-{i}", metadata={"file_name": file_name})
+                   for i in range(batch_size)]
+
+
+class _RecordingVectorManager:
+    def __init__(self, processor):
+        self.processor = processor
+        self.embeddings = self
+        self.rebuild_flags = []
+        self.stored_ids = []
+        self.deleted_ids = []
+        self.max_backlog = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0] for _ in texts]
+
+    def add_documents(self, documents, target_db="personal", embeddings=None, rebuild_bm25=True):
+        self.rebuild_flags.append(rebuild_bm25)
+        self.stored_ids.extend(doc.id for doc in documents)
+        # 파싱된 배치 중 아직 기록되지 않은 배치 수 (큐 크기로 제한되어야 함)
+        self.max_backlog = max(self.max_backlog, self.processor.produced - len(self.rebuild_flags))
+        return True
+
+    def rebuild_bm25_index(self, target_db="personal"):
+        self.rebuild_flags.append("rebuild")
+
+    def delete_documents_by_ids(self, chunk_ids, target_db="personal"):
+        self.deleted_ids.extend(chunk_ids)
+        return True
+
+
+def _run(processor, manager, queue_size=1):
+    done = []
+    pipeline = IngestionPipeline(processor, manager, parse_workers=1, embed_workers=2,
+                                 embed_batch_size=4, queue_size=queue_size, use_processes=False)
+    summary = pipeline.run([("/tmp/big.pdf", "big.pdf", "pdf")],
+                           on_file_done=lambda name, ok, error, count: done.append((ok, error, count)))
+    return summary, done
+
+
+def test_pipeline_streams_batches_with_bounded_backlog():
+    processor = _StreamingProcessor(batches=30)
+    manager = _RecordingVectorManager(processor)
+    summary, done = _run(processor, manager)
+
+    assert done == [(True, None, 120)]
+    assert summary["chunks"] == 120 and len(set(manager.stored_ids)) == 120
+    # BM25는 마지막에 한 번만 재구축
+    assert manager.rebuild_flags.count(True) == 0 and manager.rebuild_flags[-1] == "rebuild"
+    # 파서가 파일 끝까지 앞서 달리지 않음 (parsed_q + write_q + 처리 중 배치)
+    assert manager.max_backlog <= 5
+
+
+def test_failure_mid_file_removes_partial_writes():
+    processor = _StreamingProcessor(batches=10, fail_after=3)
+    manager = _RecordingVectorManager(processor)
+    summary, done = _run(processor, manager, queue_size=4)
+
+    assert done == [(False, "페이지 파싱 실패", 0)]
+    assert summary["failed"] == {"big.pdf": "페이지 파싱 실패"}
+    assert manager.stored_ids and sorted(manager.deleted_ids) == sorted(manager.stored_ids)
+    assert "rebuild" not in manager.rebuild_flags
+
+
+if __name__ == "__main__":
+    test_pdf_engine_yields_page_by_page()
+    test_processor_batches_match_process_document()
+    test_pipeline_streams_batches_with_bounded_backlog()
+    test_failure_mid_file_removes_partial_writes()
+    print("[OK] 스트리밍 청크 파이프라인 테스트 통과")
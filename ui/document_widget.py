@@ -1,89 +1,64 @@
-from PySide6.QtCore import Qt, Signal, QObject, QThread
+from PySide6.QtCore import Qt, Signal, QObject, QThread, QTimer
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QFileDialog,
                                QListWidget, QHBoxLayout, QMessageBox, QProgressBar,
                                QApplication, QTextEdit, QCheckBox, QRadioButton, QButtonGroup, QComboBox)
 import os
-import shutil
 import sys
 import subprocess
 
+from utils.bulk_ingest import embedded_documents_dir, file_type_from_name, save_embedded_copy
+from utils.ingestion_pipeline import IngestionPipeline
+from utils.ingestion_journal import IngestionJournal, default_journal_path
+
 
 class UploadWorker(QObject):
     progress = Signal(int)
     message = Signal(str)
     finished = Signal()
 
-    def __init__(self, file_paths, document_processor, vector_manager, target_db="personal"):
+    def __init__(self, file_paths, document_processor, vector_manager, target_db="personal", ingestion_config=None):
         super().__init__()
         self.file_paths = file_paths
         self.document_processor = document_processor
         self.vector_manager = vector_manager
         self.target_db = target_db
+        self.ingestion_config = ingestion_config or {}
 
     def run(self):
         total = len(self.file_paths) or 1
+        done_count = 0
         try:
             db_name = "공유 DB" if self.target_db == "shared" else "개인 DB"
-            self.message.emit(f"업로드 시작 ({db_name})")
-            for idx, file_path in enumerate(self.file_paths, 1):
+            self.message.emit(f"업로드 시작 ({db_name}, {len(self.file_paths)}개 파일)")
+
+            jobs = []
+            for file_path in self.file_paths:
                 file_name = file_path.split('/')[-1].split('\\')[-1]
-                self.message.emit(f"업로드 중: {file_name} ({idx}/{total})")
-                try:
-                    # 원본 파일을 DB별 embedded_documents에 저장
-                    self._save_embedded_file(file_path, file_name, self.target_db, self.vector_manager)
-
-                    file_type = self._ext_to_type(file_name)
-                    self.message.emit(f"문서 처리: {file_name} ...")
-                    chunks = self.document_processor.process_document(
-                        file_path=file_path, file_name=file_name, file_type=file_type
-                    )
-                    self.message.emit(f"임베딩 추가: {file_name} (청크 {len(chunks)}개) → {db_name}")
-                    self.vector_manager.add_documents(chunks, target_db=self.target_db)
-                    self.message.emit(f"✅ 완료: {file_name}")
-                except Exception as e:
-                    error_msg = str(e)
+                # 원본 파일을 DB별 embedded_documents에 저장
+                save_embedded_copy(file_path, file_name, self.vector_manager, self.target_db)
+                jobs.append((file_path, file_name, file_type_from_name(file_name)))
+
+            def on_file_done(file_name, ok, error, chunk_count):
+                nonlocal done_count
+                done_count += 1
+                if ok:
+                    self.message.emit(f"✅ 완료: {file_name} (청크 {chunk_count}개 → {db_name}, {done_count}/{total})")
+                else:
                     self.message.emit(f"❌ 오류: {file_name}")
                     # 에러 메시지가 여러 줄이면 각 줄을 표시
-                    for line in error_msg.split('\n'):
+                    for line in (error or "").split('\n'):
                         if line.strip():
                             self.message.emit(f"   {line}")
-                self.progress.emit(int(idx * 100 / total))
+                self.progress.emit(int(done_count * 100 / total))
+
+            # 파싱(프로세스 풀) → 임베딩(스레드 풀) → 기록(단일 writer) 병렬 처리
+            pipeline = IngestionPipeline.from_config(self.document_processor, self.vector_manager, self.ingestion_config)
+            pipeline.run(jobs, target_db=self.target_db, on_message=self.message.emit, on_file_done=on_file_done)
+        except Exception as e:
+            self.message.emit(f"❌ 업로드 중단: {e}")
         finally:
             self.message.emit("업로드 완료")
             self.finished.emit()
-    
-    def _save_embedded_file(self, file_path: str, file_name: str, target_db: str, vector_manager) -> None:
-        """임베딩된 파일을 DB별 embedded_documents 폴더에 저장"""
-        try:
-            # DB별 embedded_documents 경로 결정
-            if target_db == "shared" and vector_manager.shared_db_enabled:
-                # 공유 DB: [공유DB경로]/../embedded_documents
-                shared_base = os.path.dirname(vector_manager.shared_db_path)  # .../data/chroma_db → .../data
-                embedded_dir = os.path.join(shared_base, "embedded_documents")
-            else:
-                # 개인 DB: data/embedded_documents
-                embedded_dir = "data/embedded_documents"
-
-            os.makedirs(embedded_dir, exist_ok=True)
-
-            dest_path = os.path.join(embedded_dir, file_name)
-            shutil.copy2(file_path, dest_path)  # copy2: 메타데이터 보존
-        except Exception as e:
-            # 파일 복사 실패해도 계속 진행
-            print(f"[DocumentWidget][WARN] 원본 파일 저장 실패 ({file_name}): {e}")
-            pass
-
-    def _ext_to_type(self, file_name: str) -> str:
-        ext = file_name.lower().split('.')[-1]
-        if ext == 'pdf':
-            return 'pdf'
-        if ext == 'pptx':
-            return 'pptx'
-        if ext in ('xlsx', 'xls'):
-            return 'xlsx'
-        if ext == 'txt':
-            return 'txt'
-        return 'unknown'
 
 
 class DocumentWidget(QWidget):
@@ -101,6 +76,48 @@ class DocumentWidget(QWidget):
         self.refresh_list()
         self._thread: QThread | None = None
         self._worker: UploadWorker | None = None
+        QTimer.singleShot(0, self._offer_resume_uploads)  # 중단된 업로드 재개 안내
+
+    def _offer_resume_uploads(self) -> None:
+        """저널에 남은 중단/실패 업로드를 이어서 처리할지 확인"""
+        if not self.vector_manager:
+            return
+        try:
+            journal = IngestionJournal(default_journal_path(self.vector_manager.persist_directory))
+            entries = journal.unfinished()
+        except Exception as e:
+            print(f"[DocumentWidget][WARN] 업로드 저널 확인 실패: {e}")
+            return
+
+        by_db = {}
+        for entry in entries:
+            if entry["target_db"] == "shared" and not self.vector_manager.shared_db_enabled:
+                continue
+            # 원본이 없으면 embedded_documents에 저장된 사본 사용
+            file_path = entry["file_path"]
+            if not os.path.exists(file_path):
+                file_path = self._embedded_path(entry["file_name"], entry["target_db"])
+            if os.path.exists(file_path):
+                by_db.setdefault(entry["target_db"], []).append(file_path)
+        if not by_db:
+            return
+
+        names = "\n".join(os.path.basename(p) for paths in by_db.values() for p in paths)
+        reply = QMessageBox.question(
+            self,
+            "업로드 재개",
+            f"완료되지 않은 업로드가 있습니다.\n\n{names}\n\n마지막으로 저장된 지점부터 이어서 처리하시겠습니까?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            self.log_view.append("ℹ️ 중단된 업로드는 같은 파일을 다시 추가하면 이어서 처리됩니다.")
+            return
+        # 한 번에 하나의 업로드만 실행 → 개인 DB 우선, 나머지는 다음 실행에서 안내
+        target_db = "personal" if "personal" in by_db else "shared"
+        self._start_upload(by_db[target_db], target_db=target_db)
+
+    def _embedded_path(self, file_name: str, target_db: str) -> str:
+        return os.path.join(embedded_documents_dir(self.vector_manager, target_db), file_name)
 
     def _update_shared_db_status(self) -> None:
         """공유 DB 상태 업데이트"""
@@ -269,12 +286,13 @@ class DocumentWidget(QWidget):
                 f"{vision_marker}{db_type_marker} {item['file_name']}  (chunks: {item['chunk_count']})"
             )
 
-    def _start_upload(self, file_paths):
+    def _start_upload(self, file_paths, target_db=None):
         if not file_paths:
             return
 
-        # 대상 DB 선택
-        target_db = "shared" if self.shared_db_radio.isChecked() else "personal"
+        # 대상 DB 선택 (재개 시에는 저널의 대상 DB)
+        if target_db is None:
+            target_db = "shared" if self.shared_db_radio.isChecked() else "personal"
 
         # 공유 DB 선택 시 활성화 여부 확인
         if target_db == "shared" and not self.vector_manager.shared_db_enabled:
@@ -300,7 +318,10 @@ class DocumentWidget(QWidget):
 
         # QThread 시작
         self._thread = QThread(self)
-        self._worker = UploadWorker(file_paths, self.document_processor, self.vector_manager, target_db=target_db)
+        self._worker = UploadWorker(
+            file_paths, self.document_processor, self.vector_manager,
+            target_db=target_db, ingestion_config=config_manager.get_all()
+        )
         self._worker.moveToThread(self._thread)
         self._thread.started.connect(self._worker.run)
         self._worker.progress.connect(self.progress.setValue)
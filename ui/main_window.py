@@ -203,12 +203,18 @@ class MainWindow(QMainWindow):
         # 새로운 세션 ID 생성
         import time
         self.session_id = f"session_{int(time.time() * 1000)}"
+        self._reset_rag_session()
         
         # 이력 목록 새로고침
         self._reload_history_sidebar()
         
         self.statusBar().showMessage("새로운 대화를 시작했습니다", 2000)
     
+    def _reset_rag_session(self) -> None:
+        """대화 전환 시 이전 대화의 검색 후보 풀 폐기 (다른 대화 후보 재사용 방지)"""
+        if self.rag_chain is not None:
+            self.rag_chain.clear_memory()
+
     def _reload_history_sidebar(self) -> None:
         self.history_list.clear()
         self._session_map = {}  # 인덱스 -> 세션 ID 매핑
@@ -264,6 +270,7 @@ class MainWindow(QMainWindow):
         
         # 현재 세션 ID 업데이트
         self.session_id = session_id
+        self._reset_rag_session()
         self.statusBar().showMessage(f"대화 내용을 불러왔습니다 ({len(history)}개 메시지)", 3000)
 
     def _delete_selected_histories(self) -> None:
@@ -0,0 +1,185 @@
+"""
+Answer Cache
+최종 query() 결과 캐시 (정규화 질문 + 검색 모드 + 설정 해시 + 코퍼스 버전 키)
+- 1단계: 정확 일치 (정규화된 질문 문자열)
+- 2단계(선택): 의미 일치 (질문 임베딩 코사인 ≥ 임계값, 같은 모드/설정/코퍼스 버전 내에서만)
+문서 추가/삭제 시 코퍼스 버전이 바뀌므로 이전 항목은 자동으로 조회되지 않고 정리됨
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import copy
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+
+import numpy as np
+
+
+_PUNCT_PATTERN = re.compile(r'[\s?？!！.。,，~]+')
+
+
+def normalize_question(question: str) -> str:
+    """캐시 키용 질문 정규화 (유니코드 NFKC, 소문자, 공백/문장부호 통일)"""
+    text = unicodedata.normalize("NFKC", question or "").lower()
+    return _PUNCT_PATTERN.sub(" ", text).strip()
+
+
+def config_hash(settings: Dict[str, Any]) -> str:
+    """답변에 영향을 주는 설정 값의 짧은 해시"""
+    payload = json.dumps(settings, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class _CacheEntry:
+    __slots__ = ("scope", "normalized", "embedding", "result", "retrieved_docs")
+
+    def __init__(self, scope: Tuple, normalized: str, embedding: Optional[np.ndarray],
+                 result: Dict[str, Any], retrieved_docs: List[Any]):
+        self.scope = scope
+        self.normalized = normalized
+        self.embedding = embedding
+        self.result = result
+        self.retrieved_docs = retrieved_docs
+
+
+class AnswerCache:
+    """LRU 답변 캐시 (정확 일치 + 선택적 의미 일치)"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        embeddings=None,
+        semantic_threshold: float = 0.97
+    ):
+        """
+        Args:
+            max_entries: 최대 보관 항목 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+            embeddings: embed_query를 가진 임베딩 모델 (None이면 의미 일치 비활성화)
+            semantic_threshold: 의미 일치로 인정할 최소 질문 임베딩 코사인 유사도
+        """
+        self.max_entries = max(1, max_entries)
+        self.embeddings = embeddings
+        self.semantic_threshold = semantic_threshold
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        self._scope_versions: Dict[Tuple, Hashable] = {}
+        self._lock = threading.Lock()
+        self._last_embedding: Optional[Tuple[str, Optional[np.ndarray]]] = None  # miss → put 재임베딩 방지
+        self.hits = {"exact": 0, "semantic": 0}
+        self.misses = 0
+
+    @staticmethod
+    def _scope(search_mode: str, config_key: str, extra_key: str) -> Tuple:
+        return (search_mode, config_key, extra_key)
+
+    def _embed(self, normalized: str) -> Optional[np.ndarray]:
+        if self.embeddings is None:
+            return None
+        last = self._last_embedding
+        if last is not None and last[0] == normalized:
+            return last[1]
+        try:
+            vec = np.asarray(self.embeddings.embed_query(normalized), dtype=np.float32)
+        except Exception as e:
+            print(f"[CACHE][WARN] 질문 임베딩 실패, 의미 일치 생략: {e}")
+            return None
+        norm = np.linalg.norm(vec)
+        unit = vec / norm if norm > 0 else None
+        self._last_embedding = (normalized, unit)
+        return unit
+
+    def _purge_stale_locked(self, scope: Tuple, corpus_version: Hashable) -> None:
+        """코퍼스 버전이 바뀐 범위의 항목 제거"""
+        if self._scope_versions.get(scope, corpus_version) == corpus_version:
+            self._scope_versions[scope] = corpus_version
+            return
+        stale = [key for key, entry in self._entries.items() if entry.scope == scope]
+        for key in stale:
+            del self._entries[key]
+        self._scope_versions[scope] = corpus_version
+        if stale:
+            print(f"[CACHE] 코퍼스 변경 감지 → {len(stale)}개 답변 무효화")
+
+    def get(
+        self,
+        question: str,
+        search_mode: str,
+        config_key: str,
+        corpus_version: Hashable,
+        extra_key: str = ""
+    ) -> Optional[Tuple[Dict[str, Any], List[Any], Dict[str, Any]]]:
+        """캐시 조회
+
+        Returns:
+            (결과 복사본, 검색 문서 복사본, {"tier": "exact"|"semantic", "similarity": float}) 또는 None
+        """
+        normalized = normalize_question(question)
+        scope = self._scope(search_mode, config_key, extra_key)
+        with self._lock:
+            self._purge_stale_locked(scope, corpus_version)
+            key = scope + (normalized,)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits["exact"] += 1
+                return copy.deepcopy(entry.result), list(entry.retrieved_docs), {"tier": "exact", "similarity": 1.0}
+            candidates = [(k, e) for k, e in self._entries.items() if e.scope == scope and e.embedding is not None]
+
+        if candidates and self.embeddings is not None:
+            query_vec = self._embed(normalized)
+            if query_vec is not None:
+                matrix = np.stack([e.embedding for _, e in candidates])
+                sims = matrix @ query_vec
+                best = int(np.argmax(sims))
+                if sims[best] >= self.semantic_threshold:
+                    best_key, entry = candidates[best]
+                    with self._lock:
+                        if best_key in self._entries:
+                            self._entries.move_to_end(best_key)
+                        self.hits["semantic"] += 1
+                    return (copy.deepcopy(entry.result), list(entry.retrieved_docs),
+                            {"tier": "semantic", "similarity": float(sims[best])})
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        question: str,
+        search_mode: str,
+        config_key: str,
+        corpus_version: Hashable,
+        result: Dict[str, Any],
+        retrieved_docs: Optional[List[Any]] = None,
+        extra_key: str = ""
+    ) -> None:
+        normalized = normalize_question(question)
+        scope = self._scope(search_mode, config_key, extra_key)
+        embedding = self._embed(normalized)
+        entry = _CacheEntry(scope, normalized, embedding, copy.deepcopy(result), list(retrieved_docs or []))
+        with self._lock:
+            self._purge_stale_locked(scope, corpus_version)
+            key = scope + (normalized,)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._scope_versions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits["exact"] + self.hits["semantic"] + self.misses
+            return {
+                "entries": len(self._entries),
+                "exact_hits": self.hits["exact"],
+                "semantic_hits": self.hits["semantic"],
+                "misses": self.misses,
+                "hit_rate": (lookups - self.misses) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,375 @@
+"""
+Bulk Ingestion
+폴더 단위 일괄 업로드 (스캔 / 감시 모드)
+- GUI 업로드와 같은 DocumentProcessor + VectorStoreManager + IngestionPipeline 경로 사용
+- 파일 내용 해시(sha256)로 중복 파일과 이미 업로드된 파일을 건너뜀
+- 처리량 보고: pages/sec, chunks/sec, embeddings/sec
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import json
+import os
+import shutil
+import threading
+import time
+
+from .ingestion_journal import file_sha256
+from .ingestion_pipeline import IngestionPipeline
+
+
+# 확장자 → 파일 타입 (GUI 업로드 목록과 동일)
+FILE_TYPES = {
+    "pdf": "pdf",
+    "pptx": "pptx",
+    "xlsx": "xlsx",
+    "xls": "xlsx",
+    "txt": "txt",
+}
+
+# 건너뜀 사유 중 다시 시도할 대상 (폴더 감시 모드에서 다음 주기 재시도)
+_READ_FAILED = "읽기 실패"
+
+
+def file_type_from_name(file_name: str) -> str:
+    """파일명 확장자로 파일 타입 결정 (미지원 확장자는 "unknown")"""
+    return FILE_TYPES.get(file_name.lower().rsplit(".", 1)[-1], "unknown")
+
+
+def embedded_documents_dir(vector_manager, target_db: str) -> str:
+    """DB별 원본 파일 보관 폴더 (공유 DB: [공유DB경로]/../embedded_documents, 개인 DB: data/embedded_documents)"""
+    if target_db == "shared" and vector_manager.shared_db_enabled:
+        return os.path.join(os.path.dirname(vector_manager.shared_db_path), "embedded_documents")
+    return "data/embedded_documents"
+
+
+def save_embedded_copy(file_path: str, file_name: str, vector_manager, target_db: str) -> None:
+    """임베딩한 원본 파일을 DB별 embedded_documents 폴더에 보관 (실패해도 업로드는 계속)"""
+    try:
+        embedded_dir = embedded_documents_dir(vector_manager, target_db)
+        os.makedirs(embedded_dir, exist_ok=True)
+        dest_path = os.path.join(embedded_dir, file_name)
+        if os.path.abspath(file_path) != os.path.abspath(dest_path):  # 저장된 사본으로 재개하는 경우 제외
+            shutil.copy2(file_path, dest_path)  # copy2: 메타데이터 보존
+    except Exception as e:
+        print(f"[BulkIngest][WARN] 원본 파일 저장 실패 ({file_name}): {e}")
+
+
+def resolve_shared_db(config: Dict[str, Any]) -> Tuple[str, bool]:
+    """공유 DB 설정 검증 → (경로, 사용 여부). 경로에 chroma.sqlite3가 없으면 사용 안 함"""
+    shared_db_enabled = config.get("shared_db_enabled", False)
+    shared_db_path = config.get("shared_db_path", "")
+
+    if shared_db_enabled and shared_db_path:
+        chroma_db_file = os.path.join(shared_db_path, "chroma.sqlite3")
+        if os.path.exists(chroma_db_file):
+            print(f"[초기화] ✓ 공유 DB 연결 성공: {shared_db_path}")
+        else:
+            print(f"[초기화] ⚠ 공유 DB 경로에 chroma.sqlite3 파일이 없습니다: {shared_db_path}")
+            print(f"[초기화] ℹ 설정 탭에서 올바른 경로를 지정하세요")
+            shared_db_enabled = False
+    elif shared_db_enabled:
+        print(f"[초기화] ⚠ 공유 DB 사용이 활성화되었지만 경로가 설정되지 않았습니다")
+        print(f"[초기화] ℹ 설정 탭에서 공유 DB 경로를 지정하세요")
+        shared_db_enabled = False
+    else:
+        print(f"[초기화] ℹ 공유 DB 사용 안 함 (개인 DB만 사용)")
+    return shared_db_path, shared_db_enabled
+
+
+def build_document_processor(config: Dict[str, Any]):
+    """설정으로 DocumentProcessor 생성 (데스크톱 앱과 동일)"""
+    from .document_processor import DocumentProcessor
+
+    return DocumentProcessor(
+        chunk_size=config.get("chunk_size", 1500),
+        chunk_overlap=config.get("chunk_overlap", 200),
+        pdf_parallel_page_workers=config.get("pdf_parallel_page_workers", 0),
+        pdf_layout_backend=config.get("pdf_layout_backend", "pymupdf"),
+    )
+
+
+def build_vector_manager(config: Dict[str, Any], shared_db_path: Optional[str] = None,
+                         shared_db_enabled: bool = False, persist_directory: str = "data/chroma_db"):
+    """설정으로 VectorStoreManager 생성 (데스크톱 앱과 동일)"""
+    from .vector_store import VectorStoreManager
+
+    return VectorStoreManager(
+        persist_directory=persist_directory,
+        embedding_api_type=config.get("embedding_api_type", "ollama"),
+        embedding_base_url=config.get("embedding_base_url", "http://localhost:11434"),
+        embedding_model=config.get("embedding_model", "nomic-embed-text"),
+        embedding_api_key=config.get("embedding_api_key", ""),
+        shared_db_path=shared_db_path if shared_db_enabled else None,
+        shared_db_enabled=shared_db_enabled,
+        distance_function=config.get("chroma_distance_function", "l2"),
+        search_cache_size=config.get("search_cache_size", 128),
+    )
+
+
+class IngestManifest:
+    """업로드 완료 파일의 내용 해시 목록 (JSON, DB별)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[BulkIngest][WARN] 매니페스트 로드 실패, 새로 작성: {e}")
+
+    @staticmethod
+    def _key(file_hash: str, target_db: str) -> str:
+        return f"{target_db}:{file_hash}"
+
+    def get(self, file_hash: str, target_db: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(self._key(file_hash, target_db))
+
+    def add(self, file_hash: str, target_db: str, file_name: str) -> None:
+        # 같은 파일의 이전 버전 해시 제거 (v1 → v2 → v1로 되돌리면 DB는 v2이므로 다시 업로드해야 함)
+        prefix = self._key("", target_db)
+        stale = [key for key, entry in self._entries.items()
+                 if key.startswith(prefix) and entry.get("file_name") == file_name]
+        for key in stale:
+            del self._entries[key]
+        self._entries[self._key(file_hash, target_db)] = {"file_name": file_name, "ingested_at": time.time()}
+
+    def remove(self, file_hash: str, target_db: str) -> None:
+        self._entries.pop(self._key(file_hash, target_db), None)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+class BulkIngestor:
+    """폴더 스캔/감시 → 해시 중복 제거 → 병렬 업로드 파이프라인"""
+
+    def __init__(
+        self,
+        document_processor,
+        vector_manager,
+        config: Dict[str, Any],
+        target_db: str = "personal",
+        manifest_path: Optional[str] = None,
+        copy_to_embedded: bool = True,
+        **pipeline_overrides
+    ):
+        """
+        Args:
+            document_processor: DocumentProcessor
+            vector_manager: VectorStoreManager
+            config: ingestion_* 설정 (IngestionPipeline.from_config)
+            target_db: 대상 DB ("personal" | "shared")
+            manifest_path: 업로드 완료 해시 목록 경로 (None = 벡터 DB 폴더 옆 ingest_manifest.json)
+            copy_to_embedded: 원본 파일을 embedded_documents에 보관 (GUI 업로드와 동일)
+            pipeline_overrides: 설정 대신 사용할 파이프라인 인자 (parse_workers, embed_workers 등)
+        """
+        self.document_processor = document_processor
+        self.vector_manager = vector_manager
+        self.config = config
+        self.target_db = target_db
+        self.copy_to_embedded = copy_to_embedded
+        self.pipeline_overrides = pipeline_overrides
+        self.manifest = IngestManifest(manifest_path or os.path.join(
+            os.path.dirname(vector_manager.persist_directory), "ingest_manifest.json"))
+        self._hash_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}  # 경로 → ((크기, 수정 시각), 해시)
+
+    # ===== 스캔 =====
+
+    @staticmethod
+    def scan(directory: str, recursive: bool = True) -> List[str]:
+        """폴더 내 지원 형식 파일 경로 (정렬, 임시/숨김 파일 제외)"""
+        paths = []
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if name.startswith((".", "~$")) or file_type_from_name(name) == "unknown":
+                    continue
+                paths.append(os.path.join(root, name))
+            if not recursive:
+                break
+        return paths
+
+    def _file_hash(self, path: str) -> str:
+        stat = os.stat(path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._hash_cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        file_hash = file_sha256(path)
+        self._hash_cache[path] = (signature, file_hash)
+        return file_hash
+
+    def _already_ingested(self, file_hash: str) -> bool:
+        entry = self.manifest.get(file_hash, self.target_db)
+        if entry is None:
+            return False
+        # GUI에서 삭제된 문서는 다시 업로드
+        if self.vector_manager.get_file_page_index(entry["file_name"], target_db=self.target_db) is None:
+            self.manifest.remove(file_hash, self.target_db)
+            return False
+        return True
+
+    def plan(self, paths: Iterable[str]) -> Tuple[List[Tuple[str, str, str]], Dict[str, str], Dict[str, str]]:
+        """업로드할 파일 선정
+
+        Returns:
+            (jobs, 파일 경로 → 해시, 건너뛴 파일 경로 → 사유)
+        """
+        jobs, hashes, skipped = [], {}, {}
+        seen_hashes: Dict[str, str] = {}
+        seen_names: Dict[str, str] = {}
+        for path in paths:
+            file_name = os.path.basename(path)
+            try:
+                file_hash = self._file_hash(path)
+            except OSError as e:
+                skipped[path] = f"{_READ_FAILED}: {e}"
+                continue
+            if file_hash in seen_hashes:
+                skipped[path] = f"내용 중복: {os.path.basename(seen_hashes[file_hash])}"
+                continue
+            if file_name in seen_names:
+                # DB는 파일명으로 문서를 구분 → 같은 이름의 다른 파일은 덮어쓰게 됨
+                skipped[path] = f"파일명 중복: {seen_names[file_name]}"
+                continue
+            seen_hashes[file_hash] = path
+            seen_names[file_name] = path
+            if self._already_ingested(file_hash):
+                skipped[path] = "이미 업로드됨"
+                continue
+            hashes[path] = file_hash
+            jobs.append((path, file_name, file_type_from_name(file_name)))
+        return jobs, hashes, skipped
+
+    # ===== 업로드 =====
+
+    def ingest_paths(self, paths: Iterable[str], on_message: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """파일 목록 업로드 후 처리량 보고 반환"""
+        emit = on_message or print
+        start = time.perf_counter()
+        jobs, hashes, skipped = self.plan(paths)
+        for path, reason in skipped.items():
+            emit(f"[SKIP] {os.path.basename(path)} ({reason})")
+
+        summary: Dict[str, Any] = {"succeeded": [], "failed": {}, "chunks": 0, "pages": 0, "embeddings": 0}
+        if jobs:
+            if self.copy_to_embedded:
+                for path, file_name, _ in jobs:
+                    save_embedded_copy(path, file_name, self.vector_manager, self.target_db)
+            pipeline = IngestionPipeline.from_config(
+                self.document_processor, self.vector_manager, self.config, **self.pipeline_overrides
+            )
+            summary = pipeline.run(jobs, target_db=self.target_db, on_message=emit)
+
+            succeeded = set(summary["succeeded"])
+            for path, file_name, _ in jobs:
+                if file_name in succeeded:
+                    self.manifest.add(hashes[path], self.target_db, file_name)
+            self.manifest.save()
+
+        # 다시 시도할 필요 없는 파일 (업로드 성공 + 읽기 실패가 아닌 건너뜀)
+        succeeded = set(summary["succeeded"])
+        done_paths = [path for path, file_name, _ in jobs if file_name in succeeded]
+        done_paths += [path for path, reason in skipped.items() if not reason.startswith(_READ_FAILED)]
+
+        elapsed = time.perf_counter() - start
+        report = {
+            "files": len(jobs),
+            "skipped": len(skipped),
+            "succeeded": len(summary["succeeded"]),
+            "failed": summary["failed"],
+            "pages": summary["pages"],
+            "chunks": summary["chunks"],
+            "embeddings": summary["embeddings"],
+            "elapsed_sec": elapsed,
+            "done_paths": done_paths,
+        }
+        for key in ("pages", "chunks", "embeddings"):
+            report[f"{key}_per_sec"] = report[key] / elapsed if elapsed > 0 else 0.0
+        return report
+
+    def ingest_directory(self, directory: str, recursive: bool = True,
+                         on_message: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """폴더 1회 스캔 업로드"""
+        return self.ingest_paths(self.scan(directory, recursive), on_message=on_message)
+
+    def watch(
+        self,
+        directory: str,
+        interval: float = 10.0,
+        recursive: bool = True,
+        stop_event: Optional[threading.Event] = None,
+        on_report: Optional[Callable[[Dict[str, Any]], None]] = None,
+        on_message: Optional[Callable[[str], None]] = None,
+        max_cycles: Optional[int] = None,
+        max_retries: int = 5
+    ) -> None:
+        """폴더 감시: 주기적으로 스캔하여 새 파일/수정된 파일 업로드
+
+        다운로드 중인 파일을 피하기 위해 크기·수정 시각이 두 번 연속 같은 파일만 처리한다.
+        실패한 파일은 1, 2, 4, ... 주기 간격으로 다시 시도하고, max_retries번 재시도해도 실패하면
+        파일이 수정될 때까지 건너뛴다.
+        수정된 파일은 해시가 바뀌므로 다시 업로드 대상이 되고, 파이프라인의 증분 업데이트가 변경 페이지만 반영한다.
+        """
+        stop_event = stop_event or threading.Event()
+        previous: Dict[str, Tuple[int, int]] = {}
+        handled: Dict[str, Tuple[int, int]] = {}
+        retries: Dict[str, Tuple[Tuple[int, int], int, int]] = {}  # 경로 → (크기/수정 시각, 실패 횟수, 다음 시도 주기)
+        cycles = 0
+        print(f"[BulkIngest] 폴더 감시 시작: {directory} ({interval:.0f}초 간격)")
+        while not stop_event.is_set():
+            current = {}
+            for path in self.scan(directory, recursive):
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                current[path] = (stat.st_size, stat.st_mtime_ns)
+            ready = [path for path, signature in current.items()
+                     if previous.get(path) == signature and handled.get(path) != signature
+                     and not (path in retries and retries[path][0] == signature and cycles < retries[path][2])]
+            if ready:
+                report = self.ingest_paths(ready, on_message=on_message)
+                done = set(report["done_paths"])
+                for path in ready:
+                    signature = current[path]
+                    if path in done:
+                        handled[path] = signature
+                        retries.pop(path, None)
+                        continue
+                    prior = retries.get(path)
+                    failures = prior[1] + 1 if prior and prior[0] == signature else 1
+                    if failures > max_retries:
+                        # 파일이 바뀔 때까지 다시 파싱하지 않음
+                        handled[path] = signature
+                        retries.pop(path, None)
+                        print(f"[BulkIngest][WARN] {os.path.basename(path)}: {failures}회 실패, 파일이 수정될 때까지 재시도 중단")
+                    else:
+                        retries[path] = (signature, failures, cycles + 2 ** (failures - 1))
+                if on_report:
+                    on_report(report)
+            previous = current
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            stop_event.wait(interval)
+        print("[BulkIngest] 폴더 감시 종료")
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """처리량 보고 문자열"""
+    lines = [
+        f"파일: 업로드 {report['succeeded']}/{report['files']}개, 건너뜀 {report['skipped']}개, "
+        f"실패 {len(report['failed'])}개 ({report['elapsed_sec']:.1f}s)",
+        f"페이지 {report['pages']}개 ({report['pages_per_sec']:.2f} pages/sec), "
+        f"청크 {report['chunks']}개 ({report['chunks_per_sec']:.2f} chunks/sec), "
+        f"임베딩 {report['embeddings']}개 ({report['embeddings_per_sec']:.2f} embeddings/sec)",
+    ]
+    lines.extend(f"  ❌ {file_name}: {error}" for file_name, error in report["failed"].items())
+    return "\n".join(lines)
@@ -0,0 +1,126 @@
+"""
+Cascade Re-ranking: Bi-Encoder Prefilter
+Cross-Encoder 호출 전에 저장된 Chroma 임베딩과의 코사인 유사도로 후보를 1차 선별
+(임베딩은 이미 디스크에 있으므로 추가 비용은 쿼리 임베딩 1회뿐)
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import time
+
+import numpy as np
+
+
+class BiEncoderPrefilter:
+    """저장된 임베딩 기반 후보 선별기 (Cross-Encoder 앞단 Cascade 단계)"""
+
+    def __init__(
+        self,
+        vector_manager,
+        min_keep: int = 20,
+        max_keep: int = 40,
+        z_cutoff: float = 0.0,
+        query_cache_size: int = 128
+    ):
+        """
+        Args:
+            vector_manager: VectorStoreManager 인스턴스 (get_document_embeddings 필요)
+            min_keep: 최소 유지 후보 수 (리콜 안전망)
+            max_keep: 최대 유지 후보 수 (Cross-Encoder 입력 상한)
+            z_cutoff: 점수 분포 기준 컷오프 (mean + z_cutoff * std 이상 유지)
+                      0.0 = 평균 이상 유지, 음수일수록 관대
+            query_cache_size: 쿼리 임베딩 캐시 크기
+        """
+        self.vector_manager = vector_manager
+        self.min_keep = max(1, min_keep)
+        self.max_keep = max(self.min_keep, max_keep)
+        self.z_cutoff = z_cutoff
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        # 마지막 실행 통계 (벤치마크/로그용)
+        self.last_stats: Dict[str, Any] = {}
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """쿼리 임베딩 (LRU 캐시)"""
+        cached = self._query_cache.get(query)
+        if cached is not None:
+            self._query_cache.move_to_end(query)
+            return cached
+
+        vector = np.asarray(self.vector_manager.embeddings.embed_query(query), dtype=np.float32)
+        self._query_cache[query] = vector
+        if len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+        return vector
+
+    def score(self, query: str, candidates: List[tuple]) -> np.ndarray:
+        """후보별 쿼리 코사인 유사도 계산 (행렬-벡터 곱 1회)
+
+        Args:
+            query: 검색 쿼리
+            candidates: (Document, score) 튜플 리스트
+
+        Returns:
+            후보 순서와 같은 코사인 유사도 배열
+        """
+        query_vec = self._embed_query(query)
+        doc_matrix = self.vector_manager.get_document_embeddings([doc for doc, _ in candidates])
+
+        doc_norms = np.linalg.norm(doc_matrix, axis=1)
+        query_norm = np.linalg.norm(query_vec)
+        denom = doc_norms * query_norm
+        denom[denom == 0] = 1.0
+        return (doc_matrix @ query_vec) / denom
+
+    def _adaptive_keep_count(self, sims: np.ndarray) -> int:
+        """점수 분포로 유지할 후보 수 결정
+
+        분포가 뾰족하면(소수 후보만 유사) 적게, 평평하면 많이 유지하고
+        [min_keep, max_keep] 범위로 제한한다.
+        """
+        threshold = float(sims.mean() + self.z_cutoff * sims.std())
+        keep = int(np.count_nonzero(sims >= threshold))
+        return max(self.min_keep, min(self.max_keep, keep))
+
+    def filter(self, query: str, candidates: List[tuple], min_keep: Optional[int] = None) -> List[tuple]:
+        """Cross-Encoder에 넘길 후보 선별
+
+        Args:
+            query: 검색 쿼리
+            candidates: (Document, score) 튜플 리스트
+            min_keep: 호출별 최소 유지 수 (None이면 기본값)
+
+        Returns:
+            선별된 (Document, score) 튜플 리스트 (원래 순서 유지)
+        """
+        floor = self.min_keep if min_keep is None else max(1, min_keep)
+        if not candidates or len(candidates) <= floor:
+            self.last_stats = {"input": len(candidates), "kept": len(candidates), "skipped": True}
+            return candidates
+
+        start = time.perf_counter()
+        try:
+            sims = self.score(query, candidates)
+        except Exception as e:
+            print(f"[CASCADE][WARN] Bi-Encoder 선별 실패: {e}, 원본 유지")
+            self.last_stats = {"input": len(candidates), "kept": len(candidates), "error": str(e)}
+            return candidates
+
+        keep = max(floor, self._adaptive_keep_count(sims))
+        if keep >= len(candidates):
+            self.last_stats = {"input": len(candidates), "kept": len(candidates), "skipped": True}
+            return candidates
+
+        kept_idx = np.sort(np.argsort(-sims, kind="stable")[:keep])
+        filtered = [candidates[i] for i in kept_idx]
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "input": len(candidates),
+            "kept": len(filtered),
+            "min_sim_kept": float(sims[kept_idx].min()),
+            "elapsed_sec": elapsed,
+        }
+        print(f"[CASCADE] Bi-Encoder 선별: {len(candidates)} → {len(filtered)}개 ({elapsed:.3f}s)")
+        return filtered
@@ -0,0 +1,131 @@
+"""
+Page / Slide Content Hash
+재업로드 시 변경된 페이지·슬라이드만 다시 청킹/임베딩하기 위한 콘텐츠 해시
+- PDF: 페이지 텍스트 + 이미지 목록 + 페이지 시작 섹션 제목 (앞 페이지에서 이어받는 청크 문맥)
+- PPTX: 슬라이드 XML + 노트 + 연결 이미지/차트 + 이전/다음 슬라이드 제목 (요약 청크 문맥)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import hashlib
+
+import fitz  # PyMuPDF
+
+
+# 페이지 단위 해시를 지원하는 파일 형식
+PAGE_HASH_TYPES = ("pdf", "pptx")
+
+
+def _digest(parts: List[bytes], salt: str) -> str:
+    hasher = hashlib.sha256(salt.encode("utf-8"))
+    for part in parts:
+        hasher.update(len(part).to_bytes(8, "little"))
+        hasher.update(part)
+    return hasher.hexdigest()[:32]
+
+
+def with_section_title(page_hash: str, section_title: Optional[str]) -> str:
+    """페이지 해시에 페이지 시작 섹션 제목을 반영 (앞 페이지 제목이 바뀌면 뒤 페이지도 재처리)"""
+    return _digest([page_hash.encode("utf-8"), (section_title or "").encode("utf-8")], "")
+
+
+def pdf_page_hashes(file_path: str, salt: str = "",
+                    section_titles: Optional[Dict[int, str]] = None) -> Dict[int, str]:
+    """PDF 페이지 번호(1부터) → 콘텐츠 해시
+
+    section_titles: 페이지 번호 → 페이지 시작 섹션 제목 (고급 청킹의 청크 문맥, 주면 해시에 반영)
+    """
+    hashes = {}
+    with fitz.open(file_path) as doc:
+        for page in doc:
+            images = repr(sorted(page.get_images(full=True))).encode("utf-8")
+            page_hash = _digest([page.get_text("text").encode("utf-8"), images], salt)
+            if section_titles is not None:
+                page_hash = with_section_title(page_hash, section_titles.get(page.number + 1))
+            hashes[page.number + 1] = page_hash
+    return hashes
+
+
+def _slide_title(slide) -> str:
+    try:
+        if slide.shapes.title is not None:
+            return slide.shapes.title.text.strip()
+    except Exception:
+        pass
+    return ""
+
+
+def pptx_slide_hashes(file_path: str, salt: str = "") -> Dict[int, str]:
+    """PPTX 슬라이드 번호(1부터) → 콘텐츠 해시"""
+    from pptx import Presentation
+
+    slides = list(Presentation(file_path).slides)
+    titles = [_slide_title(slide) for slide in slides]
+    hashes = {}
+    for index, slide in enumerate(slides):
+        parts = [slide.part.blob]
+        # 이미지/차트/노트 등 슬라이드가 참조하는 내부 파트 (rId 순서 고정)
+        for rel_id in sorted(slide.part.rels):
+            rel = slide.part.rels[rel_id]
+            if rel.is_external or rel.reltype.endswith("/slideLayout"):
+                continue
+            parts.append(rel.target_part.blob)
+        # 슬라이드 요약 청크에 이전/다음 슬라이드 제목이 들어가므로 함께 반영
+        parts.append((titles[index - 1] if index > 0 else "").encode("utf-8"))
+        parts.append((titles[index + 1] if index + 1 < len(titles) else "").encode("utf-8"))
+        hashes[index + 1] = _digest(parts, salt)
+    return hashes
+
+
+def compute_page_hashes(file_path: str, file_type: str, salt: str = "",
+                        section_titles: Optional[Dict[int, str]] = None) -> Dict[int, str]:
+    """파일 형식별 페이지/슬라이드 해시 (미지원 형식은 빈 dict)"""
+    if file_type == "pdf":
+        return pdf_page_hashes(file_path, salt, section_titles)
+    if file_type == "pptx":
+        return pptx_slide_hashes(file_path, salt)
+    return {}
+
+
+@dataclass
+class PageDiff:
+    """저장된 해시와 새 버전 해시 비교 결과 (페이지 번호 기준)"""
+    unchanged: List[int] = field(default_factory=list)
+    moved: Dict[int, int] = field(default_factory=dict)  # 기존 번호 → 새 번호 (내용 동일, 위치만 이동)
+    changed: List[int] = field(default_factory=list)     # 새 버전에서 다시 청킹할 페이지
+    removed: List[int] = field(default_factory=list)     # 기존 청크를 삭제할 페이지
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.moved or self.changed or self.removed)
+
+
+def diff_page_hashes(stored: Dict[int, Optional[str]], current: Dict[int, str]) -> PageDiff:
+    """같은 번호·같은 해시는 유지, 번호만 바뀐 페이지는 이동, 나머지는 재처리/삭제"""
+    diff = PageDiff()
+    claimed = set()  # 재사용되는 기존 페이지 번호
+    for page, page_hash in current.items():
+        if stored.get(page) == page_hash:
+            diff.unchanged.append(page)
+            claimed.add(page)
+
+    # 슬라이드 삽입/삭제로 번호만 밀린 페이지는 임베딩을 재사용
+    free_by_hash: Dict[str, List[int]] = {}
+    for page in sorted(stored):
+        if page not in claimed and stored[page]:
+            free_by_hash.setdefault(stored[page], []).append(page)
+    unchanged = set(diff.unchanged)
+    for page in sorted(current):
+        if page in unchanged:
+            continue
+        candidates = free_by_hash.get(current[page])
+        if candidates:
+            old_page = candidates.pop(0)
+            diff.moved[old_page] = page
+            claimed.add(old_page)
+        else:
+            diff.changed.append(page)
+
+    diff.unchanged.sort()
+    diff.removed = sorted(page for page in stored if page not in claimed)
+    return diff
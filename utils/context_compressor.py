@@ -0,0 +1,151 @@
+"""
+Extractive Context Compression
+생성 전에 청크를 문장 단위로 나눠 질문과의 관련도를 매기고
+상위 문장(+앞뒤 이웃 문장)만 남겨 프롬프트 크기를 줄임
+(파일/페이지 메타데이터는 그대로 유지 → Citation 영향 없음)
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import re
+import time
+
+import numpy as np
+from langchain.schema import Document
+
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+class ExtractiveCompressor:
+    """문장 단위 추출 압축기"""
+
+    def __init__(
+        self,
+        embeddings=None,
+        reranker_getter: Optional[Callable[[], Any]] = None,
+        keep_ratio: float = 0.3,
+        neighbor_window: int = 1,
+        min_sentences_per_doc: int = 1,
+        min_doc_chars: int = 300
+    ):
+        """
+        Args:
+            embeddings: embed_query/embed_documents를 가진 임베딩 모델 (Cross-Encoder 없을 때 사용)
+            reranker_getter: 준비된 CrossEncoderReranker를 반환하는 함수 (없거나 None 반환 시 임베딩 사용)
+            keep_ratio: 유지할 문자 수 비율 (0.3 ≈ 3배 이상 축소)
+            neighbor_window: 선택 문장 앞뒤로 함께 유지할 문장 수 (문맥 보존)
+            min_sentences_per_doc: 문서별 최소 유지 문장 수 (출처 보존)
+            min_doc_chars: 이보다 짧은 청크는 압축하지 않음
+        """
+        self.embeddings = embeddings
+        self.reranker_getter = reranker_getter
+        self.keep_ratio = min(max(keep_ratio, 0.05), 1.0)
+        self.neighbor_window = max(0, neighbor_window)
+        self.min_sentences_per_doc = max(0, min_sentences_per_doc)
+        self.min_doc_chars = min_doc_chars
+        self.last_stats: Dict[str, Any] = {}
+
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        return [s.strip() for s in _SENTENCE_SPLIT.split(text or "") if s and s.strip()]
+
+    def _score_sentences(self, query: str, sentences: List[str]) -> Tuple[np.ndarray, str]:
+        """문장-질문 관련도 (Cross-Encoder 우선, 없으면 배치 임베딩 코사인)"""
+        reranker = self.reranker_getter() if self.reranker_getter else None
+        if reranker is not None:
+            scores = reranker.model.predict([[query, s] for s in sentences])
+            return np.asarray(scores, dtype=np.float32), "cross_encoder"
+
+        if self.embeddings is None:
+            raise ValueError("문장 점수 계산에 사용할 Re-ranker/임베딩이 없습니다")
+        query_vec = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        sent_matrix = np.asarray(self.embeddings.embed_documents(sentences), dtype=np.float32)
+        denom = np.linalg.norm(sent_matrix, axis=1) * np.linalg.norm(query_vec)
+        denom[denom == 0] = 1.0
+        return (sent_matrix @ query_vec) / denom, "embedding"
+
+    def compress(self, query: str, docs: List[Document]) -> List[Document]:
+        """문서 리스트 압축 (순서/메타데이터 유지, 내용만 축약)"""
+        if not docs:
+            return docs
+
+        start = time.perf_counter()
+        doc_sentences = [
+            self.split_sentences(doc.page_content) if len(doc.page_content or "") >= self.min_doc_chars else []
+            for doc in docs
+        ]
+        flat: List[Tuple[int, int]] = [(d, s) for d, sents in enumerate(doc_sentences) for s in range(len(sents))]
+        if not flat:
+            return docs
+
+        try:
+            scores, scorer = self._score_sentences(query, [doc_sentences[d][s] for d, s in flat])
+        except Exception as e:
+            print(f"[COMPRESS][WARN] 문장 점수 계산 실패: {e}, 원본 유지")
+            return docs
+
+        # 전체 문장을 점수순으로 선택 (문자 수 기준 keep_ratio까지)
+        total_chars = sum(len(doc_sentences[d][s]) for d, s in flat)
+        char_budget = total_chars * self.keep_ratio
+        selected = [set() for _ in docs]
+        used_chars = 0
+
+        # 문서별 최소 문장 먼저 확보 (모든 출처가 컨텍스트에 남도록)
+        if self.min_sentences_per_doc:
+            for d in range(len(docs)):
+                idx = [i for i, (dd, _) in enumerate(flat) if dd == d]
+                for i in sorted(idx, key=lambda i: -scores[i])[:self.min_sentences_per_doc]:
+                    selected[d].add(flat[i][1])
+                    used_chars += len(doc_sentences[d][flat[i][1]])
+
+        for i in np.argsort(-scores, kind="stable"):
+            if used_chars >= char_budget:
+                break
+            d, s = flat[i]
+            if s in selected[d]:
+                continue
+            selected[d].add(s)
+            used_chars += len(doc_sentences[d][s])
+
+        compressed_docs = []
+        out_chars = 0
+        in_chars = 0
+        for d, doc in enumerate(docs):
+            in_chars += len(doc.page_content or "")
+            sentences = doc_sentences[d]
+            if not sentences:
+                compressed_docs.append(doc)
+                out_chars += len(doc.page_content or "")
+                continue
+
+            # 이웃 문장 포함 (문맥 보존)
+            keep = set()
+            for s in selected[d]:
+                keep.update(range(max(0, s - self.neighbor_window), min(len(sentences), s + self.neighbor_window + 1)))
+
+            parts = []
+            prev = -1
+            for s in sorted(keep):
+                if prev >= 0 and s != prev + 1:
+                    parts.append("…")
+                parts.append(sentences[s])
+                prev = s
+            content = " ".join(parts)
+
+            metadata = dict(doc.metadata or {})
+            metadata["compressed"] = True
+            compressed_docs.append(Document(page_content=content, metadata=metadata, id=getattr(doc, "id", None)))
+            out_chars += len(content)
+
+        elapsed = time.perf_counter() - start
+        self.last_stats = {
+            "scorer": scorer,
+            "sentences": len(flat),
+            "input_chars": in_chars,
+            "output_chars": out_chars,
+            "ratio": in_chars / out_chars if out_chars else 0.0,
+            "elapsed_sec": elapsed,
+        }
+        print(f"[COMPRESS] {in_chars} → {out_chars}자 ({self.last_stats['ratio']:.1f}배 축소, "
+              f"{scorer}, 문장 {len(flat)}개, {elapsed:.2f}s)")
+        return compressed_docs
@@ -0,0 +1,175 @@
+"""
+Token-budgeted Context Packer
+검색된 청크를 토큰 예산 안에서 점수 순으로 채워 LLM 컨텍스트 구성
+(간결한 1줄 헤더, Small-to-Large 부모/자식 중복 문장 제거, 문장 경계 절단)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+from langchain.schema import Document
+
+
+# 한글/가나/한자는 대부분의 로컬 LLM 토크나이저에서 글자당 약 1토큰
+_CJK_PATTERN = re.compile(r'[\uac00-\ud7a3\u1100-\u11ff\u3130-\u318f\u3040-\u30ff\u4e00-\u9fff]')
+_WHITESPACE_PATTERN = re.compile(r'\s')
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """로컬 토크나이저 근사 토큰 수
+
+    CJK 문자는 1자당 1토큰, 그 외 문자(공백 제외)는 약 4자당 1토큰으로 계산한다.
+    """
+    if not text:
+        return 0
+    cjk = len(_CJK_PATTERN.findall(text))
+    spaces = len(_WHITESPACE_PATTERN.findall(text))
+    other = max(0, len(text) - cjk - spaces)
+    return cjk + (other + 3) // 4
+
+
+class ContextPacker:
+    """토큰 예산 기반 컨텍스트 구성기"""
+
+    def __init__(self, max_tokens: int = 4000, min_chunk_tokens: int = 40, dedup_min_chars: int = 20):
+        """
+        Args:
+            max_tokens: 컨텍스트 전체 토큰 예산 (0 이하 = 무제한)
+            min_chunk_tokens: 예산이 이보다 적게 남으면 해당 청크는 넣지 않음
+            dedup_min_chars: 중복 판정 대상 최소 문장 길이 (표 구분선 등 짧은 줄 제외)
+        """
+        self.max_tokens = max_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+        self.dedup_min_chars = dedup_min_chars
+        self.last_stats: Dict[str, Any] = {}
+
+    @staticmethod
+    def _split_units(text: str) -> List[Tuple[str, str]]:
+        """문장/줄 단위 분리 → (문장, 뒤따르는 구분자) 리스트 (줄바꿈 보존)"""
+        units: List[Tuple[str, str]] = []
+        lines = text.strip().split("\n")
+        for line_idx, line in enumerate(lines):
+            sentences = [s for s in _SENTENCE_SPLIT.split(line) if s]
+            if not sentences:
+                if line_idx < len(lines) - 1:
+                    units.append(("", "\n"))
+                continue
+            for sent_idx, sentence in enumerate(sentences):
+                last_in_line = sent_idx == len(sentences) - 1
+                sep = ("\n" if line_idx < len(lines) - 1 else "") if last_in_line else " "
+                units.append((sentence, sep))
+        return units
+
+    def _dedup_key(self, sentence: str) -> Optional[str]:
+        normalized = " ".join(sentence.split()).lower()
+        if len(normalized) < self.dedup_min_chars:
+            return None
+        return normalized
+
+    @staticmethod
+    def _header(index: int, doc: Document) -> str:
+        metadata = doc.metadata or {}
+        parts = [f"[{index}] {metadata.get('file_name', 'Unknown')}"]
+        page = metadata.get('page_number')
+        if page is not None:
+            parts.append(f"p.{page}")
+        section = metadata.get('section_title')
+        if section:
+            parts.append(str(section)[:60])
+        return " · ".join(parts)
+
+    def pack(self, docs: List[Document], scores: Optional[List[float]] = None) -> str:
+        """컨텍스트 문자열 구성 (pack_with_indices의 문자열만 반환)"""
+        return self.pack_with_indices(docs, scores)[0]
+
+    def pack_with_indices(self, docs: List[Document],
+                          scores: Optional[List[float]] = None) -> Tuple[str, List[int]]:
+        """컨텍스트 문자열 구성 + 실제로 포함된 문서 인덱스
+
+        Args:
+            docs: 문서 리스트 (scores가 없으면 리스트 순서를 순위로 간주)
+            scores: 문서별 점수 (높을수록 우선)
+
+        Returns:
+            (컨텍스트, 포함된 입력 인덱스 리스트)
+            컨텍스트는 "[n] 파일명 · p.페이지" 헤더가 붙고 입력 순서를 유지하며,
+            n번째 헤더는 인덱스 리스트의 n번째 문서에 해당 (출처/인용 번호 매핑용)
+        """
+        if not docs:
+            self.last_stats = {"input": 0, "packed": 0, "tokens": 0}
+            return "", []
+
+        if scores is not None:
+            order = sorted(range(len(docs)), key=lambda i: -float(scores[i]))
+        else:
+            order = list(range(len(docs)))
+
+        budget = self.max_tokens if self.max_tokens and self.max_tokens > 0 else None
+        used = 0
+        seen = set()
+        packed: Dict[int, Tuple[str, bool]] = {}
+        dropped_duplicate = 0
+        dropped_budget = 0
+        truncated_count = 0
+        header_tokens = estimate_tokens(self._header(len(docs), docs[0])) + 2
+
+        for idx in order:
+            units = self._split_units(docs[idx].page_content or "")
+            # 상위 문서에 이미 포함된 문장 제거 (부모/자식 청크 중복)
+            fresh = [(s, sep) for s, sep in units if self._dedup_key(s) is None or self._dedup_key(s) not in seen]
+            if not any(s.strip() for s, _ in fresh):
+                dropped_duplicate += 1
+                continue
+
+            remaining = None if budget is None else budget - used - header_tokens
+            if remaining is not None and remaining < self.min_chunk_tokens:
+                dropped_budget += 1
+                continue
+
+            kept: List[Tuple[str, str]] = []
+            kept_tokens = 0
+            truncated = False
+            for sentence, sep in fresh:
+                sentence_tokens = estimate_tokens(sentence)
+                if remaining is not None and kept_tokens + sentence_tokens > remaining:
+                    truncated = True
+                    break
+                kept.append((sentence, sep))
+                kept_tokens += sentence_tokens
+
+            if not any(s.strip() for s, _ in kept):
+                dropped_budget += 1
+                continue
+
+            for sentence, _ in kept:
+                key = self._dedup_key(sentence)
+                if key is not None:
+                    seen.add(key)
+
+            body = "".join(s + sep for s, sep in kept).strip()
+            if truncated:
+                body += " …"
+                truncated_count += 1
+            packed[idx] = (body, truncated)
+            used += header_tokens + kept_tokens
+
+        kept_indices = sorted(packed)
+        sections = []
+        for number, idx in enumerate(kept_indices, 1):
+            sections.append(f"{self._header(number, docs[idx])}\n{packed[idx][0]}")
+
+        self.last_stats = {
+            "input": len(docs),
+            "packed": len(packed),
+            "tokens": used,
+            "budget": budget,
+            "truncated": truncated_count,
+            "dropped_duplicate": dropped_duplicate,
+            "dropped_budget": dropped_budget,
+        }
+        if dropped_duplicate or dropped_budget or truncated_count:
+            print(f"[CONTEXT] {len(packed)}/{len(docs)}개 청크, ~{used} 토큰 (예산 {budget}) | "
+                  f"중복 제외 {dropped_duplicate}, 예산 초과 {dropped_budget}, 절단 {truncated_count}")
+
+        return "\n\n".join(sections), kept_indices
@@ -1,7 +1,8 @@
 import os
 import fitz  # PyMuPDF
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import chain, islice
+from typing import List, Dict, Any, Iterator, Optional, Set
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader, UnstructuredPowerPointLoader, UnstructuredExcelLoader
@@ -14,6 +15,9 @@ from .pdf_chunking import Chunk, ChunkFactory
 from .pptx_chunking_engine import PPTXChunkingEngine
 from .pptx_chunking import PPTXChunk, PPTXChunkFactory
 
+# 페이지/슬라이드 콘텐츠 해시 (증분 재업로드)
+from .content_hash import PAGE_HASH_TYPES, compute_page_hashes, with_section_title
+
 # PDF 로딩 안정화를 위한 선택적 설정 (지원되지 않으면 조용히 건너뜀)
 try:
     if hasattr(fitz, "TOOLS") and hasattr(fitz.TOOLS, "mupdf_set_subset_fonts"):
@@ -30,12 +34,16 @@ class DocumentProcessor:
     def __init__(self, chunk_size: int = 1500, chunk_overlap: int = 200,
                  enable_advanced_pdf_chunking: bool = True,
                  enable_advanced_pptx_chunking: bool = True,
-                 llm_client=None):
+                 llm_client=None,
+                 pdf_parallel_page_workers: int = 0,
+                 pdf_layout_backend: str = "pymupdf"):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.enable_advanced_pdf_chunking = enable_advanced_pdf_chunking
         self.enable_advanced_pptx_chunking = enable_advanced_pptx_chunking
         self.llm_client = llm_client
+        self.pdf_parallel_page_workers = pdf_parallel_page_workers
+        self.pdf_layout_backend = pdf_layout_backend
         
         # 기본 텍스트 분할기
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -52,7 +60,9 @@ class DocumentProcessor:
                 "min_chunk_size": 50,  # 상용 서비스 수준: 최소 50자
                 "min_word_count": 5,   # 상용 서비스 수준: 최소 5단어
                 "enable_small_to_large": True,
-                "enable_layout_analysis": True
+                "enable_layout_analysis": True,
+                "parallel_page_workers": pdf_parallel_page_workers,  # 긴 PDF 페이지 구간 병렬 분석 (0 = CPU 수, 1 = 순차)
+                "layout_backend": pdf_layout_backend  # pymupdf: span 기반 고속 분석 (표 후보 페이지만 pdfplumber)
             }
             self.pdf_engine = PDFChunkingEngine(pdf_config)
         else:
@@ -76,110 +86,130 @@ class DocumentProcessor:
     
     def load_document(self, file_path: str, file_type: str) -> List[Document]:
         """파일 타입에 따라 문서 로드"""
+        return list(self.iter_loaded_documents(file_path, file_type))
+    
+    def iter_loaded_documents(self, file_path: str, file_type: str,
+                              pages: Optional[Set[int]] = None) -> Iterator[Document]:
+        """파일 타입에 따라 문서를 페이지/슬라이드 단위로 로드 (pages: PDF/PPTX 처리 대상 페이지 번호)"""
         try:
             if file_type == "pdf":
                 if self.enable_advanced_pdf_chunking and self.pdf_engine:
                     # 고급 PDF 청킹 사용
-                    documents = self._load_pdf_with_advanced_chunking(file_path)
+                    yield from self._iter_pdf_with_advanced_chunking(file_path, pages)
                 else:
                     # 기존 방식 사용
-                    documents = self._load_pdf_with_fitz(file_path)
+                    yield from self._iter_pdf_with_fitz(file_path, pages)
             elif file_type == "pptx":
                 if self.enable_advanced_pptx_chunking and self.pptx_engine:
                     # 고급 PPTX 청킹 사용
-                    documents = self._load_pptx_with_advanced_chunking(file_path)
+                    yield from self._iter_pptx_with_advanced_chunking(file_path, pages)
                 else:
                     # 기존 방식 사용
                     loader = UnstructuredPowerPointLoader(file_path)
-                    documents = loader.load()
+                    yield from loader.load()
             elif file_type in ["xlsx", "xls"]:
                 loader = UnstructuredExcelLoader(file_path)
-                documents = loader.load()
+                yield from loader.load()
             elif file_type == "txt":
                 # 텍스트 파일 직접 로드
                 with open(file_path, 'r', encoding='utf-8') as f:
                     content = f.read()
-                documents = [Document(page_content=content, metadata={"source": file_path})]
+                yield Document(page_content=content, metadata={"source": file_path})
             else:
                 raise ValueError(f"지원하지 않는 파일 형식: {file_type}")
-            
-            return documents
         except Exception as e:
             raise Exception(f"문서 로드 실패 ({file_path}): {str(e)}")
     
     def _load_pdf_with_advanced_chunking(self, file_path: str) -> List[Document]:
         """고급 PDF 청킹을 사용하여 PDF 로드"""
+        return list(self._iter_pdf_with_advanced_chunking(file_path))
+    
+    def _iter_pdf_with_advanced_chunking(self, file_path: str,
+                                         pages: Optional[Set[int]] = None) -> Iterator[Document]:
+        """고급 PDF 청킹을 사용하여 PDF를 페이지 순서대로 로드"""
+        emitted = 0
         try:
             print(f"고급 PDF 청킹으로 처리 중: {file_path}")
             
-            # PDF 고급 청킹 엔진으로 청크 생성
-            chunks = self.pdf_engine.process_pdf_document(file_path)
-            
-            # Chunk 객체를 LangChain Document로 변환
-            documents = []
-            for chunk in chunks:
-                # 빈 텍스트 청크 필터링
-                if not chunk.content or not chunk.content.strip():
-                    continue
-                
-                # 메타데이터 변환
-                metadata = {
-                    "source": file_path,
-                    "file_name": os.path.basename(file_path),
-                    "page_number": chunk.metadata.page_number,
-                    "chunk_id": chunk.id,
-                    "chunk_type": chunk.chunk_type,
-                    "chunk_type_weight": chunk.metadata.chunk_type_weight,
-                    "parent_chunk_id": chunk.metadata.parent_chunk_id,
-                    "section_title": chunk.metadata.section_title,
-                    # Phase 3 구조 메타데이터
-                    "heading_level": getattr(chunk.metadata, "heading_level", None),
-                    "caption_type": getattr(chunk.metadata, "caption_type", None),
-                    "section_number": getattr(chunk.metadata, "section_number", None),
-                    "font_size": chunk.metadata.font_size,
-                    "is_bold": chunk.metadata.is_bold,
-                    "word_count": chunk.metadata.word_count,
-                    "char_count": chunk.metadata.char_count,
-                    "has_code": chunk.metadata.has_code,
-                    "has_table": chunk.metadata.has_table,
-                    "has_list": chunk.metadata.has_list,
-                    "has_formula": chunk.metadata.has_formula,
-                    "language": chunk.metadata.language,
-                    "created_at": chunk.metadata.created_at,
-                    # Phase 1-3: 표 구조화 메타데이터 (None 값은 저장하지 않음)
-                    "table_id": getattr(chunk.metadata, "table_id", None) or None,
-                    "table_title": getattr(chunk.metadata, "table_title", None) or None,
-                    "row_index": getattr(chunk.metadata, "row_index", None),
-                    "col_index": getattr(chunk.metadata, "col_index", None),
-                    "cell_reference": getattr(chunk.metadata, "cell_reference", None) or None,
-                    "header_row": (",".join(getattr(chunk.metadata, "header_row", [])) if getattr(chunk.metadata, "header_row", []) and len(getattr(chunk.metadata, "header_row", [])) > 0 else None),  # ChromaDB는 리스트 미지원
-                    "is_header_row": getattr(chunk.metadata, "is_header_row", False),
-                    "item_number": getattr(chunk.metadata, "item_number", None) or None,
-                    "data_type": getattr(chunk.metadata, "data_type", None) or None,
-                    "table_row_count": getattr(chunk.metadata, "table_row_count", None),
-                    "table_col_count": getattr(chunk.metadata, "table_col_count", None)
-                }
-                
-                # 좌표 정보가 있으면 추가
-                if chunk.metadata.coordinates:
-                    metadata["coordinates"] = chunk.metadata.coordinates
-                
-                document = Document(
-                    page_content=chunk.content,
-                    metadata=metadata
-                )
-                documents.append(document)
+            # PDF 고급 청킹 엔진이 페이지 단위로 만든 청크를 바로 LangChain Document로 변환
+            for chunk in self.pdf_engine.iter_pdf_chunks(file_path, pages):
+                document = self._pdf_chunk_to_document(chunk, file_path)
+                if document is not None:
+                    emitted += 1
+                    yield document
             
-            print(f"고급 청킹 완료: {len(documents)}개 청크 생성")
-            return documents
+            print(f"고급 청킹 완료: {emitted}개 청크 생성")
             
         except Exception as e:
+            # 이미 내보낸 청크가 있으면 중복을 막기 위해 폴백하지 않고 호출자에게 전달
+            if emitted:
+                raise
             print(f"고급 PDF 청킹 실패, 기본 방식으로 폴백: {e}")
             # 폴백: 기존 방식 사용
-            return self._load_pdf_with_fitz(file_path)
+            yield from self._iter_pdf_with_fitz(file_path, pages)
+    
+    def _pdf_chunk_to_document(self, chunk: Chunk, file_path: str) -> Optional[Document]:
+        """PDF Chunk 객체를 LangChain Document로 변환 (빈 청크는 None)"""
+        # 빈 텍스트 청크 필터링
+        if not chunk.content or not chunk.content.strip():
+            return None
+        
+        # 메타데이터 변환
+        metadata = {
+            "source": file_path,
+            "file_name": os.path.basename(file_path),
+            "page_number": chunk.metadata.page_number,
+            "chunk_id": chunk.id,
+            "chunk_type": chunk.chunk_type,
+            "chunk_type_weight": chunk.metadata.chunk_type_weight,
+            "parent_chunk_id": chunk.metadata.parent_chunk_id,
+            "section_title": chunk.metadata.section_title,
+            "page_section_title": chunk.metadata.page_section_title,  # 페이지 해시용 (iter_documents에서 제거)
+            # Phase 3 구조 메타데이터
+            "heading_level": getattr(chunk.metadata, "heading_level", None),
+            "caption_type": getattr(chunk.metadata, "caption_type", None),
+            "section_number": getattr(chunk.metadata, "section_number", None),
+            "font_size": chunk.metadata.font_size,
+            "is_bold": chunk.metadata.is_bold,
+            "word_count": chunk.metadata.word_count,
+            "char_count": chunk.metadata.char_count,
+            "has_code": chunk.metadata.has_code,
+            "has_table": chunk.metadata.has_table,
+            "has_list": chunk.metadata.has_list,
+            "has_formula": chunk.metadata.has_formula,
+            "language": chunk.metadata.language,
+            "created_at": chunk.metadata.created_at,
+            # Phase 1-3: 표 구조화 메타데이터 (None 값은 저장하지 않음)
+            "table_id": getattr(chunk.metadata, "table_id", None) or None,
+            "table_title": getattr(chunk.metadata, "table_title", None) or None,
+            "row_index": getattr(chunk.metadata, "row_index", None),
+            "col_index": getattr(chunk.metadata, "col_index", None),
+            "cell_reference": getattr(chunk.metadata, "cell_reference", None) or None,
+            "header_row": (",".join(getattr(chunk.metadata, "header_row", [])) if getattr(chunk.metadata, "header_row", []) and len(getattr(chunk.metadata, "header_row", [])) > 0 else None),  # ChromaDB는 리스트 미지원
+            "is_header_row": getattr(chunk.metadata, "is_header_row", False),
+            "item_number": getattr(chunk.metadata, "item_number", None) or None,
+            "data_type": getattr(chunk.metadata, "data_type", None) or None,
+            "table_row_count": getattr(chunk.metadata, "table_row_count", None),
+            "table_col_count": getattr(chunk.metadata, "table_col_count", None)
+        }
+        
+        # 좌표 정보가 있으면 추가
+        if chunk.metadata.coordinates:
+            metadata["coordinates"] = chunk.metadata.coordinates
+        
+        return Document(
+            page_content=chunk.content,
+            metadata=metadata
+        )
     
     def _load_pptx_with_advanced_chunking(self, file_path: str) -> List[Document]:
         """고급 PPTX 청킹을 사용하여 PPTX 로드"""
+        return list(self._iter_pptx_with_advanced_chunking(file_path))
+    
+    def _iter_pptx_with_advanced_chunking(self, file_path: str,
+                                          pages: Optional[Set[int]] = None) -> Iterator[Document]:
+        """고급 PPTX 청킹을 사용하여 PPTX를 슬라이드 순서대로 로드"""
+        emitted = 0
         try:
             print(f"고급 PPTX 청킹으로 처리 중: {file_path}")
             
@@ -191,78 +221,47 @@ class DocumentProcessor:
             llm_base_url = config.get("llm_base_url", "http://localhost:11434")
             llm_model = config.get("llm_model", "gpt-4o")
             llm_api_key = config.get("llm_api_key", "")
+            vision_options = {
+                "max_concurrency": config.get("vision_max_concurrency", 4),
+                "image_max_side": config.get("vision_image_max_side", 1280),
+                "jpeg_quality": config.get("vision_jpeg_quality", 85),
+                "cache_enabled": config.get("vision_cache_enabled", True),
+            }
             
             if enable_vision:
                 print(f"  ✓ Vision 청킹 활성화: {llm_model}")
             
-            # PPTX 고급 청킹 엔진으로 청크 생성 (Vision 설정 전달)
-            chunks = self.pptx_engine.process_pptx_document(
+            # PPTX 고급 청킹 엔진이 슬라이드 단위로 만든 청크를 바로 변환 (Vision 설정 전달)
+            chunks = self.pptx_engine.iter_pptx_chunks(
                 file_path,
                 enable_vision=enable_vision,
                 llm_api_type=llm_api_type,
                 llm_base_url=llm_base_url,
                 llm_model=llm_model,
-                llm_api_key=llm_api_key
+                llm_api_key=llm_api_key,
+                slides=pages,
+                vision_options=vision_options
             )
-            
-            # PPTXChunk 객체를 LangChain Document로 변환
-            documents = []
             for chunk in chunks:
-                # 빈 텍스트 청크 필터링
-                if not chunk.content or not chunk.content.strip():
-                    continue
-                
-                # 메타데이터 변환 (Phase 1-3: 표 구조화 메타데이터 포함)
-                metadata = {
-                    "source": file_path,
-                    "file_name": os.path.basename(file_path),
-                    "slide_number": chunk.metadata.slide_number,
-                    "chunk_type": chunk.chunk_type,
-                    "chunk_type_weight": chunk.metadata.chunk_type_weight,
-                    "parent_chunk_id": chunk.metadata.parent_chunk_id,
-                    "slide_title": chunk.metadata.slide_title,
-                    "word_count": chunk.metadata.word_count,
-                    "char_count": chunk.metadata.char_count,
-                    "bullet_level": chunk.metadata.bullet_level,
-                    "has_notes": chunk.metadata.has_notes,
-                    "has_table": chunk.metadata.has_table,
-                    "shape_type": chunk.metadata.shape_type,
-                    "language": chunk.metadata.language,
-                    "created_at": chunk.metadata.created_at,
-                    # Vision 청킹 사용 여부
-                    "enable_vision_chunking": enable_vision if enable_vision else False,
-                    # Phase 1-3: 표 구조화 메타데이터 (None 값은 저장하지 않음)
-                    "table_id": chunk.metadata.table_id if chunk.metadata.table_id else None,
-                    "table_title": chunk.metadata.table_title if chunk.metadata.table_title else None,
-                    "row_index": chunk.metadata.row_index if chunk.metadata.row_index is not None else None,
-                    "col_index": chunk.metadata.col_index if chunk.metadata.col_index is not None else None,
-                    "cell_reference": chunk.metadata.cell_reference if chunk.metadata.cell_reference else None,
-                    "header_row": ",".join(chunk.metadata.header_row) if chunk.metadata.header_row and len(chunk.metadata.header_row) > 0 else None,  # ChromaDB는 리스트 미지원
-                    "is_header_row": chunk.metadata.is_header_row if chunk.metadata.is_header_row else False,
-                    "item_number": chunk.metadata.item_number if chunk.metadata.item_number else None,
-                    "data_type": chunk.metadata.data_type if chunk.metadata.data_type else None,
-                    "table_row_count": chunk.metadata.table_row_count if chunk.metadata.table_row_count is not None else None,
-                    "table_col_count": chunk.metadata.table_col_count if chunk.metadata.table_col_count is not None else None
-                }
-                
-                document = Document(
-                    page_content=chunk.content,
-                    metadata=metadata
-                )
-                documents.append(document)
+                document = self._pptx_chunk_to_document(chunk, file_path, enable_vision)
+                if document is not None:
+                    emitted += 1
+                    yield document
             
-            print(f"고급 PPTX 청킹 완료: {len(documents)}개 청크 생성")
+            print(f"고급 PPTX 청킹 완료: {emitted}개 청크 생성")
             
-            # 빈 결과인 경우 폴백 (에러 발생했을 수 있음)
-            if not documents:
+            # 빈 결과인 경우 폴백
+            if not emitted:
                 print("청크가 생성되지 않았습니다. 기본 방식으로 폴백합니다.")
                 loader = UnstructuredPowerPointLoader(file_path)
                 documents = loader.load()
                 print(f"기본 PPTX 로드 완료: {len(documents)}개 문서")
-            
-            return documents
+                yield from documents
             
         except Exception as e:
+            # 이미 내보낸 청크가 있으면 중복을 막기 위해 폴백하지 않고 호출자에게 전달
+            if emitted:
+                raise
             print(f"고급 PPTX 청킹 실패, 기본 방식으로 폴백: {e}")
             import traceback
             traceback.print_exc()
@@ -272,22 +271,76 @@ class DocumentProcessor:
                 loader = UnstructuredPowerPointLoader(file_path)
                 documents = loader.load()
                 print(f"기본 PPTX 로드 완료: {len(documents)}개 문서")
-                return documents
             except Exception as fallback_error:
                 print(f"기본 PPTX 로드도 실패: {fallback_error}")
                 import traceback
                 traceback.print_exc()
-                return []
+                return
+            yield from documents
+    
+    def _pptx_chunk_to_document(self, chunk: PPTXChunk, file_path: str, enable_vision: bool) -> Optional[Document]:
+        """PPTXChunk 객체를 LangChain Document로 변환 (빈 청크는 None)"""
+        # 빈 텍스트 청크 필터링
+        if not chunk.content or not chunk.content.strip():
+            return None
+        
+        # 메타데이터 변환 (Phase 1-3: 표 구조화 메타데이터 포함)
+        metadata = {
+            "source": file_path,
+            "file_name": os.path.basename(file_path),
+            "slide_number": chunk.metadata.slide_number,
+            "chunk_type": chunk.chunk_type,
+            "chunk_type_weight": chunk.metadata.chunk_type_weight,
+            "parent_chunk_id": chunk.metadata.parent_chunk_id,
+            "slide_title": chunk.metadata.slide_title,
+            "word_count": chunk.metadata.word_count,
+            "char_count": chunk.metadata.char_count,
+            "bullet_level": chunk.metadata.bullet_level,
+            "has_notes": chunk.metadata.has_notes,
+            "has_table": chunk.metadata.has_table,
+            "shape_type": chunk.metadata.shape_type,
+            "language": chunk.metadata.language,
+            "created_at": chunk.metadata.created_at,
+            # Vision 청킹 사용 여부
+            "enable_vision_chunking": enable_vision if enable_vision else False,
+            # Phase 1-3: 표 구조화 메타데이터 (None 값은 저장하지 않음)
+            "table_id": chunk.metadata.table_id if chunk.metadata.table_id else None,
+            "table_title": chunk.metadata.table_title if chunk.metadata.table_title else None,
+            "row_index": chunk.metadata.row_index if chunk.metadata.row_index is not None else None,
+            "col_index": chunk.metadata.col_index if chunk.metadata.col_index is not None else None,
+            "cell_reference": chunk.metadata.cell_reference if chunk.metadata.cell_reference else None,
+            "header_row": ",".join(chunk.metadata.header_row) if chunk.metadata.header_row and len(chunk.metadata.header_row) > 0 else None,  # ChromaDB는 리스트 미지원
+            "is_header_row": chunk.metadata.is_header_row if chunk.metadata.is_header_row else False,
+            "item_number": chunk.metadata.item_number if chunk.metadata.item_number else None,
+            "data_type": chunk.metadata.data_type if chunk.metadata.data_type else None,
+            "table_row_count": chunk.metadata.table_row_count if chunk.metadata.table_row_count is not None else None,
+            "table_col_count": chunk.metadata.table_col_count if chunk.metadata.table_col_count is not None else None
+        }
+        
+        return Document(
+            page_content=chunk.content,
+            metadata=metadata
+        )
     
     def _load_pdf_with_fitz(self, file_path: str) -> List[Document]:
         """PyMuPDF를 사용하여 PDF 로드 (압축 해제 한계 문제 해결)"""
+        return list(self._iter_pdf_with_fitz(file_path))
+
+    def _iter_pdf_with_fitz(self, file_path: str, pages: Optional[Set[int]] = None) -> Iterator[Document]:
+        """PyMuPDF를 사용하여 PDF를 페이지 단위로 로드"""
         try:
             doc = fitz.open(file_path)
-            documents = []
+        except Exception as e:
+            raise Exception(f"PyMuPDF PDF 로드 실패: {str(e)}")
 
+        with doc:
             for page_num in range(doc.page_count):
-                page = doc[page_num]
-                text = page.get_text()
+                if pages is not None and page_num + 1 not in pages:
+                    continue
+                try:
+                    text = doc[page_num].get_text()
+                except Exception as e:
+                    raise Exception(f"PyMuPDF PDF 로드 실패: {str(e)}")
 
                 if text.strip():  # 빈 페이지 제외
                     metadata = {
@@ -295,12 +348,7 @@ class DocumentProcessor:
                         "page": page_num + 1,
                         "total_pages": doc.page_count
                     }
-                    documents.append(Document(page_content=text, metadata=metadata))
-
-            doc.close()
-            return documents
-        except Exception as e:
-            raise Exception(f"PyMuPDF PDF 로드 실패: {str(e)}")
+                    yield Document(page_content=text, metadata=metadata)
 
     def _classify_document_category(self, documents: List[Document], file_name: str) -> str:
         """LLM을 사용하여 문서 카테고리를 자동으로 분류
@@ -385,39 +433,109 @@ class DocumentProcessor:
     
     def process_document(self, file_path: str, file_name: str, file_type: str) -> List[Document]:
         """문서를 로드하고 청크로 분할하며 메타데이터 추가"""
-        # 문서 로드
-        documents = self.load_document(file_path, file_type)
+        chunks = [chunk for batch in self.iter_documents(file_path, file_name, file_type) for chunk in batch]
 
-        # LLM 기반 카테고리 자동 분류
-        category = self._classify_document_category(documents, file_name)
+        # 전체 청크 수는 모든 배치가 끝나야 알 수 있음
+        for chunk in chunks:
+            chunk.metadata["total_chunks"] = len(chunks)
+
+        return chunks
+
+    def iter_documents(self, file_path: str, file_name: str, file_type: str,
+                       batch_size: int = 64, pages: Optional[Set[int]] = None,
+                       category: Optional[str] = None) -> Iterator[List[Document]]:
+        """문서를 페이지/슬라이드 단위로 로드·분할하여 batch_size개씩 청크 배치 생성
+
+        메모리에는 현재 배치와 카테고리 분류용 앞부분 문서만 유지된다.
+        스트리밍 중에는 전체 청크 수를 알 수 없으므로 total_chunks는 넣지 않는다.
+        PDF/PPTX 청크에는 페이지·슬라이드 콘텐츠 해시(content_hash)를 기록하고,
+        pages를 주면 해당 페이지만 다시 청킹한다 (증분 재업로드, category는 기존 값 재사용).
+        """
+        # 고급 PDF 청킹은 페이지 시작 섹션 제목을 청크별로 받아 해시에 반영 (전체 분석을 두 번 하지 않음)
+        page_hashes = self.compute_page_hashes(file_path, file_type, include_section_titles=False)
+        documents = self.iter_loaded_documents(file_path, file_type, pages)
+
+        # LLM 기반 카테고리 자동 분류 (앞 3개 문서만 미리 읽음)
+        head = list(islice(documents, 3))
+        if category is None:
+            category = self._classify_document_category(head, file_name)
 
         # 업로드 시간
         upload_time = datetime.now().isoformat()
 
-        # 각 문서에 메타데이터 추가
-        for i, doc in enumerate(documents):
+        batch = []
+        chunk_index = 0
+        for i, doc in enumerate(chain(head, documents)):
             if doc.metadata is None:
                 doc.metadata = {}
 
+            # PPTX는 slide_number, 기본 PDF 로더는 page, 고급 PDF 청킹은 page_number 사용 (없으면 인덱스)
+            page_number = (doc.metadata.get("slide_number") or doc.metadata.get("page")
+                           or doc.metadata.get("page_number") or i + 1)
+            if pages is not None and page_number not in pages:
+                continue
+
+            # 각 문서에 메타데이터 추가
             doc.metadata.update({
                 "file_name": file_name,
                 "file_type": file_type,
                 "file_path": file_path,
                 "upload_time": upload_time,
-                # PPTX는 slide_number를 page_number로 사용, PDF는 기존 page 필드 또는 인덱스
-                "page_number": doc.metadata.get("slide_number") or doc.metadata.get("page", i + 1),
+                "page_number": page_number,
                 "category": category,  # 카테고리 메타데이터 추가
             })
-
-        # 청크로 분할
-        chunks = self.text_splitter.split_documents(documents)
-
-        # 청크 인덱스 추가
-        for idx, chunk in enumerate(chunks):
-            chunk.metadata["chunk_index"] = idx
-            chunk.metadata["total_chunks"] = len(chunks)
-
-        return chunks
+            page_section_title = doc.metadata.pop("page_section_title", None)
+            if page_number in page_hashes:
+                page_hash = page_hashes[page_number]
+                if self._uses_pdf_engine(file_type):
+                    page_hash = with_section_title(page_hash, page_section_title)
+                doc.metadata["content_hash"] = page_hash
+
+            # 청크로 분할 후 청크 인덱스 추가
+            for chunk in self.text_splitter.split_documents([doc]):
+                chunk.metadata["chunk_index"] = chunk_index
+                chunk_index += 1
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def compute_page_hashes(self, file_path: str, file_type: str,
+                            include_section_titles: bool = True) -> Dict[int, str]:
+        """페이지/슬라이드 번호 → 콘텐츠 해시 (청킹 설정이 바뀌면 해시도 바뀜, 미지원 형식은 빈 dict)
+
+        include_section_titles: 고급 PDF 청킹에서 앞 페이지로부터 이어받는 섹션 제목까지 반영
+                                (레이아웃 분석 필요, False면 페이지 텍스트/이미지만)
+        """
+        if file_type not in PAGE_HASH_TYPES:
+            return {}
+        try:
+            section_titles = None
+            if include_section_titles and self._uses_pdf_engine(file_type):
+                section_titles = self.pdf_engine.incoming_section_titles(file_path)
+            return compute_page_hashes(file_path, file_type, salt=self._content_hash_salt(file_type),
+                                       section_titles=section_titles)
+        except Exception as e:
+            print(f"[INGEST][WARN] 페이지 해시 계산 실패 ({os.path.basename(file_path)}): {e}")
+            return {}
+
+    def _uses_pdf_engine(self, file_type: str) -> bool:
+        """PDF를 고급 청킹 엔진으로 처리하는지 여부"""
+        return file_type == "pdf" and self.enable_advanced_pdf_chunking and self.pdf_engine is not None
+
+    def _content_hash_salt(self, file_type: str) -> str:
+        """청크 결과에 영향을 주는 설정 (설정 변경 시 모든 페이지를 다시 처리)"""
+        settings = [self.chunk_size, self.chunk_overlap]
+        if file_type == "pdf":
+            settings += [self.enable_advanced_pdf_chunking, self.pdf_layout_backend]
+        elif file_type == "pptx":
+            from config import ConfigManager
+            settings += [self.enable_advanced_pptx_chunking,
+                         ConfigManager().get("enable_vision_chunking", False)]
+        return "|".join(str(value) for value in settings)
     
     def get_file_type(self, file_name: str) -> str:
         """파일 확장자에서 타입 추출"""
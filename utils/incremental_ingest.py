@@ -0,0 +1,109 @@
+"""
+Incremental Re-ingestion
+이미 업로드된 PDF/PPTX의 새 버전을 페이지·슬라이드 콘텐츠 해시로 비교하여
+변경된 페이지만 다시 청킹/임베딩하고, 사라진 페이지의 청크만 삭제
+"""
+
+from typing import Any, Callable, Dict, Optional
+import time
+import uuid
+
+from .content_hash import PAGE_HASH_TYPES, diff_page_hashes
+
+
+class IncrementalUpdater:
+    """페이지 해시 비교 기반 증분 재업로드"""
+
+    def __init__(self, document_processor, vector_manager, embed_batch_size: int = 64):
+        """
+        Args:
+            document_processor: DocumentProcessor (compute_page_hashes + iter_documents)
+            vector_manager: VectorStoreManager (페이지 인덱스 조회/삭제/기록)
+            embed_batch_size: 임베딩 요청 1회당 청크 수
+        """
+        self.document_processor = document_processor
+        self.vector_manager = vector_manager
+        self.embed_batch_size = max(1, embed_batch_size)
+
+    def update(
+        self,
+        file_path: str,
+        file_name: str,
+        file_type: str,
+        target_db: str = "personal",
+        on_message: Optional[Callable[[str], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """저장된 버전과 비교하여 변경분만 반영
+
+        Returns:
+            증분 반영 결과 {"unchanged", "moved", "changed", "removed", "chunks", "elapsed_sec"}
+            처음 업로드하는 파일이면 None (호출자가 전체 업로드)
+            페이지 해시가 없는 기존 청크(이전 버전 업로드)나 미지원 형식은 전체 삭제 후 None
+        """
+        emit = on_message or (lambda text: None)
+        index = self.vector_manager.get_file_page_index(file_name, target_db=target_db)
+        if index is None:
+            return None
+
+        current = self.document_processor.compute_page_hashes(file_path, file_type)
+        stored = {page: entry["hash"] for page, entry in index["pages"].items()}
+        if file_type not in PAGE_HASH_TYPES or not current or not any(stored.values()):
+            # 페이지 단위 비교 불가 → 기존처럼 파일 전체 교체
+            emit(f"기존 청크 교체: {file_name}")
+            self.vector_manager.delete_documents_by_file_name(file_name, target_db=target_db)
+            return None
+
+        start = time.perf_counter()
+        diff = diff_page_hashes(stored, current)
+        result = {
+            "unchanged": len(diff.unchanged),
+            "moved": len(diff.moved),
+            "changed": len(diff.changed),
+            "removed": len(diff.removed),
+            "chunks": 0,
+        }
+        if not diff.has_changes:
+            result["elapsed_sec"] = time.perf_counter() - start
+            print(f"[INGEST] 증분 업데이트: {file_name} 변경 없음 ({len(current)}페이지)")
+            return result
+
+        emit(f"증분 업데이트: {file_name} (변경 {len(diff.changed)}, 이동 {len(diff.moved)}, 삭제 {len(diff.removed)}페이지)")
+
+        # 1. 변경 페이지만 다시 청킹 → 배치 임베딩 → 기록 (실패 시 새 청크만 정리하여 기존 버전 유지)
+        if diff.changed:
+            written = []
+            try:
+                batches = self.document_processor.iter_documents(
+                    file_path=file_path, file_name=file_name, file_type=file_type,
+                    batch_size=self.embed_batch_size, pages=set(diff.changed), category=index["category"]
+                )
+                for batch in batches:
+                    for chunk in batch:
+                        chunk.id = chunk.id or str(uuid.uuid4())
+                    embeddings = self.vector_manager.embeddings.embed_documents([c.page_content for c in batch])
+                    self.vector_manager.add_documents(batch, target_db=target_db, embeddings=embeddings, rebuild_bm25=False)
+                    written.extend(chunk.id for chunk in batch)
+            except Exception:
+                self.vector_manager.delete_documents_by_ids(written, target_db=target_db)
+                raise
+            result["chunks"] = len(written)
+
+        # 2. 번호만 바뀐 페이지는 임베딩을 유지하고 페이지 번호만 갱신
+        for old_page, new_page in diff.moved.items():
+            page_meta = {"page_number": new_page}
+            if file_type == "pptx":
+                page_meta["slide_number"] = new_page
+            self.vector_manager.update_documents_metadata(index["pages"][old_page]["ids"], page_meta, target_db=target_db)
+
+        # 3. 사라졌거나 내용이 바뀐 페이지의 기존 청크 삭제 (ID는 비교 시점 기준, BM25 전체 재구축 포함)
+        stale_ids = [chunk_id for page in diff.removed for chunk_id in index["pages"][page]["ids"]]
+        if stale_ids:
+            self.vector_manager.delete_documents_by_ids(stale_ids, target_db=target_db)
+        else:
+            self.vector_manager.rebuild_bm25_index(target_db)
+
+        result["elapsed_sec"] = time.perf_counter() - start
+        print(f"[INGEST] 증분 업데이트: {file_name} 유지 {result['unchanged']}, 이동 {result['moved']}, "
+              f"재처리 {result['changed']}, 삭제 {result['removed']}페이지 → 청크 {result['chunks']}개, "
+              f"{result['elapsed_sec']:.1f}s")
+        return result
@@ -0,0 +1,207 @@
+"""
+Ingestion Journal
+업로드 진행 상황을 기록하는 write-ahead 저널 (JSON Lines, 기록마다 fsync)
+- begin: 파일 해시와 함께 업로드 시작
+- intent: Chroma에 기록하기 직전의 청크 배치 (청크 ID + 페이지 번호, 기록 전에 먼저 저널에 남김)
+- batch: Chroma 기록이 확인된 배치 (intent 이후 확인되지 않은 청크는 재개 시 삭제 후 재처리)
+- failed / done / discard: 실패(재시도 가능) / 완료 / 폐기
+강제 종료 후 재시작하면 마지막으로 기록된 배치 이후부터 이어서 처리
+"""
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """파일 내용 해시 (재개 시 같은 버전인지 확인)"""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def default_journal_path(persist_directory: str) -> str:
+    """벡터 DB 폴더 옆 저널 경로 (data/chroma_db → data/ingestion_journal.jsonl)"""
+    return os.path.join(os.path.dirname(persist_directory), "ingestion_journal.jsonl")
+
+
+class IngestionJournal:
+    """파일 단위 업로드 저널 (완료되지 않은 항목만 메모리에 유지)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._replay()
+        self._compact()
+
+    @staticmethod
+    def _key(file_name: str, target_db: str) -> str:
+        return f"{target_db}:{file_name}"
+
+    def _replay(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # 기록 도중 종료된 마지막 줄은 무시 (해당 배치는 재처리)
+                    continue
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        key = record["key"]
+        event = record["event"]
+        if event == "begin":
+            self._entries[key] = {
+                "file_name": record["file_name"],
+                "file_path": record["file_path"],
+                "file_type": record["file_type"],
+                "target_db": record["target_db"],
+                "file_hash": record["file_hash"],
+                "status": "running",
+                "ids": [],
+                "pages": [],
+                "pending": {},  # 기록 의도만 남은 청크 ID → 페이지 번호 (Chroma 기록 여부 불확실)
+                "batches": 0,
+                "error": None,
+            }
+        elif key not in self._entries:
+            return
+        elif event == "intent":
+            self._entries[key]["pending"].update(zip(record["ids"], record["pages"]))
+        elif event == "batch":
+            entry = self._entries[key]
+            entry["ids"].extend(record["ids"])
+            entry["pages"].extend(record["pages"])
+            entry["batches"] += 1
+            for chunk_id in record["ids"]:
+                entry["pending"].pop(chunk_id, None)
+        elif event == "resume":
+            self._entries[key]["status"] = "running"
+            self._entries[key]["error"] = None
+        elif event == "failed":
+            self._entries[key]["status"] = "failed"
+            self._entries[key]["error"] = record.get("error")
+        elif event == "drop":
+            # 재처리할 부분 페이지의 청크를 삭제한 기록
+            entry = self._entries[key]
+            dropped = set(record["ids"])
+            kept = [(chunk_id, page) for chunk_id, page in zip(entry["ids"], entry["pages"]) if chunk_id not in dropped]
+            entry["ids"] = [chunk_id for chunk_id, _ in kept]
+            entry["pages"] = [page for _, page in kept]
+            entry["pending"] = {chunk_id: page for chunk_id, page in entry["pending"].items() if chunk_id not in dropped}
+        elif event in ("done", "discard"):
+            del self._entries[key]
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        record["ts"] = time.time()
+        with self._lock:
+            self._apply(record)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _compact(self) -> None:
+        """완료된 항목을 걷어내고 미완료 항목만 다시 기록 (임시 파일 → 교체)"""
+        if not os.path.exists(self.path):
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, entry in self._entries.items():
+                records = [{"event": "begin", "key": key, **{k: entry[k] for k in (
+                    "file_name", "file_path", "file_type", "target_db", "file_hash")}}]
+                if entry["ids"]:
+                    records.append({"event": "batch", "key": key, "ids": entry["ids"], "pages": entry["pages"]})
+                if entry["pending"]:
+                    records.append({"event": "intent", "key": key, "ids": list(entry["pending"]),
+                                    "pages": list(entry["pending"].values())})
+                if entry["status"] == "failed":
+                    records.append({"event": "failed", "key": key, "error": entry["error"]})
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    # ===== 기록 =====
+
+    def begin(self, file_path: str, file_name: str, file_type: str, target_db: str, file_hash: str) -> None:
+        self._append({
+            "event": "begin", "key": self._key(file_name, target_db), "file_name": file_name,
+            "file_path": file_path, "file_type": file_type, "target_db": target_db, "file_hash": file_hash,
+        })
+
+    def record_intent(self, file_name: str, target_db: str, chunk_ids: List[str], pages: List[Any]) -> None:
+        """Chroma 기록 전 호출 (기록 도중 종료되면 이 청크들은 재개 시 삭제 대상)"""
+        self._append({"event": "intent", "key": self._key(file_name, target_db), "ids": list(chunk_ids), "pages": list(pages)})
+
+    def record_batch(self, file_name: str, target_db: str, chunk_ids: List[str], pages: List[Any]) -> None:
+        """Chroma 기록 확인 후 호출"""
+        self._append({"event": "batch", "key": self._key(file_name, target_db), "ids": list(chunk_ids), "pages": list(pages)})
+
+    def resume(self, file_name: str, target_db: str) -> None:
+        self._append({"event": "resume", "key": self._key(file_name, target_db)})
+
+    def drop_ids(self, file_name: str, target_db: str, chunk_ids: List[str]) -> None:
+        self._append({"event": "drop", "key": self._key(file_name, target_db), "ids": list(chunk_ids)})
+
+    def fail(self, file_name: str, target_db: str, error: str) -> None:
+        self._append({"event": "failed", "key": self._key(file_name, target_db), "error": error})
+
+    def complete(self, file_name: str, target_db: str) -> None:
+        self._append({"event": "done", "key": self._key(file_name, target_db)})
+
+    def discard(self, file_name: str, target_db: str) -> None:
+        self._append({"event": "discard", "key": self._key(file_name, target_db)})
+
+    # ===== 조회 =====
+
+    def get(self, file_name: str, target_db: str) -> Optional[Dict[str, Any]]:
+        """완료되지 않은 항목 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(self._key(file_name, target_db))
+            return self._copy(entry) if entry else None
+
+    def unfinished(self, target_db: Optional[str] = None) -> List[Dict[str, Any]]:
+        """중단/실패한 업로드 목록"""
+        with self._lock:
+            return [self._copy(entry) for entry in self._entries.values()
+                    if target_db is None or entry["target_db"] == target_db]
+
+    @staticmethod
+    def _copy(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {**entry, "ids": list(entry["ids"]), "pages": list(entry["pages"]), "pending": dict(entry["pending"])}
+
+    @staticmethod
+    def written_ids(entry: Dict[str, Any]) -> List[str]:
+        """Chroma에 남아 있을 수 있는 모든 청크 ID (확인된 배치 + 기록 의도만 남은 배치)"""
+        return list(entry["ids"]) + [chunk_id for chunk_id in entry["pending"] if chunk_id not in set(entry["ids"])]
+
+    @staticmethod
+    def resume_plan(entry: Dict[str, Any]) -> Tuple[Set[Any], List[str]]:
+        """(건너뛸 완료 페이지, 다시 처리하기 위해 삭제할 청크 ID)
+
+        배치 경계가 페이지 중간일 수 있으므로 마지막 배치의 마지막 페이지는 미완료로 보고 다시 처리한다.
+        기록 확인이 없는 intent 청크는 일부만 기록되었을 수 있으므로 함께 삭제하고 해당 페이지를 다시 처리한다.
+        페이지 번호가 없는 형식은 기록된 청크를 모두 지우고 처음부터 처리한다.
+        """
+        ids, pages, pending = entry["ids"], entry["pages"], entry.get("pending", {})
+        if not ids:
+            return set(), list(pending)
+        if any(page is None for page in pages) or any(page is None for page in pending.values()):
+            return set(), IngestionJournal.written_ids({"ids": ids, "pending": pending})
+        partial_page = pages[-1]
+        done_pages = {page for page in pages if page != partial_page} - set(pending.values())
+        partial_ids = [chunk_id for chunk_id, page in zip(ids, pages) if page not in done_pages]
+        partial_ids += [chunk_id for chunk_id in pending if chunk_id not in set(partial_ids)]
+        return done_pages, partial_ids
@@ -0,0 +1,447 @@
+"""
+Parallel Ingestion Pipeline
+다중 파일 업로드를 단계별로 병렬 처리
+- 1단계: 파싱/청킹 (CPU 작업 → 프로세스 풀, 스레드 파싱은 페이지/슬라이드 단위 스트리밍)
+- 2단계: 임베딩 배치 (I/O 작업 → 스레드 풀, 파일 간 동시 진행)
+- 3단계: Chroma 기록 (단일 writer 스레드, DB 동시 쓰기 방지)
+단계 사이는 크기 제한 큐로 연결하여 메모리 사용량을 제한
+(스트리밍 시 파일 크기와 무관하게 큐 크기 × 배치 크기만큼의 청크만 메모리에 유지)
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import os
+import queue
+import threading
+import time
+import uuid
+
+from langchain.schema import Document
+
+from .content_hash import PAGE_HASH_TYPES
+from .incremental_ingest import IncrementalUpdater
+from .ingestion_journal import IngestionJournal, default_journal_path, file_sha256
+
+
+# 파일 1건: (파일 경로, 파일명, 파일 타입)
+FileJob = Tuple[str, str, str]
+
+_SENTINEL = object()
+
+# 프로세스 풀 워커별 DocumentProcessor (워커 프로세스당 1회 생성)
+_WORKER_PROCESSOR = None
+
+
+def _parse_in_worker(file_path: str, file_name: str, file_type: str, settings: Dict[str, Any],
+                     pages: Optional[Set[int]] = None) -> List[Document]:
+    """프로세스 풀 워커: 파일 파싱 + 청킹 (pages: 이어서 처리할 페이지만)"""
+    global _WORKER_PROCESSOR
+    if _WORKER_PROCESSOR is None:
+        from utils.document_processor import DocumentProcessor
+        _WORKER_PROCESSOR = DocumentProcessor(**settings)
+    return _parse_pages(_WORKER_PROCESSOR, file_path, file_name, file_type, pages)
+
+
+def _parse_pages(processor, file_path: str, file_name: str, file_type: str,
+                 pages: Optional[Set[int]] = None) -> List[Document]:
+    if pages is None:
+        return processor.process_document(file_path=file_path, file_name=file_name, file_type=file_type)
+    batches = processor.iter_documents(file_path=file_path, file_name=file_name, file_type=file_type, pages=pages)
+    return [chunk for batch in batches for chunk in batch]
+
+
+class IngestionPipeline:
+    """파싱(프로세스) → 임베딩(스레드) → 기록(단일 writer) 파이프라인"""
+
+    def __init__(
+        self,
+        document_processor,
+        vector_manager,
+        parse_workers: Optional[int] = None,
+        embed_workers: int = 4,
+        embed_batch_size: int = 64,
+        queue_size: int = 4,
+        use_processes: bool = True,
+        incremental_update: bool = False,
+        journal: Optional[IngestionJournal] = None
+    ):
+        """
+        Args:
+            document_processor: DocumentProcessor (스레드 파싱/프로세스 풀 설정 원본)
+            vector_manager: VectorStoreManager (embeddings + add_documents)
+            parse_workers: 파싱 워커 수 (None = CPU 수 - 1, 최소 1)
+            embed_workers: 동시 임베딩 배치 수
+            embed_batch_size: 임베딩 요청 1회당 청크 수
+            queue_size: 단계 사이 대기 파일 수 상한 (메모리 제한)
+            use_processes: 파싱을 프로세스 풀에서 수행 (LLM 클라이언트가 있으면 스레드 사용)
+            incremental_update: 이미 업로드된 PDF/PPTX는 변경된 페이지·슬라이드만 다시 처리
+            journal: 업로드 저널 (배치 기록 전 intent, 기록 후 확인 체크포인트, 중단/실패한 파일은 마지막 확인 배치 이후부터 재개)
+        """
+        self.document_processor = document_processor
+        self.vector_manager = vector_manager
+        self.parse_workers = parse_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.embed_workers = max(1, embed_workers)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.queue_size = max(1, queue_size)
+        # 카테고리 분류용 LLM 클라이언트는 프로세스 간 전달 불가 → 스레드 파싱
+        self.use_processes = use_processes and getattr(document_processor, "llm_client", None) is None
+        self._process_mode = self.use_processes  # 이번 실행의 실제 파싱 방식
+        self.incremental_updater = (
+            IncrementalUpdater(document_processor, vector_manager, embed_batch_size=self.embed_batch_size)
+            if incremental_update else None
+        )
+        self.journal = journal
+        self._resume_pages: Dict[FileJob, Set[int]] = {}  # 이어서 처리할 파일 → 남은 페이지
+        self._resumed_counts: Dict[FileJob, int] = {}     # 이어서 처리할 파일 → 이미 기록된 청크 수
+        self._stats = {"pages": 0, "embeddings": 0}       # 이번 실행에서 처리한 페이지/임베딩 수
+
+    @classmethod
+    def from_config(cls, document_processor, vector_manager, config: Dict[str, Any], **overrides) -> "IngestionPipeline":
+        """ingestion_* 설정으로 파이프라인 생성 (GUI 업로드와 일괄 수집 CLI 공용)
+
+        overrides: 설정 대신 사용할 생성자 인자 (예: CLI의 parse_workers)
+        """
+        journal = None
+        if config.get("ingestion_journal_enabled", True):
+            journal = IngestionJournal(default_journal_path(vector_manager.persist_directory))
+        options = {
+            "parse_workers": config.get("ingestion_parse_workers") or None,
+            "embed_workers": config.get("ingestion_embed_workers", 4),
+            "embed_batch_size": config.get("ingestion_embed_batch_size", 64),
+            "queue_size": config.get("ingestion_queue_size", 4),
+            "use_processes": config.get("ingestion_use_processes", True),
+            "incremental_update": config.get("ingestion_incremental_update", True),
+            "journal": journal,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(document_processor, vector_manager, **options)
+
+    def _processor_settings(self) -> Dict[str, Any]:
+        processor = self.document_processor
+        return {
+            "chunk_size": processor.chunk_size,
+            "chunk_overlap": processor.chunk_overlap,
+            "enable_advanced_pdf_chunking": processor.enable_advanced_pdf_chunking,
+            "enable_advanced_pptx_chunking": processor.enable_advanced_pptx_chunking,
+            "pdf_parallel_page_workers": getattr(processor, "pdf_parallel_page_workers", 0),
+            "pdf_layout_backend": getattr(processor, "pdf_layout_backend", "pymupdf"),
+        }
+
+    def _create_parse_executor(self, job_count: int):
+        # 파일 1개는 프로세스 풀 이점 없음 → 스레드에서 파싱 (긴 PDF는 엔진이 페이지 단위로 병렬 처리)
+        self._process_mode = self.use_processes and job_count > 1
+        if self._process_mode:
+            try:
+                return ProcessPoolExecutor(max_workers=self.parse_workers)
+            except Exception as e:
+                print(f"[INGEST][WARN] 프로세스 풀 생성 실패, 스레드 파싱으로 전환: {e}")
+                self._process_mode = False
+        return ThreadPoolExecutor(max_workers=self.parse_workers, thread_name_prefix="ingest-parse")
+
+    def _submit_parse(self, executor, job: FileJob, parsed_q: "queue.Queue") -> Future:
+        file_path, file_name, file_type = job
+        if self._process_mode:
+            return executor.submit(_parse_in_worker, file_path, file_name, file_type, self._processor_settings(),
+                                   self._resume_pages.get(job))
+        return executor.submit(self._stream_parse, job, parsed_q)
+
+    def _stream_parse(self, job: FileJob, parsed_q: "queue.Queue") -> None:
+        """스레드 파싱: 청크 배치를 생성되는 대로 큐에 전달 (큐가 차면 파싱 대기)"""
+        file_path, file_name, file_type = job
+        try:
+            batches = self.document_processor.iter_documents(
+                file_path=file_path, file_name=file_name, file_type=file_type,
+                batch_size=self.embed_batch_size, pages=self._resume_pages.get(job)
+            )
+            for batch in batches:
+                parsed_q.put((job, batch, None, False))
+        except Exception as e:
+            parsed_q.put((job, None, e, True))
+            return
+        parsed_q.put((job, [], None, True))
+
+    def _parse_stage(self, jobs: List[FileJob], parsed_q: "queue.Queue", emit: Callable[[str], None]) -> None:
+        """파싱 결과를 완료 순서대로 큐에 전달 (동시 진행 파일 수 제한)
+
+        큐 항목: (파일, 청크 배치, 오류, 파일 마지막 여부)
+        """
+        executor = self._create_parse_executor(len(jobs))
+        pending = list(jobs)
+        in_flight: Dict[Future, FileJob] = {}
+        max_in_flight = self.parse_workers + self.queue_size
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < max_in_flight:
+                    job = pending.pop(0)
+                    emit(f"문서 처리: {job[1]} ...")
+                    in_flight[self._submit_parse(executor, job, parsed_q)] = job
+                done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = in_flight.pop(future)
+                    if not self._process_mode:
+                        # 스레드 파싱은 _stream_parse가 직접 큐에 전달
+                        continue
+                    try:
+                        chunks, error = future.result(), None
+                    except BrokenProcessPool as e:
+                        # 워커 비정상 종료 → 현재 스레드에서 재시도
+                        print(f"[INGEST][WARN] 파싱 프로세스 중단 ({job[1]}), 스레드에서 재시도: {e}")
+                        try:
+                            chunks, error = _parse_pages(
+                                self.document_processor, job[0], job[1], job[2], self._resume_pages.get(job)
+                            ), None
+                        except Exception as retry_error:
+                            chunks, error = None, retry_error
+                    except Exception as e:
+                        chunks, error = None, e
+                    parsed_q.put((job, chunks, error, True))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            parsed_q.put(_SENTINEL)
+
+    def _apply_incremental_updates(
+        self,
+        jobs: List[FileJob],
+        target_db: str,
+        emit: Callable[[str], None],
+        file_done: Callable[[str, bool, Optional[str], int], None]
+    ) -> List[FileJob]:
+        """이미 업로드된 파일은 변경분만 반영하고, 전체 업로드가 필요한 파일 목록 반환"""
+        remaining = []
+        for job in jobs:
+            file_path, file_name, file_type = job
+            try:
+                result = self.incremental_updater.update(
+                    file_path, file_name, file_type, target_db=target_db, on_message=emit
+                )
+            except Exception as e:
+                file_done(file_name, False, str(e), 0)
+                continue
+            if result is None:
+                remaining.append(job)
+            else:
+                self._stats["pages"] += result["changed"]
+                self._stats["embeddings"] += result["chunks"]
+                file_done(file_name, True, None, result["chunks"])
+        return remaining
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return self.vector_manager.embeddings.embed_documents(texts)
+
+    def _writer_stage(
+        self,
+        write_q: "queue.Queue",
+        target_db: str,
+        on_file_done: Callable[[str, bool, Optional[str], int], None]
+    ) -> None:
+        """단일 writer: 배치별 임베딩 완료를 기다려 Chroma에 기록
+
+        BM25는 파일의 마지막 배치에서 한 번만 재구축한다.
+        파일 도중 실패하면 저널이 없을 때는 이미 기록한 배치를 삭제하여 부분 업로드를 남기지 않고,
+        저널이 있으면 기록된 배치를 체크포인트로 남겨 재시도 시 이어서 처리한다.
+        """
+        written: Dict[FileJob, List[str]] = {}
+        pages: Dict[FileJob, Set[Any]] = {}
+        failed = set()
+        while True:
+            item = write_q.get()
+            if item is _SENTINEL:
+                return
+            job, chunks, batch_futures, final, error = item
+            file_name = job[1]
+            if job in failed:
+                if final:
+                    failed.discard(job)
+                continue
+            chunk_ids = written.setdefault(job, [])
+            job_pages = pages.setdefault(job, set())
+            try:
+                if error is not None:
+                    raise error
+                for index, future in enumerate(batch_futures):
+                    batch = chunks[index * self.embed_batch_size:(index + 1) * self.embed_batch_size]
+                    last = final and index == len(batch_futures) - 1
+                    batch_ids = [doc.id for doc in batch]
+                    batch_pages = [doc.metadata.get("page_number") for doc in batch]
+                    if self.journal is not None:
+                        # write-ahead: 기록 전에 의도를 남겨 기록 도중 종료되어도 재개 시 정리 가능
+                        self.journal.record_intent(file_name, target_db, batch_ids, batch_pages)
+                    self.vector_manager.add_documents(
+                        batch, target_db=target_db, embeddings=future.result(), rebuild_bm25=last
+                    )
+                    chunk_ids.extend(batch_ids)
+                    job_pages.update(batch_pages)
+                    self._stats["embeddings"] += len(batch)
+                    if self.journal is not None:
+                        self.journal.record_batch(file_name, target_db, batch_ids, batch_pages)
+                if final and not chunks and chunk_ids:
+                    # 마지막 빈 배치: 앞서 미뤄 둔 BM25 재구축
+                    self.vector_manager.rebuild_bm25_index(target_db)
+                if final:
+                    del written[job]
+                    self._stats["pages"] += len(pages.pop(job))
+                    chunk_count = len(chunk_ids) + self._resumed_counts.get(job, 0)
+                    if chunk_count:
+                        if self.journal is not None:
+                            self.journal.complete(file_name, target_db)
+                        on_file_done(file_name, True, None, chunk_count)
+                    else:
+                        if self.journal is not None:
+                            self.journal.discard(file_name, target_db)
+                        on_file_done(file_name, False, "추출된 청크가 없습니다", 0)
+            except Exception as e:
+                del written[job]
+                pages.pop(job, None)
+                if self.journal is not None:
+                    # 기록된 배치는 유지 → 같은 파일을 다시 올리면 마지막 배치 이후부터 처리
+                    self.journal.fail(file_name, target_db, str(e))
+                    if chunk_ids:
+                        self.vector_manager.rebuild_bm25_index(target_db)
+                elif chunk_ids:
+                    print(f"[INGEST][WARN] {file_name} 처리 중 실패, 기록된 청크 {len(chunk_ids)}개 삭제")
+                    self.vector_manager.delete_documents_by_ids(chunk_ids, target_db=target_db)
+                if not final:
+                    failed.add(job)
+                on_file_done(file_name, False, str(e), 0)
+
+    def _prepare_journal(
+        self,
+        jobs: List[FileJob],
+        target_db: str,
+        emit: Callable[[str], None]
+    ) -> Tuple[List[FileJob], List[FileJob]]:
+        """저널에 미완료 기록이 있는 파일은 이어서 처리하도록 준비
+
+        Returns:
+            (이어서 처리할 파일, 새로 처리할 파일)
+        """
+        self._resume_pages, self._resumed_counts = {}, {}
+        resumed, fresh = [], []
+        for job in jobs:
+            file_path, file_name, file_type = job
+            entry = self.journal.get(file_name, target_db)
+            if entry is None:
+                fresh.append(job)
+                continue
+            try:
+                same_file = file_sha256(file_path) == entry["file_hash"]
+            except OSError:
+                same_file = False
+            if not same_file:
+                # 다른 버전 → 이전 부분 기록 폐기 후 새로 처리
+                stale_ids = IngestionJournal.written_ids(entry)
+                if stale_ids:
+                    self.vector_manager.delete_documents_by_ids(stale_ids, target_db=target_db)
+                self.journal.discard(file_name, target_db)
+                fresh.append(job)
+                continue
+
+            done_pages, partial_ids = IngestionJournal.resume_plan(entry)
+            all_pages = set(self.document_processor.compute_page_hashes(file_path, file_type,
+                                                                        include_section_titles=False)) \
+                if file_type in PAGE_HASH_TYPES else set()
+            if not all_pages:
+                # 페이지 단위 재개 불가 → 기록된 청크를 지우고 처음부터
+                done_pages, partial_ids = set(), IngestionJournal.written_ids(entry)
+            if partial_ids:
+                self.vector_manager.delete_documents_by_ids(partial_ids, target_db=target_db)
+                self.journal.drop_ids(file_name, target_db, partial_ids)
+            self.journal.resume(file_name, target_db)
+            if done_pages:
+                self._resume_pages[job] = all_pages - done_pages
+            self._resumed_counts[job] = sum(1 for page in entry["pages"] if page in done_pages)
+            emit(f"이어서 처리: {file_name} (완료 {len(done_pages)}페이지 건너뜀)")
+            print(f"[INGEST] 저널 재개: {file_name} 완료 {len(done_pages)}페이지, "
+                  f"기록된 청크 {self._resumed_counts[job]}개 유지")
+            resumed.append(job)
+        return resumed, fresh
+
+    def run(
+        self,
+        jobs: List[FileJob],
+        target_db: str = "personal",
+        on_message: Optional[Callable[[str], None]] = None,
+        on_file_done: Optional[Callable[[str, bool, Optional[str], int], None]] = None
+    ) -> Dict[str, Any]:
+        """파일 목록 병렬 업로드
+
+        Args:
+            jobs: (파일 경로, 파일명, 파일 타입) 리스트
+            target_db: 대상 DB ("personal" | "shared")
+            on_message: 진행 메시지 콜백
+            on_file_done: 파일 완료 콜백 (파일명, 성공 여부, 오류 메시지, 청크 수)
+
+        Returns:
+            {"files": 요청한 파일 수, "succeeded": [...], "failed": {파일명: 오류}, "chunks": int,
+             "pages": 이번에 파싱한 페이지 수, "embeddings": 이번에 생성한 임베딩 수, "elapsed_sec": float}
+        """
+        emit = on_message or (lambda text: None)
+        start = time.perf_counter()
+        # 증분 반영/재개 분류 전에 요청 파일 수 기록 (jobs는 이후 전체 업로드 대상만 남음)
+        summary: Dict[str, Any] = {"files": len(jobs), "succeeded": [], "failed": {}, "chunks": 0}
+        lock = threading.Lock()
+        self._stats = {"pages": 0, "embeddings": 0}
+
+        def file_done(file_name: str, ok: bool, error: Optional[str], chunk_count: int) -> None:
+            with lock:
+                if ok:
+                    summary["succeeded"].append(file_name)
+                    summary["chunks"] += chunk_count
+                else:
+                    summary["failed"][file_name] = error or "알 수 없는 오류"
+            if on_file_done:
+                on_file_done(file_name, ok, error, chunk_count)
+
+        resumed: List[FileJob] = []
+        if self.journal is not None:
+            resumed, jobs = self._prepare_journal(jobs, target_db, emit)
+        if self.incremental_updater is not None:
+            jobs = self._apply_incremental_updates(jobs, target_db, emit, file_done)
+        if self.journal is not None:
+            # 첫 배치 기록 전에 시작 기록 (write-ahead)
+            for file_path, file_name, file_type in jobs:
+                self.journal.begin(file_path, file_name, file_type, target_db, file_sha256(file_path))
+        jobs = resumed + jobs
+
+        parsed_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        write_q: "queue.Queue" = queue.Queue(maxsize=self.queue_size)
+        embed_executor = ThreadPoolExecutor(max_workers=self.embed_workers, thread_name_prefix="ingest-embed")
+
+        parser = threading.Thread(target=self._parse_stage, args=(jobs, parsed_q, emit), daemon=True)
+        writer = threading.Thread(target=self._writer_stage, args=(write_q, target_db, file_done), daemon=True)
+        parser.start()
+        writer.start()
+
+        try:
+            # 임베딩 단계: 파싱 완료 파일의 배치를 스레드 풀에 제출 (writer가 순서대로 수거)
+            while True:
+                item = parsed_q.get()
+                if item is _SENTINEL:
+                    break
+                job, chunks, error, final = item
+                if error is not None or not chunks:
+                    # 오류/파일 끝 표시도 writer를 거쳐 앞선 배치와 순서 유지
+                    write_q.put((job, None, [], final, error))
+                    continue
+                emit(f"임베딩 추가: {job[1]} (청크 {len(chunks)}개)")
+                # writer가 실패 시 부분 기록을 지울 수 있도록 ID를 미리 부여
+                for chunk in chunks:
+                    chunk.id = chunk.id or str(uuid.uuid4())
+                batch_futures = [
+                    embed_executor.submit(self._embed_batch, [c.page_content for c in chunks[i:i + self.embed_batch_size]])
+                    for i in range(0, len(chunks), self.embed_batch_size)
+                ]
+                write_q.put((job, chunks, batch_futures, final, None))
+        finally:
+            write_q.put(_SENTINEL)
+            writer.join()
+            parser.join()
+            embed_executor.shutdown(wait=True)
+
+        summary.update(self._stats)
+        summary["elapsed_sec"] = time.perf_counter() - start
+        print(f"[INGEST] {len(summary['succeeded'])}/{summary['files']}개 파일, 청크 {summary['chunks']}개, "
+              f"{summary['elapsed_sec']:.1f}s (파싱 {'프로세스' if self._process_mode else '스레드'} "
+              f"{self.parse_workers}개, 임베딩 {self.embed_workers}개)")
+        return summary
@@ -0,0 +1,105 @@
+"""
+Latency Budget Scheduler
+요청별 지연 예산(ms) 안에서 선택 단계(동의어 확장, Multi-Query, 재생성 등) 실행 여부 결정
+(단계별 비용은 최근 실행 이력의 지수이동평균으로 추정)
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+import threading
+import time
+
+
+class StageCostTracker:
+    """단계별 실행 시간 추정기 (EWMA, ms 단위)"""
+
+    # 이력이 없을 때 사용할 초기 추정치 (로컬 Ollama 기준 대략값)
+    DEFAULT_COSTS_MS: Dict[str, float] = {
+        "synonym_expansion": 300.0,
+        "multi_query": 4000.0,
+        "generation": 5000.0,
+        "self_consistency": 12000.0,
+        "regeneration": 5000.0,
+        "format_retry": 5000.0,
+        "citations": 800.0,
+        "context_compression": 400.0,
+    }
+
+    def __init__(self, alpha: float = 0.3, default_costs_ms: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            alpha: EWMA 가중치 (클수록 최근 실행 반영이 빠름)
+            default_costs_ms: 단계별 초기 추정치 (None이면 DEFAULT_COSTS_MS)
+        """
+        self.alpha = alpha
+        self._estimates: Dict[str, float] = dict(default_costs_ms or self.DEFAULT_COSTS_MS)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, stage: str) -> float:
+        with self._lock:
+            return self._estimates.get(stage, 0.0)
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        with self._lock:
+            count = self._counts.get(stage, 0)
+            if count == 0:
+                # 첫 실측치는 초기 추정치를 대체
+                self._estimates[stage] = elapsed_ms
+            else:
+                prev = self._estimates.get(stage, elapsed_ms)
+                self._estimates[stage] = (1 - self.alpha) * prev + self.alpha * elapsed_ms
+            self._counts[stage] = count + 1
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {stage: round(ms, 1) for stage, ms in self._estimates.items()}
+
+
+class LatencyBudget:
+    """요청 1건의 지연 예산"""
+
+    def __init__(self, budget_ms: float, tracker: StageCostTracker):
+        self.budget_ms = float(budget_ms)
+        self.tracker = tracker
+        self._start = time.perf_counter()
+        self.skipped: List[str] = []
+        self.decisions: Dict[str, bool] = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def remaining_ms(self) -> float:
+        return self.budget_ms - self.elapsed_ms()
+
+    def allow(self, stage: str, reserve_stages: tuple = ()) -> bool:
+        """선택 단계 실행 가능 여부
+
+        Args:
+            stage: 실행하려는 단계 이름
+            reserve_stages: 이 단계 이후 반드시 실행될 단계들 (예산에서 미리 확보)
+        """
+        needed = self.tracker.estimate(stage) + sum(self.tracker.estimate(s) for s in reserve_stages)
+        allowed = needed <= self.remaining_ms()
+        self.decisions[stage] = allowed
+        if not allowed:
+            if stage not in self.skipped:
+                self.skipped.append(stage)
+            print(f"[BUDGET] '{stage}' 건너뜀 (예상 {needed:.0f}ms > 남은 {self.remaining_ms():.0f}ms)")
+        return allowed
+
+    def report(self) -> Dict[str, object]:
+        return {
+            "budget_ms": self.budget_ms,
+            "elapsed_ms": round(self.elapsed_ms(), 1),
+            "skipped_stages": list(self.skipped),
+            "stage_estimates_ms": self.tracker.snapshot(),
+        }
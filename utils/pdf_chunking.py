@@ -15,6 +15,7 @@ class ChunkMetadata:
     page_number: int
     parent_chunk_id: Optional[str] = None  # Small-to-Large용 부모 청크 ID
     section_title: str = ""  # 이 청크가 속한 섹션 제목
+    page_section_title: Optional[str] = None  # 페이지 시작 시점의 섹션 제목 (앞 페이지에서 이어받음, 페이지 해시용)
     chunk_type_weight: float = 1.0  # 청크 타입별 가중치 (title=2.0, paragraph=1.0)
     font_size: float = 12.0  # 텍스트의 평균 폰트 크기
     is_bold: bool = False  # 텍스트의 굵기 여부
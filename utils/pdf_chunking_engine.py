@@ -2,20 +2,74 @@
 PDF 고급 청킹 엔진
 Small-to-Large 아키텍처와 Layout-Aware 분석을 통한 PDF 청킹
 """
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+import multiprocessing
+import os
 import pdfplumber
 import uuid
 from .pdf_chunking import Chunk, ChunkMetadata, ChunkFactory, CHUNK_TYPE_WEIGHTS
-from .pdf_layout_analyzer import PDFLayoutAnalyzer
+from .pdf_layout_analyzer import PDFLayoutAnalyzer, create_layout_analyzer, open_pdf_pages
 from .chunking_fallback import ChunkingFallback
 
+# 첫 제목이 나오기 전 페이지의 섹션 제목
+DOCUMENT_START_TITLE = "문서 서두"
+
+
+def analyze_page(layout_analyzer: PDFLayoutAnalyzer, page, enable_layout_analysis: bool) -> Dict[str, Any]:
+    """페이지 1장 분석 결과 (프로세스 간 전달 가능한 dict)"""
+    return {
+        "text": layout_analyzer.extract_page_text(page),
+        "elements": layout_analyzer.analyze_page_elements(page) if enable_layout_analysis else None,
+        "table_check": layout_analyzer.last_table_check if enable_layout_analysis else None,
+    }
+
+
+def iter_page_range(layout_analyzer: PDFLayoutAnalyzer, pages, page_range: Tuple[int, int],
+                    enable_layout_analysis: bool) -> Iterator[Dict[str, Any]]:
+    """[start, end) 페이지 구간을 한 페이지씩 분석"""
+    for page_index in range(*page_range):
+        print(f"페이지 {page_index + 1} 처리 중...")
+        page = pages[page_index]
+        result = analyze_page(layout_analyzer, page, enable_layout_analysis)
+        # 분석이 끝난 pdfplumber 페이지의 문자 캐시 해제 (긴 문서 메모리 절감)
+        if hasattr(page, "flush_cache"):
+            page.flush_cache()
+        yield result
+
+
+def analyze_page_range(layout_analyzer: PDFLayoutAnalyzer, pages, page_range: Tuple[int, int],
+                       enable_layout_analysis: bool) -> List[Dict[str, Any]]:
+    """[start, end) 페이지 구간 분석"""
+    return list(iter_page_range(layout_analyzer, pages, page_range, enable_layout_analysis))
+
+
+def _analyze_page_range_in_worker(pdf_path: str, page_range: Tuple[int, int], enable_layout_analysis: bool,
+                                  backend: str, enable_table_screening: bool = True) -> List[Dict[str, Any]]:
+    """프로세스 풀 워커: PDF를 직접 열어 페이지 구간 분석"""
+    layout_analyzer = create_layout_analyzer(backend, enable_table_screening)
+    doc, pages = open_pdf_pages(pdf_path, backend)
+    try:
+        with doc:
+            return analyze_page_range(layout_analyzer, pages, page_range, enable_layout_analysis)
+    finally:
+        layout_analyzer.close()
+
+
+def _file_signature(pdf_path: str) -> Tuple[str, int, int]:
+    """파일 변경 여부 판단용 (절대 경로, 크기, 수정 시각)"""
+    stat = os.stat(pdf_path)
+    return os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns
+
 
 class PDFChunkingEngine:
     """PDF 고급 청킹 엔진"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.layout_analyzer = PDFLayoutAnalyzer()
+        self.layout_backend = config.get("layout_backend", "pdfplumber")  # pdfplumber | pymupdf (span 기반 고속 분석)
+        self.enable_table_screening = config.get("enable_table_screening", True)  # 괘선/정렬 열 판정으로 표 후보 페이지만 extract_tables
+        self.layout_analyzer = create_layout_analyzer(self.layout_backend, self.enable_table_screening)
         self.fallback = ChunkingFallback(config)
         
         # 설정값들
@@ -23,87 +77,227 @@ class PDFChunkingEngine:
         self.overlap_size = config.get("overlap_size", 100)
         self.enable_small_to_large = config.get("enable_small_to_large", True)
         self.enable_layout_analysis = config.get("enable_layout_analysis", True)
+        self.parallel_page_workers = config.get("parallel_page_workers", 0)  # 0 = CPU 수, 1 = 순차
+        self.parallel_min_pages = config.get("parallel_min_pages", 16)  # 이보다 짧은 문서는 순차 처리
+        self.min_pages_per_worker = config.get("min_pages_per_worker", 4)
+        self.last_table_stats: Dict[str, int] = {}
+        self._section_title_cache: Optional[Tuple[Tuple, Dict[int, str]]] = None  # (파일 서명, 페이지별 시작 섹션 제목)
     
     def process_pdf_document(self, pdf_path: str) -> List[Chunk]:
         """PDF 문서를 레이아웃을 인식하여 계층적으로 청킹"""
-        all_chunks = []
+        return list(self.iter_pdf_chunks(pdf_path))
+    
+    def iter_pdf_chunks(self, pdf_path: str, pages: Optional[Set[int]] = None) -> Iterator[Chunk]:
+        """페이지 단위로 유효 청크 생성 (전체 청크 목록을 메모리에 두지 않음)
+
+        pages: 처리할 페이지 번호(1부터) 집합, None이면 전체 (증분 재업로드용)
+        """
         document_id = str(uuid.uuid4())
+        self.last_table_stats = self._collect_table_stats([])
+        pages_done = set()
+        total_count = 0
+        valid_count = 0
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                current_section_title = "문서 서두"
-                
-                for page_num, page in enumerate(pdf.pages, 1):
-                    print(f"페이지 {page_num} 처리 중...")
-                    
-                    # 1. Large 청크 생성 (페이지 전체) - Small-to-Large 아키텍처
-                    if self.enable_small_to_large:
-                        page_chunk = self._create_page_summary_chunk(
-                            page, document_id, page_num, current_section_title
-                        )
-                        all_chunks.append(page_chunk)
-                        parent_id = page_chunk.id
-                    else:
-                        parent_id = None
-                    
-                    # 2. Small 청크 생성 (Layout-Aware)
-                    if self.enable_layout_analysis:
-                        elements = self.layout_analyzer.analyze_page_elements(page)
-                        small_chunks = self._process_page_elements(
-                            elements, document_id, page_num, 
-                            parent_id, current_section_title
-                        )
-                        all_chunks.extend(small_chunks)
-                        
-                        # 3. 섹션 제목 업데이트
-                        current_section_title = self._update_section_title(
-                            elements, current_section_title
-                        )
-                    else:
-                        # 폴백: 기본 텍스트 추출
-                        basic_text = page.extract_text()
-                        if basic_text:
-                            basic_chunks = self._create_basic_chunks(
-                                basic_text, document_id, page_num, parent_id, current_section_title
-                            )
-                            all_chunks.extend(basic_chunks)
+            # 1. 페이지 분석 (긴 문서는 페이지 구간별 병렬 처리)
+            # 2. 페이지 순서대로 청크 생성 (섹션 제목은 구간 경계를 넘어 이어짐)
+            # 3. 일부 페이지만 처리할 때도 앞 페이지의 섹션 제목을 이어받음
+            #    (같은 파일의 페이지별 시작 제목을 알면 선택 페이지만, 모르면 마지막 선택 페이지까지 분석)
+            current_section_title = DOCUMENT_START_TITLE
+            seed_titles = self._cached_section_titles(pdf_path) if pages is not None else None
+            analyzed = pages if pages is None or seed_titles is not None else set(range(1, max(pages, default=0) + 1))
+            incoming_titles = {}
+            for page_num, page_result in self._iter_page_results(pdf_path, analyzed):
+                if seed_titles is not None:
+                    current_section_title = seed_titles.get(page_num, current_section_title)
+                incoming_titles[page_num] = current_section_title
+                if pages is not None and page_num not in pages:
+                    # 변경되지 않은 앞 페이지: 섹션 제목만 갱신 (청크 생성 안 함)
+                    if page_result["elements"] is not None:
+                        current_section_title = self._update_section_title(page_result["elements"], current_section_title)
+                    continue
+                pages_done.add(page_num)
+                self._add_table_stats(page_result)
+                page_chunks, current_section_title = self._build_page_chunks(
+                    page_result, document_id, page_num, current_section_title
+                )
+                for chunk in page_chunks:
+                    chunk.metadata.page_section_title = incoming_titles[page_num]
+                total_count += len(page_chunks)
+                # 상용 서비스 수준: 페이지별 청크 필터링
+                for chunk in self._filter_invalid_chunks(page_chunks):
+                    valid_count += 1
+                    yield chunk
+            if pages is None:
+                self._section_title_cache = (_file_signature(pdf_path), incoming_titles)
         
         except Exception as e:
             print(f"PDF 처리 중 오류 발생: {e}")
-            # 최종 폴백: 기본 텍스트 추출
+            # 최종 폴백: 기본 텍스트 추출 (이미 처리한 페이지 이후)
             try:
                 with pdfplumber.open(pdf_path) as pdf:
+                    remaining = [
+                        page_num for page_num in range(1, len(pdf.pages) + 1)
+                        if page_num not in pages_done and (pages is None or page_num in pages)
+                    ]
                     all_text = ""
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
+                    for page_num in remaining:
+                        page_text = pdf.pages[page_num - 1].extract_text()
                         if page_text:
                             all_text += page_text + "\n\n"
                     
                     if all_text:
                         basic_chunks = self._create_basic_chunks(
-                            all_text, document_id, 1, None, "문서 전체"
+                            all_text, document_id, remaining[0], None, "문서 전체"
                         )
-                        all_chunks.extend(basic_chunks)
+                        total_count += len(basic_chunks)
+                        for chunk in self._filter_invalid_chunks(basic_chunks):
+                            valid_count += 1
+                            yield chunk
             except Exception as fallback_error:
                 print(f"폴백 처리도 실패: {fallback_error}")
         
-        # 상용 서비스 수준: 최종 청크 필터링 및 통계
-        filtered_chunks = self._filter_invalid_chunks(all_chunks)
-        
-        print(f"총 {len(all_chunks)}개 청크 생성 → {len(filtered_chunks)}개 유효 청크")
-        return filtered_chunks
+        if self.last_table_stats["pages_screened"]:
+            print(f"[PDF] 표 검출: 후보 {self.last_table_stats['pages_extracted']}페이지 추출, "
+                  f"{self.last_table_stats['pages_skipped']}페이지 생략 (표 {self.last_table_stats['tables_found']}개)")
+        print(f"총 {total_count}개 청크 생성 → {valid_count}개 유효 청크")
+    
+    def _iter_page_results(self, pdf_path: str,
+                           selected: Optional[Set[int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(페이지 번호, 페이지 분석 결과)를 페이지 순서대로 생성"""
+        doc, pages = open_pdf_pages(pdf_path, self.layout_backend)
+        with doc:
+            page_count = len(pages)
+            # 앞쪽 연속 페이지(1..N) 선택은 전체 처리처럼 구간 병렬 분석 가능
+            if selected is not None and selected == set(range(1, len(selected) + 1)):
+                page_count = min(page_count, len(selected))
+                selected = None
+            # 일부 페이지만 처리할 때는 순차 분석 (변경 페이지 수가 적음)
+            workers = 1 if selected is not None else self._page_worker_count(page_count)
+            if workers <= 1:
+                try:
+                    for page_index in range(page_count):
+                        if selected is not None and page_index + 1 not in selected:
+                            continue
+                        for result in iter_page_range(self.layout_analyzer, pages, (page_index, page_index + 1),
+                                                      self.enable_layout_analysis):
+                            yield page_index + 1, result
+                finally:
+                    self.layout_analyzer.close()
+                return
+        
+        # 페이지 구간을 워커 수만큼 나누어 각 프로세스가 PDF를 직접 열어 분석 (구간 순서대로 전달)
+        shard_size = -(-page_count // workers)
+        ranges = [(start, min(start + shard_size, page_count)) for start in range(0, page_count, shard_size)]
+        print(f"[PDF] 페이지 병렬 분석: {page_count}페이지 → {len(ranges)}개 구간 (프로세스 {workers}개)")
+        pages_yielded = 0
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                shards = executor.map(
+                    _analyze_page_range_in_worker, [pdf_path] * len(ranges), ranges,
+                    [self.enable_layout_analysis] * len(ranges), [self.layout_backend] * len(ranges),
+                    [self.enable_table_screening] * len(ranges)
+                )
+                for shard in shards:
+                    for result in shard:
+                        pages_yielded += 1
+                        yield pages_yielded, result
+        except Exception as e:
+            print(f"[PDF][WARN] 페이지 병렬 분석 실패, 순차 처리로 전환: {e}")
+            results = _analyze_page_range_in_worker(
+                pdf_path, (pages_yielded, page_count), self.enable_layout_analysis,
+                self.layout_backend, self.enable_table_screening
+            )
+            for page_num, result in enumerate(results, pages_yielded + 1):
+                yield page_num, result
+    
+    def incoming_section_titles(self, pdf_path: str) -> Dict[int, str]:
+        """페이지 번호(1부터) → 페이지 시작 시점의 섹션 제목 (앞 페이지에서 이어받은 청크 문맥)
+
+        페이지 해시에 반영하여 앞쪽 제목이 바뀌면 뒤 페이지도 다시 청킹되도록 한다.
+        같은 파일(경로/크기/수정 시각)은 분석 결과를 재사용한다.
+        """
+        cached = self._cached_section_titles(pdf_path)
+        if cached is not None:
+            return cached
+        titles = {}
+        current_section_title = DOCUMENT_START_TITLE
+        for page_num, page_result in self._iter_page_results(pdf_path):
+            titles[page_num] = current_section_title
+            if page_result["elements"] is not None:
+                current_section_title = self._update_section_title(page_result["elements"], current_section_title)
+        self._section_title_cache = (_file_signature(pdf_path), titles)
+        return dict(titles)
+    
+    def _cached_section_titles(self, pdf_path: str) -> Optional[Dict[int, str]]:
+        """같은 파일의 페이지별 시작 섹션 제목 캐시 (없거나 파일이 바뀌었으면 None)"""
+        cache = self._section_title_cache
+        if cache is None or cache[0] != _file_signature(pdf_path):
+            return None
+        return dict(cache[1])
+    
+    def _add_table_stats(self, page_result: Dict[str, Any]) -> None:
+        """페이지 1장의 표 사전 판정 결과 누적"""
+        page_stats = self._collect_table_stats([page_result])
+        for key, value in page_stats.items():
+            self.last_table_stats[key] += value
     
-    def _create_page_summary_chunk(self, page, document_id: str, page_num: int, 
-                                 section_title: str) -> Chunk:
-        """페이지 전체 텍스트를 부모 청크로 생성"""
-        page_text = page.extract_text() or ""
+    @staticmethod
+    def _collect_table_stats(page_results: List[Dict[str, Any]]) -> Dict[str, int]:
+        """페이지별 표 사전 판정 결과 집계"""
+        checks = [result.get("table_check") for result in page_results]
+        return {
+            "pages_screened": sum(1 for check in checks if check),
+            "pages_skipped": checks.count("skipped"),
+            "pages_extracted": checks.count("extracted"),
+            "tables_found": sum(
+                1 for result in page_results for elem in (result.get("elements") or []) if elem.get("type") == "table"
+            ),
+        }
+    
+    def _page_worker_count(self, page_count: int) -> int:
+        """페이지 병렬 분석 프로세스 수 (1 = 순차)"""
+        if self.parallel_page_workers == 1 or page_count < self.parallel_min_pages:
+            return 1
+        # 수집 파이프라인 워커 프로세스 안에서는 파일 단위 병렬과 중첩하지 않음
+        if multiprocessing.parent_process() is not None:
+            return 1
+        workers = self.parallel_page_workers or (os.cpu_count() or 1)
+        return max(1, min(workers, page_count // max(1, self.min_pages_per_worker)))
+    
+    def _build_page_chunks(self, page_result: Dict[str, Any], document_id: str, page_num: int,
+                           section_title: str) -> Tuple[List[Chunk], str]:
+        """페이지 분석 결과 → (청크 목록, 다음 페이지의 섹션 제목)"""
+        chunks = []
         
-        return ChunkFactory.create_page_summary_chunk(
-            page_text=page_text,
-            document_id=document_id,
-            page_num=page_num,
-            section_title=section_title
-        )
+        # 1. Large 청크 생성 (페이지 전체) - Small-to-Large 아키텍처
+        if self.enable_small_to_large:
+            page_chunk = ChunkFactory.create_page_summary_chunk(
+                page_text=page_result["text"],
+                document_id=document_id,
+                page_num=page_num,
+                section_title=section_title
+            )
+            chunks.append(page_chunk)
+            parent_id = page_chunk.id
+        else:
+            parent_id = None
+        
+        # 2. Small 청크 생성 (Layout-Aware)
+        elements = page_result["elements"]
+        if elements is not None:
+            chunks.extend(self._process_page_elements(
+                elements, document_id, page_num, parent_id, section_title
+            ))
+            # 3. 섹션 제목 업데이트
+            section_title = self._update_section_title(elements, section_title)
+        elif page_result["text"]:
+            # 폴백: 기본 텍스트 추출
+            chunks.extend(self._create_basic_chunks(
+                page_result["text"], document_id, page_num, parent_id, section_title
+            ))
+        
+        return chunks, section_title
     
     def _process_page_elements(self, elements: List[Dict[str, Any]], 
                              document_id: str, page_num: int, 
@@ -741,6 +935,8 @@ class PDFChunkingEngine:
         stats["avg_char_count"] = total_chars / len(chunks)
         stats["pages_covered"] = len(stats["pages_covered"])
         stats["sections"] = len(stats["sections"])
+        # 직전 문서의 표 검출 사전 판정 통계 (생략/추출 페이지 수)
+        stats["table_detection"] = dict(self.last_table_stats)
         
         return stats
     
@@ -7,7 +7,14 @@ import fitz  # PyMuPDF
 import re
 from typing import List, Dict, Any, Tuple, Optional
 import statistics
+import numpy as np
 from dataclasses import dataclass
+from operator import itemgetter
+
+
+_CHAR_TEXT = itemgetter('text')
+_CHAR_FONTNAME = itemgetter('fontname')
+_CHAR_NUMERIC = itemgetter('top', 'x0', 'x1', 'bottom', 'size')
 
 
 @dataclass
@@ -18,6 +25,22 @@ class FontInfo:
     family: str = ""
 
 
+@dataclass
+class CharArrays:
+    """페이지 문자 정보 (열 단위 NumPy 배열)"""
+    text: List[str]
+    fontname: List[str]
+    top: np.ndarray
+    x0: np.ndarray
+    x1: np.ndarray
+    bottom: np.ndarray
+    size: np.ndarray
+    bold: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.text)
+
+
 @dataclass
 class TextBlock:
     """텍스트 블록 정보"""
@@ -31,15 +54,29 @@ class TextBlock:
 class PDFLayoutAnalyzer:
     """PDF의 시각적 레이아웃을 분석하는 클래스"""
     
-    def __init__(self):
+    def __init__(self, enable_table_screening: bool = True, min_ruling_lines: int = 6, min_aligned_rows: int = 3):
         self.title_font_threshold = 18.0  # 제목으로 간주할 최소 폰트 크기
         self.bold_threshold = 0.7  # 굵기 판별 임계값
         self.min_title_length = 3  # 최소 제목 길이
         self.max_title_length = 50  # 최대 제목 길이
+        self.enable_table_screening = enable_table_screening  # 표 후보 페이지에서만 extract_tables 실행
+        self.min_ruling_lines = min_ruling_lines  # 표 후보 판정 최소 괘선 수
+        self.min_aligned_rows = min_aligned_rows  # 표 후보 판정 최소 다열(3열 이상) 줄 수
+        self.last_table_check: Optional[str] = None  # 직전 페이지 표 검출 결과 ("skipped" | "extracted" | None)
+        self._cached_char_arrays: Optional[Tuple[Any, CharArrays]] = None
+    
+    def extract_page_text(self, page) -> str:
+        """페이지 전체 텍스트 (Small-to-Large 부모 청크/폴백용)"""
+        return page.extract_text() or ""
+    
+    def close(self) -> None:
+        """백엔드가 연 보조 리소스 정리 (pdfplumber 백엔드는 없음)"""
+        pass
     
     def analyze_page_elements(self, page) -> List[Dict[str, Any]]:
         """페이지의 시각적 요소를 분석하여 구조화된 리스트 반환"""
         elements = []
+        self.last_table_check = None
         
         try:
             # 1. 텍스트 블록과 폰트 정보 추출
@@ -102,7 +139,7 @@ class PDFLayoutAnalyzer:
             print(f"페이지 분석 중 오류 발생: {e}")
             # 폴백: 기본 텍스트 추출
             try:
-                basic_text = page.extract_text()
+                basic_text = self.extract_page_text(page)
                 if basic_text:
                     elements.append({
                         "type": "paragraph",
@@ -121,25 +158,10 @@ class PDFLayoutAnalyzer:
         try:
             # pdfplumber 사용 (더 정확한 폰트 정보)
             if hasattr(page, 'chars'):
-                # 문자 단위로 폰트 정보 추출
+                # 문자 정보를 열 단위 배열로 1회 변환 후 블록 분할/폰트/좌표를 벡터 연산으로 계산
                 chars = page.chars
                 if chars:
-                    # 문자들을 블록으로 그룹화
-                    blocks = self._group_chars_into_blocks(chars)
-                    for block_chars in blocks:
-                        if block_chars:
-                            text = ''.join([char['text'] for char in block_chars])
-                            if text.strip():
-                                font_info = self._extract_font_from_chars(block_chars)
-                                coords = self._calculate_block_coordinates(block_chars)
-                                
-                                text_blocks.append(TextBlock(
-                                    text=text,
-                                    font_size=font_info.size,
-                                    is_bold=font_info.is_bold,
-                                    coordinates=coords,
-                                    font_family=font_info.family
-                                ))
+                    text_blocks = self._blocks_from_char_arrays(self._page_char_arrays(page))
             
             # 폴백: 기본 텍스트 추출
             if not text_blocks:
@@ -169,69 +191,82 @@ class PDFLayoutAnalyzer:
         
         return text_blocks
     
-    def _group_chars_into_blocks(self, chars) -> List[List[Dict]]:
-        """문자들을 블록으로 그룹화"""
-        if not chars:
-            return []
-        
-        blocks = []
-        current_block = []
-        
-        for char in chars:
-            if not current_block:
-                current_block.append(char)
-            else:
-                # 같은 줄에 있고 폰트가 비슷하면 같은 블록
-                last_char = current_block[-1]
-                # 폰트 크기 키 확인 (size 또는 fontsize)
-                char_size = char.get('size', char.get('fontsize', 12.0))
-                last_size = last_char.get('size', last_char.get('fontsize', 12.0))
-                
-                if (abs(char.get('top', 0) - last_char.get('top', 0)) < 5 and  # 같은 줄
-                    abs(char_size - last_size) < 2):  # 비슷한 폰트 크기
-                    current_block.append(char)
-                else:
-                    if current_block:
-                        blocks.append(current_block)
-                    current_block = [char]
-        
-        if current_block:
-            blocks.append(current_block)
-        
-        return blocks
+    def _page_char_arrays(self, page) -> CharArrays:
+        """현재 페이지 문자 배열 (블록 분석과 표 후보 판정에서 재사용)"""
+        if self._cached_char_arrays is None or self._cached_char_arrays[0] is not page:
+            self._cached_char_arrays = (page, self._char_arrays(page.chars))
+        return self._cached_char_arrays[1]
     
-    def _extract_font_from_chars(self, chars) -> FontInfo:
-        """문자들로부터 폰트 정보 추출"""
-        if not chars:
-            return FontInfo(size=12.0, is_bold=False)
-        
-        # 가장 빈번한 폰트 크기 사용 (size 또는 fontsize 키 확인)
-        font_sizes = [char.get('size', char.get('fontsize', 12.0)) for char in chars]
-        most_common_size = max(set(font_sizes), key=font_sizes.count) if font_sizes else 12.0
-        
-        # 굵기 판별 (문자 속성 기반)
-        is_bold = any(char.get('fontname', '').lower().find('bold') != -1 for char in chars)
-        
-        # 폰트 패밀리
-        font_family = chars[0].get('fontname', 'Arial') if chars else 'Arial'
-        
-        return FontInfo(
-            size=most_common_size,
-            is_bold=is_bold,
-            family=font_family
+    def _char_arrays(self, chars: List[Dict[str, Any]]) -> CharArrays:
+        """pdfplumber 문자 dict 리스트 → 열 단위 배열 (dict 순회는 여기서 1회만)"""
+        try:
+            # pdfplumber 문자는 항상 이 키를 가짐 → itemgetter로 일괄 추출
+            texts = list(map(_CHAR_TEXT, chars))
+            fontnames = list(map(_CHAR_FONTNAME, chars))
+            numeric = np.array(list(map(_CHAR_NUMERIC, chars)), dtype=np.float64)
+        except KeyError:
+            # 폰트 크기 키 확인 (size 또는 fontsize)
+            texts = [char.get('text', '') for char in chars]
+            fontnames = [char.get('fontname', 'Arial') for char in chars]
+            numeric = np.array(
+                [(char.get('top', 0), char.get('x0', 0), char.get('x1', 0), char.get('bottom', 0),
+                  char.get('size', char.get('fontsize', 12.0))) for char in chars],
+                dtype=np.float64
+            )
+        numeric = numeric.reshape(-1, 5)
+        # 굵기 판별은 폰트명 단위로 1회만 수행
+        bold_by_font = {name: 'bold' in name.lower() for name in set(fontnames)}
+        return CharArrays(
+            text=texts,
+            fontname=fontnames,
+            top=numeric[:, 0],
+            x0=numeric[:, 1],
+            x1=numeric[:, 2],
+            bottom=numeric[:, 3],
+            size=numeric[:, 4],
+            bold=np.fromiter(map(bold_by_font.__getitem__, fontnames), dtype=bool, count=len(fontnames)),
         )
     
-    def _calculate_block_coordinates(self, chars) -> Tuple[float, float, float, float]:
-        """블록의 좌표 계산"""
-        if not chars:
-            return (0, 0, 0, 0)
+    def _segment_blocks(self, arrays: CharArrays) -> np.ndarray:
+        """블록 시작 인덱스: 직전 문자와 다른 줄이거나 폰트 크기가 크게 다르면 새 블록"""
+        if len(arrays) == 0:
+            return np.zeros(0, dtype=np.intp)
+        breaks = (np.abs(np.diff(arrays.top)) >= 5) | (np.abs(np.diff(arrays.size)) >= 2)
+        return np.concatenate(([0], np.flatnonzero(breaks) + 1))
+    
+    def _blocks_from_char_arrays(self, arrays: CharArrays) -> List[TextBlock]:
+        """블록별 텍스트/최빈 폰트 크기/굵기/좌표를 reduceat·bincount로 일괄 계산"""
+        starts = self._segment_blocks(arrays)
+        if len(starts) == 0:
+            return []
+        ends = np.append(starts[1:], len(arrays))
+        
+        # 좌표: 블록별 min/max
+        x1 = np.minimum.reduceat(arrays.x0, starts)
+        y1 = np.minimum.reduceat(arrays.top, starts)
+        x2 = np.maximum.reduceat(arrays.x1, starts)
+        y2 = np.maximum.reduceat(arrays.bottom, starts)
+        is_bold = np.maximum.reduceat(arrays.bold.astype(np.uint8), starts).astype(bool)
         
-        x1 = min(char['x0'] for char in chars)
-        y1 = min(char['top'] for char in chars)
-        x2 = max(char['x1'] for char in chars)
-        y2 = max(char['bottom'] for char in chars)
+        # 최빈 폰트 크기: (블록, 크기) 쌍 빈도 집계 (동률이면 작은 크기)
+        sizes, size_codes = np.unique(arrays.size, return_inverse=True)
+        block_ids = np.repeat(np.arange(len(starts)), ends - starts)
+        counts = np.bincount(block_ids * len(sizes) + size_codes, minlength=len(starts) * len(sizes))
+        mode_sizes = sizes[counts.reshape(len(starts), len(sizes)).argmax(axis=1)]
         
-        return (x1, y1, x2, y2)
+        text_blocks = []
+        for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+            text = ''.join(arrays.text[start:end])
+            if not text.strip():
+                continue
+            text_blocks.append(TextBlock(
+                text=text,
+                font_size=float(mode_sizes[i]),
+                is_bold=bool(is_bold[i]),
+                coordinates=(float(x1[i]), float(y1[i]), float(x2[i]), float(y2[i])),
+                font_family=arrays.fontname[start]
+            ))
+        return text_blocks
     
     def _calculate_font_statistics(self, text_blocks: List[TextBlock]) -> Dict[str, float]:
         """폰트 크기 통계 계산"""
@@ -428,7 +463,47 @@ class PDFLayoutAnalyzer:
         return False
     
     def _extract_tables(self, page) -> List[Dict[str, Any]]:
-        """테이블 추출"""
+        """테이블 추출 (괘선/정렬 열 사전 판정으로 표 후보 페이지만 전체 추출)"""
+        if self.enable_table_screening and not self._looks_tabular(page):
+            self.last_table_check = "skipped"
+            return []
+        self.last_table_check = "extracted"
+        return self._run_table_extractor(page)
+    
+    def _looks_tabular(self, page) -> bool:
+        """표 후보 페이지 판정: 수평/수직 괘선 수 또는 3열 이상으로 정렬된 줄 수"""
+        try:
+            if self._ruling_line_count(page) >= self.min_ruling_lines:
+                return True
+            return self._aligned_row_count(page) >= self.min_aligned_rows
+        except Exception as e:
+            # 판정 실패 시 누락 방지를 위해 전체 추출
+            print(f"표 후보 판정 중 오류: {e}")
+            return True
+    
+    def _ruling_line_count(self, page) -> int:
+        """pdfplumber 선/사각형 객체 중 수평/수직 괘선 수 (사각형은 4개로 계산)"""
+        horizontal_or_vertical = sum(
+            1 for line in page.lines
+            if abs(line["top"] - line["bottom"]) < 1 or abs(line["x0"] - line["x1"]) < 1
+        )
+        return horizontal_or_vertical + 4 * len(page.rects)
+    
+    def _aligned_row_count(self, page) -> int:
+        """문자 배열 기준, 같은 줄에서 글자 크기 2배 이상 간격으로 3개 이상 열이 나뉘는 줄 수"""
+        if not page.chars:
+            return 0
+        arrays = self._page_char_arrays(page)
+        if len(arrays) < 2:
+            return 0
+        line_ids = np.concatenate(([0], np.cumsum(np.abs(np.diff(arrays.top)) >= 5)))
+        gaps = arrays.x0[1:] - arrays.x1[:-1]
+        column_breaks = (line_ids[1:] == line_ids[:-1]) & (gaps > 2 * np.maximum(arrays.size[1:], 1.0))
+        breaks_per_line = np.bincount(line_ids[1:][column_breaks], minlength=line_ids[-1] + 1)
+        return int(np.count_nonzero(breaks_per_line >= 2))
+    
+    def _run_table_extractor(self, page) -> List[Dict[str, Any]]:
+        """테이블 추출 (pdfplumber 전체 표 검출)"""
         tables = []
         
         try:
@@ -480,3 +555,173 @@ class PDFLayoutAnalyzer:
             return (coords[1], coords[0])  # (y, x) 순서로 정렬
         
         return sorted(elements, key=get_position)
+
+
+class PyMuPDFLayoutAnalyzer(PDFLayoutAnalyzer):
+    """PyMuPDF span 기반 레이아웃 분석기
+    
+    page.get_text("dict")의 span(폰트 크기/플래그/bbox)을 그대로 사용하여
+    pdfplumber의 문자 단위 dict 생성 비용을 없앰. 요소 스키마는 PDFLayoutAnalyzer와 동일.
+    표 추출은 표 후보 페이지에 한해 pdfplumber로 수행.
+    """
+    
+    BOLD_FLAG = 16  # PyMuPDF span flags: bit 4 = bold
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._page_key = None
+        self._page_dict: Optional[Dict[str, Any]] = None
+        self._plumber_pdfs: Dict[str, Any] = {}
+    
+    def close(self) -> None:
+        for pdf in self._plumber_pdfs.values():
+            try:
+                pdf.close()
+            except Exception:
+                pass
+        self._plumber_pdfs.clear()
+        self._page_key = None
+        self._page_dict = None
+    
+    def _get_page_dict(self, page) -> Dict[str, Any]:
+        """페이지 dict 1회 추출 후 재사용 (텍스트/블록/표 판정 공용)"""
+        key = (page.parent.name, page.number)
+        if key != self._page_key:
+            self._page_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP)
+            self._page_key = key
+        return self._page_dict
+    
+    def _text_lines(self, page) -> List[List[Dict[str, Any]]]:
+        """텍스트 줄 목록 (줄 = 비어 있지 않은 span 리스트)"""
+        lines = []
+        for block in self._get_page_dict(page).get("blocks", []):
+            if block.get("type", 0) != 0:
+                continue
+            for line in block.get("lines", []):
+                spans = [span for span in line.get("spans", []) if span.get("text")]
+                if spans:
+                    lines.append(spans)
+        return lines
+    
+    def extract_page_text(self, page) -> str:
+        return "\n".join("".join(span["text"] for span in spans) for spans in self._text_lines(page)).strip()
+    
+    def _extract_text_blocks_with_font(self, page) -> List[TextBlock]:
+        """줄 단위로 span을 묶고, 폰트 크기가 크게 바뀌면 블록 분리 (pdfplumber 그룹화와 동일 기준)"""
+        text_blocks = []
+        try:
+            for spans in self._text_lines(page):
+                group = [spans[0]]
+                for span in spans[1:]:
+                    if abs(span["size"] - group[-1]["size"]) < 2:
+                        group.append(span)
+                    else:
+                        self._append_span_block(text_blocks, group)
+                        group = [span]
+                self._append_span_block(text_blocks, group)
+        except Exception as e:
+            print(f"텍스트 블록 추출 중 오류: {e}")
+        
+        if not text_blocks:
+            basic_text = page.get_text() if hasattr(page, "get_text") else ""
+            if basic_text and basic_text.strip():
+                text_blocks.append(TextBlock(
+                    text=basic_text,
+                    font_size=12.0,
+                    is_bold=False,
+                    coordinates=(0, 0, 100, 100)
+                ))
+        return text_blocks
+    
+    def _append_span_block(self, text_blocks: List[TextBlock], spans: List[Dict[str, Any]]) -> None:
+        text = "".join(span["text"] for span in spans)
+        if not text.strip():
+            return
+        # 가장 많은 문자를 차지하는 폰트 크기 (pdfplumber 백엔드의 최빈값과 동일 의미)
+        size_weights: Dict[float, int] = {}
+        for span in spans:
+            size = round(span["size"], 2)
+            size_weights[size] = size_weights.get(size, 0) + len(span["text"])
+        font_size = max(size_weights, key=size_weights.get)
+        is_bold = any(
+            span["flags"] & self.BOLD_FLAG or "bold" in span.get("font", "").lower() for span in spans
+        )
+        x0s, y0s, x1s, y1s = zip(*(span["bbox"] for span in spans))
+        text_blocks.append(TextBlock(
+            text=text,
+            font_size=font_size,
+            is_bold=is_bold,
+            coordinates=(min(x0s), min(y0s), max(x1s), max(y1s)),
+            font_family=spans[0].get("font", "")
+        ))
+    
+    def _ruling_line_count(self, page) -> int:
+        """벡터 그리기 명령의 수평/수직 선 수 (사각형은 4개로 계산)"""
+        ruling = 0
+        try:
+            for path in page.get_drawings():
+                for item in path.get("items", []):
+                    if item[0] == "re":
+                        ruling += 4
+                    elif item[0] == "l":
+                        p1, p2 = item[1], item[2]
+                        if abs(p1.x - p2.x) < 1 or abs(p1.y - p2.y) < 1:
+                            ruling += 1
+                if ruling >= self.min_ruling_lines:
+                    break
+        except Exception:
+            pass
+        return ruling
+    
+    def _aligned_row_count(self, page) -> int:
+        """같은 기준선의 span(블록 무관)이 큰 간격으로 3개 이상 열로 나뉘는 줄 수"""
+        spans = sorted(
+            (span for spans in self._text_lines(page) for span in spans if span["text"].strip()),
+            key=lambda span: (round(span["origin"][1]), span["bbox"][0])
+        )
+        aligned_rows = 0
+        columns = 0
+        prev = None
+        for span in spans:
+            if prev is None or abs(span["origin"][1] - prev["origin"][1]) >= 3:
+                aligned_rows += columns >= 3
+                columns = 1
+            elif span["bbox"][0] - prev["bbox"][2] > 2 * max(span["size"], 1.0):
+                columns += 1
+            prev = span
+        return aligned_rows + (columns >= 3)
+    
+    def _run_table_extractor(self, page) -> List[Dict[str, Any]]:
+        """표 후보 페이지만 pdfplumber로 열어 표 추출"""
+        path = page.parent.name
+        try:
+            plumber_pdf = self._plumber_pdfs.get(path)
+            if plumber_pdf is None:
+                plumber_pdf = pdfplumber.open(path)
+                self._plumber_pdfs[path] = plumber_pdf
+            plumber_page = plumber_pdf.pages[page.number]
+            tables = self._plumber_tables(plumber_page)
+            plumber_page.flush_cache()
+            return tables
+        except Exception as e:
+            print(f"테이블 추출 중 오류: {e}")
+            return []
+    
+    def _plumber_tables(self, plumber_page) -> List[Dict[str, Any]]:
+        return super()._run_table_extractor(plumber_page)
+
+
+def create_layout_analyzer(backend: str = "pdfplumber", enable_table_screening: bool = True) -> PDFLayoutAnalyzer:
+    """레이아웃 분석 백엔드 생성 ("pdfplumber" | "pymupdf")"""
+    if backend == "pymupdf":
+        return PyMuPDFLayoutAnalyzer(enable_table_screening=enable_table_screening)
+    return PDFLayoutAnalyzer(enable_table_screening=enable_table_screening)
+
+
+def open_pdf_pages(pdf_path: str, backend: str = "pdfplumber"):
+    """백엔드에 맞는 PDF 문서 열기 → (문서, 페이지 시퀀스). 문서는 with 문으로 닫음"""
+    if backend == "pymupdf":
+        doc = fitz.open(pdf_path)
+        return doc, doc
+    pdf = pdfplumber.open(pdf_path)
+    return pdf, pdf.pages
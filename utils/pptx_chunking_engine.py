@@ -3,15 +3,93 @@ PPTX 슬라이드 중심 청킹 엔진
 Small-to-Large 아키텍처와 paragraph.level 기반 불릿 그룹핑
 Vision-Augmented 청킹 지원
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Set
 from pptx import Presentation
 import uuid
 import re
 import base64
 import io
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from .pptx_chunking import PPTXChunk, PPTXChunkMetadata, PPTXChunkFactory, PPTX_CHUNK_TYPE_WEIGHTS
 from .chunking_fallback import ChunkingFallback
+from .slide_vision import VisionResultCache, prepare_vision_image
+
+
+# Vision LLM 슬라이드 분석 프롬프트 (분석 결과 캐시 키에 포함)
+_VISION_PROMPT = """이 비즈니스 슬라이드를 분석하여 RAG 검색에 최적화된 설명을 제공하세요.
+
+**분석 단계:**
+1단계 [이미지 인식]: 슬라이드의 전반적인 구조와 레이아웃을 파악하세요.
+2단계 [텍스트 추출]: 모든 텍스트(제목, 라벨, 범례 등)를 정확히 추출하세요.
+3단계 [데이터 분석]: 표나 그래프의 데이터 구조를 이해하세요.
+4단계 [수치 추출]: 모든 숫자값을 항목명과 함께 정확히 추출하세요.
+5단계 [관계 분석]: 데이터 간의 비교, 추이, 관계를 분석하세요.
+
+**필수 항목:**
+1. **주제**: 핵심 메시지 (1문장, 슬라이드의 목적과 결론 포함)
+2. **데이터 타입**: 표/그래프 형태 상세 설명
+   - 표: 행/열 개수, 구조 (예: "3행 4열 매출 비교표")
+   - 그래프: 유형 (막대/선/파이 등), 축 라벨, 시계열 여부
+3. **구체적 수치**: 모든 숫자값을 항목명과 함께 (단위 포함)
+   - 형식: "항목명: 값 (단위)" 또는 "항목명 [시간/기간]: 값"
+   - 배열 순서: 논리적 순서 유지 (시간순, 크기순 등)
+4. **항목명**: 표의 행/열 제목, 그래프 범례, 축 라벨
+5. **비교/추이**: 
+   - 전기 대비 변화율
+   - 목표 대비 달성률
+   - 시계열 추이 (증가/감소/유지)
+   - 상대적 비교 (최대/최소, 평균 대비)
+
+**출력 형식 (구조화):**
+```
+주제: [핵심 메시지]
+
+데이터 유형: [표/그래프 상세 설명]
+- 구조: [행/열 개수 또는 그래프 유형]
+- 축/범례: [축 라벨, 범례 항목]
+
+주요 수치:
+- [항목1]: [값1] ([단위])
+- [항목2]: [값2] ([단위])
+...
+
+비교 및 추이:
+- [비교 항목1]: [변화율/차이]
+- [추이 분석]: [패턴 설명]
+```
+
+**예시:**
+주제: 2024년 1분기 경영 성과 분석 - 온라인/B2B 성장세 지속
+
+데이터 유형: Q1-Q4 분기별 온라인/오프라인/B2B 매출 비교 테이블
+- 구조: 3행(채널) × 4열(분기) 매출 비교표
+- 단위: 억원
+
+주요 수치:
+- Q1 온라인: 150억원
+- Q1 오프라인: 200억원
+- Q1 B2B: 100억원
+- Q2 온라인: 180억원
+- Q2 오프라인: 210억원
+- Q2 B2B: 115억원
+- Q3 온라인: 190억원
+- Q3 오프라인: 220억원
+- Q3 B2B: 125억원
+- Q4 온라인: 195억원
+- Q4 오프라인: 230억원
+- Q4 B2B: 130억원
+
+비교 및 추이:
+- 온라인 Q4/Q1 성장률: +30% (150억 → 195억)
+- 오프라인 Q4/Q1 성장률: +15% (200억 → 230억)
+- B2B Q4/Q1 성장률: +30% (100억 → 130억)
+- 총 매출 (Q4): 555억원
+
+**주의사항:**
+- 텍스트가 흐릿하거나 읽기 어려운 경우, 가능한 범위 내에서 추정하되 "[추정]" 표시
+- 숫자가 명확하지 않은 경우, 근사값 표시 및 "[약]" 표시
+- 그래프에서 정확한 수치를 추출할 수 없는 경우, 상대적 비교만 수행"""
 
 
 class PPTXChunkingEngine:
@@ -31,102 +109,146 @@ class PPTXChunkingEngine:
                               llm_api_type: str = None,
                               llm_base_url: str = None,
                               llm_model: str = None,
-                              llm_api_key: str = None) -> List[PPTXChunk]:
+                              llm_api_key: str = None,
+                              vision_options: Optional[Dict[str, Any]] = None) -> List[PPTXChunk]:
         """PPTX 문서를 슬라이드 구조 인식 기반으로 청킹"""
         all_chunks = []
+        try:
+            for chunk in self.iter_pptx_chunks(pptx_path, enable_vision, llm_api_type,
+                                               llm_base_url, llm_model, llm_api_key,
+                                               vision_options=vision_options):
+                all_chunks.append(chunk)
+        
+        except Exception as e:
+            print(f"PPTX 처리 중 오류 발생: {e}")
+            import traceback
+            traceback.print_exc()
+            # 에러 발생 시 빈 리스트 반환 (상위에서 폴백 처리)
+            return []
+        
+        print(f"총 {len(all_chunks)}개 청크 생성 완료")
+        return all_chunks
+    
+    def iter_pptx_chunks(self, pptx_path: str,
+                         enable_vision: bool = False,
+                         llm_api_type: str = None,
+                         llm_base_url: str = None,
+                         llm_model: str = None,
+                         llm_api_key: str = None,
+                         slides: Optional[Set[int]] = None,
+                         vision_options: Optional[Dict[str, Any]] = None) -> Iterator[PPTXChunk]:
+        """슬라이드 단위로 청크 생성 (오류는 호출자에게 전달)
+
+        slides: 처리할 슬라이드 번호(1부터) 집합, None이면 전체 (증분 재업로드용)
+        vision_options: Vision 분석 설정 (max_concurrency, image_max_side, jpeg_quality, cache_enabled, cache_dir)
+        """
         document_id = str(uuid.uuid4())
         
         # Vision 청킹을 위해 pptx_path 저장 (COM 렌더링용)
         self.pptx_path = pptx_path if enable_vision else None
         
-        try:
-            presentation = Presentation(pptx_path)
-            
-            # Vision 청킹을 위해 presentation 객체 저장 (슬라이드 크기 추출용)
-            if enable_vision:
-                self.presentation = presentation
-            
-            # Vision 청킹 사용 시: 모든 슬라이드 이미지를 먼저 렌더링
-            slide_images = {}
-            if enable_vision and llm_api_type and llm_base_url and llm_model:
-                print("[Vision] 모든 슬라이드 이미지 렌더링 중...")
-                # COM 방식 사용 시 한 번에 모든 슬라이드 렌더링
-                if sys.platform == "win32":
-                    try:
-                        slide_images = self._render_all_slides_via_com(len(presentation.slides))
-                        print(f"[Vision] [OK] COM으로 {len(slide_images)}개 슬라이드 렌더링 완료")
-                    except Exception as e:
-                        print(f"[Vision] [WARN] COM 방식 실패: {e}, Pillow 방식으로 폴백")
-                        # 폴백: 슬라이드별 Pillow 렌더링
-                        for slide_index, slide in enumerate(presentation.slides):
-                            try:
-                                slide_images[slide_index] = self._slide_to_base64_image(slide, slide_index)
-                                print(f"  [OK] 슬라이드 {slide_index + 1} 렌더링 완료")
-                            except Exception as e:
-                                print(f"  [WARN] 슬라이드 {slide_index + 1} 렌더링 실패: {e}")
-                else:
-                    # 비-Windows: Pillow로 슬라이드별 렌더링
+        presentation = Presentation(pptx_path)
+        
+        # Vision 청킹을 위해 presentation 객체 저장 (슬라이드 크기 추출용)
+        if enable_vision:
+            self.presentation = presentation
+        
+        # Vision 청킹 사용 시: 모든 슬라이드 이미지를 먼저 렌더링
+        slide_images = {}
+        if enable_vision and llm_api_type and llm_base_url and llm_model:
+            print("[Vision] 모든 슬라이드 이미지 렌더링 중...")
+            # COM 방식 사용 시 한 번에 모든 슬라이드 렌더링
+            if sys.platform == "win32":
+                try:
+                    slide_images = self._render_all_slides_via_com(len(presentation.slides))
+                    print(f"[Vision] [OK] COM으로 {len(slide_images)}개 슬라이드 렌더링 완료")
+                except Exception as e:
+                    print(f"[Vision] [WARN] COM 방식 실패: {e}, Pillow 방식으로 폴백")
+                    # 폴백: 슬라이드별 Pillow 렌더링
                     for slide_index, slide in enumerate(presentation.slides):
                         try:
                             slide_images[slide_index] = self._slide_to_base64_image(slide, slide_index)
                             print(f"  [OK] 슬라이드 {slide_index + 1} 렌더링 완료")
                         except Exception as e:
                             print(f"  [WARN] 슬라이드 {slide_index + 1} 렌더링 실패: {e}")
-                
-                print(f"[Vision] 총 {len(slide_images)}개 슬라이드 렌더링 완료")
+            else:
+                # 비-Windows: Pillow로 슬라이드별 렌더링
+                for slide_index, slide in enumerate(presentation.slides):
+                    if slides is not None and slide_index + 1 not in slides:
+                        continue
+                    try:
+                        slide_images[slide_index] = self._slide_to_base64_image(slide, slide_index)
+                        print(f"  [OK] 슬라이드 {slide_index + 1} 렌더링 완료")
+                    except Exception as e:
+                        print(f"  [WARN] 슬라이드 {slide_index + 1} 렌더링 실패: {e}")
             
-            # 슬라이드별 청크 생성
-            slides_list = list(presentation.slides)  # Phase 2: 전체 슬라이드 리스트 저장
-            for slide_index, slide in enumerate(slides_list):
-                slide_number = slide_index + 1
-                print(f"슬라이드 {slide_number} 처리 중...")
-
-                # 슬라이드 제목 추출 (메타데이터용)
-                slide_title = self._extract_slide_title(slide)
-
-                # Phase 3: 슬라이드 타입 분류
-                slide_type = self._classify_slide_type(slide)
-                slide_type_weight = self._get_chunk_weight_by_slide_type(slide_type)
-                print(f"  슬라이드 타입: {slide_type} (가중치: {slide_type_weight})")
-
-                # 1. Large 청크 생성 (슬라이드 전체) - Small-to-Large 아키텍처
-                if self.enable_small_to_large:
-                    if enable_vision and slide_index in slide_images:
-                        # Vision 청킹 사용 (이미 렌더링된 이미지 재사용)
-                        slide_chunk = self._create_slide_summary_chunk_with_vision(
-                            slide, document_id, slide_number, slide_title, slide_index,
-                            llm_api_type, llm_base_url, llm_model, llm_api_key or "",
-                            slide_images[slide_index],  # 미리 렌더링된 이미지 전달
-                            slide_type, slide_type_weight  # Phase 3: 슬라이드 타입 전달
-                        )
-                    else:
-                        # Phase 2: 텍스트 청킹 + 슬라이드 문맥 추가
-                        slide_chunk = self._create_slide_summary_chunk(
-                            slide, document_id, slide_number, slide_title,
-                            slides_list, slide_index,  # Phase 2: 전체 슬라이드와 인덱스 전달
-                            slide_type, slide_type_weight  # Phase 3: 슬라이드 타입 전달
-                        )
-                    all_chunks.append(slide_chunk)
-                    parent_id = slide_chunk.id
+            print(f"[Vision] 총 {len(slide_images)}개 슬라이드 렌더링 완료")
+
+        # Vision 분석은 동시 요청 수를 제한한 스레드 풀에서 미리 시작 (슬라이드 순서대로 결과 수거)
+        vision_futures: Dict[int, Future] = {}
+        vision_executor = None
+        if slide_images:
+            vision_executor, vision_futures = self._start_vision_analysis(
+                slide_images, slides, llm_api_type, llm_base_url, llm_model, llm_api_key or "", vision_options
+            )
+
+        try:
+            yield from self._iter_slide_chunks(presentation, document_id, enable_vision, slides, vision_futures,
+                                               llm_api_type, llm_base_url, llm_model, llm_api_key)
+        finally:
+            if vision_executor is not None:
+                # 소비자가 중간에 멈추면 대기 중인 요청 취소
+                vision_executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_slide_chunks(self, presentation, document_id: str, enable_vision: bool,
+                           slides: Optional[Set[int]], vision_futures: Dict[int, Future],
+                           llm_api_type: str, llm_base_url: str, llm_model: str,
+                           llm_api_key: str) -> Iterator[PPTXChunk]:
+        """슬라이드 순서대로 요약(Large) + 요소(Small) 청크 생성"""
+        # 슬라이드별 청크 생성
+        slides_list = list(presentation.slides)  # Phase 2: 전체 슬라이드 리스트 저장
+        for slide_index, slide in enumerate(slides_list):
+            slide_number = slide_index + 1
+            if slides is not None and slide_number not in slides:
+                continue
+            print(f"슬라이드 {slide_number} 처리 중...")
+
+            # 슬라이드 제목 추출 (메타데이터용)
+            slide_title = self._extract_slide_title(slide)
+
+            # Phase 3: 슬라이드 타입 분류
+            slide_type = self._classify_slide_type(slide)
+            slide_type_weight = self._get_chunk_weight_by_slide_type(slide_type)
+            print(f"  슬라이드 타입: {slide_type} (가중치: {slide_type_weight})")
+
+            # 1. Large 청크 생성 (슬라이드 전체) - Small-to-Large 아키텍처
+            if self.enable_small_to_large:
+                if enable_vision and slide_index in vision_futures:
+                    # Vision 청킹 사용 (미리 시작한 분석 결과 사용)
+                    slide_chunk = self._create_slide_summary_chunk_with_vision(
+                        slide, document_id, slide_number, slide_title, slide_index,
+                        llm_api_type, llm_base_url, llm_model, llm_api_key or "",
+                        None, slide_type, slide_type_weight,  # Phase 3: 슬라이드 타입 전달
+                        vision_future=vision_futures.pop(slide_index)
+                    )
                 else:
-                    parent_id = None
+                    # Phase 2: 텍스트 청킹 + 슬라이드 문맥 추가
+                    slide_chunk = self._create_slide_summary_chunk(
+                        slide, document_id, slide_number, slide_title,
+                        slides_list, slide_index,  # Phase 2: 전체 슬라이드와 인덱스 전달
+                        slide_type, slide_type_weight  # Phase 3: 슬라이드 타입 전달
+                    )
+                yield slide_chunk
+                parent_id = slide_chunk.id
+            else:
+                parent_id = None
 
-                # 2. Small 청크 생성
-                slide_chunks = self._process_slide_elements(
-                    slide, document_id, slide_number, parent_id, slide_title,
-                    slide_type, slide_type_weight  # Phase 3: 슬라이드 타입 전달
-                )
-                all_chunks.extend(slide_chunks)
-        
-        except Exception as e:
-            print(f"PPTX 처리 중 오류 발생: {e}")
-            import traceback
-            traceback.print_exc()
-            # 에러 발생 시 빈 리스트 반환 (상위에서 폴백 처리)
-            return []
-        
-        print(f"총 {len(all_chunks)}개 청크 생성 완료")
-        return all_chunks
+            # 2. Small 청크 생성
+            slide_chunks = self._process_slide_elements(
+                slide, document_id, slide_number, parent_id, slide_title,
+                slide_type, slide_type_weight  # Phase 3: 슬라이드 타입 전달
+            )
+            yield from slide_chunks
     
     def _extract_slide_title(self, slide) -> str:
         """슬라이드 제목 추출"""
@@ -1095,18 +1217,25 @@ class PPTXChunkingEngine:
                                                 llm_api_type: str, llm_base_url: str,
                                                 llm_model: str, llm_api_key: str,
                                                 slide_img_base64: str = None,
-                                                slide_type: str = None, slide_type_weight: float = 1.0) -> PPTXChunk:
-        """슬라이드 전체를 부모 청크로 생성 (Vision LLM 사용) - Phase 3 Enhanced"""
+                                                slide_type: str = None, slide_type_weight: float = 1.0,
+                                                vision_future: Optional[Future] = None) -> PPTXChunk:
+        """슬라이드 전체를 부모 청크로 생성 (Vision LLM 사용) - Phase 3 Enhanced
+
+        vision_future: 미리 시작한 Vision 분석 (없으면 여기서 직접 요청)
+        """
 
         # 1. 기본 텍스트 추출
         slide_text = self._extract_full_text_from_slide(slide)
 
         # 2. Vision LLM으로 시각적 분석 추가 (이미 렌더링된 이미지 사용)
         try:
-            vision_description = self._analyze_slide_with_vision(
-                slide, slide_index, llm_api_type, llm_base_url, llm_model, llm_api_key,
-                slide_img_base64  # 미리 렌더링된 이미지 전달
-            )
+            if vision_future is not None:
+                vision_description = vision_future.result()
+            else:
+                vision_description = self._analyze_slide_with_vision(
+                    slide, slide_index, llm_api_type, llm_base_url, llm_model, llm_api_key,
+                    slide_img_base64  # 미리 렌더링된 이미지 전달
+                )
             # Vision 설명을 텍스트 앞에 추가
             enhanced_text = f"""[Vision Analysis]
 {vision_description}
@@ -1132,9 +1261,85 @@ class PPTXChunkingEngine:
 
         return chunk
     
+    def _vision_settings(self, vision_options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        settings = {
+            "max_concurrency": self.config.get("vision_max_concurrency", 4),
+            "image_max_side": self.config.get("vision_image_max_side", 1280),
+            "jpeg_quality": self.config.get("vision_jpeg_quality", 85),
+            "cache_enabled": self.config.get("vision_cache_enabled", True),
+            "cache_dir": self.config.get("vision_cache_dir", "data/vision_cache"),
+        }
+        settings.update(vision_options or {})
+        if "vision_enabled" not in settings or "vision_mode" not in settings:
+            # _analyze_slide_with_vision과 같은 비전 설정 (캐시 키/캐시 사용 여부 판단)
+            from config import ConfigManager
+            cfg = ConfigManager().get_all()
+            settings.setdefault("vision_enabled", cfg.get("vision_enabled", True))
+            settings.setdefault("vision_mode", cfg.get("vision_mode", "auto"))
+        return settings
+
+    def _start_vision_analysis(self, slide_images: Dict[int, str], slides: Optional[Set[int]],
+                               llm_api_type: str, llm_base_url: str, llm_model: str, llm_api_key: str,
+                               vision_options: Optional[Dict[str, Any]] = None):
+        """렌더링된 슬라이드의 Vision 분석을 제한된 동시 요청 수로 시작
+
+        Returns:
+            (executor, {슬라이드 인덱스: Future})
+        """
+        settings = self._vision_settings(vision_options)
+        cache = VisionResultCache(settings["cache_dir"]) if settings["cache_enabled"] else None
+        max_workers = max(1, int(settings["max_concurrency"]))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pptx-vision")
+        futures = {}
+        for slide_index in sorted(slide_images):
+            if slides is not None and slide_index + 1 not in slides:
+                continue
+            # 렌더링 이미지는 요청 작업에만 남기고 dict에서 해제
+            futures[slide_index] = executor.submit(
+                self._analyze_slide_cached, slide_index, slide_images.pop(slide_index),
+                llm_api_type, llm_base_url, llm_model, llm_api_key, settings, cache
+            )
+        slide_images.clear()
+        print(f"[Vision] 슬라이드 {len(futures)}개 분석 시작 (동시 요청 {max_workers}개, "
+              f"최대 {settings['image_max_side']}px, 캐시 {'사용' if cache else '사용 안 함'})")
+        return executor, futures
+
+    def _analyze_slide_cached(self, slide_index: int, slide_img_base64: str, llm_api_type: str,
+                              llm_base_url: str, llm_model: str, llm_api_key: str,
+                              settings: Dict[str, Any], cache: Optional[VisionResultCache] = None) -> str:
+        """캐시 조회 → 이미지 축소/JPEG 변환 → Vision LLM 분석 → 캐시 저장"""
+        max_side = int(settings["image_max_side"] or 0)
+        jpeg_quality = int(settings["jpeg_quality"] or 0)
+        key = None
+        # ollama/request 타입은 vision_enabled=False면 이미지 없이 텍스트 전용 요청 → 캐시하지 않음
+        sends_image = llm_api_type == "openai" or bool(settings["vision_enabled"])
+        if cache is not None and sends_image:
+            key = VisionResultCache.make_key(slide_img_base64, llm_api_type, llm_base_url, llm_model,
+                                             settings["vision_mode"], _VISION_PROMPT, max_side, jpeg_quality)
+            cached = cache.get(key)
+            if cached is not None:
+                print(f"[Vision] 슬라이드 {slide_index + 1} 캐시 사용")
+                return cached
+
+        try:
+            image_base64, image_mime = prepare_vision_image(slide_img_base64, max_side, jpeg_quality)
+        except Exception as e:
+            print(f"[Vision][WARN] 슬라이드 {slide_index + 1} 이미지 축소 실패, 원본 사용: {e}")
+            image_base64, image_mime = slide_img_base64, "image/png"
+        del slide_img_base64
+
+        vision_text = self._analyze_slide_with_vision(
+            None, slide_index, llm_api_type, llm_base_url, llm_model, llm_api_key,
+            image_base64, image_mime=image_mime
+        )
+        if key is not None and vision_text:
+            cache.put(key, vision_text)
+        return vision_text
+
     def _analyze_slide_with_vision(self, slide, slide_index: int, llm_api_type: str, 
                                    llm_base_url: str, llm_model: str, 
-                                   llm_api_key: str, slide_img_base64: str = None) -> str:
+                                   llm_api_key: str, slide_img_base64: str = None,
+                                   image_mime: str = "image/png") -> str:
         """Vision LLM으로 슬라이드 이미지 분석"""
         import requests
         
@@ -1157,84 +1362,12 @@ class PPTXChunkingEngine:
                     "content": [
                         {
                             "type": "text",
-                            "text": """이 비즈니스 슬라이드를 분석하여 RAG 검색에 최적화된 설명을 제공하세요.
-
-**분석 단계:**
-1단계 [이미지 인식]: 슬라이드의 전반적인 구조와 레이아웃을 파악하세요.
-2단계 [텍스트 추출]: 모든 텍스트(제목, 라벨, 범례 등)를 정확히 추출하세요.
-3단계 [데이터 분석]: 표나 그래프의 데이터 구조를 이해하세요.
-4단계 [수치 추출]: 모든 숫자값을 항목명과 함께 정확히 추출하세요.
-5단계 [관계 분석]: 데이터 간의 비교, 추이, 관계를 분석하세요.
-
-**필수 항목:**
-1. **주제**: 핵심 메시지 (1문장, 슬라이드의 목적과 결론 포함)
-2. **데이터 타입**: 표/그래프 형태 상세 설명
-   - 표: 행/열 개수, 구조 (예: "3행 4열 매출 비교표")
-   - 그래프: 유형 (막대/선/파이 등), 축 라벨, 시계열 여부
-3. **구체적 수치**: 모든 숫자값을 항목명과 함께 (단위 포함)
-   - 형식: "항목명: 값 (단위)" 또는 "항목명 [시간/기간]: 값"
-   - 배열 순서: 논리적 순서 유지 (시간순, 크기순 등)
-4. **항목명**: 표의 행/열 제목, 그래프 범례, 축 라벨
-5. **비교/추이**: 
-   - 전기 대비 변화율
-   - 목표 대비 달성률
-   - 시계열 추이 (증가/감소/유지)
-   - 상대적 비교 (최대/최소, 평균 대비)
-
-**출력 형식 (구조화):**
-```
-주제: [핵심 메시지]
-
-데이터 유형: [표/그래프 상세 설명]
-- 구조: [행/열 개수 또는 그래프 유형]
-- 축/범례: [축 라벨, 범례 항목]
-
-주요 수치:
-- [항목1]: [값1] ([단위])
-- [항목2]: [값2] ([단위])
-...
-
-비교 및 추이:
-- [비교 항목1]: [변화율/차이]
-- [추이 분석]: [패턴 설명]
-```
-
-**예시:**
-주제: 2024년 1분기 경영 성과 분석 - 온라인/B2B 성장세 지속
-
-데이터 유형: Q1-Q4 분기별 온라인/오프라인/B2B 매출 비교 테이블
-- 구조: 3행(채널) × 4열(분기) 매출 비교표
-- 단위: 억원
-
-주요 수치:
-- Q1 온라인: 150억원
-- Q1 오프라인: 200억원
-- Q1 B2B: 100억원
-- Q2 온라인: 180억원
-- Q2 오프라인: 210억원
-- Q2 B2B: 115억원
-- Q3 온라인: 190억원
-- Q3 오프라인: 220억원
-- Q3 B2B: 125억원
-- Q4 온라인: 195억원
-- Q4 오프라인: 230억원
-- Q4 B2B: 130억원
-
-비교 및 추이:
-- 온라인 Q4/Q1 성장률: +30% (150억 → 195억)
-- 오프라인 Q4/Q1 성장률: +15% (200억 → 230억)
-- B2B Q4/Q1 성장률: +30% (100억 → 130억)
-- 총 매출 (Q4): 555억원
-
-**주의사항:**
-- 텍스트가 흐릿하거나 읽기 어려운 경우, 가능한 범위 내에서 추정하되 "[추정]" 표시
-- 숫자가 명확하지 않은 경우, 근사값 표시 및 "[약]" 표시
-- 그래프에서 정확한 수치를 추출할 수 없는 경우, 상대적 비교만 수행"""
+                            "text": _VISION_PROMPT
                         },
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/png;base64,{slide_img_base64}",
+                                "url": f"data:{image_mime};base64,{slide_img_base64}",
                                 "detail": "low"  # 폐쇄망은 low로 비용/속도 최적화
                             }
                         }
@@ -1269,81 +1402,7 @@ class PPTXChunkingEngine:
                 # auto: 휴리스틱으로 판단
                 return _is_openai_like(llm_base_url, {})
             
-            prompt_text = """[INST] 이 비즈니스 슬라이드를 분석하여 RAG 검색에 최적화된 설명을 제공하세요.
-
-**분석 단계:**
-1단계 [이미지 인식]: 슬라이드의 전반적인 구조와 레이아웃을 파악하세요.
-2단계 [텍스트 추출]: 모든 텍스트(제목, 라벨, 범례 등)를 정확히 추출하세요.
-3단계 [데이터 분석]: 표나 그래프의 데이터 구조를 이해하세요.
-4단계 [수치 추출]: 모든 숫자값을 항목명과 함께 정확히 추출하세요.
-5단계 [관계 분석]: 데이터 간의 비교, 추이, 관계를 분석하세요.
-
-**필수 항목:**
-1. **주제**: 핵심 메시지 (1문장, 슬라이드의 목적과 결론 포함)
-2. **데이터 타입**: 표/그래프 형태 상세 설명
-   - 표: 행/열 개수, 구조 (예: "3행 4열 매출 비교표")
-   - 그래프: 유형 (막대/선/파이 등), 축 라벨, 시계열 여부
-3. **구체적 수치**: 모든 숫자값을 항목명과 함께 (단위 포함)
-   - 형식: "항목명: 값 (단위)" 또는 "항목명 [시간/기간]: 값"
-   - 배열 순서: 논리적 순서 유지 (시간순, 크기순 등)
-4. **항목명**: 표의 행/열 제목, 그래프 범례, 축 라벨
-5. **비교/추이**: 
-   - 전기 대비 변화율
-   - 목표 대비 달성률
-   - 시계열 추이 (증가/감소/유지)
-   - 상대적 비교 (최대/최소, 평균 대비)
-
-**출력 형식 (구조화):**
-```
-주제: [핵심 메시지]
-
-데이터 유형: [표/그래프 상세 설명]
-- 구조: [행/열 개수 또는 그래프 유형]
-- 축/범례: [축 라벨, 범례 항목]
-
-주요 수치:
-- [항목1]: [값1] ([단위])
-- [항목2]: [값2] ([단위])
-...
-
-비교 및 추이:
-- [비교 항목1]: [변화율/차이]
-- [추이 분석]: [패턴 설명]
-```
-
-**예시:**
-주제: 2024년 1분기 경영 성과 분석 - 온라인/B2B 성장세 지속
-
-데이터 유형: Q1-Q4 분기별 온라인/오프라인/B2B 매출 비교 테이블
-- 구조: 3행(채널) × 4열(분기) 매출 비교표
-- 단위: 억원
-
-주요 수치:
-- Q1 온라인: 150억원
-- Q1 오프라인: 200억원
-- Q1 B2B: 100억원
-- Q2 온라인: 180억원
-- Q2 오프라인: 210억원
-- Q2 B2B: 115억원
-- Q3 온라인: 190억원
-- Q3 오프라인: 220억원
-- Q3 B2B: 125억원
-- Q4 온라인: 195억원
-- Q4 오프라인: 230억원
-- Q4 B2B: 130억원
-
-비교 및 추이:
-- 온라인 Q4/Q1 성장률: +30% (150억 → 195억)
-- 오프라인 Q4/Q1 성장률: +15% (200억 → 230억)
-- B2B Q4/Q1 성장률: +30% (100억 → 130억)
-- 총 매출 (Q4): 555억원
-
-**주의사항:**
-- 텍스트가 흐릿하거나 읽기 어려운 경우, 가능한 범위 내에서 추정하되 "[추정]" 표시
-- 숫자가 명확하지 않은 경우, 근사값 표시 및 "[약]" 표시
-- 그래프에서 정확한 수치를 추출할 수 없는 경우, 상대적 비교만 수행
-
-[/INST]"""
+            prompt_text = f"[INST] {_VISION_PROMPT}\n\n[/INST]"
             
             # 비전이 활성화되고 이미지가 있는 경우
             if vision_enabled and slide_img_base64:
@@ -1364,7 +1423,7 @@ class PPTXChunkingEngine:
                                 {
                                     "type": "image_url",
                                     "image_url": {
-                                        "url": f"data:image/png;base64,{slide_img_base64}",
+                                        "url": f"data:{image_mime};base64,{slide_img_base64}",
                                         "detail": "low"
                                     }
                                 }
@@ -3,12 +3,21 @@ from langchain_ollama import OllamaLLM
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.schema import Document
-from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
-from utils.reranker import get_reranker
+from utils.reranker import get_reranker, load_reranker_async
+from utils.cascade_prefilter import BiEncoderPrefilter
+from utils.streaming_citations import StreamingCitationProcessor
+from utils.latency_budget import LatencyBudget, StageCostTracker
+from utils.context_packer import ContextPacker
+from utils.context_compressor import ExtractiveCompressor
+from utils.answer_cache import AnswerCache, config_hash
+from utils.session_pool import SessionCandidatePool
 from utils.request_llm import RequestLLM
 from utils.small_to_large_search import SmallToLargeSearch
 from utils.hybrid_retriever import HybridRetriever  # Phase 4: Hybrid Search
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 import json
 import re
 import time
@@ -18,6 +27,11 @@ import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# 요청별 지연 예산 (동시 요청이 같은 RAGChain에서 서로의 예산을 덮어쓰지 않도록 컨텍스트 단위로 보관)
+_request_latency_budget: ContextVar[Optional[LatencyBudget]] = ContextVar("rag_request_latency_budget", default=None)
+# 현재 요청의 Multi-Query 게이트 판정 기록 (요청 종료 시 답변 결과를 덧붙임)
+_request_gate_record: ContextVar[Optional[Dict[str, Any]]] = ContextVar("rag_request_gate_record", default=None)
+
 
 class RAGChain:
     def __init__(self, vectorstore,
@@ -49,12 +63,46 @@ class RAGChain:
                  file_aggregation_min_chunks: int = 1,  # 파일 포함 최소 매칭 청크 수
                  # Phase A-3: Self-Consistency Check
                  enable_self_consistency: bool = False,
-                 self_consistency_n: int = 3):
+                 self_consistency_n: int = 3,
+                 # Cascade Re-ranking: Bi-Encoder 1차 선별 후 Cross-Encoder
+                 enable_cascade_rerank: bool = False,
+                 cascade_min_keep: int = 20,
+                 cascade_max_keep: int = 40,
+                 # Re-ranker 백그라운드 로딩 (준비 전 질의는 Hybrid 점수로 처리)
+                 lazy_reranker_loading: bool = False,
+                 # 스트리밍 답변 인라인 출처 표시
+                 enable_streaming_citations: bool = True,
+                 # Multi-Query Confidence Gate: 1차 검색이 확실하면 재작성 생략
+                 enable_multi_query_gate: bool = True,
+                 multi_query_gate_min_top1: float = 0.8,
+                 multi_query_gate_min_margin: float = 0.15,
+                 # 컨텍스트 토큰 예산 (prefill 지연 상한)
+                 context_max_tokens: int = 4000,
+                 # 추출 압축: 질문 관련 문장(+이웃)만 남겨 prefill 축소
+                 enable_context_compression: bool = False,
+                 context_compression_ratio: float = 0.3,
+                 # Ollama 모델 상주/컨텍스트 설정 (접두부 KV 캐시 재사용)
+                 llm_num_ctx: Optional[int] = None,
+                 llm_keep_alive: Optional[Any] = None,
+                 llm_options: Optional[Dict[str, Any]] = None,
+                 # 답변 캐시: 반복 질문은 전체 파이프라인 생략
+                 enable_answer_cache: bool = True,
+                 answer_cache_max_entries: int = 256,
+                 answer_cache_semantic: bool = False,
+                 answer_cache_semantic_threshold: float = 0.97,
+                 # 세션 후보 풀: 후속 질문은 최근 턴 후보를 먼저 Re-ranking
+                 enable_session_pool: bool = True,
+                 session_pool_max_turns: int = 3,
+                 session_pool_min_hits: int = 2,
+                 session_pool_min_similarity: float = 0.5):
         self.llm_api_type = llm_api_type
         self.llm_base_url = llm_base_url
         self.llm_model = llm_model
         self.llm_api_key = llm_api_key
         self.temperature = temperature
+        self.llm_num_ctx = llm_num_ctx
+        self.llm_keep_alive = llm_keep_alive
+        self.llm_options = dict(llm_options or {})
         self.max_tokens = max_tokens  # Phase D
         self.top_k = top_k
         self.vectorstore = vectorstore
@@ -67,7 +115,13 @@ class RAGChain:
         
         # Re-ranker 초기화 (사용 시)
         self.reranker = None
-        if self.use_reranker:
+        self._reranker_future = None
+        self._reranker_wait_logged = False
+        if self.use_reranker and lazy_reranker_loading:
+            # 모델 로딩 + 워밍업을 백그라운드에서 수행 (앱 시작 차단 방지)
+            self._reranker_future = load_reranker_async(model_name=reranker_model)
+            logger.info(f"Re-ranker 백그라운드 로딩 시작: {reranker_model}")
+        elif self.use_reranker:
             try:
                 self.reranker = get_reranker(model_name=reranker_model)
                 logger.info(f"Re-ranker 모델 로딩 완료: {reranker_model}")
@@ -82,6 +136,20 @@ class RAGChain:
                 logger.warning("Re-ranker 없이 계속 진행합니다.")
                 self.use_reranker = False
                 self.reranker = None
+
+        # Cascade Re-ranking 초기화 (저장된 Chroma 임베딩 코사인으로 후보 축소)
+        self.enable_cascade_rerank = enable_cascade_rerank and self.use_reranker
+        self.cascade_prefilter = None
+        if self.enable_cascade_rerank:
+            self.cascade_prefilter = BiEncoderPrefilter(
+                vector_manager=vectorstore,
+                min_keep=cascade_min_keep,
+                max_keep=cascade_max_keep
+            )
+            # search_with_mode → similarity_search_with_rerank 경로에도 적용
+            if hasattr(vectorstore, "cascade_prefilter"):
+                vectorstore.cascade_prefilter = self.cascade_prefilter
+            logger.info(f"Cascade Re-ranking 활성화 (keep={cascade_min_keep}~{cascade_max_keep})")
         
         # 마지막 검색 결과 캐시 (출처 표시용)
         self._last_retrieved_docs = []
@@ -97,9 +165,44 @@ class RAGChain:
         self.multi_query_num = max(0, multi_query_num)
         self.enable_multi_query = enable_multi_query and self.multi_query_num > 0
 
+        # Multi-Query Confidence Gate 설정 (판정 기록과 답변 결과는 튜닝용으로 최근 200건 보관)
+        self.enable_multi_query_gate = enable_multi_query_gate
+        self.multi_query_gate_min_top1 = multi_query_gate_min_top1
+        self.multi_query_gate_min_margin = multi_query_gate_min_margin
+        self._multi_query_gate_stats = self._new_multi_query_gate_stats()
+
         # Small-to-Large 컨텍스트 크기 설정
         self.small_to_large_context_size = small_to_large_context_size
 
+        # 컨텍스트 패커 (토큰 예산 내 점수순 채우기 + 부모/자식 중복 제거)
+        self.context_packer = ContextPacker(max_tokens=context_max_tokens)
+
+        # 추출 압축 (Cross-Encoder 준비 시 사용, 아니면 배치 임베딩)
+        self.context_compressor = None
+        if enable_context_compression:
+            self.context_compressor = ExtractiveCompressor(
+                embeddings=getattr(vectorstore, "embeddings", None),
+                reranker_getter=lambda: self.reranker if self._reranker_ready() else None,
+                keep_ratio=context_compression_ratio
+            )
+            logger.info(f"Context Compression 활성화 (keep_ratio={context_compression_ratio})")
+
+        # 답변 캐시 (코퍼스 버전이 바뀌면 해당 검색 모드 항목 자동 무효화)
+        self.answer_cache = None
+        if enable_answer_cache:
+            self.answer_cache = AnswerCache(
+                max_entries=answer_cache_max_entries,
+                embeddings=getattr(vectorstore, "embeddings", None) if answer_cache_semantic else None,
+                semantic_threshold=answer_cache_semantic_threshold
+            )
+            logger.info(f"Answer Cache 활성화 (max={answer_cache_max_entries}, semantic={answer_cache_semantic})")
+
+        # 세션 후보 풀 (풀 커버리지가 낮으면 전체 Hybrid 검색으로 폴백)
+        self.session_pool = SessionCandidatePool(max_turns=session_pool_max_turns) if enable_session_pool else None
+        self.session_pool_min_hits = session_pool_min_hits
+        self.session_pool_min_similarity = session_pool_min_similarity
+        self._session_pool_stats = {"checked": 0, "used": 0}
+
         # Diversity Penalty 설정 (다문서 합성 개선)
         self.diversity_penalty = diversity_penalty
         self.diversity_source_key = diversity_source_key
@@ -142,6 +245,10 @@ class RAGChain:
 
         # Phase A-3: Self-Consistency Check 설정
         self.enable_self_consistency = enable_self_consistency
+        self.enable_streaming_citations = enable_streaming_citations
+
+        # Latency Budget: 단계별 비용 이력 (요청별 budget_ms 지정 시 선택 단계 스케줄링)
+        self.stage_costs = StageCostTracker()
         self.self_consistency_n = max(2, self_consistency_n)  # 최소 2회
         if self.enable_self_consistency:
             logger.info(f"Self-Consistency Check 활성화 (n={self.self_consistency_n})")
@@ -175,22 +282,10 @@ class RAGChain:
         )
         
         # 기본 프롬프트 템플릿 (Phase D: Answer Naturalization)
+        # 정적 지시문을 앞에, 요청별 입력(대화/문서/질문)을 뒤에 배치
+        # → Ollama/llama.cpp가 동일 접두부 KV 캐시를 재사용해 prefill(TTFT) 단축
         self.base_prompt_template = """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
 
-제공된 문서:
-{context}
-
-이전 대화:
-{chat_history}
-
-질문:
-{question}
-
----
-
-추가 지시사항:
-{extra_instructions}
-
 답변 가이드:
 
 1. **자연스러운 형식**:
@@ -225,25 +320,25 @@ class RAGChain:
    - 문서에 근거하지 않은 추측은 하지 마세요. 문서의 내용만을 바탕으로 답변하세요.
    - 수학 공식, 부등식, 관계식이 있으면 반드시 정확히 인용하세요.
 
-답변:"""
-        
-        # 질문 타입별 프롬프트 템플릿
-        self.prompt_templates = {
-            "specific_info": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
+---
+
+이전 대화:
+{chat_history}
 
 제공된 문서:
 {context}
 
-이전 대화:
-{chat_history}
+추가 지시사항:
+{extra_instructions}
 
 질문:
 {question}
 
----
-
-추가 지시사항:
-{extra_instructions}
+답변:"""
+        
+        # 질문 타입별 프롬프트 템플릿 (동일하게 정적 지시문 → 요청별 입력 순서)
+        self.prompt_templates = {
+            "specific_info": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
 
 답변 가이드:
 
@@ -271,23 +366,23 @@ class RAGChain:
    - 문서에 근거하지 않은 추측은 하지 마세요. 문서의 내용만을 바탕으로 답변하세요.
    - 수학 공식이나 수치는 절대 생략하거나 추측하지 마세요.
 
-답변:""",
-            
-            "summary": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
+---
+
+이전 대화:
+{chat_history}
 
 제공된 문서:
 {context}
 
-이전 대화:
-{chat_history}
+추가 지시사항:
+{extra_instructions}
 
 질문:
 {question}
 
----
-
-추가 지시사항:
-{extra_instructions}
+답변:""",
+            
+            "summary": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
 
 답변 가이드:
 
@@ -308,23 +403,23 @@ class RAGChain:
 4. **중요**:
    문서에 근거하지 않은 추측은 하지 마세요. 문서의 내용만을 바탕으로 답변하세요.
 
-답변:""",
-            
-            "comparison": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
+---
+
+이전 대화:
+{chat_history}
 
 제공된 문서:
 {context}
 
-이전 대화:
-{chat_history}
+추가 지시사항:
+{extra_instructions}
 
 질문:
 {question}
 
----
-
-추가 지시사항:
-{extra_instructions}
+답변:""",
+            
+            "comparison": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
 
 답변 가이드:
 
@@ -350,23 +445,23 @@ class RAGChain:
    - 문서에 근거하지 않은 추측은 하지 마세요. 문서의 내용만을 바탕으로 답변하세요.
    - 수학 공식, 부등식, 관계식이 있으면 반드시 정확히 인용하세요.
 
-답변:""",
-            
-            "relationship": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
+---
+
+이전 대화:
+{chat_history}
 
 제공된 문서:
 {context}
 
-이전 대화:
-{chat_history}
+추가 지시사항:
+{extra_instructions}
 
 질문:
 {question}
 
----
-
-추가 지시사항:
-{extra_instructions}
+답변:""",
+            
+            "relationship": """당신은 문서 기반 AI 어시스턴트입니다. 제공된 문서를 바탕으로 정확하고 유용한 답변을 제공하세요.
 
 답변 가이드:
 
@@ -392,6 +487,20 @@ class RAGChain:
    - 문서에 근거하지 않은 추측은 하지 마세요. 문서의 내용만을 바탕으로 답변하세요.
    - 관계를 나타내는 수식이 있으면 반드시 정확히 인용하세요.
 
+---
+
+이전 대화:
+{chat_history}
+
+제공된 문서:
+{context}
+
+추가 지시사항:
+{extra_instructions}
+
+질문:
+{question}
+
 답변:""",
             
             "general": self.base_prompt_template
@@ -399,27 +508,10 @@ class RAGChain:
         
         # 기본 프롬프트 (나중에 질문 타입에 따라 동적으로 선택)
         self.prompt_template = self.base_prompt_template
-        
-        self.prompt = PromptTemplate(
-            template=self.prompt_template,
-            input_variables=["chat_history", "context", "question", "extra_instructions"]
-        )
-        
-        # LCEL 방식으로 체인 구성 (대화 이력 포함)
-        self.chain = (
-            RunnablePassthrough.assign(
-                chat_history=lambda x: x.get("chat_history") or self._format_chat_history(x.get("chat_history_raw", [])),
-                context=lambda x: x.get("context") or self._get_context(
-                    x["question"],
-                    x.get("chat_history_raw"),
-                    x.get("search_mode", "integrated")
-                ),
-                extra_instructions=lambda x: x.get("extra_instructions", "")
-            )
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
-        )
+
+        # 템플릿별 프롬프트/체인 사전 컴파일 (요청마다 재구성하지 않음)
+        self._compile_chains()
+        self.prompt, self.chain = self._compiled_chains["base"]
 
         # Question Classifier 초기화 (Quick Wins: 질문 유형별 최적화)
         from utils.question_classifier import create_classifier
@@ -436,20 +528,36 @@ class RAGChain:
 
     def _create_llm(self):
         """API 타입에 따라 적절한 LLM 클라이언트 생성"""
+        # num_ctx/keep_alive는 설정된 경우에만 전달 (미설정 시 클라이언트/서버 기본값)
+        ollama_kwargs = {}
+        if self.llm_num_ctx:
+            ollama_kwargs["num_ctx"] = self.llm_num_ctx
+        if self.llm_keep_alive is not None:
+            ollama_kwargs["keep_alive"] = self.llm_keep_alive
+
         if self.llm_api_type == "request":
             return RequestLLM(
                 base_url=self.llm_base_url,
                 model=self.llm_model,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,  # Phase D
-                timeout=60
+                timeout=60,
+                options=self.llm_options,
+                **ollama_kwargs
             )
         elif self.llm_api_type == "ollama":
+            # OllamaLLM은 options dict 대신 개별 필드만 지원 → 알려진 필드만 전달
+            option_fields = {
+                key: value for key, value in self.llm_options.items()
+                if key in OllamaLLM.model_fields and key not in ("temperature", "num_predict", *ollama_kwargs)
+            }
             return OllamaLLM(
                 base_url=self.llm_base_url,
                 model=self.llm_model,
                 temperature=self.temperature,
-                num_predict=self.max_tokens  # Phase D: Ollama는 num_predict 사용
+                num_predict=self.max_tokens,  # Phase D: Ollama는 num_predict 사용
+                **option_fields,
+                **ollama_kwargs
             )
         elif self.llm_api_type == "openai":
             kwargs = {
@@ -470,34 +578,34 @@ class RAGChain:
         else:
             raise ValueError(f"지원하지 않는 API 타입: {self.llm_api_type}")
 
-    def _format_docs(self, docs: List[Document]) -> str:
-        """문서를 구조화된 형식으로 포맷팅 (상용 서비스 수준 개선)"""
-        formatted_sections = []
-        
-        for i, doc in enumerate(docs, 1):
-            metadata = doc.metadata or {}
-            file_name = metadata.get('file_name', 'Unknown')
-            page_number = metadata.get('page_number', 'Unknown')
-            chunk_type = metadata.get('chunk_type', 'unknown')
-            section_title = metadata.get('section_title', '')
-            
-            # 문서 번호와 메타데이터
-            header = f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n"
-            header += f"📄 문서 #{i}\n"
-            header += f"   파일명: {file_name}\n"
-            header += f"   페이지: {page_number}\n"
-            if chunk_type != 'unknown':
-                header += f"   청크 타입: {chunk_type}\n"
-            if section_title:
-                header += f"   섹션: {section_title}\n"
-            header += f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            
-            # 문서 내용
-            content = doc.page_content.strip()
-            
-            formatted_sections.append(header + content)
-        
-        return "\n\n".join(formatted_sections)
+    def _format_docs(self, docs: List[Document], scores: Optional[List[float]] = None) -> str:
+        """문서를 토큰 예산 내 컨텍스트로 포맷팅 (간결한 "[n] 파일명 · p.페이지" 헤더)
+
+        Args:
+            docs: 문서 리스트 (scores가 없으면 순서를 순위로 간주)
+            scores: 문서별 점수 (예산 부족 시 높은 점수부터 채움)
+        """
+        return self.context_packer.pack(docs, scores)
+
+    def _build_context(self, question: str, pairs: List[tuple], rank_by_score: bool = True) -> str:
+        """검색 결과 (doc, score) → (선택적 추출 압축) → 토큰 예산 컨텍스트
+
+        패킹에서 빠진 문서(부모/자식 중복, 예산 초과)는 _last_retrieved_docs에서도 제외해
+        컨텍스트의 [n] 번호가 출처 목록/스트리밍 인용/신뢰도의 n번째 문서와 일치하도록 한다.
+
+        Args:
+            pairs: (Document, score) 리스트 (순위 순)
+            rank_by_score: True면 score(클수록 우선) 순으로 예산을 채움
+                           (벡터 거리처럼 작을수록 좋은 점수는 False → 리스트 순서 사용)
+        """
+        docs = [d for d, _ in pairs]
+        if self.context_compressor is not None and docs and self._stage_allowed("context_compression"):
+            with self.stage_costs.measure("context_compression"):
+                docs = self.context_compressor.compress(question, docs)
+        scores = [float(s) for _, s in pairs] if rank_by_score else None
+        context, kept = self.context_packer.pack_with_indices(docs, scores)
+        self._last_retrieved_docs = [pairs[i] for i in kept]
+        return context
 
     def _unique_by_file(self, pairs: List[tuple], k: int) -> List[tuple]:
         """(Document, score) 리스트에서 파일명 기준으로 중복을 제거하며 최대 k개 반환
@@ -571,7 +679,7 @@ class RAGChain:
                     search_mode=search_mode,
                     initial_k=initial_k,
                     top_k=initial_k,
-                    use_reranker=self.use_reranker,
+                    use_reranker=self._reranker_ready(),
                     reranker_model=self.reranker_model
                 )
             # 우선순위 2: 폴백 - 기본 하이브리드 검색
@@ -646,13 +754,15 @@ class RAGChain:
         Returns:
             Re-ranking된 (Document, rerank_score) 튜플 리스트
         """
-        if not self.use_reranker or not self.reranker:
+        if not self._reranker_ready():
             print("[INFO] Re-ranker가 비활성화되어 있거나 로드되지 않았습니다. 원본 반환.")
             return docs
 
         if not docs:
             return docs
 
+        docs = self._prefilter_for_rerank(query, docs)
+
         try:
             # Re-ranker 입력 형식으로 변환
             docs_for_rerank = [{
@@ -680,6 +790,62 @@ class RAGChain:
             print(f"[WARN] Re-ranking 오류: {e}, 원본 반환")
             return docs
 
+    def _reranker_ready(self) -> bool:
+        """Re-ranker 사용 가능 여부 (백그라운드 로딩 중이면 차단하지 않고 False)
+
+        로딩이 끝나지 않은 동안의 질의는 Hybrid(BM25+Vector) 점수만으로 처리된다.
+        """
+        if not self.use_reranker:
+            return False
+        if self.reranker is not None:
+            return True
+
+        future = self._reranker_future
+        if future is None:
+            return False
+        if not future.done():
+            if not self._reranker_wait_logged:
+                print("[INFO] Re-ranker 로딩 중 → Hybrid 점수로 검색합니다.")
+                self._reranker_wait_logged = True
+            return False
+
+        self._reranker_future = None
+        try:
+            self.reranker = future.result()
+            print(f"[INFO] Re-ranker 준비 완료: {self.reranker_model}")
+            return True
+        except Exception as e:
+            logger.warning(f"Re-ranker 백그라운드 로딩 실패 ({self.reranker_model}): {e}")
+            logger.warning("Re-ranker 없이 계속 진행합니다.")
+            self.use_reranker = False
+            self.enable_cascade_rerank = False
+            self.cascade_prefilter = None
+            if getattr(self.vectorstore, "cascade_prefilter", None) is not None:
+                self.vectorstore.cascade_prefilter = None
+            return False
+
+    def _stage_allowed(self, stage: str, reserve_stages: tuple = ()) -> bool:
+        """선택 단계 실행 여부 (현재 요청에 지연 예산이 없으면 항상 True)"""
+        budget = _request_latency_budget.get()
+        if budget is None:
+            return True
+        return budget.allow(stage, reserve_stages=reserve_stages)
+
+    def _prefilter_for_rerank(self, query: str, candidates: List[tuple], min_keep: Optional[int] = None) -> List[tuple]:
+        """Cascade Re-ranking 1단계: Cross-Encoder 전에 Bi-Encoder 코사인으로 후보 축소
+
+        Args:
+            query: 검색 쿼리
+            candidates: (Document, score) 튜플 리스트
+            min_keep: 최소 유지 수 (이후 rerank top_k 이상으로 지정)
+
+        Returns:
+            선별된 (Document, score) 튜플 리스트 (비활성화 시 원본)
+        """
+        if not self.cascade_prefilter or not candidates:
+            return candidates
+        return self.cascade_prefilter.filter(query, candidates, min_keep=min_keep)
+
     def _semantic_similarity_filter(self, query: str, candidates: List[tuple], threshold: float = 0.5) -> List[tuple]:
         """의미론적 유사도 기반 필터링 (Solution #1)
 
@@ -697,31 +863,37 @@ class RAGChain:
             return candidates
 
         try:
-            # 쿼리 임베딩 생성
-            query_embedding = self.vectorstore.embeddings.embed_query(query)
-
-            filtered = []
-            removed_count = 0
-
-            for doc, score in candidates:
-                # 문서 임베딩 생성
-                doc_embedding = self.vectorstore.embeddings.embed_query(doc.page_content)
-
-                # 코사인 유사도 계산
-                similarity = np.dot(query_embedding, doc_embedding) / (
-                    np.linalg.norm(query_embedding) * np.linalg.norm(doc_embedding)
+            # 쿼리 임베딩 1회 + 저장된 청크 임베딩 재사용 (문서별 재임베딩 없음)
+            query_embedding = np.asarray(self.vectorstore.embeddings.embed_query(query), dtype=np.float32)
+            docs = [doc for doc, _ in candidates]
+            if hasattr(self.vectorstore, "get_document_embeddings"):
+                doc_matrix = self.vectorstore.get_document_embeddings(docs)
+            else:
+                doc_matrix = np.asarray(
+                    self.vectorstore.embeddings.embed_documents([d.page_content for d in docs]),
+                    dtype=np.float32
                 )
 
-                if similarity >= threshold:
-                    filtered.append((doc, score))
-                else:
-                    removed_count += 1
-
-            # 필터링 결과가 너무 적으면 threshold 완화
-            if len(filtered) < max(2, len(candidates) // 3):
+            # 코사인 유사도 (행렬-벡터 곱 1회, threshold 완화 시 재사용)
+            denom = np.linalg.norm(doc_matrix, axis=1) * np.linalg.norm(query_embedding)
+            denom[denom == 0] = 1.0
+            similarities = (doc_matrix @ query_embedding) / denom
+
+            min_required = max(2, len(candidates) // 3)
+            mask = similarities >= threshold
+            relax_steps = 0
+            # 필터링 결과가 너무 적으면 threshold 완화 (캐시된 유사도로 재판정)
+            while np.count_nonzero(mask) < min_required:
+                if relax_steps >= 10:
+                    print("[WARN] Semantic 필터링 threshold 완화 한도 도달, 원본 반환")
+                    return candidates
                 print(f"[WARN] Semantic 필터링 결과 부족, threshold 완화 ({threshold} -> {threshold * 0.7})")
-                return self._semantic_similarity_filter(query, candidates, threshold * 0.7)
+                threshold *= 0.7
+                mask = similarities >= threshold
+                relax_steps += 1
 
+            filtered = [cand for cand, keep in zip(candidates, mask) if keep]
+            removed_count = len(candidates) - len(filtered)
             if removed_count > 0:
                 print(f"[SEMANTIC] 의미론적 유사도 필터링: {removed_count}개 문서 제거 (threshold={threshold:.2f})")
 
@@ -865,6 +1037,22 @@ class RAGChain:
             print(f"[WARN] 통계 필터링 오류: {e}, 원본 반환")
             return candidates
 
+    @staticmethod
+    def _score_gap_statistics(scores: List[float]) -> Optional[Dict[str, Any]]:
+        """내림차순 점수의 인접 Gap 통계 (최대 Gap, 위치, 평균 Gap)"""
+        # 점수 차이(gap) 계산
+        gaps = [scores[i] - scores[i+1] for i in range(len(scores)-1)]
+        if not gaps:
+            return None
+
+        # 가장 큰 gap 찾기
+        max_gap = max(gaps)
+        return {
+            "max_gap": max_gap,
+            "max_gap_idx": gaps.index(max_gap),
+            "mean_gap": statistics.mean(gaps)
+        }
+
     def _reranker_gap_based_cutoff(self, candidates: List[tuple], min_docs: int = 3, gap_threshold_multiplier: float = 2.0) -> List[tuple]:
         """Re-ranker 점수 Gap 기반 동적 컷오프 (개선안 5)
 
@@ -885,18 +1073,12 @@ class RAGChain:
         try:
             scores = [float(score) for _, score in candidates]
 
-            # 점수 차이(gap) 계산
-            gaps = [scores[i] - scores[i+1] for i in range(len(scores)-1)]
-
-            if not gaps:
+            gap = self._score_gap_statistics(scores)
+            if not gap:
                 return candidates
-
-            # 가장 큰 gap 찾기
-            max_gap = max(gaps)
-            max_gap_idx = gaps.index(max_gap)
-
-            # Gap의 통계 분석
-            mean_gap = statistics.mean(gaps)
+            max_gap = gap["max_gap"]
+            max_gap_idx = gap["max_gap_idx"]
+            mean_gap = gap["mean_gap"]
 
             # Gap이 충분히 큰 경우에만 컷오프 적용
             # 조건: Gap이 평균의 gap_threshold_multiplier배 이상 && 컷오프 위치가 min_docs 이상
@@ -1248,7 +1430,7 @@ class RAGChain:
                 }
 
             # 2. Reranking (reranker 활성화 시)
-            if self.use_reranker and self.reranker:
+            if self._reranker_ready():
                 logger.info(f"[Step 2] Reranking...")
                 chunks = [doc for doc, _ in chunks_with_scores]
                 reranked_docs = self.reranker.rerank(
@@ -1514,6 +1696,13 @@ class RAGChain:
 
         # 쿼리 타입 감지
         query_type = self._detect_query_type(question)
+
+        # 후속 질문: 최근 턴 후보 풀을 먼저 Re-ranking (커버리지 부족 시 아래 전체 검색)
+        if getattr(self, "session_pool", None) is not None:
+            pool_context = self._get_context_from_session_pool(question, chat_history, search_mode, query_type, categories)
+            if pool_context is not None:
+                print(f"[Timing] context retrieval (session pool, type={query_type}): {time.perf_counter() - context_start:.2f}s")
+                return pool_context
         
         # 구체적 정보 추출 모드: Small-to-Large 검색 활용
         if query_type == "specific_info":
@@ -1538,7 +1727,7 @@ class RAGChain:
                     weighted_results = self._filter_by_category(weighted_results, categories)
 
                     # Re-ranking 적용 (있는 경우)
-                    if self.use_reranker and len(weighted_results) > 0:
+                    if self._reranker_ready() and len(weighted_results) > 0:
                         docs_for_rerank = [{
                             "page_content": d.page_content,
                             "metadata": d.metadata,
@@ -1549,15 +1738,14 @@ class RAGChain:
                         pairs = [(d["document"], d.get("rerank_score", 0.8)) for d in reranked]
                     else:
                         pairs = weighted_results
+                    self._remember_candidates(pairs)
                     
                     # 중복 제거
                     dedup = self._unique_by_file(pairs, self.top_k * 2)
-                    self._last_retrieved_docs = dedup[:self.top_k]
-                    docs = [d for d, _ in self._last_retrieved_docs]
                     elapsed = time.perf_counter() - context_start
                     print(f"[Timing] context retrieval (Small-to-Large, type={query_type}): {elapsed:.2f}s")
                     print(f"[SEARCH] 구체적 정보 추출 모드: Small-to-Large 검색 (쿼리 타입: {query_type})")
-                    return self._format_docs(docs)
+                    return self._build_context(question, dedup[:self.top_k])
             except Exception as e:
                 print(f"Small-to-Large 검색 실패, 기본 검색으로 폴백: {e}")
                 # 폴백: 기본 검색 계속 진행
@@ -1588,13 +1776,44 @@ class RAGChain:
         if categories is None:
             categories = []
         overall_start = time.perf_counter()
+        # 요청 단위로 Re-ranker 사용 여부 고정 (도중에 로딩 완료돼도 점수 체계 혼용 방지)
+        use_reranker = self._reranker_ready()
         
         # 🆕 동적 top_k 결정 (질문 특성 분석)
         dynamic_top_k = self.determine_optimal_top_k(question)
         print(f"[SEARCH] 질문 특성 분석: top_k = {dynamic_top_k} (기본: {self.top_k})")
         
-        # Multi-Query Rewriting 적용
-        if self.enable_multi_query:
+        # Multi-Query Rewriting 적용 (지연 예산 부족 시 단일 쿼리로)
+        run_multi_query = self.enable_multi_query and self._stage_allowed("multi_query", reserve_stages=("generation",))
+
+        # Confidence Gate: 원본 쿼리 1차 검색이 확실하면 재작성 + 추가 검색 생략
+        first_pass = None
+        gate_passed = False
+        if run_multi_query and self.enable_multi_query_gate and use_reranker:
+            gate_start = time.perf_counter()
+            try:
+                first_pass = self._retrieve_for_rewritten_query(question, categories, search_mode, use_reranker)
+            except Exception as e:
+                print(f"[GATE][WARN] 1차 검색 실패: {e}")
+                first_pass = None
+            if first_pass:
+                gate = self._first_pass_confidence(first_pass)
+                gate_passed = gate["passed"]
+                self._record_multi_query_gate(question, gate)
+                print(f"[GATE] top1={gate['top1']:.3f}, margin={gate['margin']:.3f}, "
+                      f"gap_separated={gate['gap_separated']} → {'Multi-Query 생략' if gate_passed else 'Multi-Query 진행'} "
+                      f"({time.perf_counter() - gate_start:.2f}s)")
+
+        if gate_passed:
+            # 원본 쿼리 Re-ranking 결과로 바로 필터링 (같은 쿼리로 재순위 불필요)
+            self._remember_candidates(first_pass)
+            pairs = self._statistical_outlier_removal(first_pass, method='mad')
+            pairs = self._score_based_filtering(pairs, question=question)
+            dedup = self._unique_by_file(pairs, len(pairs))
+            print(f"[Timing] context_standard total: {time.perf_counter() - overall_start:.2f}s (mode=gated, docs={len(dedup)})")
+            return self._build_context(question, dedup)
+
+        if run_multi_query:
             mq_start = time.perf_counter()
             queries = self.generate_rewritten_queries(question, num_queries=self.multi_query_num)
             print(f"[Timing] multi_query_generate: {time.perf_counter() - mq_start:.2f}s (queries={len(queries)})")
@@ -1605,37 +1824,11 @@ class RAGChain:
             for idx, query in enumerate(queries, start=1):
                 query_start = time.perf_counter()
                 try:
-                    results = []
-                    if self.use_reranker:
-                        base = self._search_candidates(query, search_mode=search_mode)
-                        if base:
-                            docs_for_rerank = [{
-                                "page_content": d.page_content,
-                                "metadata": d.metadata,
-                                "vector_score": s,
-                                "document": d
-                            } for d, s in base]
-                            reranked = self.reranker.rerank(query, docs_for_rerank, top_k=max(self.top_k * 3, 15))
-                            results = [(d["document"], d.get("rerank_score", 0)) for d in reranked]
-                        else:
-                            results = []
+                    if query == question and first_pass is not None:
+                        # 게이트에서 이미 검색한 원본 쿼리 결과 재사용
+                        results = first_pass
                     else:
-                        # 듀얼 DB 지원: search_with_mode 사용 가능 시 사용
-                        if hasattr(self.vectorstore, 'search_with_mode'):
-                            temp_results = self.vectorstore.search_with_mode(
-                                query=query,
-                                search_mode=search_mode,
-                                initial_k=max(self.top_k * 3, 15),
-                                top_k=max(self.top_k * 3, 15),
-                                use_reranker=False,  # 이미 reranker는 외부에서 처리
-                                reranker_model=self.reranker_model
-                            )
-                            results = temp_results if temp_results else []
-                        else:
-                            results = self.vectorstore.similarity_search_with_score(query, k=max(self.top_k * 3, 15))
-
-                    # 카테고리 필터링 적용
-                    results = self._filter_by_category(results, categories)
+                        results = self._retrieve_for_rewritten_query(query, categories, search_mode, use_reranker)
 
                     print(f"[Timing] retrieval[{idx}/{len(queries)}]: {time.perf_counter() - query_start:.2f}s (docs={len(results)})")
                     
@@ -1649,22 +1842,27 @@ class RAGChain:
                 except Exception as e:
                     print(f"쿼리 '{query}' 검색 실패: {e}")
                     continue
+            self.stage_costs.record("multi_query", (time.perf_counter() - mq_start) * 1000)
             
             if all_retrieved_chunks:
                 # 카테고리 필터링 적용 (최종 통합)
                 all_retrieved_chunks = self._filter_by_category(all_retrieved_chunks, categories)
 
                 # 원본 쿼리로 재순위 매김
-                if self.use_reranker:
+                if use_reranker:
                     rerank_start = time.perf_counter()
+                    final_candidates = self._prefilter_for_rerank(
+                        question, all_retrieved_chunks, min_keep=max(self.top_k * 2, 20)
+                    )
                     docs_for_final_rerank = [{
                         "page_content": d.page_content,
                         "metadata": d.metadata,
                         "vector_score": s,
                         "document": d
-                    } for d, s in all_retrieved_chunks]
+                    } for d, s in final_candidates]
                     final_reranked = self.reranker.rerank(question, docs_for_final_rerank, top_k=max(self.top_k * 2, 20))
                     pairs = [(d["document"], d.get("rerank_score", 0)) for d in final_reranked]
+                    self._remember_candidates(pairs)
                     print(f"[Timing] final_rerank (multi-query): {time.perf_counter() - rerank_start:.2f}s (candidates={len(all_retrieved_chunks)})")
                 else:
                     pairs = all_retrieved_chunks
@@ -1682,17 +1880,18 @@ class RAGChain:
 
                 # 중복 제거 (파일 단위)
                 dedup = self._unique_by_file(pairs, len(pairs))  # score filtering에서 이미 개수 제한
-                self._last_retrieved_docs = dedup
-                docs = [d for d, _ in dedup]
-                print(f"[Timing] context_standard total: {time.perf_counter() - overall_start:.2f}s (mode=multi-query, docs={len(docs)})")
-                return self._format_docs(docs)
+                print(f"[Timing] context_standard total: {time.perf_counter() - overall_start:.2f}s (mode=multi-query, docs={len(dedup)})")
+                return self._build_context(question, dedup, rank_by_score=use_reranker)
         
         # 폴백: 단일 쿼리 검색 (동의어 확장 포함)
-        syn_start = time.perf_counter()
-        expanded_question = self.expand_query_with_synonyms(question)
-        print(f"[Timing] synonym_expand: {time.perf_counter() - syn_start:.2f}s")
+        expanded_question = question
+        if self._stage_allowed("synonym_expansion", reserve_stages=("generation",)):
+            syn_start = time.perf_counter()
+            with self.stage_costs.measure("synonym_expansion"):
+                expanded_question = self.expand_query_with_synonyms(question)
+            print(f"[Timing] synonym_expand: {time.perf_counter() - syn_start:.2f}s")
         
-        if self.use_reranker:
+        if use_reranker:
             retrieval_start = time.perf_counter()
             base = self._search_candidates(expanded_question, search_mode=search_mode)
             if not base:
@@ -1701,6 +1900,7 @@ class RAGChain:
                 return ""
             
             # base 는 (doc, score) 형태
+            base = self._prefilter_for_rerank(expanded_question, base, min_keep=max(self.top_k * 8, 40))
             docs_for_rerank = [{
                 "page_content": d.page_content,
                 "metadata": d.metadata,
@@ -1711,6 +1911,7 @@ class RAGChain:
             rerank_start = time.perf_counter()
             reranked = self.reranker.rerank(expanded_question, docs_for_rerank, top_k=max(self.top_k * 8, 40))
             pairs = [(d["document"], d.get("rerank_score", 0)) for d in reranked]
+            self._remember_candidates(pairs)
             print(f"[Timing] final_rerank (fallback): {time.perf_counter() - rerank_start:.2f}s")
 
             # 🆕 Score-based 필터링 파이프라인 (OpenAI 스타일 + Adaptive)
@@ -1726,11 +1927,7 @@ class RAGChain:
 
             # 중복 제거 (파일 단위)
             dedup = self._unique_by_file(pairs, len(pairs))  # score filtering에서 이미 개수 제한
-
-            # 캐시 저장: 실제 사용된 문서와 점수
-            self._last_retrieved_docs = dedup  # [(doc, score), ...]
-
-            docs = [d for d, _ in dedup]
+            rank_by_score = True
             print(f"[Timing] deduplication: {time.perf_counter() - rerank_start:.2f}s (selected={len(dedup)})")
         else:
             retrieval_start = time.perf_counter()
@@ -1763,14 +1960,249 @@ class RAGChain:
 
             # 중복 제거 (파일 단위)
             dedup = self._unique_by_file(pairs, len(pairs))  # score filtering에서 이미 개수 제한
-
-            # 캐시 저장
-            self._last_retrieved_docs = dedup
-
-            docs = [d for d, _ in dedup]
+            # 벡터 점수는 거리(작을수록 유사)일 수 있으므로 검색 순서를 순위로 사용
+            rank_by_score = False
             print(f"[Timing] candidate_retrieval (vector fallback): {time.perf_counter() - retrieval_start:.2f}s (selected={len(dedup)})")
         print(f"[Timing] context_standard total: {time.perf_counter() - overall_start:.2f}s (mode=fallback, top_k={dynamic_top_k})")
-        return self._format_docs(docs)
+        # 실제 컨텍스트에 포함된 문서와 점수만 캐시 (_build_context에서 저장)
+        return self._build_context(question, dedup, rank_by_score=rank_by_score)
+
+    def _remember_candidates(self, pairs: List[tuple]) -> None:
+        """현재 턴 Re-ranking 후보를 세션 풀에 기록 (다음 후속 질문용)"""
+        if getattr(self, "session_pool", None) is not None and pairs:
+            self.session_pool.add(pairs)
+
+    def _get_context_from_session_pool(
+        self,
+        question: str,
+        chat_history: Optional[List[Dict]],
+        search_mode: str,
+        query_type: str,
+        categories: List[str]
+    ) -> Optional[str]:
+        """세션 후보 풀 기반 컨텍스트 (새 대화면 풀 초기화, 풀로 부족하면 None → 전체 검색)"""
+        pool = self.session_pool
+        try:
+            corpus_version = self.vectorstore.get_corpus_version(search_mode)
+        except Exception:
+            corpus_version = None
+        pool.bind((search_mode, corpus_version))
+        if not chat_history:
+            pool.reset()
+
+        pairs = None
+        # 요약은 넓은 검색이 필요하므로 풀 미사용
+        if chat_history and len(pool) and query_type != "summary" and self._reranker_ready():
+            try:
+                pairs = self._rerank_session_pool(question, categories)
+            except Exception as e:
+                print(f"[POOL][WARN] 세션 풀 검색 실패, 전체 검색으로 폴백: {e}")
+                pairs = None
+
+        pool.begin_turn()
+        if pairs is None:
+            return None
+
+        pool.add(pairs)
+        pairs = self._statistical_outlier_removal(pairs, method='mad')
+        pairs = self._score_based_filtering(pairs, question=question)
+        dedup = self._unique_by_file(pairs, len(pairs))
+        return self._build_context(question, dedup)
+
+    def _rerank_session_pool(self, question: str, categories: List[str]) -> Optional[List[tuple]]:
+        """풀 후보 Re-ranking (커버리지 부족 시 None)
+
+        1) 저장 임베딩 코사인으로 질문과 가까운 후보가 있는지 먼저 확인 (없으면 Re-ranking 생략)
+        2) Re-ranker 점수가 score_threshold 이상인 후보가 session_pool_min_hits개 이상이면 사용
+        """
+        pool = self.session_pool
+        docs = pool.candidates()
+        self._session_pool_stats["checked"] += 1
+
+        missing = pool.missing_embeddings(docs)
+        if missing and hasattr(self.vectorstore, "get_document_embeddings"):
+            vectors = self.vectorstore.get_document_embeddings([docs[i] for i in missing])
+            for i, vector in zip(missing, vectors):
+                pool.set_embedding(docs[i], vector)
+        matrix = pool.embedding_matrix(docs)
+        if matrix is not None:
+            query_vec = np.asarray(self.vectorstore.embeddings.embed_query(question), dtype=np.float32)
+            query_norm = np.linalg.norm(query_vec)
+            sims = self._normalize_rows(matrix) @ (query_vec / (query_norm if query_norm > 0 else 1.0))
+            best = float(sims.max())
+            if best < self.session_pool_min_similarity:
+                print(f"[POOL] 후보 {len(docs)}개, 최대 유사도 {best:.3f} < {self.session_pool_min_similarity} → 전체 검색")
+                return None
+
+        rerank_start = time.perf_counter()
+        docs_for_rerank = [{
+            "page_content": d.page_content,
+            "metadata": d.metadata,
+            "vector_score": 0.0,
+            "document": d
+        } for d in docs]
+        reranked = self.reranker.rerank(question, docs_for_rerank, top_k=len(docs_for_rerank))
+        pairs = [(d["document"], d.get("rerank_score", 0)) for d in reranked]
+        pairs = self._filter_by_category(pairs, categories)
+
+        hits = sum(1 for _, score in pairs if score >= self.score_threshold)
+        if hits < self.session_pool_min_hits:
+            print(f"[POOL] 후보 {len(docs)}개 중 임계값 이상 {hits}개 < {self.session_pool_min_hits} → 전체 검색")
+            return None
+
+        self._session_pool_stats["used"] += 1
+        print(f"[POOL] 세션 후보 풀 사용: {len(docs)}개 Re-ranking, 임계값 이상 {hits}개 "
+              f"({time.perf_counter() - rerank_start:.2f}s)")
+        return pairs
+
+    def get_session_pool_stats(self) -> Dict[str, Any]:
+        """세션 후보 풀 사용률 (후속 질문 중 전체 검색을 생략한 비율)"""
+        if getattr(self, "session_pool", None) is None:
+            return {"enabled": False}
+        stats = self._session_pool_stats
+        return {
+            "enabled": True,
+            "pool_size": len(self.session_pool),
+            "checked": stats["checked"],
+            "used": stats["used"],
+            "use_rate": stats["used"] / stats["checked"] if stats["checked"] else 0.0,
+        }
+
+    def _retrieve_for_rewritten_query(
+        self,
+        query: str,
+        categories: List[str],
+        search_mode: str,
+        use_reranker: bool
+    ) -> List[tuple]:
+        """Multi-Query 개별 쿼리 검색 (+ Re-ranking, 카테고리 필터링)"""
+        results = []
+        if use_reranker:
+            base = self._search_candidates(query, search_mode=search_mode)
+            if base:
+                base = self._prefilter_for_rerank(query, base, min_keep=max(self.top_k * 3, 15))
+                docs_for_rerank = [{
+                    "page_content": d.page_content,
+                    "metadata": d.metadata,
+                    "vector_score": s,
+                    "document": d
+                } for d, s in base]
+                reranked = self.reranker.rerank(query, docs_for_rerank, top_k=max(self.top_k * 3, 15))
+                results = [(d["document"], d.get("rerank_score", 0)) for d in reranked]
+        else:
+            # 듀얼 DB 지원: search_with_mode 사용 가능 시 사용
+            if hasattr(self.vectorstore, 'search_with_mode'):
+                temp_results = self.vectorstore.search_with_mode(
+                    query=query,
+                    search_mode=search_mode,
+                    initial_k=max(self.top_k * 3, 15),
+                    top_k=max(self.top_k * 3, 15),
+                    use_reranker=False,  # 이미 reranker는 외부에서 처리
+                    reranker_model=self.reranker_model
+                )
+                results = temp_results if temp_results else []
+            else:
+                results = self.vectorstore.similarity_search_with_score(query, k=max(self.top_k * 3, 15))
+
+        # 카테고리 필터링 적용
+        return self._filter_by_category(results, categories)
+
+    def _first_pass_confidence(self, candidates: List[tuple]) -> Dict[str, Any]:
+        """원본 쿼리 Re-ranking 결과의 확신도 (Multi-Query 생략 여부 판단)
+
+        통과 조건: top-1 점수 >= multi_query_gate_min_top1 이고
+        (top-1과 top-2 차이 >= multi_query_gate_min_margin 또는 상위 문서군과 나머지 사이에 뚜렷한 Gap)
+        """
+        scores = sorted((float(score) for _, score in candidates), reverse=True)
+        top1 = scores[0] if scores else 0.0
+        margin = top1 - scores[1] if len(scores) > 1 else top1
+
+        gap = self._score_gap_statistics(scores)
+        # _reranker_gap_based_cutoff와 같은 기준의 Gap이 top_k 이내에서 나타나면 상위군이 분리된 것
+        gap_separated = bool(
+            gap
+            and gap["max_gap"] > gap["mean_gap"] * 2.0
+            and gap["max_gap_idx"] < max(self.top_k, 1)
+        )
+
+        passed = top1 >= self.multi_query_gate_min_top1 and (
+            margin >= self.multi_query_gate_min_margin or gap_separated
+        )
+        return {
+            "passed": passed,
+            "top1": top1,
+            "margin": margin,
+            "gap_separated": gap_separated,
+            "candidates": len(scores)
+        }
+
+    @staticmethod
+    def _new_multi_query_gate_stats() -> Dict[str, Any]:
+        """게이트 판정 집계 (판정별 답변 결과 포함)"""
+        def outcome_counts():
+            return {"finished": 0, "verification_failed": 0, "regenerated": 0, "no_sources": 0}
+        return {
+            "checked": 0,
+            "skipped": 0,
+            "history": deque(maxlen=200),
+            "outcomes": {"skipped": outcome_counts(), "multi_query": outcome_counts()}
+        }
+
+    def _record_multi_query_gate(self, question: str, gate: Dict[str, Any]) -> None:
+        """게이트 판정 기록 (임계값 튜닝용, 요청 종료 시 답변 결과를 덧붙이도록 현재 요청에 연결)"""
+        stats = self._multi_query_gate_stats
+        stats["checked"] += 1
+        if gate["passed"]:
+            stats["skipped"] += 1
+        record = {
+            "question": question[:100],
+            "top1": round(gate["top1"], 4),
+            "margin": round(gate["margin"], 4),
+            "gap_separated": gate["gap_separated"],
+            "skipped": gate["passed"],
+            "outcome": None,
+            "timestamp": time.time()
+        }
+        stats["history"].append(record)
+        _request_gate_record.set(record)
+
+    def _record_multi_query_gate_outcome(
+        self,
+        gate_record: Optional[Dict[str, Any]],
+        verification_failed: Optional[bool],
+        regenerated: bool,
+        result: Dict[str, Any]
+    ) -> None:
+        """게이트 판정을 받은 질문의 답변 결과 기록 (Multi-Query 생략이 답변 품질을 떨어뜨리는지 확인)
+
+        verification_failed: 첫 답변 검증 실패 여부 (검증을 건너뛰었으면 None)
+        """
+        if gate_record is None:
+            return
+        outcome = {
+            "verification_failed": verification_failed,
+            "regenerated": bool(regenerated),
+            "no_sources": not result.get("sources")
+        }
+        gate_record["outcome"] = outcome
+        counts = self._multi_query_gate_stats["outcomes"]["skipped" if gate_record["skipped"] else "multi_query"]
+        counts["finished"] += 1
+        for key, value in outcome.items():
+            counts[key] += int(bool(value))
+
+    def get_multi_query_gate_stats(self) -> Dict[str, Any]:
+        """Multi-Query 게이트 생략률 및 최근 판정 기록"""
+        stats = self._multi_query_gate_stats
+        checked = stats["checked"]
+        return {
+            "checked": checked,
+            "skipped": stats["skipped"],
+            "skip_rate": stats["skipped"] / checked if checked else 0.0,
+            "min_top1": self.multi_query_gate_min_top1,
+            "min_margin": self.multi_query_gate_min_margin,
+            "outcomes": {decision: dict(counts) for decision, counts in stats["outcomes"].items()},
+            "history": [dict(record) for record in stats["history"]]
+        }
 
     def expand_query_with_synonyms(self, original_query: str) -> str:
         """LLM을 사용하여 원본 쿼리에 대한 동의어/연관어를 생성하고 확장된 쿼리를 반환"""
@@ -2161,7 +2593,8 @@ class RAGChain:
         context: str,
         chat_history: str,
         directives: Dict[str, Any],
-        search_mode: str = "integrated"
+        search_mode: str = "integrated",
+        chain=None
     ) -> Optional[str]:
         fmt = directives.get("expected_format")
         if fmt not in {"list", "table"}:
@@ -2193,7 +2626,8 @@ class RAGChain:
             context=context,
             chat_history=chat_history,
             extra_instructions=extra_instructions,
-            search_mode=search_mode
+            search_mode=search_mode,
+            chain=chain
         )
 
         if regenerated:
@@ -2250,12 +2684,203 @@ class RAGChain:
             return getattr(output, "text", "") or ""
         return str(output)
 
+    def _compile_chains(self) -> None:
+        """질문 유형별 프롬프트 템플릿을 LCEL 체인으로 사전 컴파일
+
+        체인 입력은 chat_history/context/question/extra_instructions를 모두 명시적으로 받는다
+        (self를 캡처하는 람다 없음 → 컴파일된 체인을 요청 간/스레드 간 재사용 가능).
+        LLM이 바뀌면 update_llm()에서 다시 호출한다.
+        """
+        templates = {"base": self.base_prompt_template, **self.prompt_templates}
+        compiled = {}
+        for name, template in templates.items():
+            prompt = PromptTemplate(
+                template=template,
+                input_variables=["chat_history", "context", "question", "extra_instructions"]
+            )
+            compiled[name] = (prompt, prompt | self.llm | StrOutputParser())
+        self._compiled_chains = compiled
+
+    def _select_prompt_for_query_type(self, query_type: str):
+        """질문 유형별 사전 컴파일된 (프롬프트, 체인) 선택
+
+        동시 요청이 서로의 템플릿을 덮어쓰지 않도록 self는 바꾸지 않는다.
+        선택 결과는 요청 안에서 생성/재시도 경로에 명시적으로 전달한다.
+        """
+        return self._compiled_chains.get(query_type, self._compiled_chains["base"])
+
+    def _finalize_answer(
+        self,
+        question: str,
+        answer: str,
+        directives: Dict[str, Any],
+        constraint_eval: Dict[str, Any],
+        verification_result: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """검증 이후 단계: 안전 응답 판정 → Citation → 출처/신뢰도 → 결과 dict"""
+        retrieval_stats = self._collect_retrieval_stats()
+        safe_check = self._should_trigger_safe_response(
+            directives,
+            constraint_eval,
+            verification_result,
+            retrieval_stats
+        )
+
+        if safe_check["trigger"]:
+            suggested_keywords = self._extract_suggested_keywords(
+                question,
+                constraint_eval["missing_terms"]
+            )
+            safe_answer = self._build_safe_response(
+                question,
+                suggested_keywords,
+                constraint_eval["missing_terms"]
+            )
+            failure_details = {
+                "reasons": safe_check["reasons"],
+                "missing_terms": constraint_eval["missing_terms"],
+                "format_feedback": constraint_eval["format_feedback"],
+                "top_scores": retrieval_stats["top_scores"]
+            }
+            return {
+                "answer": safe_answer,
+                "sources": [],
+                "confidence": 0.0,
+                "success": False,
+                "failure_reason": safe_check["reasons"][0] if safe_check["reasons"] else "unknown",
+                "failure_details": failure_details
+            }
+
+        source_docs = [doc for doc, _ in self._last_retrieved_docs[:self.top_k]]
+        if source_docs and self._stage_allowed("citations"):
+            with self.stage_costs.measure("citations"):
+                answer = self._generate_source_citations(answer, source_docs)
+
+        sources = []
+        for doc, score in self._last_retrieved_docs[:self.top_k]:
+            source_info = {
+                "file_name": doc.metadata.get("file_name", "Unknown"),
+                "page_number": doc.metadata.get("page_number", "Unknown"),
+                "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
+                "similarity_score": float(round(score * 100, 1)) if isinstance(score, (int, float)) else 0.0
+            }
+            sources.append(source_info)
+
+        confidence = self._calculate_confidence_score(question, answer, [d for d, _ in self._last_retrieved_docs[:self.top_k]])
+
+        result = {
+            "answer": answer,
+            "sources": sources,
+            "confidence": confidence,
+            "success": True,
+            "constraint_evaluation": constraint_eval
+        }
+
+        if hasattr(self, "_last_classification") and self._last_classification:
+            result["classification"] = self._last_classification
+
+        return result
+
     def query(
         self,
         question: str,
         chat_history: List[Dict[str, str]] = None,
         constraints: Optional[Dict[str, Any]] = None,
-        search_mode: str = "integrated"
+        search_mode: str = "integrated",
+        budget_ms: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """질문에 대한 답변 생성
+
+        Args:
+            budget_ms: 요청 지연 예산 (ms). 지정 시 남은 예산에 맞지 않는 선택 단계
+                       (동의어 확장, Multi-Query, Self-Consistency, 재생성, 형식 재시도, Citation)를
+                       건너뛰고 결과의 "budget"에 보고
+        """
+        budget = LatencyBudget(budget_ms, self.stage_costs) if budget_ms else None
+        budget_token = _request_latency_budget.set(budget)
+        try:
+            cache_key = self._answer_cache_key(chat_history, constraints, search_mode)
+            result = self._lookup_answer_cache(question, search_mode, cache_key) if cache_key else None
+            if result is None:
+                result = self._query_internal(question, chat_history, constraints, search_mode)
+                # 예산 때문에 단계를 건너뛴 답변/실패 답변은 저장하지 않음
+                degraded = budget is not None and budget.skipped
+                if cache_key and result.get("success", True) and not degraded:
+                    config_key, corpus_version, extra_key = cache_key
+                    self.answer_cache.put(
+                        question, search_mode, config_key, corpus_version, result,
+                        retrieved_docs=self._last_retrieved_docs, extra_key=extra_key
+                    )
+            if budget is not None:
+                result["budget"] = budget.report()
+                result["skipped_stages"] = list(budget.skipped)
+            return result
+        finally:
+            _request_latency_budget.reset(budget_token)
+
+    def _answer_config_hash(self) -> str:
+        """답변에 영향을 주는 설정 해시 (LLM/검색/프롬프트 변경 시 캐시 키가 달라짐)
+
+        질문 분류기가 질문마다 바꾸는 값(enable_multi_query, max_tokens 등)은 질문에서 결정되므로 제외
+        """
+        settings = {
+            "llm": (self.llm_api_type, self.llm_base_url, self.llm_model, self.temperature),
+            "retrieval": (
+                self.top_k, self.use_reranker, getattr(self, "reranker_model", None),
+                getattr(self, "multi_query_num", None),
+                getattr(self, "enable_synonym_expansion", None), getattr(self, "enable_hybrid_search", None),
+                getattr(self, "enable_cascade_rerank", None),
+            ),
+            "context": (
+                self.context_packer.max_tokens if getattr(self, "context_packer", None) else None,
+                self.context_compressor.keep_ratio if getattr(self, "context_compressor", None) else None,
+            ),
+            "generation": (self.enable_self_consistency, getattr(self, "self_consistency_n", None)),
+            "prompts": (self.base_prompt_template, sorted(self.prompt_templates.items())),
+        }
+        return config_hash(settings)
+
+    def _answer_cache_key(
+        self,
+        chat_history: Optional[List[Dict[str, str]]],
+        constraints: Optional[Dict[str, Any]],
+        search_mode: str
+    ) -> Optional[tuple]:
+        """(설정 해시, 코퍼스 버전, 제약조건 키) 또는 None (캐시 미사용/대화 맥락 의존 질문)"""
+        if getattr(self, "answer_cache", None) is None or chat_history:
+            return None
+        try:
+            corpus_version = self.vectorstore.get_corpus_version(search_mode)
+        except Exception as e:
+            print(f"[CACHE][WARN] 코퍼스 버전 확인 실패, 캐시 생략: {e}")
+            return None
+        extra_key = json.dumps(constraints or {}, sort_keys=True, ensure_ascii=False, default=str)
+        return self._answer_config_hash(), corpus_version, extra_key
+
+    def _lookup_answer_cache(self, question: str, search_mode: str, cache_key: tuple) -> Optional[Dict[str, Any]]:
+        config_key, corpus_version, extra_key = cache_key
+        cached = self.answer_cache.get(question, search_mode, config_key, corpus_version, extra_key=extra_key)
+        if cached is None:
+            return None
+        result, retrieved_docs, info = cached
+        # 출처 조회(get_source_documents)가 캐시된 답변 기준으로 동작하도록 복원
+        self._last_retrieved_docs = retrieved_docs
+        result["cache"] = info
+        print(f"[CACHE] 답변 캐시 적중 ({info['tier']}, 유사도 {info['similarity']:.3f})")
+        return result
+
+    def get_answer_cache_stats(self) -> Dict[str, Any]:
+        """답변 캐시 적중률 통계"""
+        if getattr(self, "answer_cache", None) is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.answer_cache.stats()}
+
+    def _query_internal(
+        self,
+        question: str,
+        chat_history: List[Dict[str, str]],
+        constraints: Optional[Dict[str, Any]],
+        search_mode: str
     ) -> Dict[str, Any]:
         try:
             constraints = constraints or {}
@@ -2267,78 +2892,66 @@ class RAGChain:
                 return self._handle_exhaustive_query(question, formatted_history)
 
             query_type = self._detect_query_type(question)
-            if query_type in self.prompt_templates:
-                selected_template = self.prompt_templates[query_type]
-                self.prompt = PromptTemplate(
-                    template=selected_template,
-                    input_variables=["chat_history", "context", "question", "extra_instructions"]
-                )
-                self.chain = (
-                    RunnablePassthrough.assign(
-                        chat_history=lambda x: x.get("chat_history") or self._format_chat_history(
-                            x.get("chat_history_raw", [])
-                        ),
-                        context=lambda x: x.get("context") or self._get_context(
-                            x["question"],
-                            x.get("chat_history_raw"),
-                            x.get("search_mode", "integrated")
-                        ),
-                        extra_instructions=lambda x: x.get("extra_instructions", "")
-                    )
-                    | self.prompt
-                    | self.llm
-                    | StrOutputParser()
-                )
+            prompt, chain = self._select_prompt_for_query_type(query_type)
 
             directives = self._compose_answer_directives(question, query_type, constraints)
+            _request_gate_record.set(None)
             context = self._get_context(question, chat_history_list, search_mode)
+            gate_record = _request_gate_record.get()
 
             chain_input = {
                 "question": question,
                 "chat_history": formatted_history,
-                "chat_history_raw": chat_history_list,
                 "context": context,
-                "extra_instructions": directives["instructions"],
-                "search_mode": search_mode
+                "extra_instructions": directives["instructions"]
             }
 
             consistency_score = 1.0
-            if self.enable_self_consistency:
-                sc_result = self._generate_with_self_consistency(
-                    question=question,
-                    context=context,
-                    chat_history=formatted_history,
-                    n=self.self_consistency_n,
-                    enable=True,
-                    extra_instructions=directives["instructions"],
-                    search_mode=search_mode
-                )
+            use_self_consistency = self.enable_self_consistency and self._stage_allowed("self_consistency")
+            if use_self_consistency:
+                with self.stage_costs.measure("self_consistency"):
+                    sc_result = self._generate_with_self_consistency(
+                        question=question,
+                        context=context,
+                        chat_history=formatted_history,
+                        n=self.self_consistency_n,
+                        enable=True,
+                        extra_instructions=directives["instructions"],
+                        search_mode=search_mode,
+                        chain=chain
+                    )
                 answer = sc_result["answer"]
                 consistency_score = sc_result["consistency"]
                 print(f"  [OK] Self-Consistency 적용 완료 (일관성: {consistency_score:.2%})")
             else:
-                raw_answer = self.chain.invoke(chain_input)
+                with self.stage_costs.measure("generation"):
+                    raw_answer = chain.invoke(chain_input)
                 answer = self._extract_text_from_llm_output(raw_answer)
 
             docs_for_confidence = [d for d, _ in self._last_retrieved_docs[:self.top_k]]
 
-            skip_verification = self.enable_self_consistency and consistency_score > 0.8
+            skip_verification = use_self_consistency and consistency_score > 0.8
             verification_result: Optional[Dict[str, Any]] = None
+            verification_failed: Optional[bool] = None
+            regenerated = False
 
             if not skip_verification:
                 verification_result = self._verify_answer_quality(question, answer, docs_for_confidence)
-                if not verification_result["is_valid"]:
+                verification_failed = not verification_result["is_valid"]
+                if verification_failed and self._stage_allowed("regeneration"):
                     print(f"[WARN] 답변 검증 실패: {verification_result['reason']}")
                     print("[INFO] 문서 기반 재생성 시도...")
-                    regenerated_answer = self._regenerate_answer(
-                        question,
-                        answer,
-                        docs_for_confidence,
-                        formatted_history,
-                        extra_instructions=directives["instructions"]
-                    )
+                    with self.stage_costs.measure("regeneration"):
+                        regenerated_answer = self._regenerate_answer(
+                            question,
+                            answer,
+                            docs_for_confidence,
+                            formatted_history,
+                            extra_instructions=directives["instructions"]
+                        )
                     if regenerated_answer:
                         answer = regenerated_answer
+                        regenerated = True
                         docs_for_confidence = [d for d, _ in self._last_retrieved_docs[:self.top_k]]
                         verification_result = self._verify_answer_quality(question, answer, docs_for_confidence)
                         print("[OK] 답변 재생성 완료")
@@ -2353,14 +2966,20 @@ class RAGChain:
                 directives["expected_format"]
             )
 
-            if directives.get("expected_format") in {"list", "table"} and not constraint_eval["format_ok"]:
-                retry_answer = self._retry_format_generation(
-                    question=question,
-                    context=context,
-                    chat_history=formatted_history,
-                    directives=directives,
-                    search_mode=search_mode
-                )
+            if (
+                directives.get("expected_format") in {"list", "table"}
+                and not constraint_eval["format_ok"]
+                and self._stage_allowed("format_retry")
+            ):
+                with self.stage_costs.measure("format_retry"):
+                    retry_answer = self._retry_format_generation(
+                        question=question,
+                        context=context,
+                        chat_history=formatted_history,
+                        directives=directives,
+                        search_mode=search_mode,
+                        chain=chain
+                    )
                 if retry_answer:
                     answer = retry_answer
                     docs_for_confidence = [d for d, _ in self._last_retrieved_docs[:self.top_k]]
@@ -2371,66 +2990,8 @@ class RAGChain:
                         directives["expected_format"]
                     )
 
-            retrieval_stats = self._collect_retrieval_stats()
-            safe_check = self._should_trigger_safe_response(
-                directives,
-                constraint_eval,
-                verification_result,
-                retrieval_stats
-            )
-
-            if safe_check["trigger"]:
-                suggested_keywords = self._extract_suggested_keywords(
-                    question,
-                    constraint_eval["missing_terms"]
-                )
-                safe_answer = self._build_safe_response(
-                    question,
-                    suggested_keywords,
-                    constraint_eval["missing_terms"]
-                )
-                failure_details = {
-                    "reasons": safe_check["reasons"],
-                    "missing_terms": constraint_eval["missing_terms"],
-                    "format_feedback": constraint_eval["format_feedback"],
-                    "top_scores": retrieval_stats["top_scores"]
-                }
-                return {
-                    "answer": safe_answer,
-                    "sources": [],
-                    "confidence": 0.0,
-                    "success": False,
-                    "failure_reason": safe_check["reasons"][0] if safe_check["reasons"] else "unknown",
-                    "failure_details": failure_details
-                }
-
-            source_docs = [doc for doc, _ in self._last_retrieved_docs[:self.top_k]]
-            if source_docs:
-                answer = self._generate_source_citations(answer, source_docs)
-
-            sources = []
-            for doc, score in self._last_retrieved_docs[:self.top_k]:
-                source_info = {
-                    "file_name": doc.metadata.get("file_name", "Unknown"),
-                    "page_number": doc.metadata.get("page_number", "Unknown"),
-                    "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                    "similarity_score": float(round(score * 100, 1)) if isinstance(score, (int, float)) else 0.0
-                }
-                sources.append(source_info)
-
-            confidence = self._calculate_confidence_score(question, answer, [d for d, _ in self._last_retrieved_docs[:self.top_k]])
-
-            result = {
-                "answer": answer,
-                "sources": sources,
-                "confidence": confidence,
-                "success": True,
-                "constraint_evaluation": constraint_eval
-            }
-
-            if hasattr(self, "_last_classification") and self._last_classification:
-                result["classification"] = self._last_classification
-
+            result = self._finalize_answer(question, answer, directives, constraint_eval, verification_result)
+            self._record_multi_query_gate_outcome(gate_record, verification_failed, regenerated, result)
             return result
         except Exception as e:
             print(f"[ERROR] query() 오류: {e}")
@@ -2443,6 +3004,222 @@ class RAGChain:
                 "success": False
             }
     
+    def query_events(
+        self,
+        question: str,
+        chat_history: List[Dict[str, str]] = None,
+        constraints: Optional[Dict[str, Any]] = None,
+        search_mode: str = "integrated"
+    ) -> Iterator[Dict[str, Any]]:
+        """query()와 같은 결과를 이벤트 스트림으로 반환 (첫 생성 즉시 스트리밍)
+
+        - 스트리밍 중 답변을 주기적으로 검증하여 금지 구문이 나오면 즉시 중단하고 재생성 시작
+        - 스트림 종료 후 품질 재생성과 형식 재시도가 모두 필요하면 동시에 실행
+        - 답변이 바뀌면 replace 이벤트로 전체 답변을 교체
+
+        Yields:
+            {"type": "token", "text": str}                      # 첫 생성 토큰
+            {"type": "replace", "answer": str, "reason": str}   # 재생성/형식 재시도 결과
+            {"type": "final", "result": Dict}                   # query()와 동일한 결과 dict
+        """
+        overall_start = time.perf_counter()
+        try:
+            constraints = constraints or {}
+            chat_history_list = chat_history or []
+            formatted_history = self._format_chat_history(chat_history_list)
+
+            if self.enable_file_aggregation and self._is_exhaustive_query(question):
+                logger.info("[Phase 3] Exhaustive query 감지 → 파일 리스트 반환 모드")
+                yield {"type": "final", "result": self._handle_exhaustive_query(question, formatted_history)}
+                return
+
+            query_type = self._detect_query_type(question)
+            prompt, chain = self._select_prompt_for_query_type(query_type)
+
+            directives = self._compose_answer_directives(question, query_type, constraints)
+            _request_gate_record.set(None)
+            context = self._get_context(question, chat_history_list, search_mode)
+            gate_record = _request_gate_record.get()
+            docs_for_confidence = [d for d, _ in self._last_retrieved_docs[:self.top_k]]
+
+            # 1. 첫 생성 스트리밍 (+ 점진적 금지 구문 검사)
+            consistency_score = 1.0
+            aborted_early = False
+            chain_start = time.perf_counter()
+            if self.enable_self_consistency:
+                sc_result = self._generate_with_self_consistency(
+                    question=question,
+                    context=context,
+                    chat_history=formatted_history,
+                    n=self.self_consistency_n,
+                    enable=True,
+                    extra_instructions=directives["instructions"],
+                    search_mode=search_mode,
+                    chain=chain
+                )
+                answer = sc_result["answer"]
+                consistency_score = sc_result["consistency"]
+                yield {"type": "token", "text": answer}
+            else:
+                prompt_text = prompt.format(
+                    chat_history=formatted_history,
+                    context=context,
+                    question=question,
+                    extra_instructions=directives["instructions"]
+                )
+                parts: List[str] = []
+                checked_len = 0
+                for chunk in self.llm.stream(prompt_text):
+                    text = self._extract_text_from_llm_output(chunk)
+                    if not text:
+                        continue
+                    if not parts:
+                        print(f"[Timing] LLM first token delay: {time.perf_counter() - chain_start:.2f}s")
+                    parts.append(text)
+                    yield {"type": "token", "text": text}
+
+                    partial = "".join(parts)
+                    if docs_for_confidence and len(partial) - checked_len >= 80:
+                        checked_len = len(partial)
+                        partial_check = self._verify_answer_quality(question, partial, docs_for_confidence)
+                        if partial_check["scores"].get("no_forbidden_phrases", 1.0) == 0:
+                            # 금지 구문이 나오면 최종 검증 실패가 확정 → 생성 중단 후 바로 재생성
+                            print("[STREAM] 금지 구문 감지, 첫 생성 중단 후 재생성")
+                            aborted_early = True
+                            break
+                answer = "".join(parts)
+            print(f"[Timing] first generation: {time.perf_counter() - chain_start:.2f}s")
+
+            # 2. 검증 + 형식 평가 (재생성/형식 재시도는 병렬 실행)
+            skip_verification = self.enable_self_consistency and consistency_score > 0.8
+            verification_result: Optional[Dict[str, Any]] = None
+            if not skip_verification:
+                verification_result = self._verify_answer_quality(question, answer, docs_for_confidence)
+            constraint_eval = self._evaluate_answer_constraints(
+                answer,
+                directives["must_terms"],
+                directives["expected_format"]
+            )
+
+            needs_regen = verification_result is not None and not verification_result["is_valid"]
+            regenerated_used = False
+            needs_format = (
+                directives.get("expected_format") in {"list", "table"}
+                and not constraint_eval["format_ok"]
+            )
+
+            if needs_regen or needs_format:
+                fix_start = time.perf_counter()
+                regenerated: Optional[str] = None
+                retried: Optional[str] = None
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix="query-fix") as executor:
+                    regen_future = None
+                    format_future = None
+                    if needs_regen:
+                        print(f"[WARN] 답변 검증 실패: {verification_result['reason']}")
+                        regen_future = executor.submit(
+                            self._regenerate_answer,
+                            question,
+                            answer,
+                            docs_for_confidence,
+                            formatted_history,
+                            extra_instructions=directives["instructions"]
+                        )
+                    if needs_format:
+                        format_future = executor.submit(
+                            self._retry_format_generation,
+                            question=question,
+                            context=context,
+                            chat_history=formatted_history,
+                            directives=directives,
+                            search_mode=search_mode,
+                            chain=chain
+                        )
+                    if regen_future is not None:
+                        regenerated = regen_future.result()
+                    if format_future is not None:
+                        retried = format_future.result()
+
+                reason = None
+                if regenerated:
+                    answer = regenerated
+                    regenerated_used = True
+                    reason = "verification_failed"
+                    constraint_eval = self._evaluate_answer_constraints(
+                        answer,
+                        directives["must_terms"],
+                        directives["expected_format"]
+                    )
+                    # query()와 동일: 재생성 답변이 형식도 통과하면 형식 재시도 결과는 버림
+                    if (
+                        directives.get("expected_format") in {"list", "table"}
+                        and not constraint_eval["format_ok"]
+                        and retried is None
+                    ):
+                        retried = self._retry_format_generation(
+                            question=question,
+                            context=context,
+                            chat_history=formatted_history,
+                            directives=directives,
+                            search_mode=search_mode,
+                            chain=chain
+                        )
+                elif needs_regen:
+                    print("[WARN] 재생성 실패, 원본 답변 사용")
+                    if aborted_early:
+                        # 중단했던 첫 생성을 끝까지 다시 생성 (잘린 답변 방지)
+                        answer = self._generate_answer_internal(
+                            question=question,
+                            context=context,
+                            chat_history=formatted_history,
+                            extra_instructions=directives["instructions"],
+                            search_mode=search_mode,
+                            chain=chain
+                        ) or answer
+                        reason = "stream_aborted"
+                        constraint_eval = self._evaluate_answer_constraints(
+                            answer,
+                            directives["must_terms"],
+                            directives["expected_format"]
+                        )
+
+                if retried and (not constraint_eval["format_ok"]):
+                    answer = retried
+                    reason = "format_mismatch"
+
+                if reason:
+                    verification_result = self._verify_answer_quality(question, answer, docs_for_confidence)
+                    constraint_eval = self._evaluate_answer_constraints(
+                        answer,
+                        directives["must_terms"],
+                        directives["expected_format"]
+                    )
+                    print(f"[Timing] answer fix ({reason}): {time.perf_counter() - fix_start:.2f}s")
+                    yield {"type": "replace", "answer": answer, "reason": reason}
+            elif skip_verification:
+                print(f"  [OK] 높은 일관성 ({consistency_score:.2%}), 검증 Skip")
+
+            result = self._finalize_answer(question, answer, directives, constraint_eval, verification_result)
+            result["stream_aborted_early"] = aborted_early
+            self._record_multi_query_gate_outcome(
+                gate_record, needs_regen if not skip_verification else None, regenerated_used, result
+            )
+            print(f"[Timing] query_events total: {time.perf_counter() - overall_start:.2f}s")
+            yield {"type": "final", "result": result}
+        except Exception as e:
+            print(f"[ERROR] query_events() 오류: {e}")
+            import traceback
+            traceback.print_exc()
+            yield {
+                "type": "final",
+                "result": {
+                    "answer": f"오류가 발생했습니다: {str(e)}",
+                    "sources": [],
+                    "confidence": 0.0,
+                    "success": False
+                }
+            }
+
     def _verify_answer_quality(self, question: str, answer: str, docs: List[Document]) -> Dict[str, Any]:
         """답변 품질 검증 (Phase 2: 상용 서비스 수준)
         
@@ -2650,11 +3427,16 @@ class RAGChain:
         try:
             formatted_history = self._format_chat_history(chat_history or [])
 
+            # 질문 유형별 프롬프트 (요청마다 지역 변수로 선택)
+            prompt, _ = self._select_prompt_for_query_type(self._detect_query_type(question))
+
             # 컨텍스트 구성 (로그 포함)
+            _request_gate_record.set(None)
             context = self._get_context(question, chat_history, search_mode)
+            gate_record = _request_gate_record.get()
 
             # 최종 프롬프트 조합 후 로그 출력
-            prompt_text = self.prompt.format(
+            prompt_text = prompt.format(
                 chat_history=formatted_history,
                 context=context,
                 question=question,
@@ -2664,23 +3446,43 @@ class RAGChain:
             print(prompt_text)
             print("[Prompt] ----------- END -----------")
 
+            # 완성된 문장마다 백그라운드에서 출처 매칭 후 인라인 삽입
+            citer = None
+            source_docs = [doc for doc, _ in self._last_retrieved_docs]
+            if self.enable_streaming_citations and source_docs:
+                citer = StreamingCitationProcessor(self, source_docs)
+
             chain_start = time.perf_counter()
             first_chunk = True
-            for chunk in self.llm.stream(prompt_text):
-                # chunk 타입별로 텍스트 추출
-                if hasattr(chunk, "content") and isinstance(chunk.content, str):
-                    text = chunk.content
-                elif hasattr(chunk, "text") and isinstance(chunk.text, str):
-                    text = chunk.text
-                else:
-                    text = str(chunk)
-
-                if text:
-                    if first_chunk:
-                        print(f"[Timing] LLM first token delay: {time.perf_counter() - chain_start:.2f}s")
-                        first_chunk = False
-                    yield text
-
+            try:
+                for chunk in self.llm.stream(prompt_text):
+                    # chunk 타입별로 텍스트 추출
+                    if hasattr(chunk, "content") and isinstance(chunk.content, str):
+                        text = chunk.content
+                    elif hasattr(chunk, "text") and isinstance(chunk.text, str):
+                        text = chunk.text
+                    else:
+                        text = str(chunk)
+
+                    if text:
+                        if first_chunk:
+                            print(f"[Timing] LLM first token delay: {time.perf_counter() - chain_start:.2f}s")
+                            first_chunk = False
+                        if citer is not None:
+                            yield from citer.feed(text)
+                        else:
+                            yield text
+
+                if citer is not None:
+                    yield from citer.flush()
+                    print(f"  [CITE] 스트리밍 Citation: {citer.citation_count}/{citer.sentence_count}개 문장")
+            finally:
+                # 오류나 소비 중단(제너레이터 close)에도 매칭 스레드 정리
+                if citer is not None:
+                    citer.close()
+
+            # 스트리밍 경로는 답변 검증/재생성이 없으므로 출처 유무만 기록
+            self._record_multi_query_gate_outcome(gate_record, None, False, {"sources": source_docs})
             print(f"[Timing] LLM streaming total: {time.perf_counter() - chain_start:.2f}s")
             print(f"[Timing] query_stream total: {time.perf_counter() - overall_start:.2f}s")
         except Exception as e:
@@ -2694,7 +3496,7 @@ class RAGChain:
                 return []
             
             # 캐시된 문서에 점수 정규화 적용
-            is_reranker = self.use_reranker
+            is_reranker = self.use_reranker and self.reranker is not None
             probs = self._normalize_scores(self._last_retrieved_docs, is_reranker=is_reranker)
             
             sources = []
@@ -2718,7 +3520,9 @@ class RAGChain:
         return getattr(self, '_last_classification', None)
 
     def clear_memory(self):
-        pass
+        # 새 대화: 이전 세션 후보 풀 폐기
+        if getattr(self, "session_pool", None) is not None:
+            self.session_pool.reset()
     
     def update_llm(self, llm_api_type: str, llm_base_url: str, llm_model: str, 
                    llm_api_key: str = "", temperature: float = 0.7):
@@ -2728,16 +3532,9 @@ class RAGChain:
         self.llm_api_key = llm_api_key
         self.temperature = temperature
         self.llm = self._create_llm()
-        self.chain = (
-            {
-                "context": lambda x: self._get_context(x["question"]),
-                "chat_history": lambda x: x.get("chat_history", "이전 대화 없음"),
-                "question": lambda x: x["question"]
-            }
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        # 새 LLM으로 체인 재컴파일 (self.prompt/self.chain은 기본 템플릿)
+        self._compile_chains()
+        self.prompt, self.chain = self._compiled_chains["base"]
     
     def update_retriever(self, vectorstore, top_k: int = 3):
         self.vectorstore = vectorstore
@@ -2745,16 +3542,7 @@ class RAGChain:
         self.retriever = vectorstore.as_retriever(
             search_kwargs={"k": max(top_k * 5, 20)}
         )
-        self.chain = (
-            {
-                "context": lambda x: self._get_context(x["question"]),
-                "chat_history": lambda x: x.get("chat_history", "이전 대화 없음"),
-                "question": lambda x: x["question"]
-            }
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
-        )
+        # 컴파일된 체인은 context를 명시적으로 받으므로 재구성 불필요
 
     def _to_percentage(self, scores: List[float], is_reranker: bool) -> List[float]:
         """점수 리스트를 0~100%로 정규화"""
@@ -3040,30 +3828,9 @@ class RAGChain:
         if not sources or not sentence:
             return []
 
-        # 1. 문장 임베딩
-        sentence_embedding = self._embed_text(sentence)
-
-        # 2. 모든 출처와 유사도 계산
-        relevant_sources = []
-
-        for source in sources:
-            # 출처 텍스트 임베딩
-            source_text = source.page_content[:500] if len(source.page_content) > 500 else source.page_content
-            source_embedding = self._embed_text(source_text)
-
-            # 코사인 유사도
-            similarity = self._cosine_similarity(sentence_embedding, source_embedding)
-
-            # 동적 임계값 이상이면 모두 추가
-            threshold = self._get_adaptive_threshold(sentence, sources)
-            if similarity > threshold:
-                relevant_sources.append((source, similarity))
-
-        # 3. 유사도 순 정렬
-        relevant_sources.sort(key=lambda x: x[1], reverse=True)
-
-        # 4. 최대 2개까지 반환
-        return [src for src, _ in relevant_sources[:2]]
+        source_matrix = self._embed_citation_sources(sources)
+        matches = self._match_citation_sources([sentence], source_matrix)
+        return [sources[idx] for idx in matches[0]]
 
     def _get_adaptive_threshold(self, sentence: str, sources: List[Document]) -> float:
         """동적 임계값 계산 (Phase C)
@@ -3089,6 +3856,80 @@ class RAGChain:
         else:
             return 0.35  # 긴 문장은 더 관대하게
 
+    def _get_adaptive_thresholds(self, sentences: List[str]) -> np.ndarray:
+        """_get_adaptive_threshold의 벡터화 버전 (문장별 임계값 배열)"""
+        lengths = np.array([len(sentence) for sentence in sentences])
+        return np.where(lengths < 20, 0.5, np.where(lengths < 40, 0.4, 0.35))
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """행 단위 L2 정규화 (영벡터는 그대로 유지 → 유사도 0)"""
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _embed_citation_sources(self, sources: List[Document]) -> np.ndarray:
+        """출처 임베딩 행렬 (요청당 1회)
+
+        Chroma에 저장된 청크 임베딩을 우선 사용하고, 저장 벡터가 없는 문서
+        (Small-to-Large 확장 문서 등)만 앞 500자를 배치 임베딩한다.
+
+        Returns:
+            (len(sources), dim) 크기의 정규화된 행렬
+        """
+        vectors: List[Optional[np.ndarray]] = [None] * len(sources)
+        if hasattr(self.vectorstore, "get_stored_embeddings"):
+            vectors = self.vectorstore.get_stored_embeddings(sources)
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            embedded = self.vectorstore.embeddings.embed_documents(
+                [sources[i].page_content[:500] for i in missing]
+            )
+            for i, emb in zip(missing, embedded):
+                vectors[i] = np.asarray(emb, dtype=np.float32)
+        print(f"    [CITE] 출처 임베딩: 저장 벡터 {len(sources) - len(missing)}개, 신규 {len(missing)}개")
+
+        return self._normalize_rows(np.vstack(vectors))
+
+    def _match_citation_sources(
+        self,
+        sentences: List[str],
+        source_matrix: np.ndarray,
+        max_sources: int = 2
+    ) -> List[List[int]]:
+        """문장×출처 유사도 행렬로 문장별 출처 인덱스 선택 (Phase C 규칙 유지)
+
+        문장들은 한 번의 배치로 임베딩하고, 동적 임계값을 넘는 출처 중
+        유사도 상위 max_sources개를 반환한다.
+
+        Args:
+            sentences: 매칭할 문장 리스트
+            source_matrix: _embed_citation_sources 결과 (정규화된 행렬)
+            max_sources: 문장당 최대 출처 수
+
+        Returns:
+            문장 순서와 같은 출처 인덱스 리스트의 리스트
+        """
+        if not sentences or source_matrix.size == 0:
+            return [[] for _ in sentences]
+
+        sentence_matrix = self._normalize_rows(self.vectorstore.embeddings.embed_documents(sentences))
+        similarity = np.clip(sentence_matrix @ source_matrix.T, 0.0, 1.0)
+        thresholds = self._get_adaptive_thresholds(sentences)
+
+        # 임계값 미달은 제외하고 유사도 내림차순 상위 max_sources개
+        masked = np.where(similarity > thresholds[:, None], similarity, -1.0)
+        order = np.argsort(-masked, axis=1, kind="stable")[:, :max_sources]
+
+        matches = []
+        for row, cols in enumerate(order):
+            matches.append([int(col) for col in cols if masked[row, col] > 0])
+        return matches
+
     def _generate_source_citations(self, answer: str, sources: List[Document]) -> str:
         """NotebookLM 스타일 출처 인라인 표시 (Phase C: 95% 목표)
 
@@ -3108,18 +3949,24 @@ class RAGChain:
         sentences = self._split_sentences(answer)
         print(f"    [OK] 문장 분리: {len(sentences)}개")
 
-        # 2. 각 문장에 출처 매칭
+        # 2. 문장×출처 유사도 행렬로 일괄 매칭
+        # Phase C: 짧은 문장 임계값 낮춤 (15 → 10)
+        target_idx = [i for i, sentence in enumerate(sentences) if len(sentence) >= 10]
+        matches_by_sentence: Dict[int, List[int]] = {}
+        if target_idx:
+            try:
+                source_matrix = self._embed_citation_sources(sources)
+                # Phase C: 여러 출처 허용 (최대 2개)
+                matches = self._match_citation_sources([sentences[i] for i in target_idx], source_matrix)
+                matches_by_sentence = dict(zip(target_idx, matches))
+            except Exception as e:
+                print(f"    [WARN] Citation 매칭 실패: {e}")
+
         cited_sentences = []
         citation_count = 0
 
         for i, sentence in enumerate(sentences):
-            # Phase C: 짧은 문장 임계값 낮춤 (15 → 10)
-            if len(sentence) < 10:
-                cited_sentences.append(sentence)
-                continue
-
-            # Phase C: 여러 출처 허용 (최대 2개)
-            relevant_sources = self._find_multiple_sources_for_sentence(sentence, sources)
+            relevant_sources = [sources[idx] for idx in matches_by_sentence.get(i, [])]
 
             if relevant_sources:
                 # 여러 출처를 인라인으로 결합
@@ -3145,7 +3992,8 @@ class RAGChain:
         context: str,
         chat_history: str = "",
         extra_instructions: str = "",
-        search_mode: str = "integrated"
+        search_mode: str = "integrated",
+        chain=None
     ) -> str:
         """내부 답변 생성 메서드 (Self-Consistency용)
 
@@ -3153,19 +4001,18 @@ class RAGChain:
             question: 사용자 질문
             context: 검색된 문맥
             chat_history: 대화 이력 (formatted)
+            chain: 요청에서 선택한 컴파일 체인 (None이면 기본 체인)
 
         Returns:
             생성된 답변 문자열
         """
         try:
             # LangChain invoke 사용
-            answer = self.chain.invoke({
+            answer = (chain or self.chain).invoke({
                 "question": question,
                 "context": context,
                 "chat_history": chat_history if chat_history else "이전 대화 없음",
-                "chat_history_raw": [],
-                "extra_instructions": extra_instructions,
-                "search_mode": search_mode
+                "extra_instructions": extra_instructions
             })
 
             return self._extract_text_from_llm_output(answer)
@@ -3236,7 +4083,8 @@ class RAGChain:
         n: int = 3,
         enable: bool = True,
         extra_instructions: str = "",
-        search_mode: str = "integrated"
+        search_mode: str = "integrated",
+        chain=None
     ) -> Dict[str, Any]:
         """Self-Consistency Check: 여러 번 생성 후 일관성 검증
 
@@ -3246,6 +4094,7 @@ class RAGChain:
             chat_history: 대화 이력
             n: 생성 횟수 (기본 3회)
             enable: Self-Consistency 활성화 여부
+            chain: 요청에서 선택한 컴파일 체인 (None이면 기본 체인)
 
         Returns:
             {
@@ -3262,7 +4111,8 @@ class RAGChain:
                 context,
                 chat_history,
                 extra_instructions=extra_instructions,
-                search_mode=search_mode
+                search_mode=search_mode,
+                chain=chain
             )
             return {
                 'answer': answer,
@@ -3284,7 +4134,8 @@ class RAGChain:
                 context,
                 chat_history,
                 extra_instructions=extra_instructions,
-                search_mode=search_mode
+                search_mode=search_mode,
+                chain=chain
             )
             if answer:  # 빈 답변 제외
                 answers.append(answer)
@@ -3,7 +3,7 @@
 LangChain의 Runnable 인터페이스 구현으로 LCEL 호환
 """
 import requests
-from typing import Any, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Union
 from langchain_core.runnables import Runnable
 from langchain_core.callbacks import CallbackManagerForLLMRun
 
@@ -24,8 +24,16 @@ class RequestLLM(Runnable):
         timeout: int = 60,
         num_ctx: int = 2048,
         num_predict: int = 512,
+        keep_alive: Optional[Union[str, int]] = None,
+        options: Optional[Dict[str, Any]] = None,
         **kwargs
     ):
+        """
+        Args:
+            num_ctx: Ollama 컨텍스트 길이 (요청마다 값이 바뀌면 모델이 다시 로드되므로 고정 권장)
+            keep_alive: Ollama 모델 메모리 유지 시간 (예: "30m", -1 = 무기한, None = 서버 기본값 5분)
+            options: Ollama options 추가 전달 (top_p, num_thread 등, 기본 옵션보다 우선)
+        """
         super().__init__()
         self.base_url = base_url.rstrip('/')
         self.model = model
@@ -33,6 +41,8 @@ class RequestLLM(Runnable):
         self.timeout = timeout
         self.num_ctx = num_ctx
         self.num_predict = num_predict
+        self.keep_alive = keep_alive
+        self.options = dict(options or {})
         self.extra_params = kwargs
         
         # API 타입 자동 감지
@@ -90,18 +100,27 @@ class RequestLLM(Runnable):
         except Exception as e:
             yield f"스트리밍 오류: {str(e)}"
     
-    def _call_ollama(self, prompt: str) -> str:
-        """Ollama API 동기 호출"""
+    def _ollama_payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        """Ollama /api/generate 요청 본문 (keep_alive로 모델 상주 → 접두부 KV 캐시 재사용)"""
+        options = {
+            "temperature": self.temperature,
+            "num_ctx": self.num_ctx,
+            "num_predict": self.num_predict
+        }
+        options.update(self.options)
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": self.temperature,
-                "num_ctx": self.num_ctx,
-                "num_predict": self.num_predict
-            }
+            "stream": stream,
+            "options": options
         }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        return payload
+
+    def _call_ollama(self, prompt: str) -> str:
+        """Ollama API 동기 호출"""
+        payload = self._ollama_payload(prompt, stream=False)
         
         try:
             print(f"[LLM] Ollama API 요청 전송 중...")
@@ -136,16 +155,7 @@ class RequestLLM(Runnable):
     
     def _stream_ollama(self, prompt: str) -> Iterator[str]:
         """Ollama API 스트리밍 호출"""
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": True,
-            "options": {
-                "temperature": self.temperature,
-                "num_ctx": self.num_ctx,
-                "num_predict": self.num_predict
-            }
-        }
+        payload = self._ollama_payload(prompt, stream=True)
         
         response = requests.post(
             self.endpoint,
@@ -5,11 +5,12 @@ Vector Search로 추출된 후보를 정확하게 재순위화
 """
 
 from typing import List, Dict, Any, Optional
-from sentence_transformers import CrossEncoder
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import logging
 import os
 import sys
+import threading
 
 # 폐쇄망 환경에서의 안전한 실행을 위한 환경변수 설정
 os.environ["TRANSFORMERS_OFFLINE"] = "1"
@@ -39,6 +40,9 @@ class CrossEncoderReranker:
             model_name: 사용할 모델 ("multilingual-mini")
             device: 실행 디바이스 ("cpu" 또는 "cuda")
         """
+        # torch/sentence-transformers는 무거우므로 실제 로딩 시점에 import
+        from sentence_transformers import CrossEncoder
+
         self.model_name = model_name
         self.device = device
         
@@ -115,6 +119,14 @@ class CrossEncoderReranker:
                 )
             raise RuntimeError(error_msg)
     
+    def warmup(self) -> None:
+        """합성 입력으로 1회 predict 실행 (첫 요청의 그래프 초기화 비용 선지불)"""
+        try:
+            self.model.predict([["warm-up query", "warm-up document"]])
+            logger.info("Re-ranker 워밍업 완료")
+        except Exception as e:
+            logger.warning(f"Re-ranker 워밍업 실패: {e}")
+
     def rerank(
         self,
         query: str,
@@ -333,6 +345,11 @@ class CrossEncoderReranker:
 
 # 전역 인스턴스 (싱글톤)
 _reranker_instance: Optional[CrossEncoderReranker] = None
+_reranker_lock = threading.Lock()
+
+# 백그라운드 로더 (모델 로딩은 한 번에 하나만)
+_loader_executor: Optional[ThreadPoolExecutor] = None
+_loader_futures: Dict[str, Future] = {}
 
 
 def get_reranker(
@@ -353,8 +370,49 @@ def get_reranker(
     """
     global _reranker_instance
     
-    if _reranker_instance is None or force_reload:
-        _reranker_instance = CrossEncoderReranker(model_name, device)
+    # 백그라운드 로딩 중 호출되면 중복 로딩 대신 완료를 기다림
+    with _reranker_lock:
+        if _reranker_instance is None or force_reload:
+            _reranker_instance = CrossEncoderReranker(model_name, device)
     
     return _reranker_instance
 
+
+def load_reranker_async(
+    model_name: str = "multilingual-mini",
+    device: str = "cpu",
+    warmup: bool = True
+) -> Future:
+    """
+    Re-ranker를 백그라운드 스레드에서 로딩 (UI 시작 지연 방지)
+    
+    Args:
+        model_name: 모델 이름
+        device: 실행 디바이스
+        warmup: 로딩 후 합성 predict로 워밍업 여부
+    
+    Returns:
+        CrossEncoderReranker를 결과로 갖는 Future (같은 모델은 Future 공유)
+    """
+    global _loader_executor
+    
+    with _reranker_lock:
+        future = _loader_futures.get(model_name)
+        if future is not None and not (future.done() and future.exception() is not None):
+            return future
+        
+        if _loader_executor is None:
+            _loader_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker-loader")
+    
+    def _load() -> CrossEncoderReranker:
+        reranker = get_reranker(model_name=model_name, device=device)
+        if warmup:
+            reranker.warmup()
+        return reranker
+    
+    future = _loader_executor.submit(_load)
+    with _reranker_lock:
+        _loader_futures[model_name] = future
+    logger.info(f"Re-ranker 백그라운드 로딩 시작: {model_name}")
+    return future
+
@@ -0,0 +1,63 @@
+"""
+Search Result Cache
+search_with_mode 결과 LRU 캐시
+(한 요청 안의 원본/동의어 확장/재생성/형식 재시도 검색과 대화 턴 간 반복 검색 재사용)
+키에 개인/공유 DB 코퍼스 버전이 포함되므로 문서 추가/삭제 후에는 자동으로 새로 검색됨
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+import threading
+
+from langchain.schema import Document
+
+
+def _copy_pairs(pairs: List[Tuple[Document, float]]) -> List[Tuple[Document, float]]:
+    """호출 측의 metadata 수정이 캐시에 반영되지 않도록 Document 복사"""
+    return [
+        (Document(page_content=doc.page_content, metadata=dict(doc.metadata or {}), id=getattr(doc, "id", None)), score)
+        for doc, score in pairs
+    ]
+
+
+class SearchResultCache:
+    """(Document, score) 검색 결과 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, List[Tuple[Document, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[List[Tuple[Document, float]]]:
+        with self._lock:
+            pairs = self._entries.get(key)
+            if pairs is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_pairs(pairs)
+
+    def put(self, key: Hashable, pairs: List[Tuple[Document, float]]) -> None:
+        stored = _copy_pairs(pairs)
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
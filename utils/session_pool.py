@@ -0,0 +1,91 @@
+"""
+Session Candidate Pool
+대화 세션의 최근 턴 검색 후보(청크 ID + 임베딩)를 보관
+후속 질문은 이 풀을 먼저 Re-ranking하고, 풀 커버리지가 낮을 때만 전체 Hybrid 검색으로 폴백
+"""
+
+from collections import OrderedDict, deque
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+
+def candidate_key(doc: Document) -> str:
+    """청크 식별자 (Chroma ID 우선, 없으면 파일/페이지/내용 앞부분)"""
+    doc_id = getattr(doc, "id", None)
+    if doc_id:
+        return doc_id
+    meta = doc.metadata or {}
+    return f"{meta.get('file_name', '')}|{meta.get('page_number', '')}|{doc.page_content[:50]}"
+
+
+class SessionCandidatePool:
+    """최근 N턴 검색 후보 풀"""
+
+    def __init__(self, max_turns: int = 3, max_candidates_per_turn: int = 40):
+        """
+        Args:
+            max_turns: 후보를 유지할 최근 턴 수
+            max_candidates_per_turn: 턴당 보관할 최대 후보 수 (점수 상위부터)
+        """
+        self.max_turns = max(1, max_turns)
+        self.max_candidates_per_turn = max(1, max_candidates_per_turn)
+        self._turns: "deque[OrderedDict[str, Document]]" = deque(maxlen=self.max_turns)
+        self._embeddings: Dict[str, Optional[np.ndarray]] = {}
+        self._scope: Optional[Hashable] = None
+
+    def reset(self) -> None:
+        self._turns.clear()
+        self._embeddings.clear()
+
+    def bind(self, scope: Hashable) -> None:
+        """검색 모드/코퍼스 버전이 바뀌면 풀 초기화 (삭제된 청크 재사용 방지)"""
+        if scope != self._scope:
+            self.reset()
+            self._scope = scope
+
+    def begin_turn(self) -> None:
+        self._turns.append(OrderedDict())
+        live = {key for turn in self._turns for key in turn}
+        for key in [k for k in self._embeddings if k not in live]:
+            del self._embeddings[key]
+
+    def add(self, pairs: List[Tuple[Document, float]]) -> None:
+        """현재 턴에 후보 추가 (pairs는 점수 내림차순 가정, 임베딩은 조회 시 지연 로딩)"""
+        if not self._turns:
+            self.begin_turn()
+        turn = self._turns[-1]
+        for doc, _ in pairs:
+            if len(turn) >= self.max_candidates_per_turn:
+                break
+            key = candidate_key(doc)
+            turn[key] = doc
+            self._embeddings.setdefault(key, None)
+
+    def missing_embeddings(self, docs: List[Document]) -> List[int]:
+        return [i for i, doc in enumerate(docs) if self._embeddings.get(candidate_key(doc)) is None]
+
+    def set_embedding(self, doc: Document, vector: np.ndarray) -> None:
+        self._embeddings[candidate_key(doc)] = vector
+
+    def candidates(self) -> List[Document]:
+        """최근 턴 우선, 중복 제거된 후보 문서"""
+        seen = set()
+        docs = []
+        for turn in reversed(self._turns):
+            for key, doc in turn.items():
+                if key not in seen:
+                    seen.add(key)
+                    docs.append(doc)
+        return docs
+
+    def embedding_matrix(self, docs: List[Document]) -> Optional[np.ndarray]:
+        """후보 임베딩 행렬 (하나라도 없으면 None)"""
+        vectors = [self._embeddings.get(candidate_key(doc)) for doc in docs]
+        if not vectors or any(v is None for v in vectors):
+            return None
+        return np.stack(vectors).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len({key for turn in self._turns for key in turn})
@@ -0,0 +1,103 @@
+"""
+Slide Vision Helpers
+PPTX Vision 청킹용 슬라이드 이미지 전처리와 분석 결과 디스크 캐시
+- 전처리: 긴 변 기준 축소 + JPEG 재인코딩 (1920x1080 PNG → 요청 크기/업로드 시간 감소)
+- 캐시: 렌더링 이미지 해시 + 모델/서버/비전 모드 + 프롬프트 + 전처리 설정 키 → 분석 텍스트
+  변경되지 않은 슬라이드를 다시 업로드하면 Vision API 호출 없이 재사용
+  (이미지를 보내지 않는 텍스트 전용 요청 결과는 캐시하지 않음)
+"""
+
+from typing import Optional, Tuple
+import base64
+import hashlib
+import io
+import os
+import threading
+
+
+def prepare_vision_image(image_base64: str, max_side: int = 1280, jpeg_quality: int = 85) -> Tuple[str, str]:
+    """슬라이드 이미지를 Vision 요청용으로 축소/재인코딩
+
+    Args:
+        image_base64: 렌더링된 슬라이드 이미지 (base64)
+        max_side: 긴 변 최대 픽셀 (0 이하면 원본 크기 유지)
+        jpeg_quality: JPEG 품질 (0 이하면 원본 형식 유지)
+
+    Returns:
+        (base64 이미지, MIME 타입)
+    """
+    if max_side <= 0 and jpeg_quality <= 0:
+        return image_base64, "image/png"
+
+    from PIL import Image
+
+    img = Image.open(io.BytesIO(base64.b64decode(image_base64)))
+    if max_side > 0 and max(img.size) > max_side:
+        scale = max_side / max(img.size)
+        img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    if jpeg_quality > 0:
+        # JPEG는 알파 채널 미지원 → 흰 배경 합성
+        if img.mode in ("RGBA", "LA", "P"):
+            img = img.convert("RGBA")
+            background = Image.new("RGB", img.size, "white")
+            background.paste(img, mask=img.getchannel("A"))
+            img = background
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+        img.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+        mime = "image/jpeg"
+    else:
+        img.save(buffer, format="PNG")
+        mime = "image/png"
+    return base64.b64encode(buffer.getvalue()).decode("utf-8"), mime
+
+
+class VisionResultCache:
+    """Vision 분석 결과 디스크 캐시 (키별 파일, 프로세스 간 공유 가능)"""
+
+    def __init__(self, directory: str = "data/vision_cache"):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_base64: str, llm_api_type: str, llm_base_url: str, llm_model: str, vision_mode: str,
+                 prompt: str, max_side: int, jpeg_quality: int) -> str:
+        """렌더링 이미지 해시 + 모델/서버/비전 모드 + 프롬프트 + 전처리 설정"""
+        hasher = hashlib.sha256()
+        for part in (image_base64, llm_api_type or "", llm_base_url or "", llm_model or "", vision_mode or "",
+                     prompt, str(max_side), str(jpeg_quality)):
+            data = part.encode("utf-8")
+            hasher.update(len(data).to_bytes(8, "little"))
+            hasher.update(data)
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일 → 교체 (동시에 쓰는 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[Vision][WARN] 분석 결과 캐시 저장 실패: {e}")
@@ -0,0 +1,172 @@
+"""
+Streaming Citation Processor
+스트리밍 답변에 NotebookLM 스타일 출처를 문장 단위로 인라인 삽입
+(생성이 계속되는 동안 완성된 문장을 백그라운드에서 마이크로 배치로 매칭)
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Optional
+import re
+
+import numpy as np
+from langchain.schema import Document
+
+
+class _CitationSlot:
+    """완성된 문장 뒤 출처 표시 위치 (매칭 완료 전까지 출력 대기)"""
+
+    __slots__ = ("sentence", "marker", "resolved")
+
+    def __init__(self, sentence: str):
+        self.sentence = sentence
+        self.marker = ""
+        self.resolved = False
+
+
+class StreamingCitationProcessor:
+    """LLM 토큰 스트림 후처리기
+
+    - 토큰은 즉시 통과시키고, 문장 경계(.!? + 공백)를 감지하면 출처 슬롯을 삽입
+    - 슬롯 이후 텍스트는 해당 문장의 매칭이 끝날 때까지만 보류
+    - 매칭 중 완성된 문장들은 다음 마이크로 배치로 묶어 한 번에 임베딩
+    """
+
+    # _split_sentences와 동일한 규칙 (Dr., Mr. 등 약어는 경계 아님)
+    _BOUNDARY = re.compile(r'(?<!\bDr)(?<!\bMr)(?<!\bMs)(?<!\bMrs)(?<!\betc)[.!?](?=\s)')
+
+    def __init__(
+        self,
+        rag_chain,
+        sources: List[Document],
+        min_sentence_length: int = 10,
+        max_batch_size: int = 8
+    ):
+        """
+        Args:
+            rag_chain: RAGChain 인스턴스 (_embed_citation_sources/_match_citation_sources 사용)
+            sources: 답변 생성에 사용된 출처 문서
+            min_sentence_length: 출처를 붙일 최소 문장 길이 (query()와 동일하게 10자)
+            max_batch_size: 마이크로 배치 최대 문장 수
+        """
+        self.rag_chain = rag_chain
+        self.sources = sources
+        self.min_sentence_length = min_sentence_length
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._sentence = ""  # 마지막 경계 이후 누적 텍스트
+        self._queue: List[object] = []  # 출력 대기열 (str 또는 _CitationSlot)
+        self._pending: List[_CitationSlot] = []  # 아직 배치에 넣지 않은 슬롯
+        self._inflight: Optional[Future] = None
+        self._inflight_slots: List[_CitationSlot] = []
+        self._source_matrix: Optional[np.ndarray] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-cite")
+
+        self.citation_count = 0
+        self.sentence_count = 0
+
+    # ----------------- 매칭 (백그라운드) -----------------
+    def _match_batch(self, sentences: List[str]) -> List[str]:
+        if self._source_matrix is None:
+            self._source_matrix = self.rag_chain._embed_citation_sources(self.sources)
+        matches = self.rag_chain._match_citation_sources(sentences, self._source_matrix)
+        markers = []
+        for indices in matches:
+            citations = [self.rag_chain._format_citation(self.sources[idx]) for idx in indices]
+            markers.append(f" {''.join(citations)}" if citations else "")
+        return markers
+
+    def _collect_inflight(self, wait: bool = False) -> None:
+        if self._inflight is None or (not wait and not self._inflight.done()):
+            return
+        try:
+            markers = self._inflight.result()
+        except Exception as e:
+            print(f"    [WARN] 스트리밍 Citation 매칭 실패: {e}")
+            markers = [""] * len(self._inflight_slots)
+        for slot, marker in zip(self._inflight_slots, markers):
+            slot.marker = marker
+            slot.resolved = True
+            if marker:
+                self.citation_count += 1
+        self._inflight = None
+        self._inflight_slots = []
+
+    def _submit_pending(self) -> None:
+        if self._inflight is not None or not self._pending:
+            return
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        self._inflight_slots = batch
+        self._inflight = self._executor.submit(self._match_batch, [slot.sentence for slot in batch])
+
+    def _drain(self) -> Iterator[str]:
+        """대기열 앞에서부터 출력 가능한 텍스트를 방출 (미해결 슬롯에서 정지)"""
+        while self._queue:
+            item = self._queue[0]
+            if isinstance(item, _CitationSlot):
+                if not item.resolved:
+                    return
+                self._queue.pop(0)
+                if item.marker:
+                    yield item.marker
+            else:
+                self._queue.pop(0)
+                yield item
+
+    # ----------------- 출력 대기열 -----------------
+    def _enqueue_text(self, text: str) -> None:
+        if not text:
+            return
+        if self._queue and isinstance(self._queue[-1], str):
+            self._queue[-1] += text
+        else:
+            self._queue.append(text)
+
+    def _add_sentence(self, sentence: str) -> None:
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        self.sentence_count += 1
+        if len(sentence) < self.min_sentence_length:
+            return
+        slot = _CitationSlot(sentence)
+        self._queue.append(slot)
+        self._pending.append(slot)
+
+    # ----------------- 공개 API -----------------
+    def feed(self, chunk: str) -> Iterator[str]:
+        """토큰 청크 입력 → 지금 출력 가능한 텍스트 반환"""
+        buffer = self._sentence + chunk
+        queued_upto = len(self._sentence)
+        cut = 0
+        for match in self._BOUNDARY.finditer(buffer):
+            end = match.end()
+            if end > queued_upto:
+                self._enqueue_text(buffer[queued_upto:end])
+                queued_upto = end
+            self._add_sentence(buffer[cut:end])
+            cut = end
+        self._enqueue_text(buffer[queued_upto:])
+        self._sentence = buffer[cut:]
+
+        self._collect_inflight()
+        self._submit_pending()
+        yield from self._drain()
+
+    def flush(self) -> Iterator[str]:
+        """스트림 종료: 마지막 문장 매칭 후 남은 텍스트 모두 방출"""
+        self._add_sentence(self._sentence)
+        self._sentence = ""
+        try:
+            while self._inflight is not None or self._pending:
+                self._collect_inflight(wait=True)
+                self._submit_pending()
+                yield from self._drain()
+            yield from self._drain()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """백그라운드 매칭 스레드 종료 (스트림 오류/중단 시에도 호출, 여러 번 호출 가능)"""
+        self._pending = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -6,8 +6,11 @@ from langchain_ollama import OllamaEmbeddings
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
 from utils.request_embeddings import RequestEmbeddings
+from utils.search_cache import SearchResultCache
 import os
+import uuid
 from utils.reranker import get_reranker
+import numpy as np
 import re
 
 # BM25 임포트 (선택적)
@@ -28,7 +31,8 @@ class VectorStoreManager:
                  embedding_api_key: str = "",
                  shared_db_path: str = None,
                  shared_db_enabled: bool = False,
-                 distance_function: str = "l2"):
+                 distance_function: str = "l2",
+                 search_cache_size: int = 128):
         # 개인 DB 설정
         self.persist_directory = persist_directory
         self.embedding_api_type = embedding_api_type
@@ -84,6 +88,15 @@ class VectorStoreManager:
         self.entity_index: Dict[str, Dict[str, List[str]]] = {}
         self.entity_index_file = os.path.join(os.path.dirname(persist_directory), "entity_index.json")
         self._load_entity_index()
+
+        # Cascade Re-ranking: Cross-Encoder 전 Bi-Encoder 1차 선별 (RAGChain에서 설정)
+        self.cascade_prefilter = None
+
+        # 코퍼스 버전: 문서 추가/삭제 시 증가 (검색/답변 캐시 무효화 기준)
+        self._corpus_versions: Dict[str, int] = {"personal": 0, "shared": 0}
+
+        # search_with_mode 결과 캐시 (0 = 비활성화)
+        self.search_cache = SearchResultCache(search_cache_size) if search_cache_size > 0 else None
     
     def _create_embeddings(self):
         """API 타입에 따라 적절한 임베딩 클라이언트 생성"""
@@ -318,7 +331,9 @@ class VectorStoreManager:
             print(f"[VectorStore][WARN] 공유 DB BM25 로드 실패: {e}")
             self.shared_bm25 = None
     
-    def add_documents(self, documents: List[Document], extract_entities: bool = False, llm=None, target_db: str = "personal") -> bool:
+    def add_documents(self, documents: List[Document], extract_entities: bool = False, llm=None,
+                      target_db: str = "personal", embeddings: Optional[List[List[float]]] = None,
+                      rebuild_bm25: bool = True) -> bool:
         """
         문서를 벡터스토어에 추가하고 BM25 및 엔티티 인덱스 업데이트
 
@@ -327,6 +342,8 @@ class VectorStoreManager:
             extract_entities: 엔티티 추출 여부
             llm: LLM 객체 (엔티티 추출 시 필요)
             target_db: 대상 DB ("personal" | "shared")
+            embeddings: 미리 계산된 문서 임베딩 (병렬 수집 파이프라인, None이면 여기서 임베딩)
+            rebuild_bm25: BM25 모델 재구축 여부 (False면 코퍼스만 추가, 스트리밍 수집은 파일 마지막 배치에서 재구축)
 
         Returns:
             성공 여부
@@ -350,12 +367,14 @@ class VectorStoreManager:
                 raise ValueError(error_msg)
 
             # 대상 DB 선택
-            if target_db == "shared":
-                self.shared_vectorstore.add_documents(documents)
-                db_name = "공유 DB"
+            store = self.shared_vectorstore if target_db == "shared" else self.vectorstore
+            db_name = "공유 DB" if target_db == "shared" else "개인 DB"
+            if embeddings is not None:
+                if len(embeddings) != len(documents):
+                    raise ValueError(f"임베딩 수({len(embeddings)})와 문서 수({len(documents)})가 다릅니다")
+                self._upsert_with_embeddings(store, documents, embeddings)
             else:
-                self.vectorstore.add_documents(documents)
-                db_name = "개인 DB"
+                store.add_documents(documents)
 
             # BM25 인덱스 업데이트
             if BM25_AVAILABLE:
@@ -366,7 +385,7 @@ class VectorStoreManager:
                         self.shared_doc_ids.append(doc.metadata.get("source", ""))
 
                     # BM25 모델 재구축
-                    if self.shared_bm25_tokenized_corpus:
+                    if rebuild_bm25 and self.shared_bm25_tokenized_corpus:
                         self.shared_bm25 = BM25Okapi(self.shared_bm25_tokenized_corpus)
                         print(f"[VectorStore] 공유 DB BM25 인덱스 업데이트: 총 {len(self.shared_bm25_corpus)}개 문서")
 
@@ -377,10 +396,12 @@ class VectorStoreManager:
                         self.doc_ids.append(doc.metadata.get("source", ""))
 
                     # BM25 모델 재구축
-                    if self.bm25_tokenized_corpus:
+                    if rebuild_bm25 and self.bm25_tokenized_corpus:
                         self.bm25 = BM25Okapi(self.bm25_tokenized_corpus)
                         print(f"[VectorStore] 개인 DB BM25 인덱스 업데이트: 총 {len(self.bm25_corpus)}개 문서")
 
+            self._bump_corpus_version(target_db)
+
             # Phase 3: 엔티티 인덱스 업데이트 (선택적, 개인 DB만)
             if extract_entities and llm is not None and target_db == "personal":
                 self._update_entity_index(documents, llm)
@@ -405,6 +426,109 @@ class VectorStoreManager:
             print(f"[VectorStore][ERROR] 문서 추가 실패: {error_msg}")
             raise ValueError(error_msg)
 
+    def rebuild_bm25_index(self, target_db: str = "personal") -> None:
+        """추가만 해 둔 BM25 코퍼스로 모델 재구축 (add_documents(rebuild_bm25=False) 이후 호출)"""
+        if not BM25_AVAILABLE:
+            return
+        if target_db == "shared" and self.shared_bm25 is not None and self.shared_bm25_tokenized_corpus:
+            self.shared_bm25 = BM25Okapi(self.shared_bm25_tokenized_corpus)
+            print(f"[VectorStore] 공유 DB BM25 인덱스 업데이트: 총 {len(self.shared_bm25_corpus)}개 문서")
+        elif target_db == "personal" and self.bm25 is not None and self.bm25_tokenized_corpus:
+            self.bm25 = BM25Okapi(self.bm25_tokenized_corpus)
+            print(f"[VectorStore] 개인 DB BM25 인덱스 업데이트: 총 {len(self.bm25_corpus)}개 문서")
+
+    @staticmethod
+    def _upsert_with_embeddings(store, documents: List[Document], embeddings: List[List[float]]) -> None:
+        """미리 계산된 임베딩으로 Chroma에 직접 기록 (langchain Chroma.add_documents와 동일한 ID 규칙)"""
+        store._collection.upsert(
+            ids=[getattr(doc, "id", None) or str(uuid.uuid4()) for doc in documents],
+            embeddings=[[float(x) for x in vector] for vector in embeddings],
+            metadatas=[doc.metadata or None for doc in documents],  # Chroma는 빈 dict 메타데이터 거부
+            documents=[doc.page_content for doc in documents],
+        )
+
+    def delete_documents_by_ids(self, chunk_ids: List[str], target_db: str = "personal") -> bool:
+        """
+        청크 ID 목록을 ChromaDB에서 삭제 (스트리밍 수집 중 실패한 파일의 부분 기록 정리)
+
+        Args:
+            chunk_ids: 삭제할 청크 ID 리스트
+            target_db: 대상 DB ("personal" | "shared")
+
+        Returns:
+            성공 여부
+        """
+        if not chunk_ids:
+            return False
+        try:
+            if target_db == "shared":
+                if not self.shared_db_enabled:
+                    return False
+                collection = self.shared_vectorstore._collection
+            else:
+                collection = self.vectorstore._collection
+
+            collection.delete(ids=list(chunk_ids))
+            self._bump_corpus_version(target_db)
+
+            # BM25 인덱스 재구축 (전체, 재구축 전 추가된 코퍼스 포함)
+            if BM25_AVAILABLE:
+                if target_db == "shared" and self.shared_bm25 is not None:
+                    self._load_shared_bm25_corpus()
+                elif target_db == "personal" and self.bm25 is not None:
+                    self._load_bm25_corpus()
+
+            print(f"[VectorStore] 부분 기록 청크 삭제 완료: {len(chunk_ids)}개")
+            return True
+
+        except Exception as e:
+            print(f"[VectorStore][ERROR] 청크 삭제 실패: {e}")
+            return False
+
+    def get_file_page_index(self, file_name: str, target_db: str = "personal") -> Optional[Dict[str, Any]]:
+        """
+        파일의 저장된 청크를 페이지별로 묶어 반환 (증분 재업로드 비교용)
+
+        Args:
+            file_name: 파일명
+            target_db: 대상 DB ("personal" | "shared")
+
+        Returns:
+            {"category": str, "pages": {페이지 번호: {"hash": 콘텐츠 해시 또는 None, "ids": [청크 ID]}}}
+            저장된 청크가 없으면 None
+        """
+        if target_db == "shared":
+            if not self.shared_db_enabled:
+                return None
+            collection = self.shared_vectorstore._collection
+        else:
+            collection = self.vectorstore._collection
+
+        results = collection.get(where={"file_name": file_name}, include=["metadatas"])
+        if not results or not results["ids"]:
+            return None
+
+        pages: Dict[int, Dict[str, Any]] = {}
+        category = None
+        for chunk_id, meta in zip(results["ids"], results["metadatas"]):
+            meta = meta or {}
+            category = category or meta.get("category")
+            entry = pages.setdefault(meta.get("page_number"), {"hash": meta.get("content_hash"), "ids": []})
+            # 같은 페이지에 해시가 다른 청크가 섞여 있으면 재처리 대상이 되도록 무효화
+            if entry["hash"] != meta.get("content_hash"):
+                entry["hash"] = None
+            entry["ids"].append(chunk_id)
+        return {"category": category, "pages": pages}
+
+    def update_documents_metadata(self, chunk_ids: List[str], metadata: Dict[str, Any],
+                                  target_db: str = "personal") -> None:
+        """청크 메타데이터 일부 갱신 (임베딩 유지, 예: 슬라이드 이동 시 페이지 번호)"""
+        if not chunk_ids:
+            return
+        collection = self.shared_vectorstore._collection if target_db == "shared" else self.vectorstore._collection
+        collection.update(ids=list(chunk_ids), metadatas=[dict(metadata) for _ in chunk_ids])
+        self._bump_corpus_version(target_db)
+
     def delete_documents_by_file_name(self, file_name: str, target_db: str = "personal") -> bool:
         """
         특정 파일명의 모든 청크를 ChromaDB에서 삭제
@@ -442,6 +566,7 @@ class VectorStoreManager:
 
             # Chroma에서 청크 삭제
             collection.delete(ids=chunk_ids)
+            self._bump_corpus_version(target_db)
 
             # BM25 인덱스 재구축 (전체)
             if BM25_AVAILABLE:
@@ -477,6 +602,58 @@ class VectorStoreManager:
             print(f"[VectorStore][ERROR] 검색 실패: {e}")
             return []
 
+    def get_stored_embeddings(self, docs: List[Document]) -> List[Optional[np.ndarray]]:
+        """검색된 Document의 저장된 임베딩을 Chroma ID로 조회 (재임베딩 없음)
+
+        Args:
+            docs: Chroma 검색 결과 Document 리스트 (Document.id 필요)
+
+        Returns:
+            docs와 같은 순서의 임베딩 리스트 (조회 실패 시 None)
+        """
+        ids = [getattr(doc, "id", None) for doc in docs]
+        found: Dict[str, np.ndarray] = {}
+
+        stores = [self.vectorstore]
+        if self.shared_db_enabled and self.shared_vectorstore is not None:
+            stores.append(self.shared_vectorstore)
+
+        for store in stores:
+            pending = list({did for did in ids if did and did not in found})
+            if not pending:
+                break
+            try:
+                data = store._collection.get(ids=pending, include=["embeddings"])
+                embeddings = data.get("embeddings")
+                if embeddings is None:
+                    continue
+                for did, emb in zip(data.get("ids", []) or [], embeddings):
+                    if emb is not None:
+                        found[did] = np.asarray(emb, dtype=np.float32)
+            except Exception as e:
+                print(f"[VectorStore][WARN] 저장된 임베딩 조회 실패: {e}")
+
+        return [found.get(did) if did else None for did in ids]
+
+    def get_document_embeddings(self, docs: List[Document]) -> np.ndarray:
+        """Document 임베딩 행렬 반환 (저장된 벡터 우선, 없는 것만 배치 임베딩)
+
+        Returns:
+            (len(docs), dim) 크기의 float32 행렬
+        """
+        if not docs:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        vectors = self.get_stored_embeddings(docs)
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            embedded = self.embeddings.embed_documents([docs[i].page_content for i in missing])
+            for i, emb in zip(missing, embedded):
+                vectors[i] = np.asarray(emb, dtype=np.float32)
+            print(f"[VectorStore] 저장된 임베딩 재사용: {len(docs) - len(missing)}/{len(docs)}개 (나머지 배치 임베딩)")
+
+        return np.vstack(vectors)
+
     # ----------------- 하이브리드 검색 -----------------
     def _tokenize(self, text: str, preserve_numbers: bool = True) -> List[str]:
         """텍스트 토큰화 (정확도 향상 v2: stopwords 제거, 숫자/단위 보존)"""
@@ -619,7 +796,7 @@ class VectorStoreManager:
                         if 0 <= idx < len(docs_raw):
                             from langchain.schema import Document as LC_Document
                             meta = metas_raw[idx] if idx < len(metas_raw) else {}
-                            doc_obj = LC_Document(page_content=docs_raw[idx], metadata=meta or {})
+                            doc_obj = LC_Document(page_content=docs_raw[idx], metadata=meta or {}, id=did)
                     if doc_obj is not None:
                         results_rrf.append((doc_obj, float(score)))
 
@@ -717,13 +894,14 @@ class VectorStoreManager:
         data = coll.get()
         docs = data.get("documents", [])
         metas = data.get("metadatas", [])
+        ids = data.get("ids", []) or []
         results = []
         max_score = max(scores) if scores else 1.0
         for idx, s in ranked:
             if idx < len(docs):
                 from langchain.schema import Document
                 meta = metas[idx] if idx < len(metas) else {}
-                doc = Document(page_content=docs[idx], metadata=meta or {})
+                doc = Document(page_content=docs[idx], metadata=meta or {}, id=ids[idx] if idx < len(ids) else None)
                 # 0~1 정규화 점수
                 norm = float(s) / max_score if max_score > 0 else 0.0
                 results.append((doc, norm))
@@ -770,6 +948,10 @@ class VectorStoreManager:
             if not candidates:
                 return []
 
+            # 1.5단계: Cascade - 저장된 임베딩 코사인으로 Cross-Encoder 후보 축소
+            if self.cascade_prefilter is not None:
+                candidates = self.cascade_prefilter.filter(query, candidates)
+
             # 2단계: Re-ranker 초기화
             reranker = get_reranker(model_name=reranker_model)
 
@@ -904,11 +1086,36 @@ class VectorStoreManager:
             
             # 벡터스토어에서 삭제
             collection.delete(where={"file_name": file_name})
+            self._bump_corpus_version("personal")
             return True
         except Exception as e:
             print(f"[VectorStore][ERROR] 문서 삭제 실패: {e}")
             return False
     
+    def _bump_corpus_version(self, target_db: str) -> None:
+        self._corpus_versions[target_db] = self._corpus_versions.get(target_db, 0) + 1
+
+    def get_corpus_version(self, search_mode: str = "integrated") -> tuple:
+        """검색 모드가 참조하는 DB들의 버전 (로컬 변경 횟수, 청크 수)
+
+        공유 DB는 다른 사용자가 변경할 수 있으므로 청크 수도 함께 비교한다.
+        """
+        if search_mode == "personal" or (search_mode == "integrated" and not self.shared_db_enabled):
+            targets = [("personal", self.vectorstore)]
+        elif search_mode == "shared":
+            targets = [("shared", self.shared_vectorstore)]
+        else:
+            targets = [("personal", self.vectorstore), ("shared", self.shared_vectorstore)]
+
+        version = []
+        for name, store in targets:
+            try:
+                count = store._collection.count() if store is not None else 0
+            except Exception:
+                count = -1
+            version.append((name, self._corpus_versions.get(name, 0), count))
+        return tuple(version)
+
     def get_vectorstore(self):
         """벡터스토어 반환 (RAG 체인에서 사용)"""
         return self.vectorstore
@@ -924,6 +1131,7 @@ class VectorStoreManager:
         # 임베딩 재생성
         self.embeddings = self._create_embeddings()
         self._init_vectorstore()
+        self._bump_corpus_version("personal")
     
     def _load_entity_index(self):
         """엔티티 인덱스를 파일에서 로드"""
@@ -1009,6 +1217,44 @@ class VectorStoreManager:
         top_k: int = 10,
         use_reranker: bool = True,
         reranker_model: str = "multilingual-mini"
+    ) -> List[tuple]:
+        """
+        검색 모드별 검색 (결과 캐시 적용, 캐시 키에 코퍼스 버전 포함)
+
+        인자와 반환값은 _search_with_mode_uncached와 동일
+        """
+        if self.search_cache is None:
+            return self._search_with_mode_uncached(query, search_mode, initial_k, top_k, use_reranker, reranker_model)
+
+        key = (
+            query, search_mode, initial_k, top_k, use_reranker, reranker_model,
+            self.cascade_prefilter is not None, self.get_corpus_version(search_mode)
+        )
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            print(f"[CACHE] 검색 결과 캐시 적중 ({search_mode}, {len(cached)}개): {query[:40]}")
+            return cached
+
+        results = self._search_with_mode_uncached(query, search_mode, initial_k, top_k, use_reranker, reranker_model)
+        # 빈 결과는 검색 오류일 수 있으므로 저장하지 않음
+        if results:
+            self.search_cache.put(key, results)
+        return results
+
+    def get_search_cache_stats(self) -> Dict[str, Any]:
+        """search_with_mode 캐시 적중률 통계"""
+        if self.search_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.search_cache.stats()}
+
+    def _search_with_mode_uncached(
+        self,
+        query: str,
+        search_mode: str = "integrated",
+        initial_k: int = 40,
+        top_k: int = 10,
+        use_reranker: bool = True,
+        reranker_model: str = "multilingual-mini"
     ) -> List[tuple]:
         """
         검색 모드에 따라 개인 DB, 공유 DB, 또는 통합 검색 수행
@@ -1224,6 +1470,7 @@ class VectorStoreManager:
 
             # 공유 DB 재초기화
             self._init_shared_vectorstore()
+            self._bump_corpus_version("shared")
 
             # BM25 인덱스 로드
             if BM25_AVAILABLE: